@@ -16,6 +16,9 @@ PATTERNS_DIR = DATA_DIR / "patterns"
 FEATURES_DIR = DATA_DIR / "features"
 LABELED_DIR = DATA_DIR / "labeled"
 
+# Shared Parquet OHLCV store (same store the SuperTrend scanner and webapp use)
+MARKET_DATA_DIR = BASE_DIR.parent / "data" / "market"
+
 # Database
 DB_PATH = DATA_DIR / "patterns.db"
 
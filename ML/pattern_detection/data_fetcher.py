@@ -1,16 +1,26 @@
 """
 Data fetcher for stock universe and historical data
 """
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from pathlib import Path
-from utils.data_utils import fetch_stock_data, fetch_index_data, get_stock_info
+from utils.data_utils import fetch_stock_data, fetch_index_data, get_stock_info, add_nse_suffix
 from utils.logger import setup_logger
-from config import RAW_DATA_DIR, STOCK_UNIVERSE
+from config import MARKET_DATA_DIR, STOCK_UNIVERSE
+
+# Shared market-data store lives in the scanner package at the project root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.scanner.market_store import MarketDataStore
+from src.scanner.data_fetcher import download_batch
+from src.scanner.scheduler import FetchScheduler, RetryQueue
 
 logger = setup_logger("data_fetcher")
 
+market_store = MarketDataStore(MARKET_DATA_DIR)
+retry_queue = RetryQueue(Path(MARKET_DATA_DIR) / "retry_queue.json")
+
 # Default NSE F&O stocks list (top liquid stocks)
 DEFAULT_FNO_STOCKS = [
     "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK", "HINDUNILVR", "ITC",
@@ -62,7 +72,7 @@ def fetch_historical_data(
         ticker: Stock ticker
         start_date: Start date
         end_date: End date
-        save_csv: Save to CSV file
+        save_csv: Save to the shared market-data store
     
     Returns:
         DataFrame with OHLCV data
@@ -74,10 +84,9 @@ def fetch_historical_data(
         df.columns = df.columns.str.lower()
         
         if save_csv:
-            # Save to CSV
-            csv_path = RAW_DATA_DIR / f"{ticker}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
-            df.to_csv(csv_path, index=False)
-            logger.info(f"Saved data to {csv_path}")
+            # Merge: the stored 1d series is shared (e.g. the scanner's weekly base)
+            market_store.append(add_nse_suffix(ticker), "1d", df, source="yahoo")
+            logger.info(f"Saved data to {market_store.path(add_nse_suffix(ticker), '1d')}")
     
     return df
 
@@ -85,7 +94,8 @@ def batch_fetch_data(
     tickers: List[str],
     start_date: datetime,
     end_date: datetime,
-    save_csv: bool = True
+    save_csv: bool = True,
+    chunk_size: int = 50
 ) -> Dict[str, pd.DataFrame]:
     """
     Fetch data for multiple stocks
@@ -94,7 +104,8 @@ def batch_fetch_data(
         tickers: List of stock tickers
         start_date: Start date
         end_date: End date
-        save_csv: Save to CSV files
+        save_csv: Save to the shared market-data store
+        chunk_size: Stocks per download request
     
     Returns:
         Dictionary of {ticker: DataFrame}
@@ -103,15 +114,27 @@ def batch_fetch_data(
     
     logger.info(f"Fetching data for {len(tickers)} stocks from {start_date} to {end_date}")
     
-    for i, ticker in enumerate(tickers, 1):
-        logger.info(f"[{i}/{len(tickers)}] Fetching {ticker}...")
-        
-        df = fetch_historical_data(ticker, start_date, end_date, save_csv)
+    # One multi-ticker request per chunk instead of one request per stock
+    symbols = {add_nse_suffix(ticker): ticker for ticker in tickers}
+    scheduler = FetchScheduler(retry_queue=retry_queue)
+    frames = download_batch(list(symbols), start_date, end_date, "1d", chunk_size=chunk_size,
+                            scheduler=scheduler)
+    
+    for symbol, ticker in symbols.items():
+        df = frames.get(symbol)
         
-        if df is not None and not df.empty:
-            data_dict[ticker] = df
-        else:
+        if df is None or df.empty:
             logger.warning(f"Failed to fetch data for {ticker}")
+            continue
+        
+        if save_csv:
+            market_store.append(symbol, "1d", df, source=scheduler.provider.name)
+        
+        df = df.copy()
+        df.columns = df.columns.str.lower()
+        if df['date'].dt.tz is not None:
+            df['date'] = df['date'].dt.tz_localize(None)
+        data_dict[ticker] = df
     
     logger.info(f"Successfully fetched data for {len(data_dict)}/{len(tickers)} stocks")
     return data_dict
@@ -135,45 +158,45 @@ def fetch_market_data(start_date: datetime, end_date: datetime) -> Dict[str, pd.
     if nifty is not None:
         market_data['nifty_50'] = nifty
         # Save
-        nifty.to_csv(RAW_DATA_DIR / "NIFTY50.csv", index=False)
+        market_store.append("^NSEI", "1d", nifty, source="yahoo")
     
     # Bank Nifty
     logger.info("Fetching Bank Nifty data...")
     banknifty = fetch_index_data("^NSEBANK", start_date, end_date)
     if banknifty is not None:
         market_data['bank_nifty'] = banknifty
-        banknifty.to_csv(RAW_DATA_DIR / "BANKNIFTY.csv", index=False)
+        market_store.append("^NSEBANK", "1d", banknifty, source="yahoo")
     
     # VIX (if available)
     # Note: VIX data might not be available on Yahoo Finance
     
     return market_data
 
-def load_cached_data(ticker: str) -> Optional[pd.DataFrame]:
+def load_cached_data(
+    ticker: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Optional[pd.DataFrame]:
     """
-    Load cached data from CSV
+    Load cached daily data from the market-data store
     
     Args:
         ticker: Stock ticker
+        start_date: Only load bars on/after this date (optional)
+        end_date: Only load bars on/before this date (optional)
     
     Returns:
         DataFrame if found, None otherwise
     """
-    # Find most recent file for ticker
-    files = list(RAW_DATA_DIR.glob(f"{ticker}_*.csv"))
+    df = market_store.read(add_nse_suffix(ticker), "1d", start_date, end_date)
     
-    if not files:
+    if df is None:
         return None
     
-    # Get most recent file
-    most_recent = max(files, key=lambda p: p.stat().st_mtime)
-    
-    logger.info(f"Loading cached data for {ticker} from {most_recent}")
-    df = pd.read_csv(most_recent)
+    logger.info(f"Loading cached data for {ticker} from {market_store.path(add_nse_suffix(ticker), '1d')}")
     
     # Ensure lowercase column names
     df.columns = df.columns.str.lower()
-    df['date'] = pd.to_datetime(df['date'])
     
     return df
 
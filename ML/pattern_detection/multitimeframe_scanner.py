@@ -9,13 +9,20 @@ sys.path.append(str(Path(__file__).parent.parent))
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from utils.data_utils import fetch_stock_data
+from utils.data_utils import add_nse_suffix
 from pattern_detection.talib_patterns import detect_talib_patterns, extract_pattern_occurrences, filter_high_quality_patterns
 from utils.logger import setup_logger
+from config import MARKET_DATA_DIR
+
+# Shared market-data store lives in the scanner package at the project root
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.scanner.data_fetcher import fetch_incremental
+from src.scanner.timeframes import resample_ohlcv
 
 logger = setup_logger("multitimeframe_scanner")
 
-# Timeframe configurations
+# Timeframe configurations. Only base resolutions (1d, 1h) are downloaded
+# and stored; 1wk and 4h are resampled from them.
 TIMEFRAMES = {
     '1W': {
         'interval': '1wk',
@@ -32,7 +39,7 @@ TIMEFRAMES = {
         'label': 'Daily'
     },
     '4H': {
-        'interval': '1h',  # yfinance doesn't have 4h, we'll resample from 1h
+        'interval': '4h',  # resampled from stored 1h bars
         'lookback_days': 60,  # 2 months
         'min_bars': 120,
         'weight': 0.20,
@@ -52,6 +59,8 @@ def resample_to_4h(df: pd.DataFrame) -> pd.DataFrame:
     """
     Resample 1H data to 4H timeframe
     
+    Buckets start at the 09:15 NSE session open (09:15-13:15, 13:15-close).
+    
     Args:
         df: DataFrame with 1H OHLCV data
     
@@ -61,22 +70,7 @@ def resample_to_4h(df: pd.DataFrame) -> pd.DataFrame:
     try:
         df = df.copy()
         df['date'] = pd.to_datetime(df['date'])
-        df.set_index('date', inplace=True)
-        
-        # Resample to 4H
-        resampled = df.resample('4H').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        })
-        
-        # Drop rows with NaN (incomplete 4H bars)
-        resampled.dropna(inplace=True)
-        
-        # Reset index
-        resampled.reset_index(inplace=True)
+        resampled = resample_ohlcv(df.sort_values('date'), '4h')
         
         logger.debug(f"Resampled {len(df)} 1H bars to {len(resampled)} 4H bars")
         return resampled
@@ -90,6 +84,10 @@ def fetch_timeframe_data(ticker: str, timeframe: str) -> Optional[pd.DataFrame]:
     """
     Fetch data for a specific timeframe
     
+    Bars come from the shared market-data store, which only downloads the
+    missing tail of the base series; 1W and 4H are derived from the cached
+    1D and 1H bars instead of separate downloads.
+    
     Args:
         ticker: Stock ticker
         timeframe: Timeframe code (1W, 1D, 4H, 1H)
@@ -103,25 +101,22 @@ def fetch_timeframe_data(ticker: str, timeframe: str) -> Optional[pd.DataFrame]:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=config['lookback_days'])
         
-        # Fetch data
-        df = fetch_stock_data(
-            symbol=ticker,
-            start_date=start_date,
-            end_date=end_date,
-            interval=config['interval']
+        df = fetch_incremental(
+            add_nse_suffix(ticker),
+            start_date.strftime('%Y-%m-%d'),
+            (end_date + timedelta(days=1)).strftime('%Y-%m-%d'),
+            MARKET_DATA_DIR,
+            timeframe=config['interval']
         )
         
+        if df is not None:
+            df = df[df['Date'] >= pd.Timestamp(start_date)].reset_index(drop=True)
+            df.columns = df.columns.str.lower()
+        
         if df is None or len(df) < config['min_bars']:
             logger.warning(f"Insufficient data for {ticker} on {timeframe}: {len(df) if df is not None else 0} bars")
             return None
         
-        # If 4H, resample from 1H
-        if timeframe == '4H':
-            df = resample_to_4h(df)
-            if len(df) < config['min_bars']:
-                logger.warning(f"Insufficient 4H bars for {ticker}: {len(df)}")
-                return None
-        
         logger.info(f"Fetched {len(df)} {timeframe} bars for {ticker}")
         return df
     
@@ -1,31 +1,31 @@
 """
 Market utilities for Indian stock markets (NSE/BSE)
 """
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict
-from config import NSE_HOLIDAYS
+
+# Shared NSE calendar lives in the scanner package at the repository root
+# (appended, so ML's own config/utils modules keep precedence)
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.scanner.trading_calendar import nse_calendar
 
 def is_trading_day(date: datetime) -> bool:
     """
     Check if a given date is a trading day
     
+    Weekends and NSE holidays are not; special sessions such as Muhurat
+    trading are not counted either (see src/scanner/trading_calendar.py)
+    
     Args:
         date: Date to check
     
     Returns:
         True if trading day, False otherwise
     """
-    # Check if weekend
-    if date.weekday() >= 5:  # Saturday=5, Sunday=6
-        return False
-    
-    # Check if holiday
-    date_str = date.strftime("%Y-%m-%d")
-    if date_str in NSE_HOLIDAYS:
-        return False
-    
-    return True
+    return nse_calendar().is_trading_day(date, special=False)
 
 def get_trading_days(start_date: datetime, end_date: datetime) -> List[datetime]:
     """
@@ -38,15 +38,8 @@ def get_trading_days(start_date: datetime, end_date: datetime) -> List[datetime]
     Returns:
         List of trading days
     """
-    trading_days = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        if is_trading_day(current_date):
-            trading_days.append(current_date)
-        current_date += timedelta(days=1)
-    
-    return trading_days
+    sessions = nse_calendar().sessions(start_date, end_date, special=False)
+    return [session.to_pydatetime() for session in sessions]
 
 def get_next_trading_day(date: datetime) -> datetime:
     """
@@ -0,0 +1 @@
+"""Offline benchmarks for the scanner hot paths (python -m benchmarks)."""
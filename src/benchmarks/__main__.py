@@ -0,0 +1,72 @@
+"""
+Run the benchmark suite and check it against a baseline.
+
+    python -m benchmarks                       # all sizes, compare to baseline.json
+    python -m benchmarks --sizes 10,100 --save # record a new baseline
+
+Exits with status 1 when a case regressed beyond the tolerance.
+"""
+import sys
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.suite import (
+    DEFAULT_SIZES, DEFAULT_BASELINE, DEFAULT_TOLERANCE,
+    run_suite, save_baseline, load_baseline, compare, machine_info
+)
+
+
+@click.command()
+@click.option('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+              help='Comma-separated universe sizes (symbols)')
+@click.option('--repeat', default=5, type=int, help='Timed runs per case')
+@click.option('--seed', default=0, type=int, help='Synthetic data seed')
+@click.option('--case', 'cases', multiple=True, help='Only run these cases (repeatable)')
+@click.option('--baseline', default=str(DEFAULT_BASELINE), type=click.Path(dir_okay=False),
+              help='Baseline JSON file')
+@click.option('--save', is_flag=True, help='Write these results as the new baseline')
+@click.option('--tolerance', default=DEFAULT_TOLERANCE, type=float,
+              help='Allowed slowdown vs the baseline best run (0.25 = 25%)')
+def main(sizes, repeat, seed, cases, baseline, save, tolerance):
+    """Time the scanner hot paths on synthetic data."""
+    sizes = [int(size) for size in sizes.split(',') if size]
+    
+    def progress(key, timing):
+        rate = f"{timing['rows_per_s']:>14,.0f} rows/s" if timing['rows_per_s'] else ''
+        click.echo(f"  {key:<28} {timing['median_s'] * 1000:>10.2f} ms  {rate}")
+    
+    click.echo(f"Benchmarking sizes {sizes} ({repeat} runs per case)")
+    results = run_suite(sizes, repeat=repeat, seed=seed, cases=cases or None, progress=progress)
+    
+    if save:
+        path = save_baseline(results, baseline, seed=seed, repeat=repeat)
+        click.echo(f"\nBaseline saved to: {path}")
+        return
+    
+    previous = load_baseline(baseline)
+    if previous is None:
+        click.echo(f"\nNo baseline at {baseline}; run with --save to record one")
+        return
+    
+    if previous.get('machine') != machine_info():
+        click.echo("\nWarning: baseline was recorded on a different machine or library versions", err=True)
+    
+    rows = compare(results, previous, tolerance=tolerance)
+    click.echo(f"\n{'case':<28} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        click.echo(f"{row['case']:<28} {row['baseline_s'] * 1000:>12.2f} {row['current_s'] * 1000:>12.2f} "
+                   f"{row['ratio']:>7.2f}{flag}")
+    
+    regressed = [row['case'] for row in rows if row['regressed']]
+    if regressed:
+        click.echo(f"\n{len(regressed)} regression(s) beyond {tolerance:.0%}: {', '.join(regressed)}", err=True)
+        sys.exit(1)
+    click.echo(f"\nNo regressions beyond {tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
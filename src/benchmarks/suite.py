@@ -0,0 +1,204 @@
+"""Timed cases for the scanner hot paths, with a JSON baseline."""
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scanner.analyser import filter_trades, compute_summary_stats
+from scanner.executor import make_shards, run_sharded, analyze_shard
+from scanner.indicators import supertrend, atr, calculate_rsi
+from scanner.market_store import MarketDataStore
+from scanner.signal_detector import find_buy_sell_pairs, find_trade_pairs
+from scanner.timeframes import resample_ohlcv, clear_memo
+from scanner.trades import concat_trades
+
+from .synthetic import generate_universe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10, 100, 2000)
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# A case regresses when its best run is this much slower than the baseline's,
+# and by more than MIN_DELTA_S (so sub-millisecond noise never trips it)
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_S = 0.005
+
+ATR_PERIOD = 10
+MULTIPLIER = 3.0
+
+
+def time_case(func, repeat=5, warmup=1):
+    """
+    Time func() over several runs.
+
+    Args:
+        func: Callable with no arguments
+        repeat: Timed runs
+        warmup: Untimed runs first
+
+    Returns:
+        dict: min_s, median_s and the individual runs
+    """
+    for _ in range(warmup):
+        func()
+
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+
+    return {'min_s': min(runs), 'median_s': statistics.median(runs), 'runs': runs}
+
+
+def _cases(daily, store_dir):
+    """
+    (name, func, rows) for one universe.
+
+    Indicator and pairing cases run per symbol on weekly bars, as the
+    scanner does; trade-table cases run on all of the universe's trades.
+    'analyze' is the full path from the store: load, resample, SuperTrend,
+    pairing and merge, with the derived-series memo cleared each run.
+    """
+    weekly = {symbol: resample_ohlcv(df, '1wk') for symbol, df in daily.items()}
+    with_st = {symbol: supertrend(df, ATR_PERIOD, MULTIPLIER) for symbol, df in weekly.items()}
+    trades = concat_trades(find_trade_pairs(df, symbol) for symbol, df in with_st.items())
+    bars = sum(len(df) for df in weekly.values())
+    symbols = list(daily)
+
+    def analyze():
+        clear_memo()
+        shards = make_shards(symbols, max_workers=1)
+        frames = [result for _, result in run_sharded(
+            analyze_shard, shards, executor='serial',
+            cache_dir=store_dir, atr_period=ATR_PERIOD, multiplier=MULTIPLIER
+        )]
+        return concat_trades(frames)
+
+    return [
+        ('atr', lambda: [atr(df, ATR_PERIOD) for df in weekly.values()], bars),
+        ('calculate_rsi', lambda: [calculate_rsi(df) for df in weekly.values()], bars),
+        ('supertrend', lambda: [supertrend(df, ATR_PERIOD, MULTIPLIER) for df in weekly.values()], bars),
+        ('find_buy_sell_pairs', lambda: [find_buy_sell_pairs(df, symbol) for symbol, df in with_st.items()], bars),
+        ('filter_trades', lambda: filter_trades(trades, abs_threshold=10.0), len(trades)),
+        ('compute_summary_stats', lambda: compute_summary_stats(trades), len(trades)),
+        ('analyze', analyze, sum(len(df) for df in daily.values())),
+    ]
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=5, seed=0, cases=None, progress=None):
+    """
+    Run every case at every universe size.
+
+    Args:
+        sizes: Universe sizes (symbols)
+        repeat: Timed runs per case
+        seed: Synthetic data seed
+        cases: Case names to run (default: all)
+        progress: Called with (case key, timing) after each case
+
+    Returns:
+        dict: {'<case>/<size>': {'min_s', 'median_s', 'runs', 'rows', 'rows_per_s'}}
+    """
+    results = {}
+    for size in sizes:
+        daily = generate_universe(size, seed=seed)
+        with tempfile.TemporaryDirectory(prefix="scanner-bench-") as store_dir:
+            store = MarketDataStore(store_dir)
+            for symbol, df in daily.items():
+                store.write(symbol, '1d', df, source='synthetic')
+
+            for name, func, rows in _cases(daily, store_dir):
+                if cases and name not in cases:
+                    continue
+                timing = time_case(func, repeat=repeat)
+                timing['rows'] = int(rows)
+                timing['rows_per_s'] = round(rows / timing['median_s'], 1) if timing['median_s'] > 0 else None
+                key = f"{name}/{size}"
+                results[key] = timing
+                if progress is not None:
+                    progress(key, timing)
+    return results
+
+
+def machine_info():
+    """Enough about the host to tell whether two baselines are comparable."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def save_baseline(results, path=DEFAULT_BASELINE, seed=0, repeat=5):
+    """Write results with machine and run details as the new baseline."""
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'config': {'seed': seed, 'repeat': repeat},
+        'results': results,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path=DEFAULT_BASELINE):
+    """
+    Load a baseline file.
+
+    Returns:
+        dict or None if the file does not exist
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_s=MIN_DELTA_S):
+    """
+    Compare results against a baseline by best-of-N time.
+
+    The fastest run is the least affected by other load on the machine, so
+    it is compared rather than the median.
+
+    Args:
+        results: Output of run_suite
+        baseline: Output of load_baseline
+        tolerance: Allowed slowdown as a fraction of the baseline time
+        min_delta_s: Slowdowns smaller than this are never regressions
+
+    Returns:
+        list: One dict per case present in both (case, baseline_s,
+            current_s, ratio, regressed), slowest ratio first
+    """
+    rows = []
+    for key, timing in results.items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        ratio = timing['min_s'] / base['min_s'] if base['min_s'] > 0 else float('inf')
+        rows.append({
+            'case': key,
+            'baseline_s': base['min_s'],
+            'current_s': timing['min_s'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + tolerance and timing['min_s'] - base['min_s'] > min_delta_s,
+        })
+    return sorted(rows, key=lambda row: row['ratio'], reverse=True)
@@ -0,0 +1,120 @@
+"""Deterministic synthetic NSE-like daily OHLCV for benchmarks."""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 248
+
+# Fixed-date NSE holidays (month, day); festival holidays move every year
+# and are drawn per year from the seed instead
+FIXED_HOLIDAYS = ((1, 26), (5, 1), (8, 15), (10, 2), (12, 25))
+FESTIVAL_HOLIDAYS_PER_YEAR = 9
+
+SPLIT_PROBABILITY = 0.3
+SPLIT_RATIOS = (2, 5, 10)
+LATE_LISTING_PROBABILITY = 0.1
+HALT_PROBABILITY = 0.002
+
+
+def trading_sessions(start='2015-01-01', end='2024-12-31', seed=0):
+    """
+    Weekdays minus fixed and (seeded) festival holidays.
+
+    Args:
+        start: First calendar day
+        end: Last calendar day
+        seed: Seed for the festival holidays
+
+    Returns:
+        pandas.DatetimeIndex: Session dates (datetime64[ns])
+    """
+    days = pd.bdate_range(start, end).as_unit('ns')
+    closed = np.zeros(len(days), dtype=bool)
+    for month, day in FIXED_HOLIDAYS:
+        closed |= (days.month == month) & (days.day == day)
+
+    for year in np.unique(days.year):
+        in_year = np.flatnonzero((days.year == year) & ~closed)
+        rng = np.random.default_rng([seed, int(year)])
+        closed[rng.choice(in_year, size=min(FESTIVAL_HOLIDAYS_PER_YEAR, len(in_year)), replace=False)] = True
+
+    return days[~closed]
+
+
+def generate_ohlcv(sessions, seed=0, index=0):
+    """
+    One symbol's daily bars as geometric Brownian motion with NSE-like quirks.
+
+    Besides GBM closes, bars have overnight gaps (with occasional earnings
+    jumps), an unadjusted split for some symbols, late listings for some
+    and the odd trading halt (missing sessions).
+
+    Args:
+        sessions: Session dates (see trading_sessions)
+        seed: Universe seed
+        index: Symbol number within the universe
+
+    Returns:
+        pandas.DataFrame: Date/Open/High/Low/Close/Volume bars
+    """
+    rng = np.random.default_rng([seed, index])
+    n = len(sessions)
+
+    drift = rng.normal(0.10, 0.15) / TRADING_DAYS_PER_YEAR
+    vol = rng.uniform(0.15, 0.55) / np.sqrt(TRADING_DAYS_PER_YEAR)
+    start_price = np.exp(rng.uniform(np.log(20), np.log(5000)))
+
+    # Overnight gap and intraday move make up each day's log return
+    gap = rng.normal(0, vol * 0.3, n)
+    jumps = rng.random(n) < 0.01
+    gap[jumps] += rng.normal(0, 0.06, jumps.sum())
+    intraday = rng.normal(drift - 0.5 * vol ** 2, vol, n)
+    gap[0] = 0.0
+
+    log_open = np.log(start_price) + np.cumsum(gap + np.concatenate(([0.0], intraday[:-1])))
+    log_close = log_open + intraday
+    open_ = np.exp(log_open)
+    close = np.exp(log_close)
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, vol * 0.5, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, vol * 0.5, n)))
+    volume = np.exp(rng.normal(np.log(rng.uniform(5e4, 5e6)), 0.6, n))
+
+    # Unadjusted split: prices before the ex-date are ratio times higher
+    if rng.random() < SPLIT_PROBABILITY and n > 2:
+        ex_date = rng.integers(1, n)
+        ratio = rng.choice(SPLIT_RATIOS)
+        for prices in (open_, high, low, close):
+            prices[:ex_date] *= ratio
+        volume[:ex_date] /= ratio
+
+    keep = rng.random(n) >= HALT_PROBABILITY
+    if rng.random() < LATE_LISTING_PROBABILITY:
+        keep[:rng.integers(0, n // 2 + 1)] = False
+    keep[-1] = True
+
+    return pd.DataFrame({
+        'Date': sessions[keep],
+        'Open': open_[keep].round(2),
+        'High': high[keep].round(2),
+        'Low': low[keep].round(2),
+        'Close': close[keep].round(2),
+        'Volume': volume[keep].astype(np.int64),
+    })
+
+
+def generate_universe(n_symbols, years=10, seed=0):
+    """
+    A synthetic universe of daily bars.
+
+    The same arguments always give the same bars, so timings are comparable
+    across runs and machines.
+
+    Args:
+        n_symbols: Number of symbols
+        years: Years of history ending 2024-12-31
+        seed: Universe seed
+
+    Returns:
+        dict: {symbol: DataFrame} with symbols SYN0000.NS, SYN0001.NS, ...
+    """
+    sessions = trading_sessions(start=f"{2025 - years}-01-01", end='2024-12-31', seed=seed)
+    return {f"SYN{i:04d}.NS": generate_ohlcv(sessions, seed=seed, index=i) for i in range(n_symbols)}
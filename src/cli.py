@@ -2,33 +2,65 @@
 import click
 import pandas as pd
 import logging
+import os
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import (
-    RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR,
-    DEFAULT_ATR_PERIOD, DEFAULT_MULTIPLIER, DEFAULT_ABS_THRESHOLD
+    RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR, MARKET_DATA_DIR,
+    DEFAULT_ATR_PERIOD, DEFAULT_MULTIPLIER, DEFAULT_ABS_THRESHOLD,
+    FETCH_RATE_LIMIT, FETCH_MAX_CONCURRENCY, FETCH_MAX_RETRIES, RETRY_QUEUE_PATH,
+    INDICATOR_CACHE_DIR, INDICATOR_CACHE_MAX_BYTES
 )
-from scanner.data_fetcher import fetch_weekly, load_cached, fetch_symbols_from_csv
-from scanner.signal_detector import detect_signals_for_symbol
+from scanner.data_fetcher import (
+    fetch_batch, load_cached, load_cached_many, list_cached_symbols, fetch_symbols_from_csv,
+    DEFAULT_CHUNK_SIZE
+)
+from scanner.providers import get_provider
+from scanner.scheduler import FetchScheduler, RetryQueue
+from scanner.timeframes import base_timeframe
+from scanner.market_store import MarketDataStore, import_csv_cache
+from scanner.trades import as_trade_frame, concat_trades
 from scanner.analyser import filter_trades, compute_summary_stats
 from scanner.report import generate_full_report, write_csv
+from scanner.report_sink import StreamingReportSink, stream_report_from_csv
+from scanner.sweep import run_sweep
+from scanner.panel import analyze_panel
+from scanner.executor import EXECUTORS, make_shards, run_sharded, analyze_shard, compute_shard
+from scanner.indicator_cache import IndicatorCache
+from scanner.watcher import SignalWatcher
 from scanner.utils import setup_logging, sanitize_symbol
+from scanner import profiling
 
 logger = None
 
 
 @click.group()
 @click.option('--log-level', default='INFO', help='Logging level (DEBUG, INFO, WARNING, ERROR)')
-def cli(log_level):
+@click.option('--profile', type=click.Path(dir_okay=False), default=None,
+              help='Write per-stage timings to this JSON file (plus .folded flamegraph stacks '
+                   'and a .timing.jsonl event log)')
+@click.pass_context
+def cli(ctx, log_level, profile):
     """SuperTrend Scanner CLI - Analyze weekly SuperTrend signals."""
     global logger
-    logger = setup_logging(log_level)
+    logger = setup_logging(log_level, timing_path=f"{profile}.timing.jsonl" if profile else None)
+    
+    if profile:
+        profiler = profiling.enable()
+        
+        def write_profile():
+            paths = profiler.write(profile)
+            profiling.disable()
+            click.echo(f"\nProfile saved to: {', '.join(paths)}")
+        
+        # Exit callbacks run last-in first-out: close the command's stage, then write
+        ctx.call_on_close(write_profile)
+        ctx.with_resource(profiling.stage(ctx.invoked_subcommand or 'cli'))
 
 
 @cli.command()
@@ -37,10 +69,16 @@ def cli(log_level):
 @click.option('--start', required=True, help='Start date (YYYY-MM-DD)')
 @click.option('--end', required=True, help='End date (YYYY-MM-DD)')
 @click.option('--tf', default='1wk', help='Timeframe (default: 1wk)')
-@click.option('--refresh', is_flag=True, help='Force refresh cached data')
-@click.option('--parallel', default=5, help='Number of parallel downloads')
-def fetch(symbols, start, end, tf, refresh, parallel):
-    """Fetch weekly OHLCV data for symbols."""
+@click.option('--refresh', is_flag=True, help='Re-download full history instead of only new bars')
+@click.option('--parallel', default=FETCH_MAX_CONCURRENCY, help='Concurrent download requests')
+@click.option('--rate', default=FETCH_RATE_LIMIT, type=float, help='Download requests per second (0 for unlimited)')
+@click.option('--max-retries', default=FETCH_MAX_RETRIES, type=int, help='Retries per request before queueing symbols')
+@click.option('--retry-failed', is_flag=True, help='Also fetch symbols left in the retry queue by earlier runs')
+@click.option('--batch-size', default=DEFAULT_CHUNK_SIZE, type=int, help='Symbols per download request')
+@click.option('--replay-dir', type=click.Path(exists=True),
+              help='Replay bars from a local market-data store instead of Yahoo Finance')
+def fetch(symbols, start, end, tf, refresh, parallel, rate, max_retries, retry_failed, batch_size, replay_dir):
+    """Fetch OHLCV data for symbols (only bars newer than the cache unless --refresh)."""
     logger.info(f"Fetching data from {start} to {end}")
     
     # Load symbols
@@ -49,42 +87,44 @@ def fetch(symbols, start, end, tf, refresh, parallel):
         click.echo("Error loading symbols file", err=True)
         return
     
-    click.echo(f"Fetching data for {len(symbols_df)} symbols...")
-    
-    success_count = 0
-    failed_symbols = []
+    symbol_list = symbols_df['full_symbol'].tolist()
+    retry_queue = RetryQueue(RETRY_QUEUE_PATH)
+    if retry_failed:
+        queued = [s for s in retry_queue.pending(base_timeframe(tf)) if s not in symbol_list]
+        click.echo(f"Retrying {len(queued)} queued symbols")
+        symbol_list.extend(queued)
+    
+    click.echo(f"Fetching data for {len(symbol_list)} symbols...")
+    
+    provider = get_provider('replay', root=replay_dir) if replay_dir else get_provider('yahoo')
+    scheduler = FetchScheduler(
+        provider,
+        rate=rate,
+        max_concurrency=parallel,
+        max_retries=max_retries,
+        retry_queue=retry_queue,
+    )
     
-    def fetch_symbol(row):
-        symbol = row['full_symbol']
-        
-        # Check cache unless refresh is requested
-        if not refresh:
-            cached = load_cached(symbol, RAW_DATA_DIR)
-            if cached is not None:
-                return symbol, True, "cached"
-        
-        # Fetch new data
-        df = fetch_weekly(symbol, start, end, RAW_DATA_DIR)
-        if df is not None:
-            return symbol, True, "fetched"
-        return symbol, False, "failed"
-    
-    # Parallel fetching
-    with ThreadPoolExecutor(max_workers=parallel) as executor:
-        futures = {executor.submit(fetch_symbol, row): row for _, row in symbols_df.iterrows()}
-        
-        with click.progressbar(length=len(symbols_df), label='Fetching') as bar:
-            for future in as_completed(futures):
-                symbol, success, status = future.result()
-                if success:
-                    success_count += 1
-                else:
-                    failed_symbols.append(symbol)
-                bar.update(1)
-    
-    click.echo(f"\nCompleted: {success_count}/{len(symbols_df)} symbols fetched")
+    # One multi-ticker request per chunk, rate limited with retries
+    with click.progressbar(length=len(symbol_list), label='Fetching') as bar:
+        statuses = fetch_batch(
+            symbol_list, start, end, MARKET_DATA_DIR,
+            timeframe=tf,
+            chunk_size=batch_size,
+            incremental=not refresh,
+            progress=bar.update,
+            scheduler=scheduler,
+        )
+    
+    failed_symbols = [symbol for symbol in symbol_list if statuses.get(symbol, 'failed') == 'failed']
+    success_count = len(symbol_list) - len(failed_symbols)
+    
+    click.echo(f"\nCompleted: {success_count}/{len(symbol_list)} symbols fetched")
+    click.echo(f"Throughput: {scheduler.stats.summary()}")
     if failed_symbols:
         click.echo(f"Failed symbols: {', '.join(failed_symbols)}")
+    if len(retry_queue):
+        click.echo(f"{len(retry_queue)} symbols queued for retry (fetch --retry-failed)")
 
 
 @cli.command()
@@ -92,7 +132,11 @@ def fetch(symbols, start, end, tf, refresh, parallel):
 @click.option('--factor', default=DEFAULT_MULTIPLIER, type=float, help='SuperTrend multiplier')
 @click.option('--atr', default=DEFAULT_ATR_PERIOD, type=int, help='ATR period')
 @click.option('--output', type=click.Path(), help='Output CSV file (optional)')
-def compute(symbols, factor, atr, output):
+@click.option('--executor', type=click.Choice(EXECUTORS), default='process',
+              help='Run shards on a process pool, a thread pool or serially')
+@click.option('--parallel', default=None, type=int, help='Number of workers (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Recompute and rewrite every symbol, bypassing the indicator cache')
+def compute(symbols, factor, atr, output, executor, parallel, no_cache):
     """Compute SuperTrend for cached symbols."""
     logger.info(f"Computing SuperTrend (ATR={atr}, multiplier={factor})")
     
@@ -105,7 +149,7 @@ def compute(symbols, factor, atr, output):
         symbol_list = symbols_df['full_symbol'].tolist()
     else:
         # Use all cached files
-        symbol_list = [f.stem for f in RAW_DATA_DIR.glob("*.csv")]
+        symbol_list = list_cached_symbols(MARKET_DATA_DIR)
         click.echo(f"Using {len(symbol_list)} cached symbols")
     
     if not symbol_list:
@@ -114,26 +158,24 @@ def compute(symbols, factor, atr, output):
     
     computed_count = 0
     
-    with click.progressbar(symbol_list, label='Computing') as bar:
-        for symbol in bar:
-            # Load cached data
-            df = load_cached(symbol, RAW_DATA_DIR)
-            if df is None:
-                logger.warning(f"No cached data for {symbol}")
-                continue
-            
-            # Compute SuperTrend
-            try:
-                df_st, _ = detect_signals_for_symbol(symbol, df, atr, factor)
-                
-                # Save processed data
-                output_path = PROCESSED_DATA_DIR / f"{sanitize_symbol(symbol)}_st.csv"
-                df_st.to_csv(output_path, index=False)
-                computed_count += 1
-            except Exception as e:
-                logger.error(f"Error computing SuperTrend for {symbol}: {str(e)}")
-    
-    click.echo(f"\nComputed SuperTrend for {computed_count}/{len(symbol_list)} symbols")
+    # Workers load their own shards from the store and write their own outputs
+    shards = make_shards(symbol_list, max_workers=parallel or os.cpu_count())
+    results = run_sharded(
+        compute_shard, shards, executor=executor, max_workers=parallel,
+        cache_dir=MARKET_DATA_DIR, atr_period=atr, multiplier=factor, output_dir=PROCESSED_DATA_DIR,
+        indicator_cache=None if no_cache else INDICATOR_CACHE_DIR, cache_max_bytes=INDICATOR_CACHE_MAX_BYTES
+    )
+    
+    unchanged_count = 0
+    with profiling.stage('shards', rows=len(symbol_list)), \
+            click.progressbar(length=len(symbol_list), label='Computing') as bar:
+        for shard, (computed, _, unchanged) in results:
+            computed_count += len(computed)
+            unchanged_count += len(unchanged)
+            bar.update(len(shard))
+    
+    click.echo(f"\nComputed SuperTrend for {computed_count}/{len(symbol_list)} symbols"
+               f" ({unchanged_count} unchanged)")
 
 
 @cli.command()
@@ -145,7 +187,15 @@ def compute(symbols, factor, atr, output):
 @click.option('--output', default='results.csv', help='Output CSV file')
 @click.option('--include-open', is_flag=True, help='Include open trades')
 @click.option('--parallel', default=5, help='Number of parallel computations')
-def analyze(symbols, factor, atr, abs_threshold, output, include_open, parallel):
+@click.option('--panel', is_flag=True, help='Compute all symbols at once as a symbols x bars panel')
+@click.option('--executor', type=click.Choice(EXECUTORS), default='process',
+              help='Run shards on a process pool, a thread pool or serially')
+@click.option('--no-cache', is_flag=True, help='Recompute every symbol, bypassing the indicator cache')
+@click.option('--stream', is_flag=True,
+              help='Append results and update summary statistics as shards finish')
+@click.option('--parquet', is_flag=True, help='With --stream, also write the trades as Parquet')
+def analyze(symbols, factor, atr, abs_threshold, output, include_open, parallel, panel, executor, no_cache,
+            stream, parquet):
     """Analyze SuperTrend signals and find buy→sell pairs."""
     logger.info(f"Analyzing signals (ATR={atr}, multiplier={factor}, threshold={abs_threshold}%)")
     
@@ -160,7 +210,7 @@ def analyze(symbols, factor, atr, abs_threshold, output, include_open, parallel)
                                    symbols_df.get('sector', [None] * len(symbols_df))))
     else:
         # Use all cached files
-        symbol_list = [f.stem for f in RAW_DATA_DIR.glob("*.csv")]
+        symbol_list = list_cached_symbols(MARKET_DATA_DIR)
         symbols_df = pd.DataFrame({'full_symbol': symbol_list})
         symbol_to_sector = {}
         click.echo(f"Using {len(symbol_list)} cached symbols")
@@ -169,80 +219,135 @@ def analyze(symbols, factor, atr, abs_threshold, output, include_open, parallel)
         click.echo("No symbols to analyze", err=True)
         return
     
-    all_trades = []
+    symbol_list = symbols_df['full_symbol'].tolist()
+    if panel:
+        # Load everything, then compute every symbol in one vectorized pass
+        cached = load_cached_many(symbol_list, MARKET_DATA_DIR)
+        symbol_data = [(symbol, cached.get(symbol)) for symbol in symbol_list]
+        shards = [symbol_list]
+        with profiling.stage('panel', rows=len(symbol_list)):
+            results = [(symbol_list, analyze_panel(symbol_data, atr, factor, include_open,
+                                                   sectors=symbol_to_sector, as_frame=True))]
+    else:
+        # Workers load their own shards from the store; trade tables stream back per shard
+        shards = make_shards(symbol_list, max_workers=parallel)
+        results = run_sharded(
+            analyze_shard, shards, executor=executor, max_workers=parallel,
+            cache_dir=MARKET_DATA_DIR, atr_period=atr, multiplier=factor,
+            include_open=include_open, sectors=symbol_to_sector,
+            indicator_cache=None if no_cache else INDICATOR_CACHE_DIR, cache_max_bytes=INDICATOR_CACHE_MAX_BYTES
+        )
     
-    def analyze_symbol(row):
-        symbol = row['full_symbol']
-        sector = symbol_to_sector.get(symbol)
-        
-        # Load cached data
-        df = load_cached(symbol, RAW_DATA_DIR)
-        if df is None:
-            return []
-        
-        try:
-            # Detect signals
-            df_st, trades = detect_signals_for_symbol(symbol, df, atr, factor, include_open)
-            
-            # Add sector to trades
-            for trade in trades:
-                trade['sector'] = sector
-            
-            return trades
-        except Exception as e:
-            logger.error(f"Error analyzing {symbol}: {str(e)}")
-            return []
-    
-    # Parallel analysis
-    with ThreadPoolExecutor(max_workers=parallel) as executor:
-        futures = {executor.submit(analyze_symbol, row): row for _, row in symbols_df.iterrows()}
-        
-        with click.progressbar(length=len(symbols_df), label='Analyzing') as bar:
-            for future in as_completed(futures):
-                trades = future.result()
-                all_trades.extend(trades)
-                bar.update(1)
+    output_path = OUTPUT_DIR / output
+    if stream:
+        with profiling.stage('shards', rows=len(symbol_list)):
+            _stream_analysis(results, len(symbol_list), abs_threshold, output_path, parquet)
+        return
     
-    if not all_trades:
+    # Shards finish in any order; merge them back in input order
+    trade_frames = [None] * len(shards)
+    with profiling.stage('shards', rows=len(symbol_list)), \
+            click.progressbar(length=len(symbol_list), label='Analyzing') as bar:
+        for shard, shard_trades in results:
+            trade_frames[shards.index(shard)] = shard_trades
+            bar.update(len(shard))
+    
+    with profiling.stage('merge') as timer:
+        trades_df = concat_trades(trade_frames)
+        timer.rows = len(trades_df)
+    del trade_frames
+    
+    if trades_df.empty:
         click.echo("\nNo trades found", err=True)
         return
     
-    # Convert to DataFrame
-    trades_df = pd.DataFrame(all_trades)
-    
     click.echo(f"\nTotal trades found: {len(trades_df)}")
     
-    # Filter by absolute threshold
-    filtered_df = trades_df.copy()
+    # Filter by absolute threshold (open trades are kept)
+    with profiling.stage('filter', rows=len(trades_df)):
+        filtered_df, kept, completed = _threshold_filter(trades_df, abs_threshold)
     if abs_threshold is not None:
-        valid_trades = filtered_df.dropna(subset=['pct_change'])
-        before_count = len(valid_trades)
-        filtered_df = filtered_df[
-            (filtered_df['pct_change'].isna()) | 
-            (filtered_df['pct_change'].abs() < abs_threshold)
-        ]
-        after_count = len(filtered_df.dropna(subset=['pct_change']))
-        click.echo(f"Trades with |%| < {abs_threshold}%: {after_count}/{before_count}")
+        click.echo(f"Trades with |%| < {abs_threshold}%: {kept}/{completed}")
     
     # Save results
-    output_path = OUTPUT_DIR / output
-    write_csv(filtered_df, output_path)
+    with profiling.stage('write', rows=len(filtered_df)):
+        write_csv(filtered_df, output_path)
     click.echo(f"\nResults saved to: {output_path}")
 
 
+def _threshold_filter(trades_df, abs_threshold):
+    """Keep open trades and completed trades with |pct_change| < abs_threshold."""
+    returns = trades_df['pct_change'].to_numpy(dtype='float64', na_value=float('nan'))
+    is_open = pd.isna(returns)
+    if abs_threshold is None:
+        return trades_df, int((~is_open).sum()), int((~is_open).sum())
+    keep = is_open | (abs(returns) < abs_threshold)
+    return trades_df[keep], int((keep & ~is_open).sum()), int((~is_open).sum())
+
+
+def _stream_analysis(results, n_symbols, abs_threshold, output_path, parquet):
+    """Write shard results to the output as they finish, with live statistics."""
+    formats = ('csv', 'parquet') if parquet else ('csv',)
+    total = kept = completed = 0
+    
+    with StreamingReportSink(output_path.parent, prefix=output_path.stem, formats=formats,
+                             trades_path=output_path) as sink:
+        with click.progressbar(length=n_symbols, label='Analyzing',
+                               item_show_func=lambda _: sink.stats.progress_line()) as bar:
+            for shard, shard_trades in results:
+                total += len(shard_trades)
+                filtered_df, shard_kept, shard_completed = _threshold_filter(shard_trades, abs_threshold)
+                kept += shard_kept
+                completed += shard_completed
+                sink.write(filtered_df)
+                bar.update(len(shard), current_item=shard)
+        
+        if total == 0:
+            click.echo("\nNo trades found", err=True)
+            return
+        generated = sink.close(echo=False)
+    
+    click.echo(f"\nTotal trades found: {total}")
+    if abs_threshold is not None:
+        click.echo(f"Trades with |%| < {abs_threshold}%: {kept}/{completed}")
+    click.echo(f"Summary: {sink.stats.progress_line()}")
+    click.echo(f"\nResults saved to:")
+    for path in generated.values():
+        click.echo(f"  {path}")
+
+
 @cli.command()
 @click.option('--input', 'input_file', required=True, type=click.Path(exists=True),
               help='Input CSV file with trade results')
 @click.option('--top', default=20, type=int, help='Number of top/bottom performers to show')
 @click.option('--sector-breakdown', is_flag=True, help='Include sector breakdown')
 @click.option('--output-dir', type=click.Path(), help='Output directory for reports')
-def report(input_file, top, sector_breakdown, output_dir):
+@click.option('--chunksize', default=None, type=int,
+              help='Read the input in chunks of this many rows (bounded memory; quantiles are approximate)')
+@click.option('--group-by', multiple=True,
+              help='Write grouped statistics by this key (sector, year, holding_bucket, return_bucket '
+                   'or any column); repeat for nested groups')
+@click.option('--bootstrap', default=0, type=int,
+              help='Bootstrap resamples for confidence intervals in the grouped statistics')
+def report(input_file, top, sector_breakdown, output_dir, chunksize, group_by, bootstrap):
     """Generate reports from trade results."""
     logger.info(f"Generating report from {input_file}")
     
+    if chunksize:
+        if group_by:
+            click.echo("--group-by needs the full table; ignored with --chunksize", err=True)
+        generated = stream_report_from_csv(
+            input_file, output_dir or OUTPUT_DIR, prefix="report", chunksize=chunksize,
+            include_sector=sector_breakdown, top_n=top
+        )
+        click.echo(f"\nReport generated:")
+        for key, path in generated.items():
+            click.echo(f"  {key}: {path}")
+        return
+    
     # Load trades
     try:
-        trades_df = pd.read_csv(input_file, parse_dates=['buy_date', 'sell_date'])
+        trades_df = as_trade_frame(pd.read_csv(input_file, parse_dates=['buy_date', 'sell_date']))
     except Exception as e:
         click.echo(f"Error loading input file: {str(e)}", err=True)
         return
@@ -256,14 +361,17 @@ def report(input_file, top, sector_breakdown, output_dir):
         output_dir = OUTPUT_DIR
     
     # Generate full report
-    generated = generate_full_report(
-        trades_df, 
-        output_dir, 
-        prefix="report",
-        include_summary=True,
-        include_sector=sector_breakdown,
-        top_n=top
-    )
+    with profiling.stage('generate', rows=len(trades_df)):
+        generated = generate_full_report(
+            trades_df, 
+            output_dir, 
+            prefix="report",
+            include_summary=True,
+            include_sector=sector_breakdown,
+            top_n=top,
+            group_by=list(group_by),
+            bootstrap=bootstrap
+        )
     
     click.echo(f"\nReport generated:")
     for key, path in generated.items():
@@ -294,58 +402,26 @@ def backtest(symbols, start, end, atr_periods, multipliers, output, parallel):
         click.echo("Error loading symbols file", err=True)
         return
     
-    # Fetch data first
+    # Fetch uncached symbols first, batched
     click.echo("Fetching data...")
-    for _, row in symbols_df.iterrows():
-        symbol = row['full_symbol']
-        df = load_cached(symbol, RAW_DATA_DIR)
-        if df is None:
-            fetch_weekly(symbol, start, end, RAW_DATA_DIR)
-    
-    backtest_results = []
-    
-    # Test each combination
-    total_combos = len(atr_list) * len(mult_list)
-    with click.progressbar(length=total_combos, label='Backtesting') as bar:
-        for atr_period in atr_list:
-            for multiplier in mult_list:
-                all_trades = []
-                
-                for _, row in symbols_df.iterrows():
-                    symbol = row['full_symbol']
-                    df = load_cached(symbol, RAW_DATA_DIR)
-                    
-                    if df is None:
-                        continue
-                    
-                    try:
-                        _, trades = detect_signals_for_symbol(symbol, df, atr_period, multiplier)
-                        all_trades.extend(trades)
-                    except:
-                        pass
-                
-                if all_trades:
-                    trades_df = pd.DataFrame(all_trades)
-                    valid_trades = trades_df.dropna(subset=['pct_change'])
-                    
-                    if len(valid_trades) > 0:
-                        result = {
-                            'atr_period': atr_period,
-                            'multiplier': multiplier,
-                            'total_trades': len(valid_trades),
-                            'mean_return': valid_trades['pct_change'].mean(),
-                            'median_return': valid_trades['pct_change'].median(),
-                            'win_rate': (len(valid_trades[valid_trades['pct_change'] > 0]) / len(valid_trades)) * 100,
-                            'mean_weeks_held': valid_trades['weeks_held'].mean(),
-                            'trades_below_10pct': len(valid_trades[valid_trades['pct_change'].abs() < 10])
-                        }
-                        backtest_results.append(result)
-                
-                bar.update(1)
+    cached = set(list_cached_symbols(MARKET_DATA_DIR))
+    missing = [s for s in symbols_df['full_symbol'] if sanitize_symbol(s) not in cached]
+    if missing:
+        fetch_batch(missing, start, end, MARKET_DATA_DIR, max_workers=parallel)
+    
+    # Evaluate the whole grid in one pass over the symbols
+    symbol_data = (
+        (row['full_symbol'], load_cached(row['full_symbol'], MARKET_DATA_DIR))
+        for _, row in symbols_df.iterrows()
+    )
+    with click.progressbar(length=len(symbols_df), label='Backtesting') as bar:
+        results_df, _ = run_sweep(
+            symbol_data, atr_list, mult_list, progress=lambda _: bar.update(1)
+        )
+    results_df = results_df[results_df['total_trades'] > 0]
     
     # Save results
-    if backtest_results:
-        results_df = pd.DataFrame(backtest_results)
+    if not results_df.empty:
         output_path = OUTPUT_DIR / output
         results_df.to_csv(output_path, index=False)
         click.echo(f"\n\nBacktest results saved to: {output_path}")
@@ -358,6 +434,158 @@ def backtest(symbols, start, end, atr_periods, multipliers, output, parallel):
         click.echo("\nNo backtest results generated", err=True)
 
 
+@cli.command()
+@click.option('--symbols', type=click.Path(exists=True), help='Path to symbols CSV (optional, uses cached if not provided)')
+@click.option('--atr-periods', default='7,10,14', help='Comma-separated ATR periods')
+@click.option('--multipliers', default='2,3,4', help='Comma-separated multipliers')
+@click.option('--include-open', is_flag=True, help='Include open trades')
+@click.option('--output', default='sweep_results.csv', help='Output CSV file')
+@click.option('--trades-output', default=None, help='Also write every sweep trade to this CSV (optional)')
+def sweep(symbols, atr_periods, multipliers, include_open, output, trades_output):
+    """Sweep SuperTrend (ATR period, multiplier) grid over cached data."""
+    atr_list = [int(x.strip()) for x in atr_periods.split(',')]
+    mult_list = [float(x.strip()) for x in multipliers.split(',')]
+    logger.info(f"Sweeping {len(atr_list)} ATR periods × {len(mult_list)} multipliers")
+    
+    if symbols:
+        symbols_df = fetch_symbols_from_csv(symbols)
+        if symbols_df is None:
+            click.echo("Error loading symbols file", err=True)
+            return
+        symbol_list = symbols_df['full_symbol'].tolist()
+    else:
+        symbol_list = list_cached_symbols(MARKET_DATA_DIR)
+        click.echo(f"Using {len(symbol_list)} cached symbols")
+    
+    if not symbol_list:
+        click.echo("No symbols to sweep", err=True)
+        return
+    
+    click.echo(f"Testing {len(atr_list) * len(mult_list)} combinations on {len(symbol_list)} symbols")
+    
+    cached = load_cached_many(symbol_list, MARKET_DATA_DIR)
+    symbol_data = ((symbol, cached.get(symbol)) for symbol in symbol_list)
+    with click.progressbar(length=len(symbol_list), label='Sweeping') as bar:
+        summary_df, trades_df = run_sweep(
+            symbol_data, atr_list, mult_list, include_open=include_open,
+            progress=lambda _: bar.update(1)
+        )
+    
+    output_path = OUTPUT_DIR / output
+    write_csv(summary_df, output_path)
+    click.echo(f"\nSweep summary saved to: {output_path}")
+    
+    if trades_output:
+        trades_path = OUTPUT_DIR / trades_output
+        write_csv(trades_df, trades_path)
+        click.echo(f"Sweep trades saved to: {trades_path}")
+    
+    ranked = summary_df[summary_df['total_trades'] > 0]
+    if not ranked.empty:
+        click.echo("\nTop 5 parameter combinations by mean return:")
+        click.echo(ranked.nlargest(5, 'mean_return').to_string(index=False))
+
+
+@cli.command()
+@click.option('--symbols', type=click.Path(exists=True), help='Path to symbols CSV (default: every stored symbol)')
+@click.option('--factor', default=DEFAULT_MULTIPLIER, type=float, help='SuperTrend multiplier')
+@click.option('--atr', default=DEFAULT_ATR_PERIOD, type=int, help='ATR period')
+@click.option('--tf', default='1wk', help='Bar interval to watch')
+@click.option('--interval', default=60, type=float, help='Seconds between polls of the store')
+@click.option('--webhook', default=None, help='URL to POST new signals to as JSON')
+@click.option('--output-dir', type=click.Path(), default=None,
+              help='Directory for signals.csv (default: the output directory)')
+@click.option('--max-polls', default=None, type=int, help='Stop after this many polls (default: run until Ctrl-C)')
+def watch(symbols, factor, atr, tf, interval, webhook, output_dir, max_polls):
+    """Watch the store and report new BUY/SELL flips as bars arrive."""
+    symbol_list, symbol_to_sector = None, {}
+    if symbols:
+        symbols_df = fetch_symbols_from_csv(symbols)
+        if symbols_df is None:
+            click.echo("Error loading symbols file", err=True)
+            return
+        symbol_list = symbols_df['full_symbol'].tolist()
+        symbol_to_sector = dict(zip(symbols_df['full_symbol'],
+                                    symbols_df.get('sector', [None] * len(symbols_df))))
+    
+    watcher = SignalWatcher(
+        MARKET_DATA_DIR, atr_period=atr, multiplier=factor, timeframe=tf, symbols=symbol_list,
+        sectors=symbol_to_sector, output_dir=output_dir or OUTPUT_DIR, webhook=webhook
+    )
+    
+    def echo_signals(signals):
+        for signal in signals:
+            click.echo(f"{signal['detected_at']}  {signal['signal']:<4} {signal['symbol']:<16} "
+                       f"{signal['date'].date()}  close {signal['close']:.2f}")
+    
+    click.echo(f"Watching {MARKET_DATA_DIR} every {interval:g}s (Ctrl-C to stop)")
+    try:
+        watcher.run(interval=interval, max_polls=max_polls, on_signals=echo_signals)
+    except KeyboardInterrupt:
+        click.echo("\nStopped")
+
+
+@cli.command('import-cache')
+@click.option('--source', type=click.Path(exists=True, file_okay=False), default=str(RAW_DATA_DIR),
+              help='Directory with legacy per-symbol CSV caches')
+@click.option('--tf', default=None, help='Force timeframe (default: infer from file names)')
+def import_cache(source, tf):
+    """Import legacy CSV caches into the market-data store."""
+    count = import_csv_cache(MarketDataStore(MARKET_DATA_DIR), source, timeframe=tf)
+    click.echo(f"Imported {count} series from {source} into {MARKET_DATA_DIR}")
+
+
+@cli.group()
+def cache():
+    """Inspect and maintain the market-data cache."""
+    pass
+
+
+@cache.command('stats')
+@click.option('--tf', default=None, help='List every series of this timeframe')
+def cache_stats(tf):
+    """Show per-timeframe cache statistics from the manifest."""
+    store = MarketDataStore(MARKET_DATA_DIR)
+    
+    if tf:
+        entries = store.manifest.entries(tf)
+        if entries.empty:
+            click.echo(f"No cached {tf} series")
+            return
+        click.echo(entries[['symbol', 'first_bar', 'last_bar', 'rows', 'source', 'updated_at']]
+                   .to_string(index=False))
+        return
+    
+    stats = store.manifest.stats()
+    if stats.empty:
+        click.echo(f"Cache at {MARKET_DATA_DIR} is empty")
+        return
+    stats['MB'] = (stats.pop('bytes').fillna(0) / 1e6).round(2)
+    click.echo(f"Cache: {MARKET_DATA_DIR}\n")
+    click.echo(stats.to_string(index=False))
+    
+    indicator_stats = IndicatorCache(INDICATOR_CACHE_DIR, INDICATOR_CACHE_MAX_BYTES).stats()
+    click.echo(f"\nIndicator cache: {indicator_stats['entries']} entries, "
+               f"{indicator_stats['bytes'] / 1e6:.2f} / {indicator_stats['max_bytes'] / 1e6:.0f} MB")
+
+
+@cache.command('gc')
+@click.option('--older-than', default=None,
+              help='Also delete series whose last bar is before this date (YYYY-MM-DD)')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed')
+def cache_gc(older_than, dry_run):
+    """Remove temp files and stale series, reconcile the manifest and trim the indicator cache."""
+    result = MarketDataStore(MARKET_DATA_DIR).gc(older_than=older_than, dry_run=dry_run)
+    if not dry_run:
+        IndicatorCache(INDICATOR_CACHE_DIR, INDICATOR_CACHE_MAX_BYTES).evict()
+    
+    prefix = "Would remove" if dry_run else "Removed"
+    click.echo(f"{prefix} {result['tmp_files']} temp files and {result['stale_series']} stale series "
+               f"({result['bytes'] / 1e6:.2f} MB)")
+    if not dry_run:
+        click.echo(f"Manifest: {result['manifest_added']} added, {result['manifest_dropped']} dropped")
+
+
 if __name__ == '__main__':
     cli()
 
@@ -8,9 +8,10 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 OUTPUT_DIR = DATA_DIR / "output"
+MARKET_DATA_DIR = DATA_DIR / "market"  # Parquet OHLCV store shared by all fetchers
 
 # Create directories if they don't exist
-for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR]:
+for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR, MARKET_DATA_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 # SuperTrend default parameters
@@ -18,6 +19,16 @@ DEFAULT_ATR_PERIOD = 10
 DEFAULT_MULTIPLIER = 3.0
 DEFAULT_TIMEFRAME = "1wk"
 
+# Fetch scheduler
+FETCH_RATE_LIMIT = 2.0  # requests per second
+FETCH_MAX_CONCURRENCY = 4  # concurrent requests per host
+FETCH_MAX_RETRIES = 3
+RETRY_QUEUE_PATH = MARKET_DATA_DIR / "retry_queue.json"
+
+# Indicator result cache (content-addressed, LRU by disk budget)
+INDICATOR_CACHE_DIR = MARKET_DATA_DIR / "indicators"
+INDICATOR_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
 # Analysis defaults
 DEFAULT_ABS_THRESHOLD = 10.0  # percentage
 DEFAULT_MIN_TRADES = 1
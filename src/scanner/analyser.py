@@ -6,6 +6,19 @@ from typing import Dict, List
 
 logger = logging.getLogger(__name__)
 
+# Profit buckets are [low, high) on pct_change, loss buckets on |pct_change|
+BUCKET_RANGES = [('0-1%', 0, 1), ('1-5%', 1, 5), ('5-10%', 5, 10), ('10%+', 10, float('inf'))]
+BUCKET_EDGES = np.array([1, 5, 10], dtype=np.float64)
+RETURN_BUCKETS = ([f'loss {label}' for label, _, _ in reversed(BUCKET_RANGES)] + ['neutral'] +
+                  [f'profit {label}' for label, _, _ in BUCKET_RANGES])
+
+# Holding periods in weeks, [low, high)
+HOLDING_BUCKETS = [('0-4w', 0, 4), ('4-13w', 4, 13), ('13-26w', 13, 26), ('26-52w', 26, 52), ('52w+', 52, float('inf'))]
+HOLDING_EDGES = np.array([4, 13, 26, 52], dtype=np.float64)
+
+# Group keys derived from trade columns rather than read from one
+DERIVED_GROUP_KEYS = ('year', 'holding_bucket', 'return_bucket')
+
 
 def filter_trades(trades_df, abs_threshold=10.0, min_pct=None, max_pct=None):
     """
@@ -23,21 +36,28 @@ def filter_trades(trades_df, abs_threshold=10.0, min_pct=None, max_pct=None):
     if trades_df.empty:
         return trades_df
     
-    filtered = trades_df.copy()
+    # Build one mask and take the rows once, instead of copying per step
+    returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+    abs_pct = np.abs(returns)
     
     # Remove trades with missing pct_change (open trades)
-    filtered = filtered.dropna(subset=['pct_change'])
+    mask = ~np.isnan(returns)
     
     # Apply absolute threshold
     if abs_threshold is not None:
-        filtered['abs_pct'] = filtered['pct_change'].abs()
-        filtered = filtered[filtered['abs_pct'] < abs_threshold]
+        mask &= abs_pct < abs_threshold
     
     # Apply min/max thresholds
     if min_pct is not None:
-        filtered = filtered[filtered['pct_change'] >= min_pct]
+        mask &= returns >= min_pct
     if max_pct is not None:
-        filtered = filtered[filtered['pct_change'] <= max_pct]
+        mask &= returns <= max_pct
+    
+    filtered = trades_df[mask]
+    if abs_threshold is not None:
+        # Keep abs_pct at the table's precision (float32 for typed tables)
+        dtype = np.float32 if trades_df['pct_change'].dtype == np.float32 else np.float64
+        filtered = filtered.assign(abs_pct=abs_pct[mask].astype(dtype))
     
     logger.info(f"Filtered to {len(filtered)} trades from {len(trades_df)}")
     return filtered
@@ -59,43 +79,54 @@ def compute_summary_stats(trades_df) -> Dict:
             'error': 'No trades found'
         }
     
-    # Remove rows with missing pct_change
-    valid_trades = trades_df.dropna(subset=['pct_change'])
+    # Completed trades, read straight from the columns (no row copies)
+    returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(returns)
+    valid_returns = returns[valid]
     
-    if len(valid_trades) == 0:
+    if len(valid_returns) == 0:
         return {
             'total_trades': len(trades_df),
             'completed_trades': 0,
             'error': 'No completed trades'
         }
     
+    n = len(valid_returns)
+    winning = int((valid_returns > 0).sum())
+    q25, median, q75 = np.quantile(valid_returns, [0.25, 0.5, 0.75])
+    
     stats = {
-        'total_trades': len(valid_trades),
+        'total_trades': n,
         'total_symbols': trades_df['symbol'].nunique() if 'symbol' in trades_df.columns else 0,
         
         # Return statistics
-        'mean_return': valid_trades['pct_change'].mean(),
-        'median_return': valid_trades['pct_change'].median(),
-        'std_return': valid_trades['pct_change'].std(),
-        'min_return': valid_trades['pct_change'].min(),
-        'max_return': valid_trades['pct_change'].max(),
+        'mean_return': valid_returns.mean(),
+        'median_return': median,
+        'std_return': valid_returns.std(ddof=1) if n > 1 else np.nan,
+        'min_return': valid_returns.min(),
+        'max_return': valid_returns.max(),
         
         # Percentiles
-        'q25_return': valid_trades['pct_change'].quantile(0.25),
-        'q75_return': valid_trades['pct_change'].quantile(0.75),
+        'q25_return': q25,
+        'q75_return': q75,
         
         # Win/Loss
-        'winning_trades': len(valid_trades[valid_trades['pct_change'] > 0]),
-        'losing_trades': len(valid_trades[valid_trades['pct_change'] < 0]),
-        'win_rate': (len(valid_trades[valid_trades['pct_change'] > 0]) / len(valid_trades)) * 100,
-        
-        # Holding period
-        'mean_weeks_held': valid_trades['weeks_held'].mean() if 'weeks_held' in valid_trades.columns else None,
-        'median_weeks_held': valid_trades['weeks_held'].median() if 'weeks_held' in valid_trades.columns else None,
-        'min_weeks_held': valid_trades['weeks_held'].min() if 'weeks_held' in valid_trades.columns else None,
-        'max_weeks_held': valid_trades['weeks_held'].max() if 'weeks_held' in valid_trades.columns else None,
+        'winning_trades': winning,
+        'losing_trades': int((valid_returns < 0).sum()),
+        'win_rate': (winning / n) * 100,
     }
     
+    # Holding period
+    weeks = None
+    if 'weeks_held' in trades_df.columns:
+        weeks = trades_df['weeks_held'].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        weeks = weeks[~np.isnan(weeks)]
+    has_weeks = weeks is not None and len(weeks) > 0
+    stats['mean_weeks_held'] = weeks.mean() if has_weeks else None
+    stats['median_weeks_held'] = np.median(weeks) if has_weeks else None
+    stats['min_weeks_held'] = weeks.min() if has_weeks else None
+    stats['max_weeks_held'] = weeks.max() if has_weeks else None
+    
     return stats
 
 
@@ -112,23 +143,19 @@ def analyze_by_sector(trades_df) -> Dict:
     if 'sector' not in trades_df.columns or trades_df.empty:
         return {}
     
-    sector_stats = {}
+    grouped = grouped_stats(trades_df, 'sector')
+    has_weeks = 'weeks_held' in trades_df.columns
     
-    for sector in trades_df['sector'].dropna().unique():
-        sector_trades = trades_df[trades_df['sector'] == sector]
-        valid_sector_trades = sector_trades.dropna(subset=['pct_change'])
-        
-        if len(valid_sector_trades) > 0:
-            sector_stats[sector] = {
-                'total_trades': len(valid_sector_trades),
-                'mean_return': valid_sector_trades['pct_change'].mean(),
-                'median_return': valid_sector_trades['pct_change'].median(),
-                'win_rate': (len(valid_sector_trades[valid_sector_trades['pct_change'] > 0]) / 
-                           len(valid_sector_trades)) * 100,
-                'mean_weeks_held': valid_sector_trades['weeks_held'].mean() if 'weeks_held' in valid_sector_trades.columns else None,
-            }
-    
-    return sector_stats
+    return {
+        sector: {
+            'total_trades': int(row['trades']),
+            'mean_return': row['mean_return'],
+            'median_return': row['median_return'],
+            'win_rate': row['win_rate'],
+            'mean_weeks_held': row['mean_weeks_held'] if has_weeks else None,
+        }
+        for sector, row in grouped.iterrows()
+    }
 
 
 def threshold_analysis(trades_df, thresholds=[5, 10, 15, 20]) -> Dict:
@@ -145,16 +172,18 @@ def threshold_analysis(trades_df, thresholds=[5, 10, 15, 20]) -> Dict:
     if trades_df.empty:
         return {}
     
-    valid_trades = trades_df.dropna(subset=['pct_change'])
-    total = len(valid_trades)
+    returns = _completed_returns(trades_df)
+    total = len(returns)
     
     if total == 0:
         return {}
     
+    # One sort; each threshold is then a binary search
+    abs_sorted = np.sort(np.abs(returns))
     threshold_stats = {}
     
     for threshold in sorted(thresholds):
-        count = len(valid_trades[valid_trades['pct_change'].abs() < threshold])
+        count = int(np.searchsorted(abs_sorted, threshold, side='left'))
         percentage = (count / total) * 100
         
         threshold_stats[f'within_{threshold}pct'] = {
@@ -202,85 +231,259 @@ def profit_loss_buckets(trades_df) -> Dict:
     if trades_df.empty:
         return {}
     
-    valid_trades = trades_df.dropna(subset=['pct_change'])
-    total = len(valid_trades)
+    returns = _completed_returns(trades_df)
+    total = len(returns)
     
     if total == 0:
         return {}
     
-    # Separate profits and losses
-    profits = valid_trades[valid_trades['pct_change'] > 0]
-    losses = valid_trades[valid_trades['pct_change'] < 0]
-    neutral = valid_trades[valid_trades['pct_change'] == 0]
+    # Every trade's bucket in one pass, then one count per bucket
+    counts = np.bincount(return_bucket_codes(returns), minlength=len(RETURN_BUCKETS))
+    neutral_code = RETURN_BUCKETS.index('neutral')
+    loss_counts = counts[:neutral_code][::-1]
+    profit_counts = counts[neutral_code + 1:]
+    n_profits = int(profit_counts.sum())
+    n_losses = int(loss_counts.sum())
+    n_neutral = int(counts[neutral_code])
     
     result = {
         'profit_buckets': {},
         'loss_buckets': {},
         'neutral': {
-            'count': len(neutral),
-            'percentage': (len(neutral) / total) * 100 if total > 0 else 0
+            'count': n_neutral,
+            'percentage': (n_neutral / total) * 100
         }
     }
     
-    # Define profit buckets
-    profit_ranges = [
-        ('0-1%', 0, 1),
-        ('1-5%', 1, 5),
-        ('5-10%', 5, 10),
-        ('10%+', 10, float('inf'))
-    ]
-    
-    # Analyze profit buckets
-    for label, min_pct, max_pct in profit_ranges:
-        if max_pct == float('inf'):
-            bucket_trades = profits[profits['pct_change'] >= min_pct]
-        else:
-            bucket_trades = profits[(profits['pct_change'] >= min_pct) & (profits['pct_change'] < max_pct)]
-        
-        count = len(bucket_trades)
+    for (label, _, _), count in zip(BUCKET_RANGES, profit_counts):
         result['profit_buckets'][label] = {
-            'count': count,
-            'percentage_of_total': (count / total) * 100 if total > 0 else 0,
-            'percentage_of_profits': (count / len(profits)) * 100 if len(profits) > 0 else 0
+            'count': int(count),
+            'percentage_of_total': (count / total) * 100,
+            'percentage_of_profits': (count / n_profits) * 100 if n_profits > 0 else 0
         }
     
-    # Define loss buckets (using absolute values)
-    loss_ranges = [
-        ('0-1%', 0, 1),
-        ('1-5%', 1, 5),
-        ('5-10%', 5, 10),
-        ('10%+', 10, float('inf'))
-    ]
-    
-    # Analyze loss buckets
-    losses_abs = losses.copy()
-    losses_abs['pct_change_abs'] = losses_abs['pct_change'].abs()
-    
-    for label, min_pct, max_pct in loss_ranges:
-        if max_pct == float('inf'):
-            bucket_trades = losses_abs[losses_abs['pct_change_abs'] >= min_pct]
-        else:
-            bucket_trades = losses_abs[(losses_abs['pct_change_abs'] >= min_pct) & 
-                                       (losses_abs['pct_change_abs'] < max_pct)]
-        
-        count = len(bucket_trades)
+    for (label, _, _), count in zip(BUCKET_RANGES, loss_counts):
         result['loss_buckets'][label] = {
-            'count': count,
-            'percentage_of_total': (count / total) * 100 if total > 0 else 0,
-            'percentage_of_losses': (count / len(losses)) * 100 if len(losses) > 0 else 0
+            'count': int(count),
+            'percentage_of_total': (count / total) * 100,
+            'percentage_of_losses': (count / n_losses) * 100 if n_losses > 0 else 0
         }
     
     # Add summary
     result['summary'] = {
         'total_trades': total,
-        'total_profits': len(profits),
-        'total_losses': len(losses),
-        'total_neutral': len(neutral),
-        'profit_percentage': (len(profits) / total) * 100 if total > 0 else 0,
-        'loss_percentage': (len(losses) / total) * 100 if total > 0 else 0
+        'total_profits': n_profits,
+        'total_losses': n_losses,
+        'total_neutral': n_neutral,
+        'profit_percentage': (n_profits / total) * 100,
+        'loss_percentage': (n_losses / total) * 100
     }
     
-    logger.info(f"Bucket analysis: {len(profits)} profits, {len(losses)} losses, {len(neutral)} neutral")
+    logger.info(f"Bucket analysis: {n_profits} profits, {n_losses} losses, {n_neutral} neutral")
     
     return result
 
+
+def _completed_returns(trades_df):
+    """pct_change of completed trades as float64."""
+    returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+    return returns[~np.isnan(returns)]
+
+
+def return_bucket_codes(returns):
+    """
+    Position of each return in RETURN_BUCKETS.
+    
+    Args:
+        returns: Array of completed-trade returns (no NaN)
+        
+    Returns:
+        numpy.ndarray: Integer codes into RETURN_BUCKETS
+    """
+    neutral_code = len(BUCKET_RANGES)
+    idx = np.searchsorted(BUCKET_EDGES, np.abs(returns), side='right')
+    return np.where(returns > 0, neutral_code + 1 + idx,
+                    np.where(returns < 0, neutral_code - 1 - idx, neutral_code))
+
+
+def group_key(trades_df, key):
+    """
+    Values to group trades by.
+    
+    Args:
+        trades_df: DataFrame with trade data
+        key: A column (sector, symbol, or a parameter column such as
+            multiplier in sweep results) or a derived key: 'year' (of the
+            buy), 'holding_bucket' (HOLDING_BUCKETS) or 'return_bucket'
+            (RETURN_BUCKETS)
+        
+    Returns:
+        pandas.Series: One value per trade (NaN for trades without one)
+    """
+    if key in trades_df.columns:
+        return trades_df[key]
+    
+    if key == 'year':
+        return pd.to_datetime(trades_df['buy_date']).dt.year
+    
+    if key == 'holding_bucket':
+        weeks = trades_df['weeks_held'].to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.where(np.isnan(weeks), -1, np.searchsorted(HOLDING_EDGES, weeks, side='right'))
+        labels = [label for label, _, _ in HOLDING_BUCKETS]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+                         index=trades_df.index)
+    
+    if key == 'return_bucket':
+        returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.where(np.isnan(returns), -1, return_bucket_codes(np.nan_to_num(returns)))
+        return pd.Series(pd.Categorical.from_codes(codes, categories=RETURN_BUCKETS, ordered=True),
+                         index=trades_df.index)
+    
+    raise ValueError(f"Unknown group key: {key} (not a column or one of {DERIVED_GROUP_KEYS})")
+
+
+def _segment_quantile(sorted_values, starts, counts, q):
+    """Linear-interpolated quantile of each contiguous sorted segment."""
+    position = q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts - 1)
+    low_values = sorted_values[starts + lower]
+    return low_values + (position - lower) * (sorted_values[starts + upper] - low_values)
+
+
+def _bootstrap_intervals(values, starts, counts, resamples, confidence, seed, max_cells=4_000_000):
+    """
+    Percentile bootstrap intervals for each segment's mean and win rate.
+    
+    Resamples every segment at once: each replicate draws, for every trade
+    slot, a random position within that trade's own segment, and
+    np.add.reduceat sums the segments. Replicates are drawn in blocks of
+    at most max_cells draws to bound memory.
+    """
+    rng = np.random.default_rng(seed)
+    n_values = len(values)
+    segment = np.repeat(np.arange(len(counts)), counts)
+    segment_start = starts[segment]
+    segment_size = counts[segment]
+    wins = (values > 0).astype(np.float64)
+    
+    means = np.empty((resamples, len(counts)))
+    win_rates = np.empty((resamples, len(counts)))
+    block = max(1, max_cells // max(n_values, 1))
+    for first in range(0, resamples, block):
+        size = min(block, resamples - first)
+        draws = segment_start + (rng.random((size, n_values)) * segment_size).astype(np.int64)
+        means[first:first + size] = np.add.reduceat(values[draws], starts, axis=1) / counts
+        win_rates[first:first + size] = np.add.reduceat(wins[draws], starts, axis=1) / counts * 100
+    
+    alpha = (1 - confidence) / 2
+    mean_low, mean_high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    win_low, win_high = np.quantile(win_rates, [alpha, 1 - alpha], axis=0)
+    return {
+        'mean_return_ci_low': mean_low, 'mean_return_ci_high': mean_high,
+        'win_rate_ci_low': win_low, 'win_rate_ci_high': win_high,
+    }
+
+
+def grouped_stats(trades_df, by, quantiles=(0.25, 0.75), bootstrap=0, confidence=0.95, seed=0):
+    """
+    Summary statistics of completed trades for every group, in one pass.
+    
+    Trades are assigned group codes once and sorted once by (group,
+    return), so counts, means and spreads are bincounts and every group's
+    median and quantiles are read off its contiguous sorted run. Open
+    trades and trades with a missing key are left out.
+    
+    Args:
+        trades_df: DataFrame with trade data
+        by: Group key or list of keys (see group_key)
+        quantiles: Return quantiles to add as q<percent>_return columns
+        bootstrap: Resamples for confidence intervals of mean return and
+            win rate (0 to skip)
+        confidence: Confidence level of the intervals
+        seed: Seed for the bootstrap resampling
+        
+    Returns:
+        pandas.DataFrame: One row per group, indexed by the group keys
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    columns = ['trades', 'mean_return', 'median_return', 'std_return', 'min_return', 'max_return']
+    columns += [f'q{q * 100:g}_return' for q in quantiles]
+    columns += ['winning_trades', 'losing_trades', 'win_rate',
+                'mean_weeks_held', 'median_weeks_held', 'min_weeks_held', 'max_weeks_held']
+    if bootstrap:
+        columns += ['mean_return_ci_low', 'mean_return_ci_high', 'win_rate_ci_low', 'win_rate_ci_high']
+    
+    if len(keys) == 1:
+        empty = pd.DataFrame(columns=columns, index=pd.Index([], name=keys[0]))
+    else:
+        empty = pd.DataFrame(columns=columns, index=pd.MultiIndex.from_arrays([[]] * len(keys), names=keys))
+    if trades_df.empty:
+        return empty
+    
+    returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+    completed = ~np.isnan(returns)
+    key_frame = pd.DataFrame({key: group_key(trades_df, key)[completed] for key in keys})
+    
+    groups = key_frame.groupby(keys, observed=True, sort=True, dropna=True)
+    codes = groups.ngroup().to_numpy(dtype=np.float64, na_value=np.nan)
+    index = groups.size().index
+    if len(index) == 0:
+        return empty
+    
+    keep = ~np.isnan(codes)
+    codes = codes[keep].astype(np.int64)
+    values = returns[completed][keep]
+    if 'weeks_held' in trades_df.columns:
+        weeks = trades_df['weeks_held'].to_numpy(dtype=np.float64, na_value=np.nan)[completed][keep]
+    else:
+        weeks = np.full(len(values), np.nan)
+    
+    n_groups = len(index)
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = starts + counts - 1
+    
+    means = np.bincount(codes, weights=values, minlength=n_groups) / counts
+    squares = np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=n_groups)
+    winning = np.bincount(codes, weights=values > 0, minlength=n_groups).astype(np.int64)
+    losing = np.bincount(codes, weights=values < 0, minlength=n_groups).astype(np.int64)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats = {
+            'trades': counts,
+            'mean_return': means,
+            'median_return': _segment_quantile(sorted_values, starts, counts, 0.5),
+            'std_return': np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan),
+            'min_return': sorted_values[starts],
+            'max_return': sorted_values[last],
+        }
+        for q in quantiles:
+            stats[f'q{q * 100:g}_return'] = _segment_quantile(sorted_values, starts, counts, q)
+        stats['winning_trades'] = winning
+        stats['losing_trades'] = losing
+        stats['win_rate'] = winning / counts * 100
+        
+        # Holding period over trades that have one
+        has_weeks = ~np.isnan(weeks)
+        week_codes = codes[has_weeks]
+        week_counts = np.bincount(week_codes, minlength=n_groups)
+        stats['mean_weeks_held'] = np.bincount(week_codes, weights=weeks[has_weeks], minlength=n_groups) / week_counts
+        stats['median_weeks_held'] = np.full(n_groups, np.nan)
+        stats['min_weeks_held'] = np.full(n_groups, np.nan)
+        stats['max_weeks_held'] = np.full(n_groups, np.nan)
+        if has_weeks.any():
+            sorted_weeks = weeks[has_weeks][np.lexsort((weeks[has_weeks], week_codes))]
+            week_starts = np.concatenate(([0], np.cumsum(week_counts)[:-1]))
+            present = week_counts > 0
+            stats['median_weeks_held'][present] = _segment_quantile(
+                sorted_weeks, week_starts[present], week_counts[present], 0.5)
+            stats['min_weeks_held'][present] = sorted_weeks[week_starts[present]]
+            stats['max_weeks_held'][present] = sorted_weeks[week_starts[present] + week_counts[present] - 1]
+    
+    if bootstrap:
+        stats.update(_bootstrap_intervals(sorted_values, starts, counts, bootstrap, confidence, seed))
+    
+    return pd.DataFrame(stats, index=index)[columns]
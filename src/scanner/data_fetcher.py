@@ -2,67 +2,115 @@
 import pandas as pd
 import yfinance as yf
 import logging
-from pathlib import Path
+from collections import defaultdict
 from datetime import datetime
-from .utils import sanitize_symbol
+from .market_store import MarketDataStore
+from .scheduler import FetchScheduler
+from .timeframes import base_timeframe, resample_ohlcv, load_timeframe, load_many_timeframe
 
 logger = logging.getLogger(__name__)
 
 
+# Minimum bars (of the requested timeframe) for a full download to be cached
+MIN_BARS = {
+    "1wk": 20,
+    "1d": 10,
+}
+
+# Symbols per multi-ticker request
+DEFAULT_CHUNK_SIZE = 50
+
+# A cached series whose first bar is within this distance of the requested
+# start is treated as covering it (weekends/holidays shift the first bar)
+START_TOLERANCE = {
+    "1d": pd.Timedelta(days=5),
+    "1h": pd.Timedelta(days=5),
+    "5m": pd.Timedelta(days=5),
+}
+
+
+def _download(symbol, start_date, end_date, interval):
+    """
+    Download OHLCV bars from yfinance.
+    
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE.NS')
+        start_date: Start date (datetime or string)
+        end_date: End date (datetime or string, exclusive)
+        interval: yfinance interval ('1wk', '1d', ...)
+        
+    Returns:
+        pandas.DataFrame with [Date, Open, High, Low, Close, Volume] or None
+    """
+    ticker = yf.Ticker(symbol)
+    df = ticker.history(start=start_date, end=end_date, interval=interval)
+    
+    if df.empty:
+        return None
+    
+    # Reset index to have Date as a column
+    df.reset_index(inplace=True)
+    if 'Datetime' in df.columns:
+        df.rename(columns={'Datetime': 'Date'}, inplace=True)
+    
+    # Select only needed columns
+    needed_cols = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    available_cols = [col for col in needed_cols if col in df.columns]
+    df = df[available_cols]
+    
+    # Drop rows with NaN in critical columns
+    return df.dropna(subset=['Open', 'High', 'Low', 'Close'])
+
+
+def _fetch_full(symbol, start_date, end_date, cache_dir, timeframe):
+    """
+    Download full history at the timeframe's base resolution and store it.
+    
+    Only base bars (1d, 1h, 5m) are stored; derived timeframes such as 1wk
+    are resampled from them (see timeframes).
+    
+    Returns:
+        pandas.DataFrame: Bars at the requested timeframe, or None
+    """
+    base = base_timeframe(timeframe)
+    df = _download(symbol, start_date, end_date, base)
+    
+    if df is None:
+        logger.warning(f"No data found for {symbol}")
+        return None
+    
+    bars = df if base == timeframe else resample_ohlcv(df, timeframe)
+    min_bars = MIN_BARS.get(timeframe, 1)
+    if len(bars) < min_bars:
+        logger.warning(f"Insufficient data for {symbol}: only {len(bars)} bars")
+        return None
+    
+    # Save to cache
+    cache_path = MarketDataStore(cache_dir).write(symbol, base, df, source="yahoo")
+    logger.debug(f"Cached {len(df)} {base} bars for {symbol} to {cache_path}")
+    
+    return bars
+
+
 def fetch_weekly(symbol, start_date, end_date, cache_dir):
     """
     Fetch weekly OHLCV data for a symbol.
     
+    Daily bars are downloaded and cached; the weekly series is derived from
+    them, so weekly and daily scans share one download.
+    
     Args:
         symbol: Stock symbol (e.g., 'RELIANCE.NS')
         start_date: Start date (datetime or string)
         end_date: End date (datetime or string)
-        cache_dir: Directory to cache data
+        cache_dir: Market-data store root
         
     Returns:
         pandas.DataFrame: Weekly OHLCV data with columns [Date, Open, High, Low, Close, Volume]
     """
     try:
         logger.info(f"Fetching data for {symbol} from {start_date} to {end_date}")
-        
-        # Fetch data using yfinance
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(start=start_date, end=end_date, interval="1wk")
-        
-        if df.empty:
-            logger.warning(f"No data found for {symbol}")
-            return None
-        
-        # Reset index to have Date as a column
-        df.reset_index(inplace=True)
-        
-        # Rename columns to standard format
-        column_mapping = {
-            'Open': 'Open',
-            'High': 'High',
-            'Low': 'Low',
-            'Close': 'Close',
-            'Volume': 'Volume'
-        }
-        
-        # Select only needed columns
-        needed_cols = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
-        available_cols = [col for col in needed_cols if col in df.columns]
-        df = df[available_cols]
-        
-        # Drop rows with NaN in critical columns
-        df.dropna(subset=['Open', 'High', 'Low', 'Close'], inplace=True)
-        
-        if len(df) < 20:
-            logger.warning(f"Insufficient data for {symbol}: only {len(df)} bars")
-            return None
-        
-        # Save to cache
-        cache_path = Path(cache_dir) / f"{sanitize_symbol(symbol)}.csv"
-        df.to_csv(cache_path, index=False)
-        logger.info(f"Cached {len(df)} bars for {symbol} to {cache_path}")
-        
-        return df
+        return _fetch_full(symbol, start_date, end_date, cache_dir, "1wk")
         
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {str(e)}")
@@ -77,71 +125,248 @@ def fetch_daily(symbol, start_date, end_date, cache_dir):
         symbol: Stock symbol (e.g., 'RELIANCE.NS')
         start_date: Start date (datetime or string)
         end_date: End date (datetime or string)
-        cache_dir: Directory to cache data
+        cache_dir: Market-data store root
         
     Returns:
         pandas.DataFrame: Daily OHLCV data with columns [Date, Open, High, Low, Close, Volume]
     """
     try:
-        # Fetch data using yfinance
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(start=start_date, end=end_date, interval="1d")
+        return _fetch_full(symbol, start_date, end_date, cache_dir, "1d")
         
-        if df.empty:
-            logger.warning(f"No data found for {symbol}")
-            return None
+    except Exception as e:
+        logger.error(f"Error fetching daily data for {symbol}: {str(e)}")
+        return None
+
+
+def fetch_incremental(symbol, start_date, end_date, cache_dir, timeframe="1wk"):
+    """
+    Bring a cached series up to end_date by downloading only the missing tail.
+    
+    Works on the timeframe's base resolution (daily bars for 1wk, hourly for
+    4h). The last cached bar is always re-requested, because it may have
+    been stored while still forming; the merge keeps the newest copy of
+    every Date. Symbols without a usable cache (or whose cache starts after
+    start_date) fall back to a full fetch.
+    
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE.NS')
+        start_date: Start date of the full history (datetime or string)
+        end_date: End date (datetime or string)
+        cache_dir: Market-data store root
+        timeframe: Base or derived timeframe ('1wk', '1d', '4h', ...)
         
-        # Reset index to have Date as a column
-        df.reset_index(inplace=True)
+    Returns:
+        pandas.DataFrame: Full cached series at the requested timeframe after
+            the update, or None
+    """
+    base = base_timeframe(timeframe)
+    store = MarketDataStore(cache_dir)
+    
+    try:
+        span = store.date_range(symbol, base)
+        if span is None:
+            return _fetch_full(symbol, start_date, end_date, cache_dir, timeframe)
         
-        # Select only needed columns
-        needed_cols = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
-        available_cols = [col for col in needed_cols if col in df.columns]
-        df = df[available_cols]
+        first_bar, last_bar, _ = span
+        tolerance = START_TOLERANCE.get(base, pd.Timedelta(0))
+        if start_date is not None and pd.Timestamp(start_date) < first_bar - tolerance:
+            logger.info(f"{symbol}: cache starts {first_bar.date()}, refetching full history")
+            return _fetch_full(symbol, start_date, end_date, cache_dir, timeframe)
         
-        # Drop rows with NaN in critical columns
-        df.dropna(subset=['Open', 'High', 'Low', 'Close'], inplace=True)
+        if end_date is not None and pd.Timestamp(end_date) <= last_bar:
+            logger.debug(f"{symbol}: {base} cache already covers {end_date}")
+            return load_timeframe(store, symbol, timeframe)
         
-        if len(df) < 10:
-            logger.warning(f"Insufficient data for {symbol}: only {len(df)} bars")
-            return None
+        logger.info(f"Fetching {symbol} {base} tail from {last_bar.date()} to {end_date}")
+        tail = _download(symbol, last_bar.strftime("%Y-%m-%d"), end_date, base)
         
-        # Save to cache
-        cache_path = Path(cache_dir) / f"{sanitize_symbol(symbol)}_daily.csv"
-        df.to_csv(cache_path, index=False)
-        logger.debug(f"Cached {len(df)} daily bars for {symbol}")
+        if tail is None:
+            logger.debug(f"{symbol}: no new {base} bars")
+            return load_timeframe(store, symbol, timeframe)
         
-        return df
+        merged = store.append(symbol, base, tail, source="yahoo")
+        logger.info(f"Appended {len(tail)} {base} bars for {symbol} (now {len(merged)})")
+        return load_timeframe(store, symbol, timeframe)
         
     except Exception as e:
-        logger.error(f"Error fetching daily data for {symbol}: {str(e)}")
+        logger.error(f"Error updating data for {symbol}: {str(e)}")
         return None
 
 
-def load_cached(symbol, cache_dir):
+def download_batch(symbols, start_date, end_date, interval, chunk_size=DEFAULT_CHUNK_SIZE,
+                   provider=None, max_workers=1, progress=None, scheduler=None):
+    """
+    Download many symbols with one provider request per chunk.
+    
+    Args:
+        symbols: List of stock symbols
+        start_date: Start date (datetime or string)
+        end_date: End date (datetime or string, exclusive)
+        interval: Bar interval ('1wk', '1d', ...)
+        chunk_size: Symbols per request
+        provider: DataProvider (default: YahooProvider)
+        max_workers: Concurrent requests per host
+        progress: Optional callback invoked with the number of symbols settled
+        scheduler: FetchScheduler to use instead of building one from the
+            arguments above (rate limit, retries and stats are shared)
+        
+    Returns:
+        dict: {symbol: DataFrame} for symbols that returned data
+    """
+    if scheduler is None:
+        scheduler = FetchScheduler(provider, max_concurrency=max_workers, progress=progress)
+    return scheduler.download_sync(symbols, start_date, end_date, interval, chunk_size)
+
+
+def fetch_batch(symbols, start_date, end_date, cache_dir, timeframe="1wk", chunk_size=DEFAULT_CHUNK_SIZE,
+                provider=None, incremental=True, max_workers=1, progress=None, scheduler=None):
+    """
+    Fetch many symbols into the cache using batched multi-ticker requests.
+    
+    Downloads and stores the timeframe's base resolution (see
+    fetch_incremental). With incremental=True each symbol only requests bars
+    from its last cached bar onwards; symbols needing the same start date
+    are grouped so each chunk is still a single request.
+    
+    Args:
+        symbols: List of stock symbols
+        start_date: Start date of the full history (datetime or string)
+        end_date: End date (datetime or string)
+        cache_dir: Market-data store root
+        timeframe: Base or derived timeframe ('1wk', '1d', ...)
+        chunk_size: Symbols per request
+        provider: DataProvider (default: YahooProvider)
+        incremental: Only download bars newer than the cache
+        max_workers: Concurrent requests per host
+        progress: Optional callback invoked with the number of symbols processed
+        scheduler: Optional FetchScheduler (overrides provider/max_workers)
+        
+    Returns:
+        dict: {symbol: status} with status 'fetched', 'updated', 'cached' or 'failed'
+    """
+    store = MarketDataStore(cache_dir)
+    if scheduler is None:
+        scheduler = FetchScheduler(provider, max_concurrency=max_workers, progress=progress)
+    elif progress is not None:
+        scheduler.progress = progress
+    base = base_timeframe(timeframe)
+    tolerance = START_TOLERANCE.get(base, pd.Timedelta(0))
+    min_bars = MIN_BARS.get(timeframe, 1)
+    
+    statuses = {}
+    groups = defaultdict(list)   # request start -> symbols
+    full_history = set()
+    
+    # One manifest query for every cached range
+    ranges = store.date_ranges(symbols, base) if incremental else {}
+    
+    for symbol in symbols:
+        span = ranges.get(symbol)
+        if span is None or (start_date is not None and pd.Timestamp(start_date) < span[0] - tolerance):
+            groups[str(start_date)].append(symbol)
+            full_history.add(symbol)
+        elif end_date is not None and pd.Timestamp(end_date) <= span[1]:
+            statuses[symbol] = "cached"
+            if progress is not None:
+                progress(1)
+        else:
+            # Re-request the last bar, it may have been stored while forming
+            groups[span[1].strftime("%Y-%m-%d")].append(symbol)
+    
+    for request_start, group in groups.items():
+        frames = download_batch(group, request_start, end_date, base, chunk_size, scheduler=scheduler)
+        
+        for symbol in group:
+            df = frames.get(symbol)
+            try:
+                if symbol in full_history:
+                    n_bars = 0
+                    if df is not None:
+                        n_bars = len(df) if base == timeframe else len(resample_ohlcv(df, timeframe))
+                    if n_bars < min_bars:
+                        logger.warning(f"Insufficient data for {symbol}: only {n_bars} bars")
+                        statuses[symbol] = "failed"
+                        continue
+                    store.write(symbol, base, df, source=scheduler.provider.name)
+                    statuses[symbol] = "fetched"
+                elif df is None:
+                    statuses[symbol] = "cached"
+                else:
+                    store.append(symbol, base, df, source=scheduler.provider.name)
+                    statuses[symbol] = "updated"
+            except Exception as e:
+                logger.error(f"Error caching data for {symbol}: {str(e)}")
+                statuses[symbol] = "failed"
+    
+    return statuses
+
+
+def load_cached(symbol, cache_dir, timeframe="1wk", start_date=None, end_date=None, columns=None):
     """
     Load cached data for a symbol.
     
     Args:
         symbol: Stock symbol
-        cache_dir: Cache directory
+        cache_dir: Market-data store root
+        timeframe: Bar interval (default: '1wk'; derived timeframes are
+            resampled from the stored base bars)
+        start_date: Only load bars on/after this date (optional)
+        end_date: Only load bars on/before this date (optional)
+        columns: Subset of OHLCV columns to load (optional, Date always included)
         
     Returns:
         pandas.DataFrame or None
     """
-    cache_path = Path(cache_dir) / f"{sanitize_symbol(symbol)}.csv"
-    
-    if not cache_path.exists():
-        logger.debug(f"No cached data for {symbol}")
-        return None
-    
     try:
-        df = pd.read_csv(cache_path, parse_dates=['Date'])
-        logger.info(f"Loaded cached data for {symbol}: {len(df)} bars")
-        return df
+        df = load_timeframe(MarketDataStore(cache_dir), symbol, timeframe, start_date, end_date, columns)
     except Exception as e:
         logger.error(f"Error loading cached data for {symbol}: {str(e)}")
         return None
+    
+    if df is None:
+        logger.debug(f"No cached data for {symbol}")
+        return None
+    
+    logger.info(f"Loaded cached data for {symbol}: {len(df)} bars")
+    return df
+
+
+def load_cached_many(symbols, cache_dir, timeframe="1wk", start_date=None, end_date=None, columns=None):
+    """
+    Load cached data for many symbols in a single store scan.
+    
+    Args:
+        symbols: List of stock symbols (None for every cached symbol)
+        cache_dir: Market-data store root
+        timeframe: Bar interval (default: '1wk')
+        start_date: Only load bars on/after this date (optional)
+        end_date: Only load bars on/before this date (optional)
+        columns: Subset of OHLCV columns to load (optional)
+        
+    Returns:
+        dict: {symbol: DataFrame} for symbols found in the cache
+    """
+    data = load_many_timeframe(MarketDataStore(cache_dir), symbols, timeframe, start_date, end_date, columns)
+    logger.info(f"Loaded cached data for {len(data)} symbols")
+    return data
+
+
+def list_cached_symbols(cache_dir, timeframe="1wk"):
+    """
+    List symbols available in the cache.
+    
+    Args:
+        cache_dir: Market-data store root
+        timeframe: Bar interval (default: '1wk')
+        
+    Returns:
+        list: Cached symbol keys (symbols with base bars for derived timeframes)
+    """
+    store = MarketDataStore(cache_dir)
+    base = base_timeframe(timeframe)
+    if base == timeframe:
+        return store.symbols(timeframe)
+    return sorted(set(store.symbols(base)) | set(store.symbols(timeframe)))
 
 
 def fetch_symbols_from_csv(csv_path):
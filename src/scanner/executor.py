@@ -0,0 +1,234 @@
+"""Sharded execution of per-symbol work on a process, thread or serial backend."""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from . import profiling
+from .data_fetcher import load_cached_many
+from .indicator_cache import IndicatorCache, DEFAULT_MAX_BYTES, cache_key, cached_supertrend, series_hashes
+from .market_store import MarketDataStore
+from .signal_detector import find_trade_pairs
+from .trades import as_trade_frame, concat_trades
+from .utils import sanitize_symbol
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ('process', 'thread', 'serial')
+
+# Symbols per shard: large enough that one store scan amortises the read,
+# small enough to keep every worker busy and results streaming
+DEFAULT_SHARD_SIZE = 64
+
+
+def make_shards(symbols, shard_size=DEFAULT_SHARD_SIZE, max_workers=None):
+    """
+    Split symbols into contiguous shards.
+
+    Args:
+        symbols: List of symbols
+        shard_size: Maximum symbols per shard
+        max_workers: If given, shrink shards so there are about four per
+            worker (keeps the pool balanced on small universes)
+
+    Returns:
+        list of list: Shards in input order
+    """
+    if max_workers:
+        shard_size = min(shard_size, -(-len(symbols) // (4 * max_workers)))
+    shard_size = max(int(shard_size), 1)
+    return [symbols[i:i + shard_size] for i in range(0, len(symbols), shard_size)]
+
+
+def _indicator_cache(indicator_cache, cache_max_bytes):
+    if indicator_cache is None:
+        return None
+    return IndicatorCache(indicator_cache, cache_max_bytes or DEFAULT_MAX_BYTES)
+
+
+def analyze_shard(symbols, cache_dir, atr_period, multiplier, include_open=False, sectors=None,
+                  timeframe='1wk', indicator_cache=None, cache_max_bytes=None):
+    """
+    Load a shard from the store and extract its trades.
+
+    Runs inside the worker: only symbol names go in and only the (typed,
+    compact) trade table comes back, so no OHLCV frames are pickled. With
+    an indicator cache, symbols whose input series and parameters are
+    unchanged are served from the cache without reading their bars.
+
+    Args:
+        symbols: Symbols in the shard
+        cache_dir: Market-data store root
+        atr_period: ATR period for SuperTrend
+        multiplier: Multiplier for SuperTrend
+        include_open: Include open trades
+        sectors: Optional dict mapping symbol -> sector
+        timeframe: Bar interval to analyze
+        indicator_cache: Indicator cache directory (None to disable)
+        cache_max_bytes: Indicator cache disk budget
+
+    Returns:
+        pandas.DataFrame: Trade table for the shard
+    """
+    sectors = sectors or {}
+    cache = _indicator_cache(indicator_cache, cache_max_bytes)
+    hashes = series_hashes(MarketDataStore(cache_dir), symbols, timeframe) if cache else {}
+    params = {'atr_period': int(atr_period), 'multiplier': float(multiplier),
+              'include_open': bool(include_open)}
+
+    trades_by_symbol = {}
+    if cache is not None:
+        with profiling.stage('cache_lookup', rows=len(symbols)):
+            for symbol in symbols:
+                trades = cache.get(hashes.get(symbol), 'trades', params)
+                if trades is not None:
+                    trades_by_symbol[symbol] = trades
+
+    missing = [symbol for symbol in symbols if symbol not in trades_by_symbol]
+    with profiling.stage('load') as timer:
+        data = load_cached_many(missing, cache_dir, timeframe=timeframe) if missing else {}
+        timer.rows = sum(len(df) for df in data.values())
+
+    for symbol in missing:
+        df = data.get(symbol)
+        if df is None:
+            continue
+        try:
+            with profiling.stage('supertrend', rows=len(df), symbol=symbol):
+                df_st = cached_supertrend(cache, df, atr_period, multiplier, input_hash=hashes.get(symbol))
+            with profiling.stage('pairing', rows=len(df_st), symbol=symbol):
+                trades = find_trade_pairs(df_st, symbol, include_open=include_open)
+            if cache is not None:
+                cache.put(hashes.get(symbol), 'trades', params, trades)
+            trades_by_symbol[symbol] = trades
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {str(e)}")
+
+    if cache is not None:
+        logger.debug(f"Shard: {len(symbols) - len(missing)} unchanged, {len(missing)} recomputed")
+
+    return concat_trades(
+        as_trade_frame(trades_by_symbol[symbol].assign(sector=sectors.get(symbol)))
+        for symbol in symbols if symbol in trades_by_symbol
+    )
+
+
+def compute_shard(symbols, cache_dir, atr_period, multiplier, output_dir, timeframe='1wk',
+                  indicator_cache=None, cache_max_bytes=None):
+    """
+    Load a shard from the store, compute SuperTrend and write each result.
+
+    With an indicator cache, each output is stamped with its cache key in a
+    hidden <symbol>_st.key file; outputs whose key is unchanged are left as
+    they are, and recomputation reuses cached SuperTrend results.
+
+    Args:
+        symbols: Symbols in the shard
+        cache_dir: Market-data store root
+        atr_period: ATR period for SuperTrend
+        multiplier: Multiplier for SuperTrend
+        output_dir: Directory for the <symbol>_st.csv files
+        timeframe: Bar interval to compute
+        indicator_cache: Indicator cache directory (None to disable)
+        cache_max_bytes: Indicator cache disk budget
+
+    Returns:
+        tuple: (computed symbols, failed symbols, unchanged symbols)
+    """
+    output_dir = Path(output_dir)
+    cache = _indicator_cache(indicator_cache, cache_max_bytes)
+    hashes = series_hashes(MarketDataStore(cache_dir), symbols, timeframe) if cache else {}
+    params = {'atr_period': int(atr_period), 'multiplier': float(multiplier)}
+
+    keys, unchanged = {}, []
+    for symbol in symbols:
+        if hashes.get(symbol) is None:
+            continue
+        keys[symbol] = cache_key(hashes[symbol], 'supertrend', params)
+        output_path = output_dir / f"{sanitize_symbol(symbol)}_st.csv"
+        key_path = output_dir / f".{sanitize_symbol(symbol)}_st.key"
+        if output_path.exists() and key_path.exists() and key_path.read_text() == keys[symbol]:
+            unchanged.append(symbol)
+
+    todo = [symbol for symbol in symbols if symbol not in unchanged]
+    with profiling.stage('load') as timer:
+        data = load_cached_many(todo, cache_dir, timeframe=timeframe) if todo else {}
+        timer.rows = sum(len(df) for df in data.values())
+
+    computed, failed = [], []
+    for symbol in todo:
+        df = data.get(symbol)
+        if df is None:
+            logger.warning(f"No cached data for {symbol}")
+            failed.append(symbol)
+            continue
+        try:
+            with profiling.stage('supertrend', rows=len(df), symbol=symbol):
+                df_st = cached_supertrend(cache, df, atr_period, multiplier, input_hash=hashes.get(symbol))
+            with profiling.stage('write', rows=len(df_st)):
+                df_st.to_csv(output_dir / f"{sanitize_symbol(symbol)}_st.csv", index=False)
+            if symbol in keys:
+                (output_dir / f".{sanitize_symbol(symbol)}_st.key").write_text(keys[symbol])
+            computed.append(symbol)
+        except Exception as e:
+            logger.error(f"Error computing SuperTrend for {symbol}: {str(e)}")
+            failed.append(symbol)
+
+    return computed, failed, unchanged
+
+
+def run_sharded(func, shards, executor='process', max_workers=None, **kwargs):
+    """
+    Run func(shard, **kwargs) over shards, yielding results as they finish.
+
+    Results stream back shard by shard in completion order, so callers can
+    report progress and merge incrementally rather than waiting for the
+    whole universe.
+
+    Args:
+        func: Module-level function (must be picklable for 'process')
+        shards: List of symbol lists
+        executor: 'process', 'thread' or 'serial'
+        max_workers: Pool size (default: CPU count)
+        **kwargs: Extra arguments passed to every call
+
+    Yields:
+        tuple: (shard, result)
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {', '.join(EXECUTORS)}")
+
+    if executor == 'serial' or len(shards) <= 1:
+        for shard in shards:
+            yield shard, func(shard, **kwargs)
+        return
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(shards))
+    profiler = profiling.active()
+
+    if executor == 'thread':
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            if profiler is not None:
+                # Worker threads record under the caller's current stage
+                stack = profiler.current_stack()
+                futures = {pool.submit(profiler.run_under, stack, func, shard, **kwargs): shard
+                           for shard in shards}
+            else:
+                futures = {pool.submit(func, shard, **kwargs): shard for shard in shards}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        if profiler is not None:
+            # Each worker profiles its call and ships the records back
+            stack = profiler.current_stack()
+            futures = {pool.submit(profiling.call_profiled, func, shard, **kwargs): shard for shard in shards}
+            for future in as_completed(futures):
+                result, records = future.result()
+                profiler.merge(records, prefix=stack)
+                yield futures[future], result
+        else:
+            futures = {pool.submit(func, shard, **kwargs): shard for shard in shards}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
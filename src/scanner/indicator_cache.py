@@ -0,0 +1,254 @@
+"""Content-addressed cache of computed indicator outputs."""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .manifest import content_hash
+from .timeframes import base_timeframe
+from .utils import sanitize_symbol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Bump when an indicator or the pairing logic changes its output, so older
+# entries are no longer matched
+CACHE_VERSION = 1
+
+
+def series_hashes(store, symbols, timeframe):
+    """
+    Identity of each symbol's input series, from the store manifest alone.
+
+    Derived timeframes are identified by their base series' content hash
+    plus the timeframe, so no bars are read or resampled to tell whether a
+    symbol changed.
+
+    Args:
+        store: MarketDataStore
+        symbols: Symbols to look up
+        timeframe: Bar interval the indicators are computed on
+
+    Returns:
+        dict: {symbol: hash} for symbols recorded in the manifest
+    """
+    keys = {symbol: sanitize_symbol(symbol) for symbol in symbols}
+    base = base_timeframe(timeframe)
+
+    hashes = {}
+    if base != timeframe:
+        base_hashes = store.manifest.hashes(base, keys.values())
+        hashes = {symbol: f"{base_hashes[key]}/{timeframe}"
+                  for symbol, key in keys.items() if base_hashes.get(key)}
+
+    # Base timeframes, and series stored before derivation
+    own_hashes = store.manifest.hashes(timeframe, keys.values())
+    for symbol, key in keys.items():
+        if symbol not in hashes and own_hashes.get(key):
+            hashes[symbol] = own_hashes[key]
+    return hashes
+
+
+def cache_key(input_hash, name, params):
+    """Key for an indicator output: hash of input identity, name and params."""
+    payload = json.dumps([CACHE_VERSION, input_hash, name, params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Indicator outputs stored as Parquet files named by their cache key.
+
+    A key covers the input series' content hash, the indicator name and its
+    parameters, so entries never go stale: new bars or new parameters just
+    produce a new key. Reads refresh a file's mtime, and writes evict the
+    least recently used files once the cache exceeds its disk budget.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize cache
+
+        Args:
+            root: Cache directory
+            max_bytes: Disk budget before least recently used entries are evicted
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._bytes = None  # running total, scanned lazily
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.parquet"
+
+    def get(self, input_hash, name, params):
+        """
+        Cached output, or None.
+
+        Args:
+            input_hash: Identity of the input series (see series_hashes)
+            name: Indicator name
+            params: JSON-serialisable parameters
+
+        Returns:
+            pandas.DataFrame or None
+        """
+        if input_hash is None:
+            return None
+
+        path = self.path(cache_key(input_hash, name, params))
+        try:
+            df = pq.read_table(path).to_pandas()
+            os.utime(path)
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            # Missing, evicted by another worker, or half-written by a crash
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return df
+
+    def put(self, input_hash, name, params, df):
+        """
+        Store an output (atomically) and enforce the disk budget.
+
+        Args:
+            input_hash: Identity of the input series
+            name: Indicator name
+            params: JSON-serialisable parameters
+            df: Output DataFrame
+        """
+        if input_hash is None:
+            return
+
+        path = self.path(cache_key(input_hash, name, params))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # The cache is an optimisation; never fail a run because of it
+            logger.warning(f"Could not cache {name}: {str(e)}")
+            return
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self.size()
+            else:
+                self._bytes += path.stat().st_size
+            if self._bytes > self.max_bytes:
+                self._bytes = self.evict()
+
+    def get_or_compute(self, input_hash, name, params, compute):
+        """
+        Cached output, computing and storing it on a miss.
+
+        Args:
+            input_hash: Identity of the input series
+            name: Indicator name
+            params: JSON-serialisable parameters
+            compute: Called with no arguments on a miss
+
+        Returns:
+            tuple: (DataFrame, hit)
+        """
+        df = self.get(input_hash, name, params)
+        if df is not None:
+            return df, True
+        df = compute()
+        self.put(input_hash, name, params, df)
+        return df, False
+
+    def _files(self):
+        return list(self.root.glob("*/*.parquet")) if self.root.exists() else []
+
+    def size(self):
+        """Total bytes on disk."""
+        return sum(path.stat().st_size for path in self._files() if path.exists())
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used entries until the cache fits its budget.
+
+        Args:
+            max_bytes: Budget (default: the cache's max_bytes)
+
+        Returns:
+            int: Bytes remaining
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} indicator cache entries ({total} bytes left)")
+        return total
+
+    def stats(self):
+        """
+        Entry count, size and this process' hit/miss counters.
+
+        Returns:
+            dict: entries, bytes, max_bytes, hits, misses
+        """
+        files = self._files()
+        return {
+            'entries': len(files),
+            'bytes': sum(path.stat().st_size for path in files if path.exists()),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def cached_supertrend(cache, df, atr_period, multiplier, input_hash=None):
+    """
+    SuperTrend through the indicator cache.
+
+    Args:
+        cache: IndicatorCache (None to always compute)
+        df: DataFrame with OHLCV data
+        atr_period: ATR period
+        multiplier: ATR multiplier
+        input_hash: Identity of df (default: hash of its values)
+
+    Returns:
+        pandas.DataFrame: df with SuperTrend columns, as supertrend() returns
+    """
+    from .indicators import supertrend
+
+    if cache is None:
+        return supertrend(df, atr_period=atr_period, multiplier=multiplier)
+
+    if input_hash is None:
+        input_hash = content_hash(df)
+    params = {'atr_period': int(atr_period), 'multiplier': float(multiplier)}
+    df_st, _ = cache.get_or_compute(
+        input_hash, 'supertrend', params,
+        lambda: supertrend(df, atr_period=atr_period, multiplier=multiplier)
+    )
+    return df_st
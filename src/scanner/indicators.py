@@ -6,25 +6,192 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def atr(df, period=10):
+def true_range(df):
     """
-    Calculate Average True Range (ATR).
+    Calculate True Range.
     
     Args:
         df: DataFrame with 'High', 'Low', 'Close' columns
-        period: ATR period (default: 10)
         
     Returns:
-        pandas.Series: ATR values
+        pandas.Series: True range values
     """
     high_low = df['High'] - df['Low']
     high_prev_close = (df['High'] - df['Close'].shift()).abs()
     low_prev_close = (df['Low'] - df['Close'].shift()).abs()
     
-    tr = pd.concat([high_low, high_prev_close, low_prev_close], axis=1).max(axis=1)
+    return pd.concat([high_low, high_prev_close, low_prev_close], axis=1).max(axis=1)
+
+
+def atr(df, period=10, tr=None):
+    """
+    Calculate Average True Range (ATR).
+    
+    Args:
+        df: DataFrame with 'High', 'Low', 'Close' columns
+        period: ATR period (default: 10)
+        tr: Precomputed true range Series (optional, reused across periods)
+        
+    Returns:
+        pandas.Series: ATR values
+    """
+    if tr is None:
+        tr = true_range(df)
     return tr.rolling(period).mean()
 
 
+def supertrend_kernel(high, low, close, atr_values, atr_period, multiplier,
+                      final_ub, final_lb, st, st_dir):
+    """
+    Single O(n) SuperTrend pass over contiguous float arrays.
+    
+    Band and direction recursions are evaluated exactly as in the reference
+    bar-by-bar definition, but on plain floats instead of DataFrame cells,
+    and results are written into caller-provided output buffers.
+    
+    Args:
+        high, low, close: 1-D float64 arrays of equal length
+        atr_values: 1-D float64 ATR array aligned with the prices
+        atr_period: ATR period (first bar the recursion starts on)
+        multiplier: Multiplier for ATR
+        final_ub, final_lb, st: float64 output buffers (len n)
+        st_dir: int64 output buffer (len n)
+        
+    Returns:
+        tuple: (basic_ub, basic_lb) arrays
+    """
+    hl2 = (high + low) / 2
+    basic_ub = hl2 + multiplier * atr_values
+    basic_lb = hl2 - multiplier * atr_values
+    
+    final_ub[:] = basic_ub
+    final_lb[:] = basic_lb
+    st[:] = np.nan
+    st_dir[:] = 1
+    
+    n = len(close)
+    if n <= atr_period:
+        return basic_ub, basic_lb
+    
+    # Python floats are much cheaper to index and compare than numpy scalars
+    c = close.tolist()
+    bub = basic_ub.tolist()
+    blb = basic_lb.tolist()
+    
+    prev_ub = bub[atr_period - 1]
+    prev_lb = blb[atr_period - 1]
+    prev_dir = 1
+    
+    for i in range(atr_period, n):
+        # Final upper/lower bands (NaN comparisons are False, as in pandas)
+        prev_close = c[i - 1]
+        if bub[i] < prev_ub or prev_close > prev_ub:
+            ub = bub[i]
+        else:
+            ub = prev_ub
+        if blb[i] > prev_lb or prev_close < prev_lb:
+            lb = blb[i]
+        else:
+            lb = prev_lb
+        
+        # Direction and SuperTrend value
+        if i == atr_period:
+            d = -1 if c[i] <= ub else 1
+        elif prev_dir == 1:
+            d = -1 if c[i] <= lb else 1
+        else:
+            d = 1 if c[i] >= ub else -1
+        
+        final_ub[i] = ub
+        final_lb[i] = lb
+        st_dir[i] = d
+        st[i] = ub if d == -1 else lb
+        
+        prev_ub, prev_lb, prev_dir = ub, lb, d
+    
+    return basic_ub, basic_lb
+
+
+def supertrend_columns(high, low, close, atr_values, atr_period, multiplier):
+    """
+    SuperTrend over many independent columns at once.
+    
+    Same recursion as supertrend_kernel(), but the arrays are 2-D with bars
+    along axis 0 and columns (symbols or parameter sets) along axis 1, so the
+    time loop runs once for every column together.
+    
+    Args:
+        high, low, close: float64 arrays of shape (n, k)
+        atr_values: float64 ATR array of shape (n, k)
+        atr_period: ATR period (first bar the recursion starts on)
+        multiplier: Scalar multiplier or array broadcastable to (k,)
+        
+    Returns:
+        dict: 'final_ub', 'final_lb', 'ST' (float64) and 'ST_dir' (int64),
+            each of shape (n, k)
+    """
+    hl2 = (high + low) / 2
+    basic_ub = hl2 + multiplier * atr_values
+    basic_lb = hl2 - multiplier * atr_values
+    
+    final_ub = basic_ub.copy()
+    final_lb = basic_lb.copy()
+    st = np.full(basic_ub.shape, np.nan)
+    st_dir = np.ones(basic_ub.shape, dtype=np.int64)
+    
+    n = basic_ub.shape[0]
+    if n > atr_period:
+        prev_ub = final_ub[atr_period - 1]
+        prev_lb = final_lb[atr_period - 1]
+        prev_dir = st_dir[atr_period - 1]
+        
+        for i in range(atr_period, n):
+            prev_close = close[i - 1]
+            c = close[i]
+            
+            ub = np.where((basic_ub[i] < prev_ub) | (prev_close > prev_ub), basic_ub[i], prev_ub)
+            lb = np.where((basic_lb[i] > prev_lb) | (prev_close < prev_lb), basic_lb[i], prev_lb)
+            
+            if i == atr_period:
+                d = np.where(c <= ub, -1, 1)
+            else:
+                d = np.where(prev_dir == 1,
+                             np.where(c <= lb, -1, 1),
+                             np.where(c >= ub, 1, -1))
+            
+            final_ub[i] = ub
+            final_lb[i] = lb
+            st_dir[i] = d
+            st[i] = np.where(d == -1, ub, lb)
+            prev_ub, prev_lb, prev_dir = ub, lb, d
+    
+    return {'final_ub': final_ub, 'final_lb': final_lb, 'ST': st, 'ST_dir': st_dir}
+
+
+def supertrend_direction_grid(high, low, close, atr_values, atr_period, multipliers):
+    """
+    SuperTrend direction for several multipliers sharing one ATR series.
+    
+    Args:
+        high, low, close: 1-D float64 arrays of equal length
+        atr_values: 1-D float64 ATR array for atr_period
+        atr_period: ATR period
+        multipliers: Sequence of ATR multipliers
+        
+    Returns:
+        numpy.ndarray: int64 array of shape (len(multipliers), n) with ST_dir
+    """
+    mult = np.asarray(multipliers, dtype=np.float64)
+    shape = (len(close), len(mult))
+    
+    def columns(values):
+        return np.broadcast_to(values[:, None], shape)
+    
+    result = supertrend_columns(columns(high), columns(low), columns(close),
+                                columns(atr_values), atr_period, mult)
+    return result['ST_dir'].T
+
+
 def supertrend(df, atr_period=10, multiplier=3.0):
     """
     Calculate SuperTrend indicator.
@@ -49,65 +216,27 @@ def supertrend(df, atr_period=10, multiplier=3.0):
     # Calculate ATR
     df['ATR'] = atr(df, atr_period)
     
-    # Calculate basic bands
-    hl2 = (df['High'] + df['Low']) / 2
-    df['basic_ub'] = hl2 + multiplier * df['ATR']
-    df['basic_lb'] = hl2 - multiplier * df['ATR']
-    
-    # Initialize final bands
-    df['final_ub'] = df['basic_ub']
-    df['final_lb'] = df['basic_lb']
+    n = len(df)
+    final_ub = np.empty(n, dtype=np.float64)
+    final_lb = np.empty(n, dtype=np.float64)
+    st = np.empty(n, dtype=np.float64)
+    st_dir = np.empty(n, dtype=np.int64)
     
-    # Calculate final upper band
-    for i in range(atr_period, len(df)):
-        if df['basic_ub'].iloc[i] < df['final_ub'].iloc[i-1] or df['Close'].iloc[i-1] > df['final_ub'].iloc[i-1]:
-            df.loc[df.index[i], 'final_ub'] = df['basic_ub'].iloc[i]
-        else:
-            df.loc[df.index[i], 'final_ub'] = df['final_ub'].iloc[i-1]
-            
-        # Calculate final lower band
-        if df['basic_lb'].iloc[i] > df['final_lb'].iloc[i-1] or df['Close'].iloc[i-1] < df['final_lb'].iloc[i-1]:
-            df.loc[df.index[i], 'final_lb'] = df['basic_lb'].iloc[i]
-        else:
-            df.loc[df.index[i], 'final_lb'] = df['final_lb'].iloc[i-1]
+    basic_ub, basic_lb = supertrend_kernel(
+        df['High'].to_numpy(dtype=np.float64),
+        df['Low'].to_numpy(dtype=np.float64),
+        df['Close'].to_numpy(dtype=np.float64),
+        df['ATR'].to_numpy(dtype=np.float64),
+        atr_period, multiplier,
+        final_ub, final_lb, st, st_dir
+    )
     
-    # Determine SuperTrend direction and value
-    df['ST'] = np.nan
-    df['ST_dir'] = 1  # Start with uptrend
-    
-    for i in range(atr_period, len(df)):
-        if i == atr_period:
-            # Initial direction
-            if df['Close'].iloc[i] <= df['final_ub'].iloc[i]:
-                df.loc[df.index[i], 'ST_dir'] = -1
-                df.loc[df.index[i], 'ST'] = df['final_ub'].iloc[i]
-            else:
-                df.loc[df.index[i], 'ST_dir'] = 1
-                df.loc[df.index[i], 'ST'] = df['final_lb'].iloc[i]
-        else:
-            # Previous direction
-            prev_dir = df['ST_dir'].iloc[i-1]
-            
-            if prev_dir == 1:
-                # Was in uptrend
-                if df['Close'].iloc[i] <= df['final_lb'].iloc[i]:
-                    # Switch to downtrend
-                    df.loc[df.index[i], 'ST_dir'] = -1
-                    df.loc[df.index[i], 'ST'] = df['final_ub'].iloc[i]
-                else:
-                    # Continue uptrend
-                    df.loc[df.index[i], 'ST_dir'] = 1
-                    df.loc[df.index[i], 'ST'] = df['final_lb'].iloc[i]
-            else:
-                # Was in downtrend
-                if df['Close'].iloc[i] >= df['final_ub'].iloc[i]:
-                    # Switch to uptrend
-                    df.loc[df.index[i], 'ST_dir'] = 1
-                    df.loc[df.index[i], 'ST'] = df['final_lb'].iloc[i]
-                else:
-                    # Continue downtrend
-                    df.loc[df.index[i], 'ST_dir'] = -1
-                    df.loc[df.index[i], 'ST'] = df['final_ub'].iloc[i]
+    df['basic_ub'] = basic_ub
+    df['basic_lb'] = basic_lb
+    df['final_ub'] = final_ub
+    df['final_lb'] = final_lb
+    df['ST'] = st
+    df['ST_dir'] = st_dir
     
     logger.debug(f"SuperTrend calculated: {len(df)} bars, {df['ST'].notna().sum()} valid ST values")
     
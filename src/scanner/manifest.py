@@ -0,0 +1,194 @@
+"""SQLite manifest of the series held in the market-data store."""
+import hashlib
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    first_bar TEXT,
+    last_bar TEXT,
+    rows INTEGER NOT NULL,
+    source TEXT,
+    content_hash TEXT,
+    bytes INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (symbol, timeframe)
+)
+"""
+
+COLUMNS = ['symbol', 'timeframe', 'first_bar', 'last_bar', 'rows', 'source', 'content_hash',
+           'bytes', 'updated_at']
+
+
+def content_hash(df):
+    """
+    Hash of a series' values, independent of file encoding.
+
+    Args:
+        df: DataFrame (normalised OHLCV)
+
+    Returns:
+        str: Hex digest
+    """
+    values = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+
+def _timestamp(value):
+    return None if value is None else pd.Timestamp(value)
+
+
+class CacheManifest:
+    """
+    One row per stored (symbol, timeframe) series.
+
+    Records first/last bar, row count, source, content hash and file size so
+    lookups, freshness checks and universe discovery are single queries
+    instead of directory scans. Symbols are the store's sanitised keys.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self):
+        # A short-lived connection per call keeps the manifest usable from
+        # worker threads and processes
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, symbol, timeframe, df, source=None, size=None):
+        """
+        Insert or replace the entry for a series.
+
+        Args:
+            symbol: Store key
+            timeframe: Bar interval
+            df: The series as stored (normalised OHLCV)
+            source: Where the bars came from (provider name, 'csv', ...)
+            size: File size in bytes
+        """
+        first_bar = str(df['Date'].iloc[0]) if len(df) else None
+        last_bar = str(df['Date'].iloc[-1]) if len(df) else None
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (symbol, timeframe, first_bar, last_bar, len(df), source, content_hash(df), size,
+                 datetime.now().isoformat(timespec='seconds')),
+            )
+
+    def remove(self, symbol, timeframe):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM series WHERE symbol = ? AND timeframe = ?", (symbol, timeframe))
+
+    def get(self, symbol, timeframe):
+        """
+        Entry for one series.
+
+        Returns:
+            dict or None: COLUMNS, with first_bar/last_bar as Timestamps
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM series WHERE symbol = ? AND timeframe = ?", (symbol, timeframe)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(COLUMNS, row))
+        entry['first_bar'] = _timestamp(entry['first_bar'])
+        entry['last_bar'] = _timestamp(entry['last_bar'])
+        return entry
+
+    def ranges(self, timeframe, symbols=None):
+        """
+        First/last bar and row count for many series in one query.
+
+        Args:
+            timeframe: Bar interval
+            symbols: Store keys to include (None for all)
+
+        Returns:
+            dict: {symbol: (first_bar, last_bar, rows)}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT symbol, first_bar, last_bar, rows FROM series WHERE timeframe = ?", (timeframe,)
+            ).fetchall()
+
+        wanted = None if symbols is None else set(symbols)
+        return {
+            symbol: (_timestamp(first), _timestamp(last), n)
+            for symbol, first, last, n in rows
+            if (wanted is None or symbol in wanted) and n > 0
+        }
+
+    def hashes(self, timeframe, symbols=None):
+        """
+        Content hashes for many series in one query.
+
+        Args:
+            timeframe: Bar interval
+            symbols: Store keys to include (None for all)
+
+        Returns:
+            dict: {symbol: content_hash}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT symbol, content_hash FROM series WHERE timeframe = ?", (timeframe,)
+            ).fetchall()
+
+        wanted = None if symbols is None else set(symbols)
+        return {symbol: h for symbol, h in rows if wanted is None or symbol in wanted}
+
+    def symbols(self, timeframe):
+        """Store keys recorded for a timeframe, sorted."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT symbol FROM series WHERE timeframe = ? ORDER BY symbol", (timeframe,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def entries(self, timeframe=None):
+        """All entries as a DataFrame (optionally for one timeframe)."""
+        query = "SELECT * FROM series"
+        params = ()
+        if timeframe is not None:
+            query += " WHERE timeframe = ?"
+            params = (timeframe,)
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(query + " ORDER BY timeframe, symbol", conn, params=params)
+        df['first_bar'] = pd.to_datetime(df['first_bar'])
+        df['last_bar'] = pd.to_datetime(df['last_bar'])
+        return df
+
+    def stats(self):
+        """
+        Per-timeframe summary of the cache.
+
+        Returns:
+            pandas.DataFrame: timeframe, series, rows, bytes, oldest/newest last bar
+        """
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                """
+                SELECT timeframe, COUNT(*) AS series, SUM(rows) AS rows, SUM(bytes) AS bytes,
+                       MIN(last_bar) AS oldest_last_bar, MAX(last_bar) AS newest_last_bar
+                FROM series GROUP BY timeframe ORDER BY timeframe
+                """,
+                conn,
+            )
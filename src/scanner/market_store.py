@@ -0,0 +1,447 @@
+"""Columnar (Parquet) market-data store shared by all OHLCV fetchers."""
+import os
+import logging
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .manifest import CacheManifest, MANIFEST_FILE
+from .utils import sanitize_symbol
+
+logger = logging.getLogger(__name__)
+
+STORE_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+STORE_SCHEMA = pa.schema([
+    ('Date', pa.timestamp('ns')),
+    ('Open', pa.float64()),
+    ('High', pa.float64()),
+    ('Low', pa.float64()),
+    ('Close', pa.float64()),
+    ('Volume', pa.int64()),
+])
+
+DATA_FILE = "data.parquet"
+
+
+def normalize_ohlcv(df):
+    """
+    Coerce an OHLCV frame to the store's canonical layout.
+
+    Accepts capitalised (scanner) or lowercase (ML) column names, a Date
+    column or DatetimeIndex, and tz-aware timestamps (converted to naive
+    exchange-local time).
+
+    Args:
+        df: DataFrame with OHLCV data
+
+    Returns:
+        pandas.DataFrame: Columns STORE_COLUMNS, sorted by Date, unique dates
+    """
+    df = df.copy()
+
+    if 'Date' not in df.columns and 'date' not in df.columns:
+        df = df.reset_index()
+
+    rename = {col: col.capitalize() for col in df.columns
+              if isinstance(col, str) and col.capitalize() in STORE_COLUMNS}
+    if 'Datetime' in df.columns and 'Date' not in rename.values():
+        rename['Datetime'] = 'Date'
+    df = df.rename(columns=rename)
+
+    dates = pd.to_datetime(df['Date'])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    df['Date'] = dates.astype('datetime64[ns]')
+
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df[col] = df[col].astype(np.float64)
+    if 'Volume' in df.columns:
+        df['Volume'] = df['Volume'].fillna(0).astype(np.int64)
+    else:
+        df['Volume'] = np.int64(0)
+
+    df = df[STORE_COLUMNS]
+    df = df.drop_duplicates(subset='Date', keep='last').sort_values('Date')
+    return df.reset_index(drop=True)
+
+
+def _date_filter(start=None, end=None):
+    """Build a pyarrow filter expression on Date."""
+    expr = None
+    if start is not None:
+        expr = ds.field('Date') >= pd.Timestamp(start).to_datetime64()
+    if end is not None:
+        upper = ds.field('Date') <= pd.Timestamp(end).to_datetime64()
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+class MarketDataStore:
+    """
+    Parquet OHLCV store partitioned by timeframe and symbol.
+
+    Layout::
+
+        <root>/timeframe=<tf>/symbol=<SYMBOL>/data.parquet
+
+    Symbols are keyed by sanitize_symbol() of the Yahoo ticker (e.g.
+    RELIANCE.NS -> RELIANCE_NS), so every fetcher shares one copy. Every
+    write is recorded in a SQLite manifest (<root>/manifest.sqlite) that
+    answers date-range, freshness and listing queries without touching the
+    Parquet files.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        """CacheManifest for this store, rebuilt from the files if missing."""
+        if self._manifest is None:
+            self._manifest = CacheManifest(self.root / MANIFEST_FILE)
+            if self._manifest.is_new and self.timeframes():
+                self.reindex()
+        return self._manifest
+
+    def timeframes(self):
+        """Timeframes with a partition directory."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name.split('=', 1)[1] for p in self.root.glob("timeframe=*") if p.is_dir())
+
+    def timeframe_dir(self, timeframe):
+        return self.root / f"timeframe={timeframe}"
+
+    def path(self, symbol, timeframe):
+        """Parquet file for a symbol/timeframe."""
+        return self.timeframe_dir(timeframe) / f"symbol={sanitize_symbol(symbol)}" / DATA_FILE
+
+    def exists(self, symbol, timeframe):
+        return self.path(symbol, timeframe).exists()
+
+    def write(self, symbol, timeframe, df, source=None):
+        """
+        Replace the stored series for a symbol/timeframe.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Bar interval (e.g. '1wk', '1d')
+            df: DataFrame with OHLCV data
+            source: Where the bars came from (recorded in the manifest)
+
+        Returns:
+            Path: File written
+        """
+        df = normalize_ohlcv(df)
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(df, schema=STORE_SCHEMA, preserve_index=False)
+        tmp_path = path.parent / f".{DATA_FILE}.tmp"
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+        self.manifest.record(sanitize_symbol(symbol), timeframe, df, source=source,
+                             size=path.stat().st_size)
+
+        logger.debug(f"Stored {len(df)} {timeframe} bars for {symbol} at {path}")
+        return path
+
+    def read(self, symbol, timeframe, start=None, end=None, columns=None):
+        """
+        Read one symbol's series.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Bar interval
+            start: Only bars on/after this date (pushed down to the reader)
+            end: Only bars on/before this date
+            columns: Columns to load (Date is always included)
+
+        Returns:
+            pandas.DataFrame or None if the series is not stored
+        """
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return None
+
+        columns = self._project(columns)
+        table = pq.read_table(path, columns=columns, filters=_date_filter(start, end))
+        return table.to_pandas()
+
+    def date_range(self, symbol, timeframe):
+        """
+        First/last bar and row count from the manifest (no data read).
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Bar interval
+
+        Returns:
+            tuple: (first_date, last_date, rows) or None if not stored
+        """
+        entry = self.manifest.get(sanitize_symbol(symbol), timeframe)
+        if entry is not None and entry['rows'] > 0:
+            return entry['first_bar'], entry['last_bar'], entry['rows']
+        return self._footer_range(symbol, timeframe)
+
+    def date_ranges(self, symbols, timeframe):
+        """
+        date_range() for many symbols in one manifest query.
+
+        Args:
+            symbols: Iterable of symbols
+            timeframe: Bar interval
+
+        Returns:
+            dict: {symbol: (first_date, last_date, rows)} for stored symbols
+        """
+        keys = {sanitize_symbol(s): s for s in symbols}
+        ranges = self.manifest.ranges(timeframe, keys)
+        return {keys[key]: span for key, span in ranges.items()}
+
+    def _footer_range(self, symbol, timeframe):
+        """First/last bar and row count from the Parquet footer statistics."""
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return None
+
+        metadata = pq.ParquetFile(path).metadata
+        if metadata.num_rows == 0:
+            return None
+
+        date_idx = metadata.schema.names.index('Date')
+        first, last = None, None
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(date_idx).statistics
+            if stats is None or not stats.has_min_max:
+                # No statistics: fall back to reading just the Date column
+                dates = pq.read_table(path, columns=['Date']).column('Date').to_pandas()
+                return dates.min(), dates.max(), metadata.num_rows
+            first = stats.min if first is None else min(first, stats.min)
+            last = stats.max if last is None else max(last, stats.max)
+
+        return pd.Timestamp(first), pd.Timestamp(last), metadata.num_rows
+
+    def append(self, symbol, timeframe, df, source=None):
+        """
+        Merge new bars into a stored series.
+
+        Bars whose Date is already stored are replaced by the new values, so
+        re-downloading a partially formed bar overwrites the stale copy.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Bar interval
+            df: DataFrame with the new OHLCV bars
+            source: Where the new bars came from
+
+        Returns:
+            pandas.DataFrame: The merged series as stored
+        """
+        existing = self.read(symbol, timeframe)
+        new = normalize_ohlcv(df)
+        merged = new if existing is None else normalize_ohlcv(pd.concat([existing, new], ignore_index=True))
+        self.write(symbol, timeframe, merged, source=source)
+        return merged
+
+    def read_many(self, symbols, timeframe, start=None, end=None, columns=None):
+        """
+        Read several symbols in one scan of the timeframe partition.
+
+        Args:
+            symbols: Iterable of symbols (None for every stored symbol)
+            timeframe: Bar interval
+            start: Only bars on/after this date
+            end: Only bars on/before this date
+            columns: Columns to load (Date is always included)
+
+        Returns:
+            dict: {symbol: DataFrame} for symbols present in the store
+        """
+        tf_dir = self.timeframe_dir(timeframe)
+        if not tf_dir.exists():
+            return {}
+
+        dataset = ds.dataset(
+            tf_dir, format='parquet', schema=STORE_SCHEMA.append(pa.field('symbol', pa.string())),
+            partitioning=ds.partitioning(pa.schema([('symbol', pa.string())]), flavor='hive'),
+            exclude_invalid_files=False, ignore_prefixes=['.', '_'],
+        )
+
+        expr = _date_filter(start, end)
+        requested = None
+        if symbols is not None:
+            requested = {sanitize_symbol(s): s for s in symbols}
+            symbol_expr = ds.field('symbol').isin(list(requested))
+            expr = symbol_expr if expr is None else expr & symbol_expr
+
+        columns = self._project(columns)
+        table = dataset.to_table(columns=columns + ['symbol'], filter=expr)
+        codes, keys = pd.factorize(table.column('symbol').to_numpy())
+        frame = table.drop_columns(['symbol']).to_pandas()
+
+        # Files are scanned one at a time, so each symbol is normally one
+        # contiguous block; fall back to a stable sort if not
+        if len(codes) and (np.diff(codes) < 0).any():
+            order = np.argsort(codes, kind='stable')
+            codes = codes[order]
+            frame = frame.take(order)
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]))
+
+        result = {}
+        for key, lo, hi in zip(keys, bounds[:-1], bounds[1:]):
+            symbol = requested.get(key, key) if requested else key
+            result[symbol] = frame.iloc[lo:hi].reset_index(drop=True)
+        return result
+
+    def symbols(self, timeframe):
+        """List stored symbol keys for a timeframe (from the manifest)."""
+        return self.manifest.symbols(timeframe)
+
+    def delete(self, symbol, timeframe):
+        """Remove a stored series; returns True if something was deleted."""
+        self.manifest.remove(sanitize_symbol(symbol), timeframe)
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return False
+        path.unlink()
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+        return True
+
+    def reindex(self):
+        """
+        Rebuild the manifest from the Parquet files on disk.
+
+        Adds files the manifest does not know about (re-hashing them) and
+        drops entries whose file is gone.
+
+        Returns:
+            tuple: (entries added, entries dropped)
+        """
+        manifest = self.manifest
+        added, dropped = 0, 0
+
+        for timeframe in self.timeframes():
+            on_disk = {
+                p.name.split('=', 1)[1]: p / DATA_FILE
+                for p in self.timeframe_dir(timeframe).glob("symbol=*")
+                if (p / DATA_FILE).exists()
+            }
+            known = set(manifest.symbols(timeframe))
+
+            for key in known - set(on_disk):
+                manifest.remove(key, timeframe)
+                dropped += 1
+
+            for key in set(on_disk) - known:
+                try:
+                    df = pq.read_table(on_disk[key]).to_pandas()
+                    manifest.record(key, timeframe, df, source='reindex', size=on_disk[key].stat().st_size)
+                    added += 1
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable {on_disk[key]}: {str(e)}")
+
+        if added or dropped:
+            logger.info(f"Manifest reindexed: {added} added, {dropped} dropped")
+        return added, dropped
+
+    def gc(self, older_than=None, dry_run=False):
+        """
+        Garbage-collect the store.
+
+        Removes leftover temporary files and empty partitions, reconciles
+        the manifest with the files and, with older_than, deletes series
+        whose last bar is before that date (e.g. delisted symbols).
+
+        Args:
+            older_than: Delete series whose last bar is before this date
+            dry_run: Only report what would be removed
+
+        Returns:
+            dict: Counts of 'tmp_files', 'stale_series', 'manifest_added',
+                'manifest_dropped', and 'bytes' reclaimed
+        """
+        result = {'tmp_files': 0, 'stale_series': 0, 'manifest_added': 0, 'manifest_dropped': 0, 'bytes': 0}
+
+        for tmp_path in self.root.glob(f"timeframe=*/symbol=*/.{DATA_FILE}.tmp"):
+            result['tmp_files'] += 1
+            result['bytes'] += tmp_path.stat().st_size
+            if not dry_run:
+                tmp_path.unlink()
+
+        if not dry_run:
+            result['manifest_added'], result['manifest_dropped'] = self.reindex()
+
+        if older_than is not None:
+            entries = self.manifest.entries()
+            stale = entries[entries['last_bar'] < pd.Timestamp(older_than)]
+            for row in stale.itertuples():
+                result['stale_series'] += 1
+                result['bytes'] += int(row.bytes or 0)
+                if not dry_run:
+                    self.delete(row.symbol, row.timeframe)
+
+        if not dry_run:
+            for partition in self.root.glob("timeframe=*/symbol=*"):
+                if partition.is_dir() and not any(partition.iterdir()):
+                    partition.rmdir()
+
+        return result
+
+    @staticmethod
+    def _project(columns):
+        if columns is None:
+            return list(STORE_COLUMNS)
+        columns = [c for c in columns if c != 'Date']
+        return ['Date'] + columns
+
+
+def import_csv_cache(store, csv_dir, timeframe=None):
+    """
+    Load legacy per-symbol CSV caches into the store.
+
+    Recognises '<SYM>.csv' (weekly), '<SYM>_daily.csv' (daily) and the ML
+    fetcher's '<ticker>_<start>_<end>.csv' (daily, newest file wins).
+
+    Args:
+        store: MarketDataStore
+        csv_dir: Directory containing CSV files
+        timeframe: Force a timeframe instead of inferring it from the name
+
+    Returns:
+        int: Number of series imported
+    """
+    imported = 0
+    csv_files = sorted(Path(csv_dir).glob("*.csv"), key=lambda p: p.stat().st_mtime)
+
+    for csv_path in csv_files:
+        stem = csv_path.stem
+        parts = stem.rsplit('_', 2)
+
+        if stem.endswith('_daily'):
+            symbol, tf = stem[:-len('_daily')], '1d'
+        elif len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+            symbol, tf = parts[0], '1d'
+            if not symbol.endswith(('.NS', '.BO', '_NS', '_BO')) and not symbol.startswith('^'):
+                symbol = f"{symbol}.NS"
+        else:
+            symbol, tf = stem, '1wk'
+
+        try:
+            df = pd.read_csv(csv_path)
+            store.write(symbol, timeframe or tf, df, source='csv')
+            imported += 1
+        except Exception as e:
+            logger.warning(f"Skipping {csv_path.name}: {str(e)}")
+
+    logger.info(f"Imported {imported} CSV series from {csv_dir}")
+    return imported
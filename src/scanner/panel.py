@@ -0,0 +1,202 @@
+"""Universe-wide SuperTrend over a symbols x bars panel."""
+import pandas as pd
+import numpy as np
+import logging
+from dataclasses import dataclass
+from typing import List
+
+from .indicators import supertrend_columns
+from .signal_detector import pair_flips, build_trades, trades_to_records
+from .trades import as_trade_frame, concat_trades
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OHLCPanel:
+    """
+    OHLC series for many symbols packed into 2-D arrays.
+
+    Each symbol occupies one row and its bars are left-aligned, so bar j of
+    every row is that symbol's j-th bar; rows shorter than the longest
+    series are NaN-padded on the right. Keeping each symbol on its own bar
+    axis means recursive indicators see exactly the same sequence as they
+    would on the per-symbol DataFrame.
+    """
+    symbols: List[str]
+    lengths: np.ndarray   # (S,) int64 number of real bars per row
+    dates: np.ndarray     # (S, T) datetime64[ns], NaT padded
+    open: np.ndarray      # (S, T) float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def n_bars(self):
+        return self.close.shape[1]
+
+
+def build_panel(symbol_data):
+    """
+    Pack per-symbol OHLC DataFrames into an OHLCPanel.
+
+    Args:
+        symbol_data: Iterable of (symbol, DataFrame) pairs; frames need
+            Date, Open, High, Low and Close columns. None frames are skipped.
+
+    Returns:
+        OHLCPanel
+    """
+    frames = [(symbol, df) for symbol, df in symbol_data if df is not None and len(df) > 0]
+
+    n_symbols = len(frames)
+    n_bars = max((len(df) for _, df in frames), default=0)
+
+    lengths = np.zeros(n_symbols, dtype=np.int64)
+    dates = np.full((n_symbols, n_bars), np.datetime64('NaT'), dtype='datetime64[ns]')
+    arrays = {col: np.full((n_symbols, n_bars), np.nan) for col in ('Open', 'High', 'Low', 'Close')}
+
+    for row, (_, df) in enumerate(frames):
+        n = len(df)
+        lengths[row] = n
+        date_col = df['Date']
+        if not pd.api.types.is_datetime64_any_dtype(date_col):
+            date_col = pd.to_datetime(date_col)
+        dates[row, :n] = date_col.to_numpy(dtype='datetime64[ns]')
+        for col, values in arrays.items():
+            values[row, :n] = df[col].to_numpy(dtype=np.float64)
+
+    logger.debug(f"Built panel: {n_symbols} symbols x {n_bars} bars")
+
+    return OHLCPanel(
+        symbols=[symbol for symbol, _ in frames],
+        lengths=lengths,
+        dates=dates,
+        open=arrays['Open'],
+        high=arrays['High'],
+        low=arrays['Low'],
+        close=arrays['Close'],
+    )
+
+
+def panel_atr(panel, period=10):
+    """
+    ATR for every symbol in the panel.
+
+    Args:
+        panel: OHLCPanel
+        period: ATR period
+
+    Returns:
+        numpy.ndarray: (S, T) ATR values
+    """
+    prev_close = np.empty_like(panel.close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = panel.close[:, :-1]
+
+    # fmax ignores NaN like DataFrame.max(axis=1) in indicators.true_range
+    tr = np.fmax(panel.high - panel.low, np.abs(panel.high - prev_close))
+    tr = np.fmax(tr, np.abs(panel.low - prev_close))
+
+    # Rolling along the bar axis: one column per symbol
+    return pd.DataFrame(tr.T).rolling(period).mean().to_numpy().T
+
+
+def panel_supertrend(panel, atr_period=10, multiplier=3.0):
+    """
+    SuperTrend for every symbol in the panel at once.
+
+    Args:
+        panel: OHLCPanel
+        atr_period: Period for ATR calculation
+        multiplier: Multiplier for ATR
+
+    Returns:
+        dict: 'ATR', 'final_ub', 'final_lb', 'ST' and 'ST_dir' arrays of
+            shape (S, T). Values past a row's length are padding.
+    """
+    atr_values = panel_atr(panel, atr_period)
+
+    # Kernel iterates over axis 0, so feed it bars x symbols
+    result = supertrend_columns(panel.high.T, panel.low.T, panel.close.T,
+                                atr_values.T, atr_period, multiplier)
+
+    output = {key: values.T for key, values in result.items()}
+    output['ATR'] = atr_values
+    return output
+
+
+def panel_trade_table(panel, st_dir, include_open=False, sectors=None):
+    """
+    Extract buy/sell pairs from panel directions as a typed trade table.
+
+    All rows are paired in one vectorized pass (see pair_flips).
+
+    Args:
+        panel: OHLCPanel
+        st_dir: (S, T) direction array from panel_supertrend
+        include_open: Include open trades
+        sectors: Optional dict mapping symbol -> sector
+
+    Returns:
+        pandas.DataFrame: Trade table (see scanner.trades)
+    """
+    # Padding past each row's length must never produce a flip
+    valid = np.arange(panel.n_bars) < panel.lengths[:, np.newaxis]
+    st_dir = np.where(valid, st_dir, np.nan)
+
+    rows, buy_idx, sell_idx = pair_flips(st_dir, include_open=include_open)
+    trades_df = build_trades(panel.symbols, panel.dates, panel.close, rows, buy_idx, sell_idx)
+    if sectors is not None:
+        trades_df['sector'] = trades_df['symbol'].map(sectors)
+
+    logger.info(f"Panel: Found {len(trades_df)} trade pairs across {len(panel)} symbols")
+    return trades_df
+
+
+def panel_trades(panel, st_dir, include_open=False, sectors=None):
+    """
+    Extract per-symbol buy/sell pairs from panel directions.
+
+    Args:
+        panel: OHLCPanel
+        st_dir: (S, T) direction array from panel_supertrend
+        include_open: Include open trades
+        sectors: Optional dict mapping symbol -> sector
+
+    Returns:
+        list of dict: Trades in the same format as find_buy_sell_pairs
+    """
+    return trades_to_records(panel_trade_table(panel, st_dir, include_open=include_open, sectors=sectors))
+
+
+def analyze_panel(symbol_data, atr_period=10, multiplier=3.0, include_open=False, sectors=None,
+                  as_frame=False):
+    """
+    Complete panel pipeline: pack, compute SuperTrend, pair signals.
+
+    Args:
+        symbol_data: Iterable of (symbol, DataFrame) pairs
+        atr_period: ATR period for SuperTrend
+        multiplier: Multiplier for SuperTrend
+        include_open: Include open trades
+        sectors: Optional dict mapping symbol -> sector
+        as_frame: Return a typed trade table instead of dicts
+
+    Returns:
+        list of dict (or pandas.DataFrame with as_frame): Trades for all symbols
+    """
+    panel = build_panel(symbol_data)
+    if len(panel) == 0:
+        return concat_trades([]) if as_frame else []
+
+    result = panel_supertrend(panel, atr_period=atr_period, multiplier=multiplier)
+    trades_df = panel_trade_table(panel, result['ST_dir'], include_open=include_open, sectors=sectors)
+
+    logger.info(f"Panel analysis: {len(panel)} symbols, {len(trades_df)} trades")
+    if as_frame:
+        return as_trade_frame(trades_df)
+    return trades_to_records(trades_df)
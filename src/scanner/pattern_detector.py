@@ -16,244 +16,185 @@ Each pattern returns:
 - Stop loss
 - Target 1 & 2
 - Expected holding period
+
+The scan_* functions evaluate every window of a symbol's history at once
+(rolling highs, lows, ranges and volume means over strided windows) and
+return all occurrences; the detect_* functions are the latest bar of a scan.
 """
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bars of history the latest-bar detectors need
+NARROW_RANGE_LOOKBACK = 10
 
-def detect_bull_flag(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+# Window ends per kernel call; bounds the (ends x candidates x bars) matrices
+SCAN_BLOCK = 16384
+
+
+def _ohlcv(df: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+    return tuple(df[col].to_numpy(dtype=np.float64) for col in ('High', 'Low', 'Close', 'Volume'))
+
+
+def _rolling(values: np.ndarray, width: int, func, at) -> np.ndarray:
+    """func over the `width` values starting at each position in `at` (any shape)."""
+    return func(sliding_window_view(values, width)[at], axis=-1)
+
+
+def _bull_flags(high, low, close, volume, ends, lookback):
     """
-    Detect Bull Flag pattern
-    
-    Characteristics:
-    - Strong upward move (pole): 5-15% gain in 3-5 days
-    - Consolidation (flag): 2-5% range for 3-7 days
-    - Decreasing volume during consolidation
-    - Breakout above flag resistance with volume
+    Bull Flag kernel: which window ends complete a flag, and its fields
     
-    Returns pattern details or None
+    Each window's candidate poles are evaluated at once as an (ends x pole
+    offsets) matrix; as in a left-to-right search, the earliest valid pole
+    in the window is reported.
     """
-    if len(df) < lookback:
-        return None
+    n_offsets = lookback - 10
+    if n_offsets <= 0:
+        return ends[:0], {}
     
-    recent = df.tail(lookback).copy()
-    recent = recent.reset_index(drop=True)
+    offsets = np.arange(n_offsets)
+    pole_start = ends[:, np.newaxis] - (lookback - 1) + offsets
     
-    # Look for the pole (strong move up)
-    # Check last 10 days for a 5-15% rally
-    for pole_start in range(0, len(recent) - 10):
-        pole_end = pole_start + 5
-        if pole_end >= len(recent):
-            continue
-        
-        pole_gain = ((recent.loc[pole_end, 'Close'] - recent.loc[pole_start, 'Low']) / 
-                     recent.loc[pole_start, 'Low']) * 100
-        
-        # Valid pole: 5-15% gain
-        if pole_gain < 5 or pole_gain > 20:
-            continue
-        
-        # Look for consolidation flag after pole
-        flag_start = pole_end
-        flag_end = min(flag_start + 7, len(recent) - 1)
-        
-        if flag_end - flag_start < 3:
-            continue
-        
-        flag_data = recent.loc[flag_start:flag_end]
-        flag_high = flag_data['High'].max()
-        flag_low = flag_data['Low'].min()
-        flag_range = ((flag_high - flag_low) / flag_low) * 100
-        
-        # Valid flag: 2-8% range
-        if flag_range < 2 or flag_range > 8:
-            continue
-        
-        # Check volume decrease during flag
-        pole_avg_volume = recent.loc[pole_start:pole_end, 'Volume'].mean()
-        flag_avg_volume = flag_data['Volume'].mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pole_gain = (close[pole_start + 5] - low[pole_start]) / low[pole_start] * 100
+        pole_volume = _rolling(volume, 6, np.mean, pole_start)
         
-        if flag_avg_volume > pole_avg_volume * 0.8:  # Should be lower volume
-            continue
-        
-        # Current price near flag resistance
-        current_price = recent.iloc[-1]['Close']
-        resistance = flag_high
-        
-        # Check if we're within 2% of breakout
-        distance_to_breakout = ((resistance - current_price) / current_price) * 100
-        
-        if distance_to_breakout < -1 or distance_to_breakout > 3:
-            continue
-        
-        # Calculate stops and targets
-        stop_loss = flag_low * 0.985  # Just below flag low
-        target_1 = resistance + (resistance - flag_low)  # Pole height projection
-        target_2 = resistance + 1.5 * (resistance - flag_low)  # Extended target
+        # Flags run from the pole's last bar for up to 8 bars, cut at the window end
+        flag_length = np.minimum(8, lookback - offsets - 5)
+        flag_high = np.empty(pole_start.shape)
+        flag_low = np.empty(pole_start.shape)
+        flag_volume = np.empty(pole_start.shape)
+        for length in np.unique(flag_length):
+            cols = flag_length == length
+            flag_start = pole_start[:, cols] + 5
+            flag_high[:, cols] = _rolling(high, length, np.max, flag_start)
+            flag_low[:, cols] = _rolling(low, length, np.min, flag_start)
+            flag_volume[:, cols] = _rolling(volume, length, np.mean, flag_start)
         
-        return {
-            'pattern': 'Bull Flag',
-            'confidence': 75,
-            'pole_gain': pole_gain,
-            'flag_range': flag_range,
-            'resistance': resistance,
-            'support': flag_low,
-            'entry_price': resistance * 1.005,  # 0.5% above resistance
-            'stop_loss': stop_loss,
-            'target_1': target_1,
-            'target_2': target_2,
-            'risk_reward': (target_1 - resistance * 1.005) / (resistance * 1.005 - stop_loss),
-            'holding_period': '1-3 days',
-            'volume_trend': 'Decreasing (bullish)'
-        }
-    
-    return None
+        flag_range = (flag_high - flag_low) / flag_low * 100
+        current = close[ends][:, np.newaxis]
+        distance_to_breakout = (flag_high - current) / current * 100
+    
+    valid = (~((pole_gain < 5) | (pole_gain > 20)) &
+             ~((flag_range < 2) | (flag_range > 8)) &
+             ~(flag_volume > pole_volume * 0.8) &
+             ~((distance_to_breakout < -1) | (distance_to_breakout > 3)))
+    
+    rows = np.flatnonzero(valid.any(axis=1))
+    first = valid[rows].argmax(axis=1)
+    resistance = flag_high[rows, first]
+    support = flag_low[rows, first]
+    entry_price = resistance * 1.005
+    stop_loss = support * 0.985
+    target_1 = resistance + (resistance - support)
+    
+    return ends[rows], {
+        'pattern': 'Bull Flag',
+        'confidence': 75,
+        'pole_gain': pole_gain[rows, first],
+        'flag_range': flag_range[rows, first],
+        'resistance': resistance,
+        'support': support,
+        'entry_price': entry_price,
+        'stop_loss': stop_loss,
+        'target_1': target_1,
+        'target_2': resistance + 1.5 * (resistance - support),
+        'risk_reward': (target_1 - entry_price) / (entry_price - stop_loss),
+        'holding_period': '1-3 days',
+        'volume_trend': 'Decreasing (bullish)'
+    }
 
 
-def detect_ascending_triangle(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+def _ascending_triangles(high, low, close, volume, ends, lookback):
     """
-    Detect Ascending Triangle pattern
+    Ascending Triangle kernel: which window ends close near a triangle's resistance
     
-    Characteristics:
-    - Horizontal resistance (price touches 2-3 times)
-    - Rising support (higher lows)
-    - Decreasing volume
-    - Breakout above resistance with volume surge
-    
-    Returns pattern details or None
+    Touch counts for every window are one (ends x candidates x bars)
+    comparison.
     """
-    if len(df) < lookback:
-        return None
-    
-    recent = df.tail(lookback).copy()
-    recent = recent.reset_index(drop=True)
-    
-    # Identify resistance (horizontal line at highs)
-    highs = recent['High'].values
-    
-    # Find potential resistance level (recurring high)
-    resistance_candidates = []
-    for i in range(len(recent) - 3):
-        high = recent.loc[i, 'High']
-        # Count how many times price touched this level (±1%)
-        touches = sum(abs(h - high) / high < 0.01 for h in highs[i:])
-        if touches >= 2:
-            resistance_candidates.append((high, touches))
-    
-    if not resistance_candidates:
-        return None
-    
-    # Take the most-touched resistance
-    resistance = max(resistance_candidates, key=lambda x: x[1])[0]
-    
-    # Check for rising lows
-    lows = recent['Low'].tail(10).values
-    if len(lows) < 5:
-        return None
-    
-    # Simple check: are lows trending up?
-    low_trend = np.polyfit(range(len(lows)), lows, 1)[0]
-    
-    if low_trend <= 0:  # Not ascending
-        return None
-    
-    # Find the lowest point in pattern for support
-    support = recent.tail(10)['Low'].min()
-    
-    # Current price
-    current_price = recent.iloc[-1]['Close']
-    
-    # Check if near breakout
-    distance_to_breakout = ((resistance - current_price) / current_price) * 100
-    
-    if distance_to_breakout < -1 or distance_to_breakout > 3:
-        return None
-    
-    # Calculate targets
+    n_lows = min(10, lookback)
+    if lookback <= 3 or n_lows < 5:
+        return ends[:0], {}
+    
+    windows = sliding_window_view(high, lookback)[ends - (lookback - 1)]
+    candidates = windows[:, :lookback - 3]
+    
+    # touches[w, i]: highs from candidate i to the window end within 1% of it
+    later = np.arange(lookback)[np.newaxis, :] >= np.arange(lookback - 3)[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        near = np.abs(windows[:, np.newaxis, :] - candidates[:, :, np.newaxis]) / candidates[:, :, np.newaxis] < 0.01
+    touches = (near & later).sum(axis=2)
+    best = touches.argmax(axis=1)
+    resistance = candidates[np.arange(len(ends)), best]
+    
+    # Least-squares slope and minimum of the last n_lows lows
+    x = np.arange(n_lows) - (n_lows - 1) / 2
+    low_windows = sliding_window_view(low, n_lows)[ends - (n_lows - 1)]
+    low_trend = low_windows @ x / (x @ x)
+    support = low_windows.min(axis=1)
+    
+    current = close[ends]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance_to_breakout = (resistance - current) / current * 100
+    
+    valid = ((touches.max(axis=1) >= 2) & ~(low_trend <= 0) &
+             ~((distance_to_breakout < -1) | (distance_to_breakout > 3)))
+    
+    resistance, support = resistance[valid], support[valid]
     triangle_height = resistance - support
+    entry_price = resistance * 1.005
     stop_loss = support * 0.98
     target_1 = resistance + triangle_height
-    target_2 = resistance + 1.5 * triangle_height
     
-    return {
+    return ends[valid], {
         'pattern': 'Ascending Triangle',
         'confidence': 70,
         'resistance': resistance,
         'support': support,
         'triangle_height': triangle_height,
-        'entry_price': resistance * 1.005,
+        'entry_price': entry_price,
         'stop_loss': stop_loss,
         'target_1': target_1,
-        'target_2': target_2,
-        'risk_reward': (target_1 - resistance * 1.005) / (resistance * 1.005 - stop_loss),
+        'target_2': resistance + 1.5 * triangle_height,
+        'risk_reward': (target_1 - entry_price) / (entry_price - stop_loss),
         'holding_period': '1-3 days',
         'volume_trend': 'Decreasing (awaiting breakout)'
     }
 
 
-def detect_narrow_range(df: pd.DataFrame) -> Optional[Dict]:
-    """
-    Detect Narrow Range (NR4, NR7) patterns
-    
-    NR4: Today's range is smallest of last 4 days
-    NR7: Today's range is smallest of last 7 days
-    
-    Indicates contraction before expansion (breakout)
-    
-    Returns pattern details or None
-    """
-    if len(df) < 10:
-        return None
-    
-    recent = df.tail(10).copy()
-    recent['Range'] = recent['High'] - recent['Low']
-    recent['Range_Pct'] = (recent['Range'] / recent['Low']) * 100
-    
-    today = recent.iloc[-1]
-    today_range = today['Range_Pct']
-    
-    # Check NR7
-    last_7_ranges = recent.tail(7)['Range_Pct'].values
-    is_nr7 = today_range == min(last_7_ranges)
-    
-    # Check NR4
-    last_4_ranges = recent.tail(4)['Range_Pct'].values
-    is_nr4 = today_range == min(last_4_ranges)
-    
-    if not (is_nr4 or is_nr7):
-        return None
-    
-    # Calculate average range for targets
-    avg_range = recent.tail(10)['Range'].mean()
-    avg_range_pct = recent.tail(10)['Range_Pct'].mean()
-    
-    current_price = today['Close']
-    
-    # For NR patterns, we expect breakout in either direction
-    # For BTST, we look for bullish signals (covered by other confirmations)
-    
-    # Assume bullish breakout
-    resistance = today['High']
-    support = today['Low']
-    
-    entry_price = resistance * 1.003  # Just above today's high
-    stop_loss = support * 0.995  # Just below today's low
-    
-    # Target based on average range expansion
+def _narrow_ranges(high, low, close, volume, ends, lookback):
+    """NR4/NR7 kernel: which bars have the smallest range % of the last 4/7 bars."""
+    start = ends - (NARROW_RANGE_LOOKBACK - 1)
+    window_low = sliding_window_view(low, NARROW_RANGE_LOOKBACK)[start]
+    day_range = sliding_window_view(high, NARROW_RANGE_LOOKBACK)[start] - window_low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        range_pct = day_range / window_low * 100
+    
+    today_range = range_pct[:, -1]
+    is_nr7 = today_range == range_pct[:, -7:].min(axis=1)
+    is_nr4 = today_range == range_pct[:, -4:].min(axis=1)
+    valid = is_nr4 | is_nr7
+    
+    ends, today_range, is_nr7 = ends[valid], today_range[valid], is_nr7[valid]
+    avg_range = day_range[valid].mean(axis=1)
+    avg_range_pct = range_pct[valid].mean(axis=1)
+    
+    # Assume bullish breakout above the bar's high
+    resistance = high[ends]
+    support = low[ends]
+    entry_price = resistance * 1.003
+    stop_loss = support * 0.995
     target_1 = entry_price + avg_range * 1.5
-    target_2 = entry_price + avg_range * 2.5
-    
-    pattern_type = 'NR7' if is_nr7 else 'NR4'
-    confidence = 80 if is_nr7 else 70
     
-    return {
-        'pattern': pattern_type,
-        'confidence': confidence,
+    return ends, {
+        'pattern': np.where(is_nr7, 'NR7', 'NR4'),
+        'confidence': np.where(is_nr7, 80, 70),
         'today_range_pct': today_range,
         'avg_range_pct': avg_range_pct,
         'contraction_ratio': today_range / avg_range_pct,
@@ -262,88 +203,293 @@ def detect_narrow_range(df: pd.DataFrame) -> Optional[Dict]:
         'entry_price': entry_price,
         'stop_loss': stop_loss,
         'target_1': target_1,
-        'target_2': target_2,
+        'target_2': entry_price + avg_range * 2.5,
         'risk_reward': (target_1 - entry_price) / (entry_price - stop_loss),
         'holding_period': '1-2 days',
         'volume_trend': 'Watch for surge on breakout'
     }
 
 
-def detect_volume_breakout(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+def _volume_breakouts(high, low, close, volume, ends, lookback):
+    """Volume Surge Breakout kernel: which bars break out on 2X+ volume."""
+    if lookback < 2:
+        return ends[:0], {}
+    
+    prior = ends - (lookback - 1)
+    avg_volume = _rolling(volume, lookback - 1, np.mean, prior)
+    recent_high = _rolling(high, lookback - 1, np.max, prior)
+    current = close[ends]
+    day_range = high[ends] - low[ends]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = volume[ends] / avg_volume
+        distance_from_high = (recent_high - current) / current * 100
+        close_position = (current - low[ends]) / day_range
+    
+    valid = (~(volume_ratio < 2.0) & ~(distance_from_high > 3) & (day_range != 0) &
+             ~(close_position < 0.7))
+    
+    ends = ends[valid]
+    volume_ratio = volume_ratio[valid]
+    resistance = np.maximum(high[ends], recent_high[valid])
+    entry_price = resistance * 1.003
+    stop_loss = close[ends] * 0.985
+    target_1 = entry_price * 1.025
+    
+    return ends, {
+        'pattern': 'Volume Breakout',
+        'confidence': 85,
+        'volume_ratio': volume_ratio,
+        'close_position': close_position[valid],
+        'distance_from_high': distance_from_high[valid],
+        'resistance': resistance,
+        'support': _rolling(low, 5, np.min, ends - 4),
+        'entry_price': entry_price,
+        'stop_loss': stop_loss,
+        'target_1': target_1,
+        'target_2': entry_price * 1.04,
+        'risk_reward': (target_1 - entry_price) / (entry_price - stop_loss),
+        'holding_period': '1-2 days',
+        'volume_trend': [f'{ratio:.1f}X average (STRONG!)' for ratio in volume_ratio]
+    }
+
+
+def _kernels(lookback: int) -> list:
+    """(kernel, bars of history it needs) for every pattern, in detect_all_patterns order."""
+    return [
+        (_bull_flags, lookback),
+        (_ascending_triangles, lookback),
+        (_narrow_ranges, NARROW_RANGE_LOOKBACK),
+        (_volume_breakouts, lookback),
+    ]
+
+
+def _window_ends(starts: np.ndarray, lengths: np.ndarray, history: int, latest_only: bool) -> np.ndarray:
+    """Positions in the concatenated bars whose `history`-bar window lies within one series."""
+    if latest_only:
+        return (starts + lengths - 1)[lengths >= history]
+    counts = np.maximum(lengths - history + 1, 0)
+    first = np.repeat(starts + history - 1, counts)
+    return first + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _scan(frames: list, lookback: int, latest_only: bool = False, kernels=None) -> pd.DataFrame:
     """
-    Detect Volume Surge Breakout
+    Run pattern kernels over many series at once
     
-    Characteristics:
-    - Price near recent high
-    - Volume 2X+ average
-    - Strong close (in upper 25% of day's range)
+    The series are concatenated and every kernel runs once over all of
+    them, evaluating only windows that lie within a single series.
     
-    Returns pattern details or None
+    Returns DataFrame of occurrences with a 'series' column (position in frames)
     """
-    if len(df) < lookback:
+    empty = pd.DataFrame(columns=['series', 'bar', 'date', 'pattern', 'confidence'])
+    if not frames:
+        return empty
+    
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    columns = [np.concatenate(arrays) for arrays in zip(*(_ohlcv(df) for df in frames))]
+    dates = np.concatenate([df['Date'].to_numpy() if 'Date' in df.columns else df.index.to_numpy()
+                            for df in frames])
+    
+    results = []
+    for kernel, history in (kernels or _kernels(lookback)):
+        ends = _window_ends(starts, lengths, history, latest_only)
+        if len(ends) == 0:
+            continue
+        for block in range(0, len(ends), SCAN_BLOCK):
+            hits, fields = kernel(*columns, ends[block:block + SCAN_BLOCK], lookback)
+            if len(hits) == 0:
+                continue
+            series = np.searchsorted(starts, hits, side='right') - 1
+            results.append(pd.DataFrame({'series': series, 'bar': hits - starts[series], 'date': dates[hits],
+                                         **fields}))
+    
+    if not results:
+        return empty
+    occurrences = pd.concat(results, ignore_index=True)
+    return occurrences.sort_values(['series', 'bar', 'confidence'], ascending=[True, True, False],
+                                   kind='stable', ignore_index=True)
+
+
+def _scan_one(df: pd.DataFrame, kernel, history: int, lookback: int) -> pd.DataFrame:
+    return _scan([df], lookback, kernels=[(kernel, history)]).drop(columns='series')
+
+
+def _latest(occurrences: pd.DataFrame, n_bars: int) -> Optional[Dict]:
+    """The occurrence on the last bar as a detect_* dict, or None."""
+    latest = occurrences[occurrences['bar'] == n_bars - 1]
+    if latest.empty:
         return None
+    return latest.drop(columns=['bar', 'date']).to_dict('records')[0]
+
+
+def scan_bull_flags(df: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """
+    Every bar where a Bull Flag completes within the preceding `lookback` bars
+    
+    Characteristics:
+    - Strong upward move (pole): 5-20% from a bar's low to the close 5 bars later
+    - Consolidation (flag): 2-8% range over the following (up to 8) bars
+    - Flag volume below 80% of pole volume
+    - Close within -1%..3% of flag resistance
+    
+    Returns DataFrame of occurrences (bar, date and detect_bull_flag's fields)
+    """
+    return _scan_one(df, _bull_flags, lookback, lookback)
+
+
+def scan_ascending_triangles(df: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """
+    Every bar ending an Ascending Triangle over the preceding `lookback` bars
     
-    recent = df.tail(lookback).copy()
-    today = recent.iloc[-1]
+    Characteristics:
+    - Horizontal resistance: the high (of all but the last 3 bars) touched
+      most often, within 1%, by itself and later highs; at least twice
+    - Rising support: positive least-squares slope of the last 10 lows
+    - Close within -1%..3% of resistance
     
-    # Calculate average volume (exclude today)
-    avg_volume = recent.iloc[:-1]['Volume'].mean()
-    today_volume = today['Volume']
+    Returns DataFrame of occurrences (bar, date and detect_ascending_triangle's fields)
+    """
+    return _scan_one(df, _ascending_triangles, lookback, lookback)
+
+
+def scan_narrow_ranges(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Every NR4/NR7 bar (with at least 10 bars of history)
     
-    volume_ratio = today_volume / avg_volume
+    NR4: The bar's range % is the smallest of the last 4 bars
+    NR7: The bar's range % is the smallest of the last 7 bars
     
-    # Need 2X+ volume
-    if volume_ratio < 2.0:
-        return None
+    Returns DataFrame of occurrences (bar, date and detect_narrow_range's fields)
+    """
+    return _scan_one(df, _narrow_ranges, NARROW_RANGE_LOOKBACK, NARROW_RANGE_LOOKBACK)
+
+
+def scan_volume_breakouts(df: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """
+    Every Volume Surge Breakout bar
     
-    # Price should be near recent highs
-    recent_high = recent.iloc[:-1]['High'].max()
-    current_price = today['Close']
+    Characteristics:
+    - Volume 2X+ the mean of the previous lookback-1 bars
+    - Close within 3% of their highest high
+    - Close in the upper 30% of the bar's range
     
-    distance_from_high = ((recent_high - current_price) / current_price) * 100
+    Returns DataFrame of occurrences (bar, date and detect_volume_breakout's fields)
+    """
+    return _scan_one(df, _volume_breakouts, lookback, lookback)
+
+
+def detect_bull_flag(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+    """
+    Detect Bull Flag pattern on the latest bar (see scan_bull_flags)
     
-    # Should be within 3% of recent high
-    if distance_from_high > 3:
+    Returns pattern details or None
+    """
+    if len(df) < lookback:
         return None
+    return _latest(scan_bull_flags(df.tail(lookback), lookback), lookback)
+
+
+def detect_ascending_triangle(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+    """
+    Detect Ascending Triangle pattern on the latest bar (see scan_ascending_triangles)
     
-    # Strong close check
-    day_range = today['High'] - today['Low']
-    if day_range == 0:
+    Returns pattern details or None
+    """
+    if len(df) < lookback:
         return None
+    return _latest(scan_ascending_triangles(df.tail(lookback), lookback), lookback)
+
+
+def detect_narrow_range(df: pd.DataFrame) -> Optional[Dict]:
+    """
+    Detect Narrow Range (NR4, NR7) patterns on the latest bar (see scan_narrow_ranges)
     
-    close_position = (today['Close'] - today['Low']) / day_range
+    Indicates contraction before expansion (breakout)
     
-    # Close should be in upper 30% of range
-    if close_position < 0.7:
+    Returns pattern details or None
+    """
+    if len(df) < NARROW_RANGE_LOOKBACK:
         return None
+    return _latest(scan_narrow_ranges(df.tail(NARROW_RANGE_LOOKBACK)), NARROW_RANGE_LOOKBACK)
+
+
+def detect_volume_breakout(df: pd.DataFrame, lookback: int = 20) -> Optional[Dict]:
+    """
+    Detect Volume Surge Breakout on the latest bar (see scan_volume_breakouts)
     
-    # Calculate stops and targets
-    resistance = max(today['High'], recent_high)
-    support = recent.tail(5)['Low'].min()
+    Returns pattern details or None
+    """
+    if len(df) < lookback:
+        return None
+    return _latest(scan_volume_breakouts(df.tail(lookback), lookback), lookback)
+
+
+def scan_patterns(df: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """
+    Every historical occurrence of every pattern in one symbol's bars
     
-    entry_price = resistance * 1.003
-    stop_loss = current_price * 0.985  # 1.5% stop
+    Returns DataFrame of occurrences ordered by bar, then confidence
+    """
+    return _scan([df], lookback).drop(columns='series')
+
+
+def scan_universe(data: Dict[str, pd.DataFrame], lookback: int = 20, latest_only: bool = False) -> pd.DataFrame:
+    """
+    Pattern occurrences across many symbols, in one pass per pattern
     
-    # Conservative targets for volume breakout
-    target_1 = entry_price * 1.025  # 2.5%
-    target_2 = entry_price * 1.04   # 4%
+    Args:
+        data: {symbol: DataFrame with Date/OHLCV columns}
+        lookback: Pattern lookback in bars
+        latest_only: Only patterns on each symbol's last bar (live screening;
+            only the bars the detectors need are read)
     
-    return {
-        'pattern': 'Volume Breakout',
-        'confidence': 85,
-        'volume_ratio': volume_ratio,
-        'close_position': close_position,
-        'distance_from_high': distance_from_high,
-        'resistance': resistance,
-        'support': support,
-        'entry_price': entry_price,
-        'stop_loss': stop_loss,
-        'target_1': target_1,
-        'target_2': target_2,
-        'risk_reward': (target_1 - entry_price) / (entry_price - stop_loss),
-        'holding_period': '1-2 days',
-        'volume_trend': f'{volume_ratio:.1f}X average (STRONG!)'
-    }
+    Returns DataFrame of occurrences with a symbol column
+    """
+    history = max(lookback, NARROW_RANGE_LOOKBACK)
+    symbols = [symbol for symbol, df in data.items() if df is not None and not df.empty]
+    frames = [data[symbol].tail(history) if latest_only else data[symbol] for symbol in symbols]
+    
+    occurrences = _scan(frames, lookback, latest_only=latest_only)
+    symbol = np.asarray(symbols, dtype=object)[occurrences['series'].to_numpy(dtype=np.int64)]
+    occurrences.insert(0, 'symbol', symbol)
+    return occurrences.drop(columns='series')
+
+
+def label_outcomes(occurrences: pd.DataFrame, df: pd.DataFrame, horizon: int = 3) -> pd.DataFrame:
+    """
+    Forward outcomes of one symbol's occurrences, for hit-rate studies
+    
+    Adds, over the `horizon` bars after each occurrence:
+    - hit_target_1: some high reached target_1
+    - hit_stop: some low reached stop_loss
+    - forward_return: % change of the close
+    - complete: the full horizon is in the data (otherwise the above are
+      NaN/False)
+    
+    Returns a copy of occurrences with the outcome columns
+    """
+    high, low, close, _ = _ohlcv(df)
+    n = len(df)
+    bars = occurrences['bar'].to_numpy(dtype=np.int64)
+    complete = bars + horizon < n
+    
+    forward_high = np.full(len(bars), np.nan)
+    forward_low = np.full(len(bars), np.nan)
+    forward_return = np.full(len(bars), np.nan)
+    if complete.any():
+        start = bars[complete] + 1
+        forward_high[complete] = _rolling(high, horizon, np.max, start)
+        forward_low[complete] = _rolling(low, horizon, np.min, start)
+        forward_return[complete] = (close[bars[complete] + horizon] / close[bars[complete]] - 1) * 100
+    
+    return occurrences.assign(
+        hit_target_1=forward_high >= occurrences['target_1'].to_numpy(dtype=np.float64),
+        hit_stop=forward_low <= occurrences['stop_loss'].to_numpy(dtype=np.float64),
+        forward_return=forward_return,
+        complete=complete,
+    )
 
 
 def detect_all_patterns(df: pd.DataFrame) -> list:
@@ -0,0 +1,242 @@
+"""Stage-level profiling: wall/CPU time, rows and peak RSS per pipeline stage."""
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from .utils import TIMING_LOGGER
+
+logger = logging.getLogger(__name__)
+
+# Structured timing events go to this channel (see utils.setup_logging)
+timing_logger = logging.getLogger(TIMING_LOGGER)
+
+PERCENTILES = (50, 90, 99)
+
+_active = None
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StageTimer:
+    """Handle yielded by stage(); set .rows once the count is known."""
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+
+class Profiler:
+    """
+    Aggregates stage timings by call stack.
+
+    Stages nest per thread, so a 'supertrend' stage inside 'analyze_shard'
+    is recorded under the stack ('analyze', 'analyze_shard', 'supertrend').
+    Per-symbol durations are kept per stage for percentiles. Records from
+    worker processes are merged in with merge().
+    """
+
+    def __init__(self):
+        self.stacks = {}   # stack tuple -> [calls, wall, cpu, rows, peak_rss_mb]
+        self.symbols = {}  # stage -> list of per-symbol wall seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = ()
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, rows=None, symbol=None):
+        parent = self._stack()
+        stack = parent + (name,)
+        self._local.stack = stack
+        timer = StageTimer(rows)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield timer
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            self._local.stack = parent
+            self.add(stack, wall, cpu, timer.rows, _peak_rss_mb(), symbol=symbol)
+            timing_logger.debug(f"{'/'.join(stack)} {wall:.4f}s", extra={'timing': {
+                'stage': '/'.join(stack), 'symbol': symbol, 'wall_s': wall, 'cpu_s': cpu,
+                'rows': timer.rows, 'pid': os.getpid(),
+            }})
+
+    def run_under(self, stack, func, *args, **kwargs):
+        """Call func on this thread with its stages nested under stack."""
+        saved = self._stack()
+        self._local.stack = tuple(stack)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.stack = saved
+
+    def current_stack(self):
+        return self._stack()
+
+    def add(self, stack, wall, cpu, rows=None, peak_rss_mb=0.0, calls=1, symbol=None):
+        with self._lock:
+            entry = self.stacks.setdefault(tuple(stack), [0, 0.0, 0.0, 0, 0.0])
+            entry[0] += calls
+            entry[1] += wall
+            entry[2] += cpu
+            entry[3] += rows or 0
+            entry[4] = max(entry[4], peak_rss_mb)
+            if symbol is not None:
+                self.symbols.setdefault(stack[-1], []).append(wall)
+
+    def records(self):
+        """Picklable snapshot for shipping from a worker process."""
+        with self._lock:
+            return {'stacks': {stack: list(v) for stack, v in self.stacks.items()},
+                    'symbols': {name: list(v) for name, v in self.symbols.items()}}
+
+    def merge(self, records, prefix=()):
+        """
+        Fold a worker's records in, nested under prefix.
+
+        Args:
+            records: Output of Profiler.records()
+            prefix: Stack the worker's stages ran under
+        """
+        with self._lock:
+            for stack, (calls, wall, cpu, rows, peak) in records['stacks'].items():
+                entry = self.stacks.setdefault(tuple(prefix) + tuple(stack), [0, 0.0, 0.0, 0, 0.0])
+                entry[0] += calls
+                entry[1] += wall
+                entry[2] += cpu
+                entry[3] += rows
+                entry[4] = max(entry[4], peak)
+            for name, durations in records['symbols'].items():
+                self.symbols.setdefault(name, []).extend(durations)
+
+    def report(self):
+        """
+        Profile as a JSON-serialisable dict.
+
+        Returns:
+            dict: total wall time, peak RSS, per-stage totals (by stack) and
+                per-symbol percentiles (per stage)
+        """
+        stages = [
+            {
+                'stage': '/'.join(stack),
+                'calls': calls,
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'rows': rows,
+                'rows_per_s': round(rows / wall, 1) if rows and wall > 0 else None,
+                'peak_rss_mb': round(peak, 1),
+            }
+            for stack, (calls, wall, cpu, rows, peak) in sorted(self.stacks.items())
+        ]
+        per_symbol = {}
+        for name, durations in sorted(self.symbols.items()):
+            values = np.array(durations) * 1000
+            per_symbol[name] = {
+                'symbols': len(values),
+                **{f'p{p}_ms': round(float(np.percentile(values, p)), 3) for p in PERCENTILES},
+                'max_ms': round(float(values.max()), 3),
+            }
+        return {
+            'wall_s': round(time.perf_counter() - self.started, 6),
+            'peak_rss_mb': round(max([_peak_rss_mb()] + [s['peak_rss_mb'] for s in stages]), 1),
+            'stages': stages,
+            'per_symbol': per_symbol,
+        }
+
+    def folded(self):
+        """
+        Stacks in the folded format read by flamegraph.pl and speedscope.
+
+        Values are self wall time in microseconds (a stage's time minus its
+        children's), one 'a;b;c value' line per stack.
+        """
+        child_wall = {}
+        for stack, entry in self.stacks.items():
+            if len(stack) > 1:
+                child_wall[stack[:-1]] = child_wall.get(stack[:-1], 0.0) + entry[1]
+
+        lines = []
+        for stack, entry in sorted(self.stacks.items()):
+            self_time = max(entry[1] - child_wall.get(stack, 0.0), 0.0)
+            lines.append(f"{';'.join(stack)} {int(self_time * 1e6)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write <path> (JSON report) and <path>.folded (flamegraph stacks).
+
+        Returns:
+            tuple: (json path, folded path)
+        """
+        folded_path = f"{path}.folded"
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        with open(folded_path, 'w') as f:
+            f.write(self.folded())
+        return str(path), folded_path
+
+
+def enable():
+    """Start collecting into a fresh process-wide profiler."""
+    global _active
+    _active = Profiler()
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def active():
+    """The process-wide profiler, or None when profiling is off."""
+    return _active
+
+
+@contextmanager
+def stage(name, rows=None, symbol=None):
+    """
+    Time a stage (no-op when profiling is off).
+
+    Args:
+        name: Stage name
+        rows: Rows processed (or set .rows on the yielded timer)
+        symbol: Symbol, to include the duration in per-symbol percentiles
+    """
+    profiler = _active
+    if profiler is None:
+        yield StageTimer(rows)
+        return
+    with profiler.stage(name, rows=rows, symbol=symbol) as timer:
+        yield timer
+
+
+def call_profiled(func, *args, **kwargs):
+    """
+    Run func in a worker process under its own profiler.
+
+    Returns:
+        tuple: (result, profiler records)
+    """
+    global _active
+    _active = Profiler()
+    try:
+        return func(*args, **kwargs), _active.records()
+    finally:
+        _active = None
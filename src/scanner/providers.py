@@ -0,0 +1,152 @@
+"""Pluggable OHLCV download providers."""
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import pandas as pd
+
+from .market_store import MarketDataStore
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def split_wide_frame(wide, symbols):
+    """
+    Split a multi-ticker download into per-symbol OHLCV frames.
+
+    Args:
+        wide: DataFrame indexed by date with (ticker, field) column MultiIndex,
+            or plain OHLCV columns when a single symbol was requested
+        symbols: Requested symbols
+
+    Returns:
+        dict: {symbol: DataFrame} with [Date, Open, High, Low, Close, Volume],
+            symbols without any bars are omitted
+    """
+    frames = {}
+    if wide is None or wide.empty:
+        return frames
+
+    for symbol in symbols:
+        if isinstance(wide.columns, pd.MultiIndex):
+            if symbol not in wide.columns.get_level_values(0):
+                continue
+            df = wide[symbol]
+        elif len(symbols) == 1:
+            df = wide
+        else:
+            break
+
+        df = df.dropna(subset=['Open', 'High', 'Low', 'Close'], how='any')
+        if df.empty:
+            continue
+
+        df = df.rename_axis('Date').reset_index()
+        if 'Datetime' in df.columns:
+            df = df.rename(columns={'Datetime': 'Date'})
+        frames[symbol] = df[[col for col in OHLCV_COLUMNS if col in df.columns]]
+
+    return frames
+
+
+class DataProvider(ABC):
+    """
+    Source of OHLCV bars for many symbols per request.
+
+    Implementations take a chunk of symbols and return one frame per symbol
+    that had data; missing symbols are simply absent from the result.
+    """
+
+    name = "base"
+    host = None  # Concurrency is bounded per host by the fetch scheduler
+
+    @abstractmethod
+    def download(self, symbols: List[str], start_date, end_date, interval: str) -> Dict[str, pd.DataFrame]:
+        """
+        Download bars for several symbols in one request.
+
+        Args:
+            symbols: Symbols to download
+            start_date: Start date (inclusive)
+            end_date: End date (exclusive, as in yfinance)
+            interval: Bar interval ('1wk', '1d', ...)
+
+        Returns:
+            dict: {symbol: DataFrame with OHLCV columns}
+        """
+        pass
+
+
+class YahooProvider(DataProvider):
+    """Yahoo Finance via yf.download (one HTTP batch per chunk)."""
+
+    name = "yahoo"
+    host = "query1.finance.yahoo.com"
+
+    def __init__(self, threads=True):
+        self.threads = threads
+
+    def download(self, symbols, start_date, end_date, interval):
+        import yfinance as yf
+
+        wide = yf.download(
+            tickers=list(symbols),
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=self.threads,
+            progress=False,
+        )
+        return split_wide_frame(wide, list(symbols))
+
+
+class ReplayProvider(DataProvider):
+    """
+    Replays bars from a local market-data store instead of the network.
+
+    Used by tests and benchmarks; every request is recorded in `requests`
+    so callers can assert on batching behaviour.
+    """
+
+    name = "replay"
+    host = "local"
+
+    def __init__(self, root):
+        self.store = MarketDataStore(root)
+        self.requests = []
+
+    def download(self, symbols, start_date, end_date, interval):
+        self.requests.append((list(symbols), start_date, end_date, interval))
+
+        frames = self.store.read_many(symbols, interval, start=start_date, end=end_date)
+        result = {}
+        for symbol, df in frames.items():
+            if end_date is not None:
+                df = df[df['Date'] < pd.Timestamp(end_date)]
+            if not df.empty:
+                result[symbol] = df.reset_index(drop=True)
+        return result
+
+
+def get_provider(name="yahoo", **kwargs):
+    """
+    Build a provider by name.
+
+    Args:
+        name: 'yahoo' or 'replay'
+        **kwargs: Provider constructor arguments (e.g. root for replay)
+
+    Returns:
+        DataProvider
+    """
+    providers = {
+        YahooProvider.name: YahooProvider,
+        ReplayProvider.name: ReplayProvider,
+    }
+    if name not in providers:
+        raise ValueError(f"Unknown data provider '{name}' (choose from {', '.join(providers)})")
+    return providers[name](**kwargs)
@@ -224,7 +224,8 @@ def print_profit_loss_buckets(bucket_stats):
 
 
 def generate_full_report(trades_df, output_dir, prefix="supertrend", 
-                        include_summary=True, include_sector=True, include_buckets=True, top_n=20):
+                        include_summary=True, include_sector=True, include_buckets=True, top_n=20,
+                        group_by=None, bootstrap=0):
     """
     Generate complete report with CSV, JSON, and terminal output.
     
@@ -236,13 +237,20 @@ def generate_full_report(trades_df, output_dir, prefix="supertrend",
         include_sector: Include sector analysis
         include_buckets: Include profit/loss bucket analysis
         top_n: Number of top/bottom performers to show
+        group_by: Group keys for a grouped statistics CSV (see analyser.group_key)
+        bootstrap: Bootstrap resamples for the grouped confidence intervals
         
     Returns:
         dict: Paths to generated files
     """
-    from .analyser import (compute_summary_stats, analyze_by_sector, 
+    from .analyser import (compute_summary_stats, analyze_by_sector, grouped_stats,
                           threshold_analysis, get_top_performers, profit_loss_buckets)
     
+    from .trades import as_trade_frame
+    
+    # Typed tables pass through untouched; dict-built frames are packed once
+    trades_df = as_trade_frame(trades_df)
+    
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -268,6 +276,7 @@ def generate_full_report(trades_df, output_dir, prefix="supertrend",
     if include_buckets and bucket_stats:
         summary_data['bucket_analysis'] = bucket_stats
     
+    sector_stats = {}
     if include_sector and 'sector' in trades_df.columns:
         sector_stats = analyze_by_sector(trades_df)
         summary_data['sector_analysis'] = sector_stats
@@ -275,6 +284,13 @@ def generate_full_report(trades_df, output_dir, prefix="supertrend",
     if write_json(summary_data, summary_json):
         generated_files['summary_json'] = str(summary_json)
     
+    # Grouped statistics
+    if group_by:
+        groups_csv = output_dir / f"{prefix}_groups.csv"
+        grouped = grouped_stats(trades_df, group_by, bootstrap=bootstrap)
+        if write_csv(grouped.reset_index(), groups_csv):
+            generated_files['groups_csv'] = str(groups_csv)
+    
     # Print to terminal
     if include_summary:
         print_summary(stats, threshold_stats)
@@ -292,8 +308,7 @@ def generate_full_report(trades_df, output_dir, prefix="supertrend",
         print_trades_table(bottom_performers, f"Bottom {top_n} Performers", max_rows=top_n)
     
     # Print sector analysis
-    if include_sector and 'sector' in trades_df.columns:
-        sector_stats = analyze_by_sector(trades_df)
+    if sector_stats:
         print_sector_analysis(sector_stats)
     
     return generated_files
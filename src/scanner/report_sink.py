@@ -0,0 +1,429 @@
+"""Streaming report generation: chunked output files and running statistics."""
+import logging
+import math
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .analyser import BUCKET_RANGES as BUCKETS, BUCKET_EDGES
+from .trades import CATEGORICAL_COLUMNS, as_trade_frame
+
+logger = logging.getLogger(__name__)
+
+# Same thresholds as analyser.threshold_analysis
+THRESHOLDS = [5, 10, 15, 20]
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over fixed-width bins.
+
+    Values are counted in bins of `resolution` width, so memory grows with
+    the spread of the data rather than the number of values, and quantiles
+    are exact to within half a bin (0.005 percentage points by default).
+    """
+
+    def __init__(self, resolution=0.01):
+        self.resolution = resolution
+        self.counts = defaultdict(int)
+        self.n = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        bins, counts = np.unique(np.round(values / self.resolution).astype(np.int64), return_counts=True)
+        for b, c in zip(bins.tolist(), counts.tolist()):
+            self.counts[b] += c
+        self.n += len(values)
+
+    def merge(self, other):
+        for b, c in other.counts.items():
+            self.counts[b] += c
+        self.n += other.n
+
+    def quantile(self, q):
+        """Quantile with linear interpolation between order statistics (as pandas)."""
+        if self.n == 0:
+            return float('nan')
+        bins = np.array(sorted(self.counts))
+        cumulative = np.cumsum([self.counts[b] for b in bins])
+
+        position = q * (self.n - 1)
+        lower, upper = math.floor(position), math.ceil(position)
+        lower_value = bins[np.searchsorted(cumulative, lower + 1)] * self.resolution
+        upper_value = bins[np.searchsorted(cumulative, upper + 1)] * self.resolution
+        return lower_value + (upper_value - lower_value) * (position - lower)
+
+
+class _Moments:
+    """Count, mean, M2 and min/max, merged batch by batch (Chan et al.)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, values):
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else float('nan')
+
+
+class RunningTradeStats:
+    """
+    Incremental equivalents of the analyser's summary, threshold, bucket and
+    sector statistics, plus the top/bottom performers.
+
+    Each update folds a chunk of trades into O(1) (per sector) state, so the
+    final report never needs every trade in memory. Medians and quartiles
+    come from QuantileSketch.
+    """
+
+    def __init__(self, top_n=20, resolution=0.01):
+        self.top_n = top_n
+        self.rows = 0
+        self.symbols = set()
+        self.returns = _Moments()
+        self.return_sketch = QuantileSketch(resolution)
+        self.weeks = _Moments()
+        self.weeks_sketch = QuantileSketch(resolution)
+        self.winning = 0
+        self.losing = 0
+        self.profit_buckets = np.zeros(len(BUCKETS), dtype=np.int64)
+        self.loss_buckets = np.zeros(len(BUCKETS), dtype=np.int64)
+        self.within = np.zeros(len(THRESHOLDS), dtype=np.int64)
+        self.sectors = {}
+        self.top = None
+        self.bottom = None
+
+    def update(self, trades_df):
+        """Fold a chunk of trades into the running statistics."""
+        self.rows += len(trades_df)
+        if 'symbol' in trades_df.columns:
+            self.symbols.update(trades_df['symbol'].dropna().unique().tolist())
+
+        returns = trades_df['pct_change'].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(returns)
+        completed = trades_df[valid]
+        returns = returns[valid]
+        if len(returns) == 0:
+            return
+
+        self.returns.update(returns)
+        self.return_sketch.update(returns)
+        self.winning += int((returns > 0).sum())
+        self.losing += int((returns < 0).sum())
+
+        if 'weeks_held' in completed.columns:
+            weeks = completed['weeks_held'].to_numpy(dtype=np.float64, na_value=np.nan)
+            weeks = weeks[~np.isnan(weeks)]
+            self.weeks.update(weeks)
+            self.weeks_sketch.update(weeks)
+
+        abs_returns = np.abs(returns)
+        self.within += (abs_returns[:, np.newaxis] < np.array(THRESHOLDS)).sum(axis=0)
+        bucket = np.searchsorted(BUCKET_EDGES, abs_returns, side='right')
+        self.profit_buckets += np.bincount(bucket[returns > 0], minlength=len(BUCKETS))
+        self.loss_buckets += np.bincount(bucket[returns < 0], minlength=len(BUCKETS))
+
+        if 'sector' in completed.columns:
+            self._update_sectors(completed, returns)
+
+        self.top = self._keep(self.top, completed, largest=True)
+        self.bottom = self._keep(self.bottom, completed, largest=False)
+
+    def _update_sectors(self, completed, returns):
+        sectors = completed['sector'].astype(object).to_numpy()
+        weeks = (completed['weeks_held'].to_numpy(dtype=np.float64, na_value=np.nan)
+                 if 'weeks_held' in completed.columns else None)
+        for sector in pd.unique(sectors[pd.notna(sectors)]):
+            mask = sectors == sector
+            state = self.sectors.setdefault(sector, {
+                'count': 0, 'sum': 0.0, 'wins': 0, 'weeks_sum': 0.0, 'weeks_count': 0,
+                'sketch': QuantileSketch(self.return_sketch.resolution),
+            })
+            sector_returns = returns[mask]
+            state['count'] += len(sector_returns)
+            state['sum'] += sector_returns.sum()
+            state['wins'] += int((sector_returns > 0).sum())
+            state['sketch'].update(sector_returns)
+            if weeks is not None:
+                sector_weeks = weeks[mask]
+                sector_weeks = sector_weeks[~np.isnan(sector_weeks)]
+                state['weeks_sum'] += sector_weeks.sum()
+                state['weeks_count'] += len(sector_weeks)
+
+    def _keep(self, current, chunk, largest):
+        candidates = chunk if current is None else pd.concat([current, chunk], ignore_index=True)
+        if largest:
+            return candidates.nlargest(self.top_n, 'pct_change')
+        return candidates.nsmallest(self.top_n, 'pct_change')
+
+    def summary(self):
+        """Same keys as analyser.compute_summary_stats."""
+        if self.rows == 0:
+            return {'total_trades': 0, 'error': 'No trades found'}
+        n = self.returns.n
+        if n == 0:
+            return {'total_trades': self.rows, 'completed_trades': 0, 'error': 'No completed trades'}
+
+        has_weeks = self.weeks.n > 0
+        return {
+            'total_trades': n,
+            'total_symbols': len(self.symbols),
+            'mean_return': self.returns.mean,
+            'median_return': self.return_sketch.quantile(0.5),
+            'std_return': self.returns.std,
+            'min_return': self.returns.min,
+            'max_return': self.returns.max,
+            'q25_return': self.return_sketch.quantile(0.25),
+            'q75_return': self.return_sketch.quantile(0.75),
+            'winning_trades': self.winning,
+            'losing_trades': self.losing,
+            'win_rate': self.winning / n * 100,
+            'mean_weeks_held': self.weeks.mean if has_weeks else None,
+            'median_weeks_held': self.weeks_sketch.quantile(0.5) if has_weeks else None,
+            'min_weeks_held': self.weeks.min if has_weeks else None,
+            'max_weeks_held': self.weeks.max if has_weeks else None,
+        }
+
+    def threshold_stats(self):
+        """Same layout as analyser.threshold_analysis."""
+        n = self.returns.n
+        if n == 0:
+            return {}
+        return {
+            f'within_{threshold}pct': {'count': int(count), 'percentage': count / n * 100}
+            for threshold, count in zip(THRESHOLDS, self.within)
+        }
+
+    def bucket_stats(self):
+        """Same layout as analyser.profit_loss_buckets."""
+        total = self.returns.n
+        if total == 0:
+            return {}
+        neutral = total - self.winning - self.losing
+        result = {'profit_buckets': {}, 'loss_buckets': {},
+                  'neutral': {'count': neutral, 'percentage': neutral / total * 100}}
+
+        for (label, _, _), count in zip(BUCKETS, self.profit_buckets):
+            result['profit_buckets'][label] = {
+                'count': int(count),
+                'percentage_of_total': count / total * 100,
+                'percentage_of_profits': count / self.winning * 100 if self.winning else 0,
+            }
+        for (label, _, _), count in zip(BUCKETS, self.loss_buckets):
+            result['loss_buckets'][label] = {
+                'count': int(count),
+                'percentage_of_total': count / total * 100,
+                'percentage_of_losses': count / self.losing * 100 if self.losing else 0,
+            }
+
+        result['summary'] = {
+            'total_trades': total,
+            'total_profits': self.winning,
+            'total_losses': self.losing,
+            'total_neutral': neutral,
+            'profit_percentage': self.winning / total * 100,
+            'loss_percentage': self.losing / total * 100,
+        }
+        return result
+
+    def sector_stats(self):
+        """Same layout as analyser.analyze_by_sector."""
+        return {
+            sector: {
+                'total_trades': state['count'],
+                'mean_return': state['sum'] / state['count'],
+                'median_return': state['sketch'].quantile(0.5),
+                'win_rate': state['wins'] / state['count'] * 100,
+                'mean_weeks_held': state['weeks_sum'] / state['weeks_count'] if state['weeks_count'] else None,
+            }
+            for sector, state in self.sectors.items() if state['count'] > 0
+        }
+
+    def progress_line(self):
+        """Short live summary for progress bars."""
+        if self.returns.n == 0:
+            return f"{self.rows} trades"
+        return (f"{self.returns.n} trades, mean {self.returns.mean:+.2f}%, "
+                f"win {self.winning / self.returns.n * 100:.1f}%")
+
+
+class StreamingReportSink:
+    """
+    Report writer fed chunk by chunk.
+
+    Each chunk is appended to the trades CSV and/or Parquet file and folded
+    into RunningTradeStats; close() writes the summary JSON and prints the
+    same terminal report as generate_full_report, without the full trade
+    set ever being held in memory.
+    """
+
+    def __init__(self, output_dir, prefix="supertrend", formats=('csv',), top_n=20, trades_path=None):
+        """
+        Initialize sink
+
+        Args:
+            output_dir: Output directory
+            prefix: Filename prefix
+            formats: Trade file formats to write ('csv', 'parquet')
+            top_n: Number of top/bottom performers to keep
+            trades_path: Explicit trades file path (suffix replaced per format)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.formats = tuple(formats)
+        self.top_n = top_n
+        self.stats = RunningTradeStats(top_n=top_n)
+
+        base = Path(trades_path) if trades_path else self.output_dir / f"{prefix}_trades.csv"
+        self.paths = {fmt: base.with_suffix(f'.{fmt}') for fmt in self.formats}
+        self._csv_header = True
+        self._columns = None
+        self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._close_writers()
+        return False
+
+    def write(self, trades_df):
+        """
+        Append a chunk of trades and update the running statistics.
+
+        Args:
+            trades_df: Trade table chunk
+        """
+        if trades_df is None or len(trades_df) == 0:
+            return
+        trades_df = as_trade_frame(trades_df)
+
+        # Every chunk is written with the first chunk's columns
+        if self._columns is None:
+            self._columns = list(trades_df.columns)
+        trades_df = trades_df.reindex(columns=self._columns)
+
+        if 'csv' in self.formats:
+            trades_df.to_csv(self.paths['csv'], mode='w' if self._csv_header else 'a',
+                             header=self._csv_header, index=False)
+            self._csv_header = False
+
+        if 'parquet' in self.formats:
+            # Categoricals are written as plain strings so chunks with
+            # different categories share one schema
+            plain = trades_df.astype({col: object for col in CATEGORICAL_COLUMNS if col in trades_df.columns})
+            table = pa.Table.from_pandas(plain, preserve_index=False)
+            if self._parquet is None:
+                schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ]).remove_metadata()
+                self._parquet = pq.ParquetWriter(self.paths['parquet'], schema, compression='zstd')
+            self._parquet.write_table(table.cast(self._parquet.schema))
+
+        self.stats.update(trades_df)
+
+    def _close_writers(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def close(self, include_summary=True, include_sector=True, include_buckets=True, echo=True):
+        """
+        Finish the trade files and write/print the summary.
+
+        Args:
+            include_summary: Print summary statistics
+            include_sector: Include sector analysis
+            include_buckets: Include profit/loss bucket analysis
+            echo: Print the terminal report
+
+        Returns:
+            dict: Paths to generated files
+        """
+        from .report import (write_json, print_summary, print_profit_loss_buckets,
+                             print_trades_table, print_sector_analysis)
+
+        self._close_writers()
+        generated_files = {f'trades_{fmt}': str(path) for fmt, path in self.paths.items()
+                           if path.exists()}
+
+        stats = self.stats.summary()
+        threshold_stats = self.stats.threshold_stats()
+        bucket_stats = self.stats.bucket_stats() if include_buckets else {}
+        sector_stats = self.stats.sector_stats() if include_sector else {}
+
+        summary_data = {'statistics': stats, 'threshold_analysis': threshold_stats}
+        if include_buckets and bucket_stats:
+            summary_data['bucket_analysis'] = bucket_stats
+        if include_sector and sector_stats:
+            summary_data['sector_analysis'] = sector_stats
+
+        summary_json = self.output_dir / f"{self.prefix}_summary.json"
+        if write_json(summary_data, summary_json):
+            generated_files['summary_json'] = str(summary_json)
+
+        if echo:
+            if include_summary:
+                print_summary(stats, threshold_stats)
+            if include_buckets and bucket_stats:
+                print_profit_loss_buckets(bucket_stats)
+            if self.stats.top is not None:
+                print_trades_table(self.stats.top, f"Top {self.top_n} Performers", max_rows=self.top_n)
+                print_trades_table(self.stats.bottom, f"Bottom {self.top_n} Performers", max_rows=self.top_n)
+            if include_sector and sector_stats:
+                print_sector_analysis(sector_stats)
+
+        logger.info(f"Streamed {self.stats.rows} trades to {', '.join(map(str, self.paths.values()))}")
+        return generated_files
+
+
+def stream_report_from_csv(input_file, output_dir, prefix="report", chunksize=100_000,
+                           include_summary=True, include_sector=True, include_buckets=True, top_n=20):
+    """
+    generate_full_report() for a trades CSV read in chunks.
+
+    Args:
+        input_file: Trades CSV
+        output_dir: Output directory
+        prefix: Filename prefix
+        chunksize: Rows per chunk
+        include_summary: Print summary statistics
+        include_sector: Include sector analysis
+        include_buckets: Include profit/loss bucket analysis
+        top_n: Number of top/bottom performers to show
+
+    Returns:
+        dict: Paths to generated files
+    """
+    with StreamingReportSink(output_dir, prefix=prefix, top_n=top_n) as sink:
+        for chunk in pd.read_csv(input_file, parse_dates=['buy_date', 'sell_date'], chunksize=chunksize):
+            sink.write(chunk)
+        return sink.close(include_summary=include_summary, include_sector=include_sector,
+                          include_buckets=include_buckets)
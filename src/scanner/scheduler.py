@@ -0,0 +1,275 @@
+"""Asynchronous, rate-limited scheduler for batched OHLCV downloads."""
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .providers import YahooProvider
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate or 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens=1.0):
+        """Wait until `tokens` are available and take them."""
+        if not self.rate:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Retry number (1 for the first retry)
+        base: Delay scale in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        float: Seconds to wait, uniform in [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+@dataclass
+class FetchStats:
+    """Counters for one scheduler's lifetime."""
+    symbols_requested: int = 0
+    symbols_fetched: int = 0
+    symbols_failed: int = 0
+    requests: int = 0
+    retries: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def symbols_per_sec(self):
+        return self.symbols_fetched / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """One-line progress/throughput report."""
+        return (
+            f"{self.symbols_fetched}/{self.symbols_requested} symbols in {self.elapsed:.1f}s "
+            f"({self.symbols_per_sec:.1f} symbols/s, {self.bytes / 1e6:.1f} MB), "
+            f"{self.requests} requests, {self.retries} retries, {self.symbols_failed} failed"
+        )
+
+
+class RetryQueue:
+    """
+    Symbols that exhausted their retries, persisted as JSON between runs.
+
+    Entries are keyed by (interval, symbol) and record the attempt count and
+    last error, so the next `fetch --retry-failed` can pick them up.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable retry queue {self.path}: {str(e)}")
+
+    @staticmethod
+    def _key(symbol, interval):
+        return f"{interval}:{symbol}"
+
+    def add(self, symbol, interval, error):
+        """Record a failed symbol (increments its attempt count)."""
+        key = self._key(symbol, interval)
+        entry = self.entries.get(key, {'symbol': symbol, 'interval': interval, 'attempts': 0})
+        entry['attempts'] += 1
+        entry['error'] = error
+        entry['last_attempt'] = datetime.now().isoformat(timespec='seconds')
+        self.entries[key] = entry
+
+    def discard(self, symbol, interval):
+        """Drop a symbol that has since been fetched."""
+        self.entries.pop(self._key(symbol, interval), None)
+
+    def pending(self, interval=None):
+        """Symbols waiting for a retry, optionally for one interval."""
+        return [entry['symbol'] for entry in self.entries.values()
+                if interval is None or entry['interval'] == interval]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+        tmp_path.replace(self.path)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class FetchScheduler:
+    """
+    Runs chunked provider downloads concurrently under a rate limit.
+
+    Every request takes a token from a shared bucket and a slot from its
+    host's semaphore. A chunk that raises, or comes back without some of its
+    symbols (how throttling shows up in multi-ticker downloads), is retried
+    for the missing symbols after an exponential backoff with jitter. Symbols
+    still missing after `max_retries` go to the retry queue.
+
+    Providers are synchronous, so requests run in worker threads; use
+    `download` from async code (webapp) and `download_sync` elsewhere.
+    """
+
+    def __init__(self, provider=None, rate=2.0, burst=None, max_concurrency=4, host_concurrency=None,
+                 max_retries=3, backoff_base=1.0, backoff_cap=30.0, retry_queue=None, progress=None):
+        """
+        Args:
+            provider: DataProvider (default: YahooProvider)
+            rate: Requests per second across all hosts (None/0 for unlimited)
+            burst: Token-bucket capacity (default: max(1, rate))
+            max_concurrency: Concurrent requests per host
+            host_concurrency: Optional {host: limit} overrides
+            max_retries: Retries per chunk before symbols are queued
+            backoff_base: Backoff scale in seconds
+            backoff_cap: Maximum backoff in seconds
+            retry_queue: Optional RetryQueue for symbols that keep failing
+            progress: Optional callback invoked with a symbol count as chunks settle
+        """
+        self.provider = provider or YahooProvider()
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max(1, max_concurrency)
+        self.host_concurrency = host_concurrency or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_queue = retry_queue
+        self.progress = progress
+        self.stats = FetchStats()
+
+    @property
+    def host(self):
+        return getattr(self.provider, 'host', None) or self.provider.name
+
+    async def download(self, symbols, start_date, end_date, interval, chunk_size=50):
+        """
+        Download symbols in chunks, concurrently and rate limited.
+
+        Args:
+            symbols: List of stock symbols
+            start_date: Start date (inclusive)
+            end_date: End date (exclusive)
+            interval: Bar interval
+            chunk_size: Symbols per request
+
+        Returns:
+            dict: {symbol: DataFrame} for symbols that returned data
+        """
+        symbols = list(dict.fromkeys(symbols))
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        self.stats.symbols_requested += len(symbols)
+
+        # Event-loop bound primitives are created per call
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.host_concurrency.get(self.host, self.max_concurrency))
+
+        results = await asyncio.gather(*(
+            self._download_chunk(chunk, start_date, end_date, interval, bucket, semaphore)
+            for chunk in chunks
+        ))
+
+        frames = {}
+        for result in results:
+            frames.update(result)
+
+        if self.retry_queue is not None:
+            self.retry_queue.save()
+
+        logger.info(f"Fetch scheduler: {self.stats.summary()}")
+        return frames
+
+    def download_sync(self, symbols, start_date, end_date, interval, chunk_size=50):
+        """Blocking wrapper around download() for non-async callers."""
+        return asyncio.run(self.download(symbols, start_date, end_date, interval, chunk_size))
+
+    async def _download_chunk(self, chunk, start_date, end_date, interval, bucket, semaphore):
+        frames = {}
+        pending = list(chunk)
+        attempt = 0
+
+        while pending:
+            error = "no data returned"
+            result = {}
+            await bucket.acquire()
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(
+                        self.provider.download, pending, start_date, end_date, interval
+                    )
+                except Exception as e:
+                    error = str(e)
+                    logger.warning(f"Request for {len(pending)} symbols ({pending[0]}...) failed: {error}")
+            self.stats.requests += 1
+
+            for symbol in pending:
+                df = result.get(symbol)
+                if df is None:
+                    continue
+                frames[symbol] = df
+                self.stats.symbols_fetched += 1
+                self.stats.bytes += int(df.memory_usage(index=True).sum())
+                if self.retry_queue is not None:
+                    self.retry_queue.discard(symbol, interval)
+
+            settled = len(pending)
+            pending = [symbol for symbol in pending if symbol not in frames]
+            settled -= len(pending)
+
+            if pending and attempt >= self.max_retries:
+                for symbol in pending:
+                    if self.retry_queue is not None:
+                        self.retry_queue.add(symbol, interval, error)
+                self.stats.symbols_failed += len(pending)
+                settled += len(pending)
+                pending = []
+
+            if self.progress is not None and settled:
+                self.progress(settled)
+
+            if pending:
+                attempt += 1
+                self.stats.retries += 1
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+
+        return frames
@@ -6,12 +6,177 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+TRADE_COLUMNS = ['symbol', 'buy_date', 'buy_price', 'sell_date', 'sell_price', 'pct_change', 'weeks_held']
+
+
+def find_flips(st_dir):
+    """
+    Locate SuperTrend direction flips with array diffs.
+    
+    A buy is a bar whose direction is 1 after a bar at -1, a sell a bar at
+    -1 after a bar at 1. Comparisons with NaN are false, so a NaN on either
+    side never produces a flip.
+    
+    Args:
+        st_dir: Direction array, 1-D (bars) or 2-D (rows x bars)
+        
+    Returns:
+        tuple: (buy_rows, buy_cols, sell_rows, sell_cols) index arrays in
+            row-major (chronological per row) order
+    """
+    d = np.asarray(st_dir, dtype=np.float64)
+    if d.ndim == 1:
+        d = d[np.newaxis, :]
+    
+    prev, curr = d[:, :-1], d[:, 1:]
+    buy_rows, buy_cols = np.nonzero((prev == -1) & (curr == 1))
+    sell_rows, sell_cols = np.nonzero((prev == 1) & (curr == -1))
+    return buy_rows, buy_cols + 1, sell_rows, sell_cols + 1
+
+
+def pair_flips(st_dir, include_open=False):
+    """
+    Pair buy and sell flips into trades without a per-bar loop.
+    
+    Each sell closes the most recent buy since the previous sell (a later
+    buy before any sell replaces an earlier one); sells with no open buy are
+    ignored. With include_open, a buy left open at the end of a row becomes
+    a trade with sell index -1.
+    
+    Args:
+        st_dir: Direction array, 1-D (bars) or 2-D (rows x bars)
+        include_open: Include open trades
+        
+    Returns:
+        tuple: (rows, buy_idx, sell_idx) arrays ordered by row, then buy bar
+    """
+    d = np.asarray(st_dir, dtype=np.float64)
+    n_bars = d.shape[-1]
+    buy_rows, buy_cols, sell_rows, sell_cols = find_flips(d)
+    
+    if len(buy_cols) == 0:
+        # No buys: nothing to pair or leave open (and nothing to index below)
+        return buy_rows, buy_cols, buy_cols.copy()
+    
+    # Flat positions are sorted, so searchsorted finds each sell's latest buy
+    buy_flat = buy_rows * n_bars + buy_cols
+    sell_flat = sell_rows * n_bars + sell_cols
+    
+    k = np.searchsorted(buy_flat, sell_flat) - 1
+    prev_sell = np.concatenate(([-1], sell_flat[:-1]))
+    has_buy = k >= 0
+    k_safe = np.where(has_buy, k, 0)
+    closed = has_buy & (buy_rows[k_safe] == sell_rows) & (buy_flat[k_safe] > prev_sell)
+    
+    rows = sell_rows[closed]
+    buy_idx = buy_cols[k_safe[closed]]
+    sell_idx = sell_cols[closed]
+    
+    if include_open and len(buy_flat):
+        # Open: the last buy of its row with no sell after it in that row
+        last_in_row = np.ones(len(buy_flat), dtype=bool)
+        last_in_row[:-1] = buy_rows[1:] != buy_rows[:-1]
+        j = np.searchsorted(sell_flat, buy_flat)
+        j_safe = np.minimum(j, max(len(sell_flat) - 1, 0))
+        no_later_sell = (j == len(sell_flat)) | (sell_rows[j_safe] != buy_rows if len(sell_flat) else True)
+        is_open = last_in_row & no_later_sell
+        
+        rows = np.concatenate((rows, buy_rows[is_open]))
+        buy_idx = np.concatenate((buy_idx, buy_cols[is_open]))
+        sell_idx = np.concatenate((sell_idx, np.full(is_open.sum(), -1, dtype=sell_idx.dtype)))
+        
+        order = np.lexsort((buy_idx, rows))
+        rows, buy_idx, sell_idx = rows[order], buy_idx[order], sell_idx[order]
+    
+    return rows, buy_idx, sell_idx
+
+
+def build_trades(symbols, dates, close, rows, buy_idx, sell_idx):
+    """
+    Columnar trade table from paired indices.
+    
+    Args:
+        symbols: Sequence of symbols, one per row
+        dates: (rows x bars) datetime64 array, or (bars,) shared by all rows
+        close: Close prices with the same shape as dates
+        rows, buy_idx, sell_idx: Output of pair_flips
+        
+    Returns:
+        pandas.DataFrame: TRADE_COLUMNS; open trades have NaT/NaN sell fields
+    """
+    dates = np.asarray(dates)
+    close = np.asarray(close)
+    # 1-D bars are shared by every row (e.g. a parameter grid for one symbol)
+    bar_rows = rows if dates.ndim == 2 else np.zeros_like(rows)
+    if dates.ndim == 1:
+        dates, close = dates[np.newaxis, :], close[np.newaxis, :]
+    
+    is_open = sell_idx < 0
+    sell_safe = np.where(is_open, 0, sell_idx)
+    
+    buy_date = dates[bar_rows, buy_idx]
+    buy_price = close[bar_rows, buy_idx]
+    sell_date = dates[bar_rows, sell_safe]
+    sell_price = np.where(is_open, np.nan, close[bar_rows, sell_safe])
+    
+    pct_change = (sell_price - buy_price) / buy_price * 100
+    # Whole days like Timedelta.days, then weeks
+    weeks_held = np.where(is_open, np.nan, ((sell_date - buy_date) // np.timedelta64(1, 'D')) / 7)
+    sell_date = np.where(is_open, np.datetime64('NaT'), sell_date)
+    
+    return pd.DataFrame({
+        'symbol': np.asarray(symbols, dtype=object)[rows],
+        'buy_date': buy_date,
+        'buy_price': buy_price,
+        'sell_date': sell_date,
+        'sell_price': sell_price,
+        'pct_change': pct_change,
+        'weeks_held': weeks_held,
+    }, columns=TRADE_COLUMNS)
+
+
+def trades_to_records(trades_df):
+    """
+    Convert a trade table to the list-of-dict format.
+    
+    Open trades get None (not NaT/NaN) for their sell fields.
+    """
+    records = trades_df.to_dict('records')
+    for record in records:
+        if pd.isna(record['sell_date']):
+            record['sell_date'] = None
+            record['sell_price'] = None
+            record['pct_change'] = None
+            record['weeks_held'] = None
+    return records
+
+
+def find_trade_pairs(df, symbol, include_open=False):
+    """
+    Buy→sell pairs for one symbol as a columnar DataFrame.
+    
+    Args:
+        df: DataFrame with SuperTrend indicators (must have ST_dir, Date and Close)
+        symbol: Stock symbol for labeling
+        include_open: Whether to include open trades (no sell yet)
+        
+    Returns:
+        pandas.DataFrame: TRADE_COLUMNS, one row per trade
+    """
+    if df is None or len(df) == 0 or 'ST_dir' not in df.columns:
+        return pd.DataFrame(columns=TRADE_COLUMNS)
+    
+    rows, buy_idx, sell_idx = pair_flips(df['ST_dir'].to_numpy(dtype=np.float64), include_open)
+    return build_trades([symbol], df['Date'].to_numpy(), df['Close'].to_numpy(), rows, buy_idx, sell_idx)
+
+
 def find_buy_sell_pairs(df, symbol, include_open=False):
     """
     Find buy→sell signal pairs from SuperTrend data.
     
     A buy signal occurs when ST_dir changes from -1 to 1 (downtrend to uptrend).
     A sell signal occurs when ST_dir changes from 1 to -1 (uptrend to downtrend).
+    Flips are found and paired on arrays (see pair_flips).
     
     Args:
         df: DataFrame with SuperTrend indicators (must have ST_dir and Date columns)
@@ -29,73 +194,7 @@ def find_buy_sell_pairs(df, symbol, include_open=False):
         logger.error(f"DataFrame must have ST_dir column")
         return []
     
-    trades = []
-    last_buy_date = None
-    last_buy_price = None
-    last_buy_idx = None
-    
-    # Iterate through data chronologically
-    for i in range(1, len(df)):
-        prev_dir = df['ST_dir'].iloc[i-1]
-        curr_dir = df['ST_dir'].iloc[i]
-        
-        # Skip if either direction is NaN
-        if pd.isna(prev_dir) or pd.isna(curr_dir):
-            continue
-        
-        # Buy signal: direction changes from -1 to 1
-        if prev_dir == -1 and curr_dir == 1:
-            # If there was an open buy, close it first (shouldn't happen with proper logic)
-            if last_buy_date is not None:
-                logger.warning(f"{symbol}: New buy signal before sell, closing previous trade")
-                
-            last_buy_date = df['Date'].iloc[i]
-            last_buy_price = df['Close'].iloc[i]
-            last_buy_idx = i
-            logger.debug(f"{symbol}: BUY signal on {last_buy_date} at {last_buy_price}")
-        
-        # Sell signal: direction changes from 1 to -1
-        elif prev_dir == 1 and curr_dir == -1:
-            if last_buy_date is not None:
-                sell_date = df['Date'].iloc[i]
-                sell_price = df['Close'].iloc[i]
-                
-                # Calculate metrics
-                pct_change = ((sell_price - last_buy_price) / last_buy_price) * 100
-                weeks_held = (sell_date - last_buy_date).days / 7
-                
-                trade = {
-                    'symbol': symbol,
-                    'buy_date': last_buy_date,
-                    'buy_price': last_buy_price,
-                    'sell_date': sell_date,
-                    'sell_price': sell_price,
-                    'pct_change': pct_change,
-                    'weeks_held': weeks_held
-                }
-                
-                trades.append(trade)
-                logger.debug(f"{symbol}: SELL signal on {sell_date} at {sell_price}, "
-                           f"return: {pct_change:.2f}%, held: {weeks_held:.1f} weeks")
-                
-                # Reset for next trade
-                last_buy_date = None
-                last_buy_price = None
-                last_buy_idx = None
-    
-    # Handle open trade at end of data
-    if last_buy_date is not None and include_open:
-        trade = {
-            'symbol': symbol,
-            'buy_date': last_buy_date,
-            'buy_price': last_buy_price,
-            'sell_date': None,
-            'sell_price': None,
-            'pct_change': None,
-            'weeks_held': None
-        }
-        trades.append(trade)
-        logger.debug(f"{symbol}: Open trade from {last_buy_date}")
+    trades = trades_to_records(find_trade_pairs(df, symbol, include_open=include_open))
     
     logger.info(f"{symbol}: Found {len(trades)} trade pairs")
     return trades
@@ -10,8 +10,8 @@ Only takes SuperTrend buy signals when:
 import pandas as pd
 import numpy as np
 import logging
-from datetime import timedelta
-from .signal_detector_fixed_exit import find_buy_sell_pairs_fixed_exit
+from .signal_detector import find_flips
+from .signal_detector_fixed_exit import find_exit, exit_trade
 
 logger = logging.getLogger(__name__)
 
@@ -81,80 +81,49 @@ def find_buy_signals_with_filters(df, symbol,
         logger.error(f"DataFrame must have ST_dir column")
         return []
     
-    buy_signals = []
-    rejected_signals = {
-        'volume': 0,
-        'momentum': 0,
-        'ma': 0,
-        'rsi': 0,
-        'total_supertrend': 0
-    }
-    
-    df = df.copy()
     df = df.sort_values('Date').reset_index(drop=True)
-    
-    for i in range(1, len(df)):
-        prev_dir = df['ST_dir'].iloc[i-1]
-        curr_dir = df['ST_dir'].iloc[i]
-        
-        # Skip if direction is NaN
-        if pd.isna(curr_dir) or pd.isna(prev_dir):
-            continue
-        
-        # SuperTrend buy signal: direction changes from -1 to 1
-        if prev_dir == -1 and curr_dir == 1:
-            rejected_signals['total_supertrend'] += 1
-            
-            buy_date = df['Date'].iloc[i]
-            buy_price = df['Close'].iloc[i]
-            
-            # === APPLY FILTERS ===
-            
-            # 1. Volume filter
-            volume_ratio = df['volume_ratio'].iloc[i]
-            if pd.isna(volume_ratio) or volume_ratio < volume_threshold:
-                rejected_signals['volume'] += 1
-                logger.debug(f"{symbol}: Signal rejected - low volume ({volume_ratio:.2f})")
-                continue
-            
-            # 2. Momentum filter
-            momentum = df['momentum_4w'].iloc[i]
-            if pd.isna(momentum) or momentum < momentum_threshold:
-                rejected_signals['momentum'] += 1
-                logger.debug(f"{symbol}: Signal rejected - weak momentum ({momentum:.2f}%)")
-                continue
-            
-            # 3. Moving average filter
-            if use_ma_filter:
-                sma_20 = df['sma_20'].iloc[i]
-                if pd.isna(sma_20) or buy_price < sma_20:
-                    rejected_signals['ma'] += 1
-                    logger.debug(f"{symbol}: Signal rejected - price below SMA20")
-                    continue
-            
-            # 4. RSI filter
-            if use_rsi_filter:
-                rsi = df['rsi'].iloc[i]
-                if pd.isna(rsi) or rsi < 40:
-                    rejected_signals['rsi'] += 1
-                    logger.debug(f"{symbol}: Signal rejected - RSI too low ({rsi:.1f})")
-                    continue
-            
-            # === SIGNAL PASSED ALL FILTERS ===
-            signal = {
-                'symbol': symbol,
-                'buy_date': buy_date,
-                'buy_price': buy_price,
-                'buy_idx': i,
-                'volume_ratio': volume_ratio,
-                'momentum_4w': momentum,
-                'rsi': df['rsi'].iloc[i] if 'rsi' in df.columns else None,
-                'sma_20': df['sma_20'].iloc[i] if 'sma_20' in df.columns else None
-            }
-            
-            buy_signals.append(signal)
-            logger.debug(f"{symbol}: ✓ BUY signal on {buy_date} at {buy_price} "
-                        f"(vol: {volume_ratio:.2f}x, mom: {momentum:.1f}%)")
+    _, buy_cols, _, _ = find_flips(df['ST_dir'].to_numpy(dtype=np.float64))
+    
+    # === APPLY FILTERS ===
+    # Each filter is a mask over the buy bars; a signal is counted against
+    # the first filter it fails, in order volume, momentum, MA, RSI.
+    # NaN indicator values fail their filter.
+    volume_ratio = df['volume_ratio'].to_numpy(dtype=np.float64)[buy_cols]
+    momentum = df['momentum_4w'].to_numpy(dtype=np.float64)[buy_cols]
+    buy_price = df['Close'].to_numpy(dtype=np.float64)[buy_cols]
+    sma_20 = df['sma_20'].to_numpy(dtype=np.float64)[buy_cols] if 'sma_20' in df.columns else None
+    rsi = df['rsi'].to_numpy(dtype=np.float64)[buy_cols] if 'rsi' in df.columns else None
+    
+    passed = np.ones(len(buy_cols), dtype=bool)
+    checks = [
+        ('volume', volume_ratio >= volume_threshold),
+        ('momentum', momentum >= momentum_threshold),
+    ]
+    if use_ma_filter:
+        checks.append(('ma', buy_price >= sma_20))
+    if use_rsi_filter:
+        checks.append(('rsi', rsi >= 40))
+    
+    rejected_signals = {'volume': 0, 'momentum': 0, 'ma': 0, 'rsi': 0,
+                        'total_supertrend': len(buy_cols)}
+    for name, ok in checks:
+        rejected_signals[name] = int((passed & ~ok).sum())
+        passed &= ok
+    
+    dates = df['Date']
+    buy_signals = [
+        {
+            'symbol': symbol,
+            'buy_date': dates.iloc[i],
+            'buy_price': df['Close'].iloc[i],
+            'buy_idx': int(i),
+            'volume_ratio': volume_ratio[k],
+            'momentum_4w': momentum[k],
+            'rsi': rsi[k] if rsi is not None else None,
+            'sma_20': sma_20[k] if sma_20 is not None else None
+        }
+        for k, i in enumerate(buy_cols) if passed[k]
+    ]
     
     # Log filter statistics
     if rejected_signals['total_supertrend'] > 0:
@@ -213,83 +182,27 @@ def detect_signals_enhanced(symbol, df, atr_period, multiplier,
         return df_enhanced, []
     
     # Apply fixed exit strategy to each buy signal
+    dates = pd.to_datetime(df_enhanced['Date']).to_numpy()
+    high = df_enhanced['High'].to_numpy(dtype=np.float64)
+    low = df_enhanced['Low'].to_numpy(dtype=np.float64)
+    close = df_enhanced['Close'].to_numpy(dtype=np.float64)
+    
+    # SuperTrend sell flips (trend reversal) exit at the close
+    sell_flips = np.zeros(len(df_enhanced), dtype=bool)
+    _, _, _, sell_cols = find_flips(df_enhanced['ST_dir'].to_numpy(dtype=np.float64))
+    sell_flips[sell_cols] = True
+    
     trades = []
     
     for signal in buy_signals:
-        buy_idx = signal['buy_idx']
-        buy_date = signal['buy_date']
-        buy_price = signal['buy_price']
-        
-        # Calculate target prices
-        target_price = buy_price * (1 + profit_target / 100)
-        stop_price = buy_price * (1 - stop_loss / 100)
-        max_exit_date = buy_date + timedelta(days=max_days)
-        
-        # Look forward to find exit point
-        sell_date = None
-        sell_price = None
-        exit_reason = None
-        
-        for j in range(buy_idx + 1, len(df_enhanced)):
-            check_date = df_enhanced['Date'].iloc[j]
-            high = df_enhanced['High'].iloc[j]
-            low = df_enhanced['Low'].iloc[j]
-            close = df_enhanced['Close'].iloc[j]
-            
-            # Check profit target (highest priority)
-            if high >= target_price:
-                sell_date = check_date
-                sell_price = target_price
-                exit_reason = 'profit_target'
-                break
-            
-            # Check stop loss
-            if low <= stop_price:
-                sell_date = check_date
-                sell_price = stop_price
-                exit_reason = 'stop_loss'
-                break
-            
-            # Check SuperTrend sell signal (trend reversal)
-            curr_st_dir = df_enhanced['ST_dir'].iloc[j]
-            prev_st_dir = df_enhanced['ST_dir'].iloc[j-1] if j > 0 else None
-            
-            if not pd.isna(curr_st_dir) and not pd.isna(prev_st_dir):
-                # Sell signal: uptrend (1) to downtrend (-1)
-                if prev_st_dir == 1 and curr_st_dir == -1:
-                    sell_date = check_date
-                    sell_price = close  # Exit at close when trend reverses
-                    exit_reason = 'supertrend_sell'
-                    logger.debug(f"{symbol}: SuperTrend sell signal at {check_date}, exit at {close}")
-                    break
-            
-            # Check time stop (last resort)
-            if check_date >= max_exit_date:
-                sell_date = check_date
-                sell_price = close
-                exit_reason = 'time_stop'
-                break
+        exit_info = find_exit(dates, high, low, close, signal['buy_idx'],
+                              profit_target, stop_loss, max_days, sell_flips=sell_flips)
         
         # Record trade if exit found
-        if sell_date is not None:
-            pct_change = ((sell_price - buy_price) / buy_price) * 100
-            days_held = (sell_date - buy_date).days
-            weeks_held = days_held / 7
-            
-            trade = {
-                'symbol': symbol,
-                'buy_date': buy_date,
-                'buy_price': buy_price,
-                'sell_date': sell_date,
-                'sell_price': sell_price,
-                'pct_change': pct_change,
-                'days_held': days_held,
-                'weeks_held': weeks_held,
-                'exit_reason': exit_reason,
-                'volume_ratio': signal['volume_ratio'],
-                'momentum_4w': signal['momentum_4w']
-            }
-            
+        if exit_info is not None:
+            trade = exit_trade(symbol, dates, signal['buy_idx'], exit_info, close)
+            trade['volume_ratio'] = signal['volume_ratio']
+            trade['momentum_4w'] = signal['momentum_4w']
             trades.append(trade)
     
     logger.info(f"{symbol}: Found {len(trades)} quality trades with enhanced filters")
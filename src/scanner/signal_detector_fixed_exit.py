@@ -2,11 +2,89 @@
 import pandas as pd
 import numpy as np
 import logging
-from datetime import timedelta
+
+from .signal_detector import find_flips
 
 logger = logging.getLogger(__name__)
 
 
+def find_exit(dates, high, low, close, buy_idx, profit_target, stop_loss, max_days, sell_flips=None):
+    """
+    First exit after a buy, searched over the holding window as arrays.
+    
+    The window runs from the bar after the buy up to the first bar on/after
+    buy_date + max_days. On the first bar where any condition holds, the exit
+    is (in priority order) the profit target, the stop loss, a SuperTrend
+    sell flip (if sell_flips is given) and finally the time stop.
+    
+    Args:
+        dates: Sorted datetime64 array of bar dates
+        high, low, close: Price arrays
+        buy_idx: Index of the buy bar
+        profit_target: Profit target percentage
+        stop_loss: Stop loss percentage
+        max_days: Maximum holding period in days
+        sell_flips: Optional boolean array marking SuperTrend sell flips
+        
+    Returns:
+        tuple: (sell_idx, sell_price, exit_reason), or None if the data ends
+            before any exit condition
+    """
+    buy_price = close[buy_idx]
+    target_price = buy_price * (1 + profit_target / 100)
+    stop_price = buy_price * (1 - stop_loss / 100)
+    max_exit_date = dates[buy_idx] + np.timedelta64(int(max_days), 'D')
+    
+    start = buy_idx + 1
+    # Last bar of the window is the first one on/after the time stop
+    end = max(np.searchsorted(dates, max_exit_date, side='left'), start)
+    stop_bar = end if end < len(dates) else None
+    end = min(end + 1, len(dates))
+    
+    target_hit = high[start:end] >= target_price
+    stop_hit = low[start:end] <= stop_price
+    any_hit = target_hit | stop_hit
+    if sell_flips is not None:
+        any_hit = any_hit | sell_flips[start:end]
+    
+    hits = np.flatnonzero(any_hit)
+    if len(hits):
+        k = hits[0]
+        j = start + k
+        if target_hit[k]:
+            return j, target_price, 'profit_target'
+        if stop_hit[k]:
+            return j, stop_price, 'stop_loss'
+        return j, close[j], 'supertrend_sell'
+    
+    if stop_bar is not None:
+        return stop_bar, close[stop_bar], 'time_stop'
+    return None
+
+
+def exit_trade(symbol, dates, buy_idx, exit_info, close):
+    """Trade dict for a buy and the exit returned by find_exit."""
+    sell_idx, sell_price, exit_reason = exit_info
+    buy_date = pd.Timestamp(dates[buy_idx])
+    sell_date = pd.Timestamp(dates[sell_idx])
+    buy_price = close[buy_idx]
+    
+    pct_change = ((sell_price - buy_price) / buy_price) * 100
+    days_held = (sell_date - buy_date).days
+    
+    return {
+        'symbol': symbol,
+        'buy_date': buy_date,
+        'buy_price': buy_price,
+        'sell_date': sell_date,
+        'sell_price': sell_price,
+        'pct_change': pct_change,
+        'days_held': days_held,
+        'weeks_held': days_held / 7,
+        'exit_reason': exit_reason
+    }
+
+
 def find_buy_sell_pairs_fixed_exit(df, symbol, profit_target=10.0, stop_loss=10.0, max_days=30):
     """
     Find buy→sell signal pairs with fixed exit rules.
@@ -16,6 +94,9 @@ def find_buy_sell_pairs_fixed_exit(df, symbol, profit_target=10.0, stop_loss=10.
     2. Price reaches stop_loss% below buy price
     3. max_days elapsed from buy date
     
+    Buy flips come from array diffs and each exit is an array search over
+    its holding window; only buys on/after the previous exit are taken.
+    
     Args:
         df: DataFrame with SuperTrend indicators (must have ST_dir and Date columns)
         symbol: Stock symbol for labeling
@@ -33,103 +114,32 @@ def find_buy_sell_pairs_fixed_exit(df, symbol, profit_target=10.0, stop_loss=10.
         logger.error(f"DataFrame must have ST_dir column")
         return []
     
-    trades = []
+    df = df.sort_values('Date')
+    dates = pd.to_datetime(df['Date']).to_numpy()
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    _, buy_cols, _, _ = find_flips(df['ST_dir'].to_numpy(dtype=np.float64))
     
-    # Convert to daily data for more precise exit detection
-    # If data is weekly, we'll check each week
-    df = df.copy()
-    df = df.sort_values('Date').reset_index(drop=True)
+    trades = []
+    next_allowed = 0
     
-    i = 1  # Start from index 1 (need previous bar to detect change)
-    while i < len(df):
-        prev_dir = df['ST_dir'].iloc[i-1]
-        curr_dir = df['ST_dir'].iloc[i]
+    for buy_idx in buy_cols:
+        if buy_idx < next_allowed:
+            continue
         
-        # Skip if direction is NaN
-        if pd.isna(curr_dir) or pd.isna(prev_dir):
-            i += 1
+        exit_info = find_exit(dates, high, low, close, buy_idx, profit_target, stop_loss, max_days)
+        if exit_info is None:
+            # No exit found (data ends before any exit condition)
             continue
         
-        # Buy signal: direction changes from -1 to 1 (downtrend to uptrend)
-        if prev_dir == -1 and curr_dir == 1:
-            buy_date = df['Date'].iloc[i]
-            buy_price = df['Close'].iloc[i]
-            buy_idx = i
-            
-            logger.debug(f"{symbol}: BUY signal on {buy_date} at {buy_price}")
-            
-            # Calculate target prices
-            target_price = buy_price * (1 + profit_target / 100)
-            stop_price = buy_price * (1 - stop_loss / 100)
-            max_exit_date = buy_date + timedelta(days=max_days)
-            
-            # Look forward to find exit point
-            sell_date = None
-            sell_price = None
-            exit_reason = None
-            
-            for j in range(i + 1, len(df)):
-                check_date = df['Date'].iloc[j]
-                high = df['High'].iloc[j]
-                low = df['Low'].iloc[j]
-                close = df['Close'].iloc[j]
-                
-                # Check if profit target hit (using high of the candle)
-                if high >= target_price:
-                    sell_date = check_date
-                    sell_price = target_price  # Assume we got out at target
-                    exit_reason = 'profit_target'
-                    logger.debug(f"{symbol}: Profit target hit on {sell_date}")
-                    break
-                
-                # Check if stop loss hit (using low of the candle)
-                if low <= stop_price:
-                    sell_date = check_date
-                    sell_price = stop_price  # Assume we got stopped out
-                    exit_reason = 'stop_loss'
-                    logger.debug(f"{symbol}: Stop loss hit on {sell_date}")
-                    break
-                
-                # Check if max holding period reached
-                if check_date >= max_exit_date:
-                    sell_date = check_date
-                    sell_price = close  # Exit at close price
-                    exit_reason = 'time_stop'
-                    logger.debug(f"{symbol}: Time stop at {sell_date}, price: {sell_price}")
-                    break
-            
-            # If we found an exit point, record the trade
-            if sell_date is not None:
-                pct_change = ((sell_price - buy_price) / buy_price) * 100
-                days_held = (sell_date - buy_date).days
-                weeks_held = days_held / 7
-                
-                trade = {
-                    'symbol': symbol,
-                    'buy_date': buy_date,
-                    'buy_price': buy_price,
-                    'sell_date': sell_date,
-                    'sell_price': sell_price,
-                    'pct_change': pct_change,
-                    'days_held': days_held,
-                    'weeks_held': weeks_held,
-                    'exit_reason': exit_reason
-                }
-                
-                trades.append(trade)
-                logger.debug(f"{symbol}: Trade completed - {exit_reason}, "
-                           f"return: {pct_change:.2f}%, held: {days_held} days")
-                
-                # Move to the sell index to look for next buy signal
-                # Find the index corresponding to sell_date
-                next_idx = df[df['Date'] >= sell_date].index[0] if len(df[df['Date'] >= sell_date]) > 0 else len(df)
-                i = next_idx
-            else:
-                # No exit found (data ends before any exit condition)
-                # Could optionally record as open trade
-                i += 1
-        else:
-            i += 1
+        trade = exit_trade(symbol, dates, buy_idx, exit_info, close)
+        trades.append(trade)
+        logger.debug(f"{symbol}: Trade completed - {trade['exit_reason']}, "
+                   f"return: {trade['pct_change']:.2f}%, held: {trade['days_held']} days")
+        
+        # Look for the next buy from the sell bar onwards
+        next_allowed = np.searchsorted(dates, dates[exit_info[0]], side='left')
     
     logger.info(f"{symbol}: Found {len(trades)} trade pairs with fixed exits")
     return trades
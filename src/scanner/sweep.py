@@ -0,0 +1,127 @@
+"""Parameter-grid SuperTrend sweep over (ATR period, multiplier) pairs."""
+import pandas as pd
+import numpy as np
+import logging
+
+from .indicators import true_range, atr, supertrend_direction_grid
+from .signal_detector import pair_flips, build_trades, trades_to_records
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = [
+    'atr_period', 'multiplier', 'total_trades', 'mean_return', 'median_return',
+    'win_rate', 'mean_weeks_held', 'trades_below_10pct'
+]
+
+
+def sweep_symbol(symbol, df, atr_periods, multipliers, include_open=False):
+    """
+    Evaluate every (ATR period, multiplier) combination for one symbol.
+
+    True range is computed once, each rolling ATR is shared by all
+    multipliers, and directions for a whole period are produced as one
+    (multipliers x bars) array before pairing.
+
+    Args:
+        symbol: Stock symbol
+        df: DataFrame with OHLCV data
+        atr_periods: Sequence of ATR periods
+        multipliers: Sequence of ATR multipliers
+        include_open: Include open trades
+
+    Returns:
+        list of dict: Trades tagged with 'atr_period' and 'multiplier'
+    """
+    if df is None or len(df) == 0:
+        return []
+
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    dates = pd.to_datetime(df['Date']).to_numpy()
+    tr = true_range(df)
+
+    trades = []
+    for atr_period in atr_periods:
+        atr_values = atr(df, atr_period, tr=tr).to_numpy(dtype=np.float64)
+        grid = supertrend_direction_grid(high, low, close, atr_values, atr_period, multipliers)
+
+        # One pairing pass over the whole (multipliers x bars) grid
+        rows, buy_idx, sell_idx = pair_flips(grid, include_open=include_open)
+        period_trades = build_trades([symbol] * len(multipliers), dates, close, rows, buy_idx, sell_idx)
+        period_trades['atr_period'] = atr_period
+        period_trades['multiplier'] = np.asarray(multipliers)[rows]
+        trades.extend(trades_to_records(period_trades))
+
+    return trades
+
+
+def summarize_sweep(trades_df, atr_periods, multipliers):
+    """
+    Build the per-combination summary table.
+
+    Args:
+        trades_df: DataFrame of sweep trades (with atr_period/multiplier)
+        atr_periods: Sequence of ATR periods in the grid
+        multipliers: Sequence of multipliers in the grid
+
+    Returns:
+        pandas.DataFrame: One row per combination with SUMMARY_COLUMNS
+    """
+    grid = pd.MultiIndex.from_product([list(atr_periods), list(multipliers)],
+                                      names=['atr_period', 'multiplier'])
+
+    if trades_df.empty:
+        summary = pd.DataFrame(index=grid)
+        summary['total_trades'] = 0
+    else:
+        valid = trades_df.dropna(subset=['pct_change']).copy()
+        valid['pct_change'] = valid['pct_change'].astype(float)
+        valid['is_win'] = valid['pct_change'] > 0
+        valid['below_10pct'] = valid['pct_change'].abs() < 10
+
+        grouped = valid.groupby(['atr_period', 'multiplier'])
+        summary = pd.DataFrame({
+            'total_trades': grouped['pct_change'].size(),
+            'mean_return': grouped['pct_change'].mean(),
+            'median_return': grouped['pct_change'].median(),
+            'win_rate': grouped['is_win'].mean() * 100,
+            'mean_weeks_held': grouped['weeks_held'].mean(),
+            'trades_below_10pct': grouped['below_10pct'].sum(),
+        }).reindex(grid)
+        summary['total_trades'] = summary['total_trades'].fillna(0).astype(int)
+        summary['trades_below_10pct'] = summary['trades_below_10pct'].fillna(0).astype(int)
+
+    summary = summary.reset_index()
+    return summary.reindex(columns=SUMMARY_COLUMNS)
+
+
+def run_sweep(symbol_data, atr_periods, multipliers, include_open=False, progress=None):
+    """
+    Sweep a parameter grid over many symbols in a single pass.
+
+    Args:
+        symbol_data: Iterable of (symbol, DataFrame) pairs
+        atr_periods: Sequence of ATR periods
+        multipliers: Sequence of ATR multipliers
+        include_open: Include open trades
+        progress: Optional callback invoked once per symbol
+
+    Returns:
+        tuple: (summary_df, trades_df)
+    """
+    all_trades = []
+
+    for symbol, df in symbol_data:
+        try:
+            all_trades.extend(sweep_symbol(symbol, df, atr_periods, multipliers, include_open))
+        except Exception as e:
+            logger.error(f"Error sweeping {symbol}: {str(e)}")
+        if progress is not None:
+            progress(symbol)
+
+    trades_df = pd.DataFrame(all_trades)
+    summary_df = summarize_sweep(trades_df, atr_periods, multipliers)
+
+    logger.info(f"Sweep complete: {len(summary_df)} combinations, {len(trades_df)} trades")
+    return summary_df, trades_df
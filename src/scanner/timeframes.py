@@ -0,0 +1,232 @@
+"""Derived timeframes: resample stored base bars (1d, 1h, 5m) on demand."""
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+from .utils import sanitize_symbol
+
+logger = logging.getLogger(__name__)
+
+# Resolutions that are downloaded and stored
+BASE_TIMEFRAMES = ('1d', '1h', '5m')
+
+# Derived timeframe -> (base timeframe, bucket); 'W'/'M' are calendar
+# buckets, timedeltas are intraday buckets counted from the session open
+DERIVED_TIMEFRAMES = {
+    '1wk': ('1d', 'W'),
+    '1mo': ('1d', 'M'),
+    '15m': ('5m', pd.Timedelta(minutes=15)),
+    '30m': ('5m', pd.Timedelta(minutes=30)),
+    '2h': ('1h', pd.Timedelta(hours=2)),
+    '4h': ('1h', pd.Timedelta(hours=4)),
+}
+
+# NSE cash session opens at 09:15 IST; stored intraday bars are naive IST
+NSE_SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+
+# Memoized derived series per (store, symbol, timeframe)
+MEMO_SIZE = 512
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def base_timeframe(timeframe):
+    """Stored resolution a timeframe is built from (itself for base timeframes)."""
+    return DERIVED_TIMEFRAMES.get(timeframe, (timeframe,))[0]
+
+
+def bucket_starts(dates, timeframe):
+    """
+    Label every bar with the start of its derived bar.
+
+    Weekly bars start on Monday and monthly bars on the 1st, as Yahoo labels
+    them; intraday buckets are aligned to the 09:15 NSE session open, so
+    4h bars are 09:15-13:15 and 13:15-close rather than clock-aligned.
+
+    Args:
+        dates: datetime64[ns] array of bar timestamps
+        timeframe: Derived timeframe
+
+    Returns:
+        numpy.ndarray: datetime64[ns] bucket start per bar
+    """
+    bucket = DERIVED_TIMEFRAMES[timeframe][1]
+    days = dates.astype('datetime64[D]')
+
+    if bucket == 'W':
+        # 1970-01-01 was a Thursday, three days after Monday
+        weekday = (days.astype(np.int64) + 3) % 7
+        return (days - weekday).astype('datetime64[ns]')
+    if bucket == 'M':
+        return days.astype('datetime64[M]').astype('datetime64[ns]')
+
+    session_open = days.astype('datetime64[ns]') + NSE_SESSION_OPEN.to_timedelta64()
+    width = bucket.to_timedelta64()
+    return session_open + ((dates - session_open) // width) * width
+
+
+def resample_ohlcv(df, timeframe):
+    """
+    Resample base bars to a derived timeframe.
+
+    Bars must be sorted by date (as the store returns them); each bucket is
+    a contiguous run, so aggregation is a single reduceat per column.
+
+    Args:
+        df: DataFrame with Date/Open/High/Low/Close/Volume columns
+            (capitalised or lowercase)
+        timeframe: Derived timeframe (e.g. '1wk', '4h')
+
+    Returns:
+        pandas.DataFrame: Derived bars with the input's column names
+    """
+    cols = {col.lower(): col for col in df.columns if isinstance(col, str)}
+    date_col = cols.get('date', cols.get('datetime'))
+
+    if len(df) == 0:
+        return df.copy()
+
+    dates = df[date_col].to_numpy(dtype='datetime64[ns]')
+    labels = bucket_starts(dates, timeframe)
+
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.concatenate((starts[1:], [len(labels)])) - 1
+
+    out = {date_col: labels[starts]}
+    out[cols['open']] = df[cols['open']].to_numpy()[starts]
+    out[cols['high']] = np.maximum.reduceat(df[cols['high']].to_numpy(dtype=np.float64), starts)
+    out[cols['low']] = np.minimum.reduceat(df[cols['low']].to_numpy(dtype=np.float64), starts)
+    out[cols['close']] = df[cols['close']].to_numpy()[ends]
+    if 'volume' in cols:
+        out[cols['volume']] = np.add.reduceat(df[cols['volume']].to_numpy(), starts)
+
+    return pd.DataFrame(out)
+
+
+def _memo_get(key, content_hash):
+    with _memo_lock:
+        entry = _memo.get(key)
+        if entry is None or entry[0] != content_hash:
+            return None
+        _memo.move_to_end(key)
+        return entry[1]
+
+
+def _memo_put(key, content_hash, df):
+    with _memo_lock:
+        _memo[key] = (content_hash, df)
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def clear_memo():
+    """Drop every memoized derived series (e.g. to time cold reads)."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _slice(df, start=None, end=None, columns=None):
+    """Date/column selection matching MarketDataStore.read semantics."""
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (df['Date'] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (df['Date'] <= pd.Timestamp(end)).to_numpy()
+    df = df[mask]
+    if columns is not None:
+        df = df[['Date'] + [c for c in columns if c != 'Date']]
+    return df.reset_index(drop=True)
+
+
+def load_timeframe(store, symbol, timeframe, start=None, end=None, columns=None):
+    """
+    Read a symbol at any timeframe, deriving it from the stored base bars.
+
+    Derived series are memoized against the base series' content hash, so
+    repeated reads skip both the Parquet read and the resample until the
+    base bars change.
+
+    Args:
+        store: MarketDataStore
+        symbol: Stock symbol
+        timeframe: Base or derived timeframe
+        start: Only bars on/after this date
+        end: Only bars on/before this date
+        columns: Columns to load (Date is always included)
+
+    Returns:
+        pandas.DataFrame or None if neither base nor derived bars are stored
+    """
+    base = base_timeframe(timeframe)
+    if base == timeframe:
+        return store.read(symbol, timeframe, start=start, end=end, columns=columns)
+
+    entry = store.manifest.get(sanitize_symbol(symbol), base)
+    if entry is None:
+        # Stores written before derivation may still hold the series itself
+        return store.read(symbol, timeframe, start=start, end=end, columns=columns)
+
+    key = (str(store.root), sanitize_symbol(symbol), timeframe)
+    derived = _memo_get(key, entry['content_hash'])
+    if derived is None:
+        bars = store.read(symbol, base)
+        if bars is None:
+            return None
+        derived = resample_ohlcv(bars, timeframe)
+        _memo_put(key, entry['content_hash'], derived)
+
+    return _slice(derived, start, end, columns)
+
+
+def load_many_timeframe(store, symbols, timeframe, start=None, end=None, columns=None):
+    """
+    load_timeframe() for many symbols with one scan of the base partition.
+
+    Args:
+        store: MarketDataStore
+        symbols: Iterable of symbols (None for every stored symbol)
+        timeframe: Base or derived timeframe
+        start: Only bars on/after this date
+        end: Only bars on/before this date
+        columns: Columns to load (Date is always included)
+
+    Returns:
+        dict: {symbol: DataFrame} for symbols present in the store
+    """
+    base = base_timeframe(timeframe)
+    if base == timeframe:
+        return store.read_many(symbols, timeframe, start=start, end=end, columns=columns)
+
+    if symbols is None:
+        symbols = sorted(set(store.symbols(base)) | set(store.symbols(timeframe)))
+    symbols = list(symbols)
+
+    hashes = store.manifest.hashes(base, [sanitize_symbol(s) for s in symbols])
+    result, missing = {}, []
+    for symbol in symbols:
+        content_hash = hashes.get(sanitize_symbol(symbol))
+        derived = None
+        if content_hash is not None:
+            derived = _memo_get((str(store.root), sanitize_symbol(symbol), timeframe), content_hash)
+        if derived is None:
+            missing.append(symbol)
+        else:
+            result[symbol] = _slice(derived, start, end, columns)
+
+    if missing:
+        for symbol, bars in store.read_many(missing, base).items():
+            derived = resample_ohlcv(bars, timeframe)
+            _memo_put((str(store.root), sanitize_symbol(symbol), timeframe),
+                      hashes.get(sanitize_symbol(symbol)), derived)
+            result[symbol] = _slice(derived, start, end, columns)
+
+        # Stores written before derivation may still hold the series itself
+        legacy = [symbol for symbol in missing if symbol not in result]
+        if legacy:
+            result.update(store.read_many(legacy, timeframe, start=start, end=end, columns=columns))
+
+    return result
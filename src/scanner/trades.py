@@ -0,0 +1,95 @@
+"""Typed columnar trade tables shared by analyze, the analyser and the reports."""
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+# Column dtypes of a trade table; other columns (days_held, atr_period, ...)
+# are passed through unchanged
+TRADE_SCHEMA = {
+    'symbol': 'category',
+    'sector': 'category',
+    'buy_date': 'datetime64[ns]',
+    'buy_price': 'float64',
+    'sell_date': 'datetime64[ns]',
+    'sell_price': 'float64',
+    'pct_change': 'float32',
+    'weeks_held': 'float32',
+    'exit_reason': 'category',
+}
+
+CATEGORICAL_COLUMNS = [col for col, dtype in TRADE_SCHEMA.items() if dtype == 'category']
+
+
+def as_trade_frame(trades):
+    """
+    Coerce trades to the typed columnar layout.
+
+    Symbols, sectors and exit reasons become categoricals, returns and
+    holding periods float32 and dates datetime64[ns], so a full-universe
+    table is a handful of packed arrays rather than per-row Python objects.
+    Columns already of the right dtype are not copied.
+
+    Args:
+        trades: DataFrame or list of trade dicts
+
+    Returns:
+        pandas.DataFrame: Trade table
+    """
+    df = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(trades)
+
+    dtypes = {
+        col: dtype for col, dtype in TRADE_SCHEMA.items()
+        if col in df.columns and str(df[col].dtype) != dtype
+    }
+    if not dtypes:
+        return df
+
+    df = df.copy(deep=False)
+    for col, dtype in dtypes.items():
+        if dtype.startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col]).astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def concat_trades(frames):
+    """
+    Concatenate trade tables, keeping categorical columns categorical.
+
+    pandas falls back to object columns when categoricals with different
+    categories are concatenated; the categories are unioned here instead.
+
+    Args:
+        frames: Iterable of trade tables
+
+    Returns:
+        pandas.DataFrame: Combined trade table (empty if there are no trades)
+    """
+    frames = [frame for frame in frames if frame is not None and len(frame) > 0]
+    if not frames:
+        return as_trade_frame(pd.DataFrame(columns=[col for col in TRADE_SCHEMA if col != 'exit_reason']))
+
+    frames = [as_trade_frame(frame) for frame in frames]
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    categorical = [col for col in CATEGORICAL_COLUMNS if col in columns]
+
+    combined = pd.concat([frame.drop(columns=categorical, errors='ignore') for frame in frames],
+                         ignore_index=True)
+    for col in categorical:
+        # Categories are unified as object so an all-missing column (no
+        # categories) combines with string ones; absent columns are missing
+        parts = [
+            pd.Categorical(frame[col], categories=frame[col].cat.categories.astype(object))
+            if col in frame.columns
+            else pd.Categorical.from_codes(np.full(len(frame), -1), categories=pd.Index([], dtype=object))
+            for frame in frames
+        ]
+        combined[col] = union_categoricals(parts, ignore_order=True)
+
+    return combined[columns]
+
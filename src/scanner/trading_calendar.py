@@ -0,0 +1,160 @@
+"""NSE trading calendar: weekdays minus exchange holidays, plus special sessions."""
+from datetime import timedelta
+
+import pandas as pd
+
+# Full-day NSE trading holidays (update annually). Weekend dates are kept
+# as published so the list can be checked against the exchange circular.
+NSE_HOLIDAYS = {
+    "2024-01-22": "Special holiday",
+    "2024-01-26": "Republic Day",
+    "2024-03-08": "Mahashivratri",
+    "2024-03-25": "Holi",
+    "2024-03-29": "Good Friday",
+    "2024-04-11": "Id-Ul-Fitr",
+    "2024-04-17": "Ram Navami",
+    "2024-04-21": "Mahavir Jayanti",
+    "2024-05-01": "Maharashtra Day",
+    "2024-05-20": "General elections",
+    "2024-05-23": "Buddha Purnima",
+    "2024-06-17": "Bakri Id",
+    "2024-07-17": "Muharram",
+    "2024-08-15": "Independence Day",
+    "2024-08-26": "Janmashtami",
+    "2024-10-02": "Gandhi Jayanti",
+    "2024-10-12": "Dussehra",
+    "2024-11-01": "Diwali Laxmi Pujan",
+    "2024-11-02": "Diwali Balipratipada",
+    "2024-11-15": "Gurunanak Jayanti",
+    "2024-11-20": "Assembly elections",
+    "2024-12-25": "Christmas",
+    "2025-01-26": "Republic Day",
+    "2025-02-26": "Mahashivratri",
+    "2025-03-14": "Holi",
+    "2025-03-31": "Id-Ul-Fitr",
+    "2025-04-10": "Mahavir Jayanti",
+    "2025-04-14": "Dr.Ambedkar Jayanti",
+    "2025-04-18": "Good Friday",
+    "2025-05-01": "Maharashtra Day",
+    "2025-08-15": "Independence Day",
+    "2025-08-27": "Ganesh Chaturthi",
+    "2025-10-02": "Mahatma Gandhi Jayanti/Dussehra",
+    "2025-10-21": "Diwali Laxmi Pujan",
+    "2025-10-22": "Diwali Balipratipada",
+    "2025-11-05": "Gurunanak Jayanti",
+    "2025-12-25": "Christmas",
+}
+
+# Sessions on weekends or holidays (Muhurat trading, special Saturday sessions)
+SPECIAL_SESSIONS = {
+    "2024-01-20": "Saturday session",
+    "2024-03-02": "Saturday DR session",
+    "2024-05-18": "Saturday DR session",
+    "2024-11-01": "Muhurat trading",
+    "2025-02-01": "Union Budget session",
+    "2025-10-21": "Muhurat trading",
+}
+
+
+def _day(date):
+    """Midnight Timestamp of a date, datetime or 'YYYY-MM-DD' string."""
+    return pd.Timestamp(date).normalize().tz_localize(None)
+
+
+class TradingCalendar:
+    """
+    Which days the exchange trades.
+
+    A day is a session if it is a weekday and not a holiday, or a special
+    session. Between the first and last observed session (e.g. the bar
+    dates of loaded data) the observed dates are authoritative instead,
+    which covers holidays older than the list.
+    """
+
+    def __init__(self, holidays=NSE_HOLIDAYS, special_sessions=SPECIAL_SESSIONS, observed=None):
+        """
+        Initialize calendar.
+
+        Args:
+            holidays: Full-day holiday dates
+            special_sessions: Dates that trade despite the rules
+            observed: Dates known to have traded (e.g. union of bar dates)
+        """
+        self.holidays = pd.DatetimeIndex(sorted(holidays)).as_unit('ns')
+        self.special_sessions = pd.DatetimeIndex(sorted(special_sessions)).as_unit('ns')
+        self.observed = None
+        if observed is not None and len(observed):
+            self.observed = pd.DatetimeIndex(observed).as_unit('ns').normalize().unique().sort_values()
+
+    def with_observed(self, dates):
+        """Same holidays and special sessions, with dates as the observed sessions."""
+        return TradingCalendar(self.holidays, self.special_sessions, observed=dates)
+
+    def is_holiday(self, date):
+        """Whether date is a listed full-day holiday."""
+        return _day(date) in self.holidays
+
+    def is_trading_day(self, date, special=True):
+        """
+        Whether the exchange trades on date.
+
+        Args:
+            date: Date, datetime or 'YYYY-MM-DD'
+            special: Count special sessions (e.g. Muhurat trading) as trading days
+
+        Returns:
+            bool
+        """
+        day = _day(date)
+        if self.observed is not None and self.observed[0] <= day <= self.observed[-1]:
+            if day in self.observed:
+                return special or day.weekday() < 5 and day not in self.holidays
+            return False
+        if special and day in self.special_sessions:
+            return True
+        return day.weekday() < 5 and day not in self.holidays
+
+    def sessions(self, start, end, special=True):
+        """
+        Trading days from start to end (inclusive).
+
+        Returns:
+            pandas.DatetimeIndex
+        """
+        start, end = _day(start), _day(end)
+        days = pd.bdate_range(start, end).as_unit('ns')
+        days = days[~days.isin(self.holidays)]
+        if special:
+            extra = self.special_sessions[(self.special_sessions >= start) & (self.special_sessions <= end)]
+            days = days.union(extra)
+
+        if self.observed is None or end < self.observed[0] or start > self.observed[-1]:
+            return days
+
+        lo, hi = max(start, self.observed[0]), min(end, self.observed[-1])
+        observed = self.observed[(self.observed >= lo) & (self.observed <= hi)]
+        if not special:
+            observed = observed[(observed.weekday < 5) & ~observed.isin(self.holidays)]
+        return days[(days < lo) | (days > hi)].union(observed)
+
+    def next_session(self, date, special=True):
+        """First trading day after date."""
+        day = _day(date) + timedelta(days=1)
+        while not self.is_trading_day(day, special=special):
+            day += timedelta(days=1)
+        return day
+
+    def previous_session(self, date, special=True):
+        """Last trading day before date."""
+        day = _day(date) - timedelta(days=1)
+        while not self.is_trading_day(day, special=special):
+            day -= timedelta(days=1)
+        return day
+
+
+_nse_calendar = TradingCalendar()
+
+
+def nse_calendar():
+    """The shared NSE calendar (holiday list and special sessions only)."""
+    return _nse_calendar
@@ -1,11 +1,30 @@
 """Utility functions."""
+import json
 import logging
 import sys
 from pathlib import Path
 
+TIMING_LOGGER = "scanner.timing"
 
-def setup_logging(level="INFO"):
-    """Configure logging for the application."""
+
+class TimingFormatter(logging.Formatter):
+    """One JSON object per line from the structured fields of a timing record."""
+
+    def format(self, record):
+        event = {'ts': record.created}
+        event.update(getattr(record, 'timing', {'message': record.getMessage()}))
+        return json.dumps(event, default=str)
+
+
+def setup_logging(level="INFO", timing_path=None):
+    """
+    Configure logging for the application.
+    
+    Args:
+        level: Log level name
+        timing_path: If given, stage timings from the 'scanner.timing'
+            channel are written there as JSON lines instead of the console
+    """
     logging.basicConfig(
         level=getattr(logging, level.upper()),
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -13,6 +32,15 @@ def setup_logging(level="INFO"):
             logging.StreamHandler(sys.stdout)
         ]
     )
+    
+    if timing_path is not None:
+        handler = logging.FileHandler(timing_path, mode='w')
+        handler.setFormatter(TimingFormatter())
+        timing_logger = logging.getLogger(TIMING_LOGGER)
+        timing_logger.addHandler(handler)
+        timing_logger.setLevel(logging.DEBUG)
+        timing_logger.propagate = False
+    
     return logging.getLogger(__name__)
 
 
@@ -0,0 +1,238 @@
+"""Watch the market-data store and report SuperTrend flips as new bars arrive."""
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from .data_fetcher import load_cached_many, list_cached_symbols
+from .indicator_cache import series_hashes
+from .indicators import supertrend
+from .manifest import content_hash
+from .market_store import MarketDataStore
+from .signal_detector import find_flips
+from .timeframes import DERIVED_TIMEFRAMES
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_COLUMNS = ['detected_at', 'symbol', 'signal', 'date', 'close', 'supertrend', 'sector']
+
+WEBHOOK_TIMEOUT = 10
+
+# Length of a stored (base) bar; derived bars take theirs from DERIVED_TIMEFRAMES
+BASE_BAR_LENGTHS = {'1d': pd.Timedelta(days=1), '1h': pd.Timedelta(hours=1), '5m': pd.Timedelta(minutes=5)}
+
+
+def flip_events(df_st):
+    """
+    Every BUY/SELL flip in a SuperTrend frame.
+
+    Args:
+        df_st: DataFrame with Date, Close, ST and ST_dir columns
+
+    Returns:
+        set: {(Timestamp, 'BUY' | 'SELL')}
+    """
+    buy_rows, buy_cols, sell_rows, sell_cols = find_flips(df_st['ST_dir'].to_numpy())
+    dates = pd.to_datetime(df_st['Date'])
+    return ({(dates.iloc[i], 'BUY') for i in buy_cols} |
+            {(dates.iloc[i], 'SELL') for i in sell_cols})
+
+
+def bar_end(date, timeframe):
+    """
+    When the bar labelled date closes (the start of the next bar).
+
+    Args:
+        date: Bar date (start of its bucket for derived timeframes)
+        timeframe: Bar interval
+
+    Returns:
+        Timestamp, or None for an unknown timeframe
+    """
+    date = pd.Timestamp(date)
+    bucket = DERIVED_TIMEFRAMES[timeframe][1] if timeframe in DERIVED_TIMEFRAMES else BASE_BAR_LENGTHS.get(timeframe)
+    if bucket is None:
+        return None
+    if bucket == 'W':
+        return date + pd.Timedelta(days=7)
+    if bucket == 'M':
+        return date + pd.offsets.MonthBegin(1)
+    return date + bucket
+
+
+class SignalWatcher:
+    """
+    Keeps each symbol's SuperTrend in memory and rescans only changed symbols.
+
+    Each poll is one manifest query: symbols whose series hash moved are
+    reloaded, and of those only the ones whose bars at the watched timeframe
+    actually changed (a new daily bar often leaves earlier weekly bars as
+    they were) get SuperTrend recomputed. Flips on completed bars that were
+    never reported for the symbol are new signals: a flip on the unfinished
+    last bar (e.g. this week's, rewritten by every daily bar) is held back,
+    and a flip that disappears and comes back is not sent twice.
+    """
+
+    def __init__(self, cache_dir, atr_period, multiplier, timeframe='1wk', symbols=None, sectors=None,
+                 output_dir=None, webhook=None):
+        """
+        Initialize watcher
+
+        Args:
+            cache_dir: Market-data store root
+            atr_period: ATR period for SuperTrend
+            multiplier: Multiplier for SuperTrend
+            timeframe: Bar interval to watch
+            symbols: Symbols to watch (None for every stored symbol, including new ones)
+            sectors: Optional {symbol: sector}
+            output_dir: Directory for signals.csv (None to skip writing)
+            webhook: URL to POST new signals to as JSON (optional)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.store = MarketDataStore(cache_dir)
+        self.atr_period = atr_period
+        self.multiplier = multiplier
+        self.timeframe = timeframe
+        self.symbols = None if symbols is None else list(symbols)
+        self.sectors = sectors or {}
+        self.output_path = Path(output_dir) / "signals.csv" if output_dir is not None else None
+        self.webhook = webhook
+
+        self.series = {}  # symbol -> manifest series hash last seen
+        self.bars = {}    # symbol -> content hash of the bars SuperTrend was computed on
+        self.frames = {}  # symbol -> SuperTrend frame
+        self.events = {}  # symbol -> flips on completed bars of the frame
+        self.published = {}  # symbol -> every flip already seen or reported
+        self.primed = False
+
+    def _watched(self):
+        if self.symbols is not None:
+            return self.symbols
+        return list_cached_symbols(self.cache_dir, timeframe=self.timeframe)
+
+    def changed_symbols(self):
+        """Symbols whose stored series differ from the last scan."""
+        hashes = series_hashes(self.store, self._watched(), self.timeframe)
+
+        for symbol in set(self.series) - set(hashes):
+            # Deleted from the store
+            for state in (self.series, self.bars, self.frames, self.events, self.published):
+                state.pop(symbol, None)
+
+        return [symbol for symbol, h in hashes.items() if self.series.get(symbol) != h], hashes
+
+    def poll(self):
+        """
+        Rescan changed symbols.
+
+        The first poll only loads the state; later polls report flips on
+        completed bars that were never reported for the symbol.
+
+        Returns:
+            list: New signals as dicts (SIGNAL_COLUMNS)
+        """
+        changed, hashes = self.changed_symbols()
+        if not changed:
+            return []
+
+        data = load_cached_many(changed, self.cache_dir, timeframe=self.timeframe)
+        detected_at = datetime.now().isoformat(timespec='seconds')
+        signals = []
+        recomputed = 0
+
+        for symbol in changed:
+            self.series[symbol] = hashes[symbol]
+            df = data.get(symbol)
+            if df is None or df.empty:
+                continue
+
+            bars_hash = content_hash(df)
+            if self.bars.get(symbol) == bars_hash:
+                continue
+
+            try:
+                df_st = supertrend(df, atr_period=self.atr_period, multiplier=self.multiplier)
+            except Exception as e:
+                logger.error(f"Error computing SuperTrend for {symbol}: {str(e)}")
+                continue
+            recomputed += 1
+
+            events = flip_events(df_st)
+            last_date = pd.Timestamp(df_st['Date'].iloc[-1])
+            end = bar_end(last_date, self.timeframe)
+            if end is not None and end > pd.Timestamp.now():
+                # The last bar is still forming; its flip may not survive the bucket
+                events = {event for event in events if event[0] != last_date}
+
+            published = self.published.get(symbol)
+            if published is not None:
+                by_date = df_st.assign(Date=pd.to_datetime(df_st['Date'])).set_index('Date')
+                for date, signal in sorted(events - published):
+                    signals.append({
+                        'detected_at': detected_at,
+                        'symbol': symbol,
+                        'signal': signal,
+                        'date': date,
+                        'close': float(by_date.at[date, 'Close']),
+                        'supertrend': float(by_date.at[date, 'ST']),
+                        'sector': self.sectors.get(symbol),
+                    })
+
+            self.bars[symbol] = bars_hash
+            self.frames[symbol] = df_st
+            self.events[symbol] = events
+            self.published[symbol] = (published or set()) | events
+
+        if not self.primed:
+            self.primed = True
+            logger.info(f"Watching {len(self.frames)} symbols")
+            return []
+
+        logger.info(f"{len(changed)} symbols changed, {recomputed} recomputed, {len(signals)} new signals")
+        if signals:
+            self.publish(signals)
+        return signals
+
+    def publish(self, signals):
+        """Append signals to signals.csv and POST them to the webhook."""
+        if self.output_path is not None:
+            try:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                pd.DataFrame(signals, columns=SIGNAL_COLUMNS).to_csv(
+                    self.output_path, mode='a', index=False, header=not self.output_path.exists()
+                )
+            except Exception as e:
+                logger.error(f"Error writing signals: {str(e)}")
+
+        if self.webhook:
+            import requests
+
+            payload = {'signals': [dict(s, date=str(s['date'].date())) for s in signals]}
+            try:
+                response = requests.post(self.webhook, json=payload, timeout=WEBHOOK_TIMEOUT)
+                response.raise_for_status()
+            except Exception as e:
+                # Signals are already on disk; a failed push must not stop the watch
+                logger.error(f"Error posting signals to webhook: {str(e)}")
+
+    def run(self, interval=60, max_polls=None, on_signals=None):
+        """
+        Poll until interrupted.
+
+        Args:
+            interval: Seconds between polls
+            max_polls: Stop after this many polls (None to run forever)
+            on_signals: Called with each non-empty list of new signals
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            started = time.perf_counter()
+            signals = self.poll()
+            polls += 1
+            if signals and on_signals is not None:
+                on_signals(signals)
+            if max_polls is not None and polls >= max_polls:
+                break
+            time.sleep(max(interval - (time.perf_counter() - started), 0))
@@ -0,0 +1,67 @@
+"""Tests for the grouped analytics engine."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner.analyser import grouped_stats, group_key, profit_loss_buckets, threshold_analysis
+from tests.test_report_sink import make_trades
+
+
+def test_grouped_stats_match_per_group_pandas():
+    trades = make_trades(3000)
+    grouped = grouped_stats(trades, ['sector', 'holding_bucket'], quantiles=(0.1, 0.25, 0.75))
+
+    completed = trades.dropna(subset=['pct_change'])
+    buckets = group_key(completed, 'holding_bucket')
+    for (sector, bucket), row in grouped.iterrows():
+        group = completed[(completed['sector'] == sector) & (buckets == bucket)]
+        returns = group['pct_change'].astype(float)
+        assert row['trades'] == len(group)
+        assert row['mean_return'] == pytest.approx(returns.mean())
+        assert row['median_return'] == pytest.approx(returns.median())
+        assert row['std_return'] == pytest.approx(returns.std())
+        assert row['q10_return'] == pytest.approx(returns.quantile(0.1))
+        assert row['win_rate'] == pytest.approx((returns > 0).mean() * 100)
+        assert row['median_weeks_held'] == pytest.approx(group['weeks_held'].astype(float).median())
+
+    # Trades without a sector or still open are left out
+    assert grouped['trades'].sum() == completed['sector'].notna().sum()
+
+
+def test_derived_keys_and_errors():
+    trades = make_trades(500)
+    by_bucket = grouped_stats(trades, 'return_bucket')
+    buckets = profit_loss_buckets(trades)
+    assert by_bucket.loc['neutral', 'trades'] == buckets['neutral']['count']
+    assert by_bucket.loc['profit 1-5%', 'trades'] == buckets['profit_buckets']['1-5%']['count']
+    assert by_bucket.loc['loss 10%+', 'trades'] == buckets['loss_buckets']['10%+']['count']
+
+    assert list(grouped_stats(trades, 'year').index) == [2020]
+    assert grouped_stats(trades.iloc[:0], ['sector', 'year']).index.names == ['sector', 'year']
+    with pytest.raises(ValueError):
+        grouped_stats(trades, 'no_such_key')
+
+
+def test_threshold_analysis_counts_strictly_within():
+    trades = pd.DataFrame({'pct_change': [-5.0, 4.99, 5.0, 12.0, np.nan]})
+    result = threshold_analysis(trades, thresholds=[10, 5])
+    assert result == {
+        'within_5pct': {'count': 1, 'percentage': 25.0},
+        'within_10pct': {'count': 3, 'percentage': 75.0},
+    }
+
+
+def test_bootstrap_intervals_cover_the_mean():
+    trades = make_trades(4000)
+    grouped = grouped_stats(trades, 'sector', bootstrap=400, seed=3)
+
+    assert (grouped['mean_return_ci_low'] < grouped['mean_return']).all()
+    assert (grouped['mean_return'] < grouped['mean_return_ci_high']).all()
+    assert (grouped['win_rate_ci_low'] < grouped['win_rate']).all()
+    assert (grouped['win_rate'] < grouped['win_rate_ci_high']).all()
+    # Interval width roughly matches the normal approximation
+    se = grouped['std_return'] / np.sqrt(grouped['trades'])
+    width = grouped['mean_return_ci_high'] - grouped['mean_return_ci_low']
+    assert np.allclose(width, 2 * 1.96 * se, rtol=0.25)
+
+    again = grouped_stats(trades, 'sector', bootstrap=400, seed=3)
+    pd.testing.assert_frame_equal(grouped, again)
@@ -0,0 +1,112 @@
+"""Tests for the backtest engine's preloaded price panel."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from strategies.base_strategy import BaseStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.pullback_entry import PullbackEntryStrategy
+from utils.backtest_engine import BacktestConfig, BacktestEngine, cross_check_modes
+from utils.price_panel import PricePanel
+from scanner.market_store import MarketDataStore
+from benchmarks.synthetic import generate_universe
+
+
+class AboveSMA(BaseStrategy):
+    """Buys closes above their 20-day SMA."""
+
+    def __init__(self):
+        super().__init__("above_sma", "test strategy")
+
+    def scan(self, symbols, **kwargs):
+        return []
+
+    def validate_signal(self, df):
+        return df['close'].iloc[-1] > self.calculate_sma(df, 20).iloc[-1]
+
+    def calculate_targets(self, df, entry_price):
+        return {'stop_loss': entry_price * 0.95, 'target': entry_price * 1.08}
+
+
+def test_panel_lookups():
+    universe = generate_universe(3, years=2, seed=2)
+    universe['SYN0001.NS'] = universe['SYN0001.NS'].iloc[100:]  # listed later
+    panel = PricePanel(universe)
+
+    df = universe['SYN0000.NS']
+    date = df['Date'].iloc[300].to_pydatetime()
+    history = panel.history('SYN0000.NS', date, days=365)
+    expected = df[(df['Date'] >= pd.Timestamp(date) - pd.Timedelta(days=365)) & (df['Date'] < date)]
+    assert history['close'].tolist() == expected['Close'].tolist()
+    assert np.shares_memory(history['close'].to_numpy(), panel.frames['SYN0000.NS']['close'].to_numpy())
+
+    assert panel.bar('SYN0000.NS', date)['close'] == df['Close'].iloc[300]
+    assert panel.bar('SYN0001.NS', universe['SYN0000.NS']['Date'].iloc[0].to_pydatetime()) is None
+    assert panel.bar('SYN0000.NS', datetime(2023, 1, 1)) is None  # a Sunday
+    assert panel.bar('UNKNOWN.NS', date) is None
+    assert panel.history('UNKNOWN.NS', date) is None
+    assert np.isnan(panel.field('close')[:100, panel.index['SYN0001.NS']]).all()
+
+
+def test_offline_run_from_store(tmp_path, monkeypatch):
+    universe = generate_universe(5, years=3, seed=4)
+    store = MarketDataStore(tmp_path)
+    for symbol, df in universe.items():
+        store.write(symbol, '1d', df)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("backtest downloaded data")
+    monkeypatch.setattr('yfinance.download', no_network)
+
+    config = BacktestConfig(start_date='2023-01-01', end_date='2024-06-30', initial_capital=100000)
+    result = BacktestEngine(config, cache_dir=tmp_path, offline=True).run(AboveSMA(), list(universe))
+
+    assert result.total_trades > 0
+    # One equity point per session in the data, none for weekends or holidays
+    dates = pd.concat([df['Date'] for df in universe.values()])
+    sessions = sorted(set(dates[(dates >= '2023-01-01') & (dates <= '2024-06-30')]))
+    assert [point['date'] for point in result.equity_curve] == [d.strftime('%Y-%m-%d') for d in sessions]
+    for trade in result.trades:
+        df = universe[trade['symbol']].set_index('Date')
+        entry = pd.Timestamp(trade['entry_date'])
+        # Entries use the last close before the entry date
+        assert trade['entry_price'] == df.loc[:entry - pd.Timedelta(days=1), 'Close'].iloc[-1]
+
+
+def test_vectorized_and_loop_modes_agree():
+    universe = generate_universe(12, years=2, seed=6)
+    panel = PricePanel(universe)
+    config = BacktestConfig(start_date='2024-01-01', end_date='2024-12-31', initial_capital=100000)
+
+    check = cross_check_modes(config, PullbackEntryStrategy(), list(universe), panel=panel)
+    assert check['vectorized'].total_trades > 0
+    assert check['match'], (check['only_vectorized'], check['only_loop'])
+
+
+def test_mean_reversion_modes_agree():
+    universe = generate_universe(20, years=3, seed=6)
+    config = BacktestConfig(start_date='2024-01-01', end_date='2024-12-31', initial_capital=100000)
+    strategy = MeanReversionStrategy()
+    strategy.max_rsi, strategy.min_volume_ratio, strategy.min_selloff_pct = 45, 1.0, 2.0  # trade on synthetic data
+
+    check = cross_check_modes(config, strategy, list(universe), panel=PricePanel(universe))
+    assert check['vectorized'].total_trades > 0
+    assert check['match'], (check['only_vectorized'], check['only_loop'])
+
+
+def test_strategies_without_the_hook_fall_back():
+    universe = generate_universe(3, years=2, seed=6)
+    config = BacktestConfig(start_date='2024-06-01', end_date='2024-08-31', initial_capital=100000)
+
+    engine = BacktestEngine(config, panel=PricePanel(universe))
+    assert engine.run(AboveSMA(), list(universe)).total_trades > 0
+    assert engine.signals == {}
+
+    with pytest.raises(ValueError):
+        BacktestEngine(config, panel=PricePanel(universe), mode='vectorized').run(AboveSMA(), list(universe))
@@ -0,0 +1,70 @@
+"""Tests for the parallel batch backtest runner."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.backtest_engine import BacktestConfig, BacktestEngine
+from utils.batch_backtest import expand_jobs, make_strategy, run_batch
+from utils.price_panel import PricePanel
+from benchmarks.synthetic import generate_universe
+
+
+def test_saved_panel_opens_memory_mapped(tmp_path):
+    universe = generate_universe(4, years=2, seed=3)
+    universe['SYN0002.NS'] = universe['SYN0002.NS'].iloc[50:]
+    panel = PricePanel(universe)
+
+    opened = PricePanel.open(panel.save(tmp_path))
+    assert isinstance(opened.prices, np.memmap)
+    assert opened.symbols == panel.symbols
+    assert opened.dates.equals(panel.dates)
+
+    date = panel.dates[400].to_pydatetime()
+    for symbol in panel.symbols:
+        assert opened.bar(symbol, date) == panel.bar(symbol, date)
+        assert opened.history(symbol, date).equals(panel.history(symbol, date))
+    np.testing.assert_array_equal(opened.field('close'), panel.field('close'))
+
+
+def test_expand_jobs_validates_parameters():
+    universes = {'a': ['SYN0000.NS'], 'b': ['SYN0001.NS', 'SYN0002.NS']}
+    jobs = expand_jobs(
+        ['pullback_entry', 'mean_reversion'], universes,
+        {'pullback_entry': [{'min_volume_ratio': 0.9}, {'min_volume_ratio': 1.2, 'max_positions': 2}]}
+    )
+    assert [(job.strategy, job.universe) for job in jobs] == [
+        ('pullback_entry', 'a'), ('pullback_entry', 'b'), ('pullback_entry', 'a'), ('pullback_entry', 'b'),
+        ('mean_reversion', 'a'), ('mean_reversion', 'b'),
+    ]
+    assert make_strategy('pullback_entry', jobs[2].params).min_volume_ratio == 1.2
+
+    with pytest.raises(ValueError):
+        expand_jobs(['pullback_entry'], universes, [{'no_such_threshold': 1}])
+    with pytest.raises(ValueError):
+        expand_jobs(['no_such_strategy'], universes)
+
+
+@pytest.mark.parametrize('executor', ['process', 'serial'])
+def test_batch_matches_single_runs(executor):
+    universe = generate_universe(8, years=2, seed=6)
+    symbols = list(universe)
+    panel = PricePanel(universe)
+    config = BacktestConfig(start_date='2024-01-01', end_date='2024-12-31', initial_capital=100000)
+    universes = {'first': symbols[:4], 'all': symbols}
+    param_sets = [{}, {'min_volume_ratio': 0.9, 'max_positions': 2}]
+
+    batch = run_batch(config, ['pullback_entry'], universes, param_sets, panel=panel,
+                      executor=executor, max_workers=2)
+
+    assert len(batch.table) == 4 and batch.table['error'].isna().all()
+    assert (batch.table['total_trades'] > 0).all()
+    assert batch.table['total_return_pct'].is_monotonic_decreasing
+    for job in batch.jobs:
+        job_config = BacktestConfig(**{**config.to_dict(), **{k: v for k, v in job.params.items() if k == 'max_positions'}})
+        expected = BacktestEngine(job_config, panel=panel).run(make_strategy(job.strategy, job.params), job.symbols)
+        assert batch.results[job.job_id]['trades'] == expected.to_dict()['trades']
+        assert batch.results[job.job_id]['final_capital'] == expected.final_capital
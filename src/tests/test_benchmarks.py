@@ -0,0 +1,38 @@
+"""Tests for the synthetic benchmark data and the baseline check."""
+import pandas as pd
+from benchmarks.synthetic import trading_sessions, generate_universe
+from benchmarks.suite import run_suite, save_baseline, load_baseline, compare
+
+
+def test_synthetic_universe_is_deterministic_and_valid():
+    sessions = trading_sessions('2020-01-01', '2020-12-31')
+    assert (sessions.dayofweek < 5).all()
+    assert not ((sessions.month == 1) & (sessions.day == 26)).any()
+    assert len(sessions) < len(pd.bdate_range('2020-01-01', '2020-12-31')) - 5
+
+    first = generate_universe(20, years=3, seed=7)
+    second = generate_universe(20, years=3, seed=7)
+    for symbol, df in first.items():
+        pd.testing.assert_frame_equal(df, second[symbol])
+        assert df['Date'].is_monotonic_increasing
+        assert (df['High'] >= df[['Open', 'Close']].max(axis=1)).all()
+        assert (df['Low'] <= df[['Open', 'Close']].min(axis=1)).all()
+        assert (df['Low'] > 0).all()
+
+    # Late listings and trading halts leave symbols with different histories
+    lengths = {len(df) for df in first.values()}
+    assert len(lengths) > 1
+
+
+def test_suite_and_regression_check(tmp_path):
+    results = run_suite(sizes=(3,), repeat=1, cases=['atr', 'compute_summary_stats', 'analyze'])
+    assert set(results) == {'atr/3', 'compute_summary_stats/3', 'analyze/3'}
+    assert all(timing['rows'] > 0 for timing in results.values())
+
+    path = save_baseline(results, tmp_path / 'baseline.json', repeat=1)
+    baseline = load_baseline(path)
+    assert not any(row['regressed'] for row in compare(results, baseline))
+
+    slower = {key: dict(timing, min_s=timing['min_s'] * 2 + 1) for key, timing in results.items()}
+    assert all(row['regressed'] for row in compare(slower, baseline))
+    assert load_baseline(tmp_path / 'missing.json') is None
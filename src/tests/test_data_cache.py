@@ -0,0 +1,145 @@
+"""Tests for the shared OHLCV cache behind BaseStrategy.fetch_data."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from strategies.data_cache import OHLCVCache, period_start
+from scanner.market_store import MarketDataStore
+
+
+def make_bars(n=60):
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=n, freq='B', name='Date')
+    return pd.DataFrame({
+        'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 1000
+    }, index=dates)
+
+
+class CountingLoader:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, symbol, period, interval):
+        self.calls.append((symbol, period, interval))
+        time.sleep(self.delay)
+        return make_bars()
+
+
+def test_hits_misses_and_isolation():
+    """Repeat lookups are served from memory and callers get private copies."""
+    cache = OHLCVCache()
+    loader = CountingLoader()
+
+    first = cache.get('TCS.NS', '3mo', '1d', loader)
+    first['close'] = -1.0
+    second = cache.get('TCS.NS', '3mo', '1d', loader)
+    cache.get('TCS.NS', '6mo', '1d', loader)
+
+    assert len(loader.calls) == 2
+    assert (second['close'] > 0).all()
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+
+def test_single_flight():
+    """Concurrent lookups of one key should share a single load."""
+    cache = OHLCVCache()
+    loader = CountingLoader(delay=0.1)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get('A.NS', '3mo', '1d', loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loader.calls) == 1
+    assert len(results) == 8
+    assert cache.stats()['coalesced'] + cache.stats()['hits'] == 7
+
+
+def test_ttl_and_lru_bounds():
+    """Expired entries reload; the least recently used entry is evicted."""
+    cache = OHLCVCache(max_entries=2, ttl=0.05)
+    loader = CountingLoader()
+
+    cache.get('A.NS', '3mo', '1d', loader)
+    time.sleep(0.06)
+    cache.get('A.NS', '3mo', '1d', loader)
+    assert cache.stats()['expirations'] == 1
+
+    cache.ttl = 60
+    cache.get('B.NS', '3mo', '1d', loader)
+    cache.get('C.NS', '3mo', '1d', loader)
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+
+
+def test_spills_to_store(tmp_path):
+    """A fresh cache in another process should be served from the store."""
+    store = MarketDataStore(tmp_path)
+    OHLCVCache(store=store).get('INFY.NS', '1mo', '1d', CountingLoader())
+
+    loader = CountingLoader()
+    cache = OHLCVCache(store=store)
+    df = cache.get('INFY.NS', '1mo', '1d', loader)
+
+    assert loader.calls == []
+    assert cache.stats()['disk_hits'] == 1
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert df.index.min() >= period_start('1mo')
+
+
+def test_get_many_batches_misses_through_the_store(tmp_path):
+    """Only symbols missing from memory and the store reach the batch loader."""
+    store = MarketDataStore(tmp_path)
+    OHLCVCache(store=store).get('INFY.NS', '1mo', '1d', CountingLoader())
+
+    batches = []
+    def batch_loader(symbols, period, interval):
+        batches.append(list(symbols))
+        return {symbol: make_bars() for symbol in symbols if symbol != 'NONE.NS'}
+
+    cache = OHLCVCache(store=store)
+    cache.get('TCS.NS', '1mo', '1d', CountingLoader())
+    frames = cache.get_many(['TCS.NS', 'INFY.NS', 'WIPRO.NS', 'NONE.NS'], '1mo', '1d', batch_loader)
+
+    assert batches == [['WIPRO.NS', 'NONE.NS']]
+    assert set(frames) == {'TCS.NS', 'INFY.NS', 'WIPRO.NS'}
+    assert cache.stats()['disk_hits'] == 1 and cache.stats()['hits'] == 1
+
+    # The batch-loaded bars are shared with fetch_data lookups and other processes
+    loader = CountingLoader()
+    assert cache.get('WIPRO.NS', '1mo', '1d', loader) is not None
+    assert OHLCVCache(store=store).get('WIPRO.NS', '1mo', '1d', loader) is not None
+    assert loader.calls == []
+
+
+def test_recently_stored_old_window_is_not_fresh(tmp_path):
+    """Bars written just now but ending months ago must be re-fetched."""
+    store = MarketDataStore(tmp_path)
+    old = make_bars(300).iloc[:-10]
+    store.write('INFY.NS', '1d', old.rename_axis('Date').reset_index())
+
+    loader = CountingLoader()
+    df = OHLCVCache(store=store).get('INFY.NS', '1mo', '1d', loader)
+
+    assert len(loader.calls) == 1
+    assert df.index.max() == make_bars().index.max()
+
+
+def test_period_start():
+    now = pd.Timestamp('2024-05-15 13:00')
+    assert period_start('3mo', now) == pd.Timestamp('2024-02-15')
+    assert period_start('1y', now) == pd.Timestamp('2023-05-15')
+    assert period_start('ytd', now) == pd.Timestamp('2024-01-01')
+    assert period_start('max', now) is None
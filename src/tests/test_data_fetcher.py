@@ -0,0 +1,140 @@
+"""Tests for incremental fetching into the market-data store."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner import data_fetcher
+from scanner.data_fetcher import fetch_incremental, fetch_batch, load_cached
+from scanner.market_store import MarketDataStore
+from scanner.providers import ReplayProvider, split_wide_frame
+from scanner.scheduler import FetchScheduler
+
+
+def make_history(start, periods, close_offset=0.0):
+    """Daily (business-day) bars starting on a Monday."""
+    dates = pd.date_range(start, periods=periods, freq='B', tz='Asia/Kolkata')
+    close = 100 + np.arange(periods, dtype=float) + close_offset
+    return pd.DataFrame({
+        'Date': dates,
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000
+    })
+
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    """Replace yfinance with a fixed 40-week daily history; record requests."""
+    history = make_history('2023-01-02', 200)
+    calls = []
+    
+    def download(symbol, start_date, end_date, interval):
+        calls.append((pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        dates = history['Date'].dt.tz_localize(None)
+        mask = (dates >= pd.Timestamp(start_date)) & (dates < pd.Timestamp(end_date))
+        return history[mask].reset_index(drop=True) if mask.any() else None
+    
+    monkeypatch.setattr(data_fetcher, '_download', download)
+    return history, calls
+
+
+def test_incremental_fetch_requests_only_tail(tmp_path, fake_download):
+    """Second fetch should request from the last cached bar onwards."""
+    history, calls = fake_download
+    
+    first = fetch_incremental('TEST.NS', '2023-01-01', '2023-06-01', tmp_path)
+    assert first is not None
+    cached_last = MarketDataStore(tmp_path).date_range('TEST.NS', '1d')[1]
+    
+    merged = fetch_incremental('TEST.NS', '2023-01-01', '2023-10-31', tmp_path)
+    
+    assert calls[-1][0] == cached_last
+    assert len(merged) == 40
+    assert merged['Date'].is_unique
+    assert merged['Date'].is_monotonic_increasing
+
+
+def test_incremental_fetch_replaces_partial_bar(tmp_path, fake_download):
+    """A partially formed last bar should be overwritten by the new download."""
+    store = MarketDataStore(tmp_path)
+    partial = make_history('2023-01-02', 125)
+    partial.loc[124, 'Close'] = -1.0  # stale, still-forming bar
+    store.write('TEST.NS', '1d', partial)
+    
+    merged = fetch_incremental('TEST.NS', '2023-01-01', '2023-10-31', tmp_path)
+    
+    assert (merged['Close'] > 0).all()
+    assert len(merged) == 40
+
+
+def test_incremental_fetch_up_to_date(tmp_path, fake_download):
+    """No download when the cache already covers the end date."""
+    history, calls = fake_download
+    MarketDataStore(tmp_path).write('TEST.NS', '1d', history)
+    
+    df = fetch_incremental('TEST.NS', '2023-01-01', '2023-06-01', tmp_path)
+    
+    assert calls == []
+    assert len(df) == 40
+
+
+@pytest.fixture
+def replay_source(tmp_path):
+    """Local store with 40 weeks of daily bars for five symbols."""
+    source = MarketDataStore(tmp_path / 'source')
+    symbols = [f'S{i}.NS' for i in range(5)]
+    for i, symbol in enumerate(symbols):
+        source.write(symbol, '1d', make_history('2023-01-02', 200, close_offset=i))
+    return ReplayProvider(tmp_path / 'source'), symbols
+
+
+def test_fetch_batch_one_request_per_chunk(tmp_path, replay_source):
+    """Symbols should be downloaded in chunks and split back per symbol."""
+    provider, symbols = replay_source
+    
+    scheduler = FetchScheduler(provider, rate=0, max_retries=0)
+    statuses = fetch_batch(symbols + ['MISSING.NS'], '2023-01-01', '2023-10-31', tmp_path / 'cache',
+                           chunk_size=2, scheduler=scheduler)
+    
+    assert len(provider.requests) == 3
+    assert statuses['MISSING.NS'] == 'failed'
+    store = MarketDataStore(tmp_path / 'cache')
+    for i, symbol in enumerate(symbols):
+        assert statuses[symbol] == 'fetched'
+        df = load_cached(symbol, tmp_path / 'cache')
+        assert len(df) == 40
+        assert df['Open'].iloc[0] == 100 + i
+
+
+def test_fetch_batch_incremental_groups_by_tail(tmp_path, replay_source):
+    """Cached symbols sharing a last bar should share one tail request."""
+    provider, symbols = replay_source
+    cache = MarketDataStore(tmp_path / 'cache')
+    for symbol in symbols:
+        cache.write(symbol, '1d', provider.store.read(symbol, '1d').iloc[:150])
+    
+    tail_start = cache.date_range(symbols[0], '1d')[1]
+    
+    statuses = fetch_batch(symbols, '2023-01-01', '2023-10-31', tmp_path / 'cache',
+                           chunk_size=10, provider=provider)
+    
+    assert len(provider.requests) == 1
+    assert provider.requests[0][3] == '1d'
+    assert pd.Timestamp(provider.requests[0][1]) == tail_start
+    assert set(statuses.values()) == {'updated'}
+    assert all(len(load_cached(symbol, tmp_path / 'cache')) == 40 for symbol in symbols)
+
+
+def test_split_wide_frame():
+    """Multi-ticker (ticker, field) columns should split into OHLCV frames."""
+    a = make_history('2023-01-02', 5).set_index('Date')
+    b = make_history('2023-01-02', 5, close_offset=10).set_index('Date')
+    b.iloc[:2] = np.nan  # listed later
+    wide = pd.concat({'A.NS': a, 'B.NS': b}, axis=1)
+    
+    frames = split_wide_frame(wide, ['A.NS', 'B.NS', 'C.NS'])
+    
+    assert set(frames) == {'A.NS', 'B.NS'}
+    assert list(frames['A.NS'].columns) == ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    assert len(frames['B.NS']) == 3
@@ -0,0 +1,59 @@
+"""Tests for sharded analyze/compute execution."""
+import pytest
+import pandas as pd
+from scanner.market_store import MarketDataStore
+from scanner.executor import make_shards, run_sharded, analyze_shard, compute_shard
+from scanner.trades import concat_trades
+from tests.test_integration import create_realistic_data
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    store = MarketDataStore(tmp_path / 'market')
+    for i in range(6):
+        store.write(f'SYM{i}.NS', '1wk', create_realistic_data(150, seed=i))
+    return tmp_path / 'market'
+
+
+def test_make_shards():
+    symbols = [f'S{i}' for i in range(10)]
+
+    assert make_shards(symbols, shard_size=4) == [symbols[:4], symbols[4:8], symbols[8:]]
+    # Small universes are split into about four shards per worker
+    assert len(make_shards(symbols, shard_size=64, max_workers=2)) == 5
+    assert make_shards([], shard_size=4) == []
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_pooled_analyze_matches_serial(store_dir, executor):
+    """Every backend should produce the same trades, shard for shard."""
+    symbols = [f'SYM{i}.NS' for i in range(6)] + ['MISSING.NS']
+    shards = make_shards(symbols, shard_size=2)
+    kwargs = dict(cache_dir=store_dir, atr_period=10, multiplier=3.0, include_open=True,
+                  sectors={'SYM0.NS': 'IT'})
+
+    serial = dict((tuple(s), r) for s, r in run_sharded(analyze_shard, shards, 'serial', **kwargs))
+    pooled = dict((tuple(s), r) for s, r in run_sharded(analyze_shard, shards, executor, 2, **kwargs))
+
+    assert serial.keys() == pooled.keys()
+    for shard in serial:
+        pd.testing.assert_frame_equal(serial[shard], pooled[shard])
+
+    trades = concat_trades(serial.values())
+    assert len(trades) > 0
+    assert set(trades['symbol']) <= set(symbols[:-1])
+    assert (trades.loc[trades['symbol'] == 'SYM0.NS', 'sector'] == 'IT').all()
+
+
+def test_compute_shard_writes_outputs(store_dir, tmp_path):
+    computed, failed, unchanged = compute_shard(['SYM0.NS', 'MISSING.NS'], store_dir, 10, 3.0, tmp_path)
+
+    assert computed == ['SYM0.NS']
+    assert failed == ['MISSING.NS']
+    assert unchanged == []
+    assert 'ST_dir' in pd.read_csv(tmp_path / 'SYM0_NS_st.csv').columns
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        list(run_sharded(analyze_shard, [['A']], executor='gpu'))
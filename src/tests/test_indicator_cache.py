@@ -0,0 +1,99 @@
+"""Tests for the content-addressed indicator cache."""
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from scanner import executor
+from scanner.market_store import MarketDataStore
+from scanner.indicator_cache import IndicatorCache, cache_key, cached_supertrend, series_hashes
+from scanner.indicators import supertrend
+from tests.test_integration import create_realistic_data
+
+
+def test_keys_cover_input_name_and_params():
+    base = cache_key('abc', 'supertrend', {'atr_period': 10, 'multiplier': 3.0})
+
+    assert base == cache_key('abc', 'supertrend', {'multiplier': 3.0, 'atr_period': 10})
+    assert base != cache_key('abd', 'supertrend', {'atr_period': 10, 'multiplier': 3.0})
+    assert base != cache_key('abc', 'supertrend', {'atr_period': 10, 'multiplier': 2.0})
+    assert base != cache_key('abc', 'trades', {'atr_period': 10, 'multiplier': 3.0})
+
+
+def test_cached_supertrend_roundtrip(tmp_path):
+    cache = IndicatorCache(tmp_path)
+    df = create_realistic_data(120)
+
+    first = cached_supertrend(cache, df, 10, 3.0)
+    second = cached_supertrend(cache, df, 10, 3.0)
+
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(second, supertrend(df, atr_period=10, multiplier=3.0), check_dtype=False)
+    pd.testing.assert_frame_equal(first, second, check_dtype=False)
+
+
+def test_lru_eviction_by_disk_budget(tmp_path):
+    cache = IndicatorCache(tmp_path)
+    df = pd.DataFrame({'x': np.arange(1000.0)})
+    for i in range(3):
+        cache.put(f'h{i}', 'test', {}, df)
+        path = cache.path(cache_key(f'h{i}', 'test', {}))
+        os.utime(path, (1000 + i, 1000 + i))
+
+    # Reading h0 makes it the most recently used entry
+    assert cache.get('h0', 'test', {}) is not None
+    entry_size = cache.size() // 3
+    cache.evict(max_bytes=2 * entry_size)
+
+    assert cache.get('h1', 'test', {}) is None
+    assert cache.get('h0', 'test', {}) is not None
+    assert cache.get('h2', 'test', {}) is not None
+
+
+def test_series_hashes_follow_base_bars(tmp_path):
+    store = MarketDataStore(tmp_path)
+    daily = create_realistic_data(200)
+    store.write('TCS.NS', '1d', daily.iloc[:150])
+
+    before = series_hashes(store, ['TCS.NS', 'MISSING.NS'], '1wk')
+    store.append('TCS.NS', '1d', daily.iloc[150:])
+    after = series_hashes(store, ['TCS.NS'], '1wk')
+
+    assert set(before) == {'TCS.NS'}
+    assert before['TCS.NS'].endswith('/1wk')
+    assert before['TCS.NS'] != after['TCS.NS']
+
+
+def test_analyze_skips_unchanged_symbols(tmp_path, monkeypatch):
+    """A rerun only loads and recomputes symbols whose bars changed."""
+    store = MarketDataStore(tmp_path / 'market')
+    for i in range(3):
+        store.write(f'SYM{i}.NS', '1wk', create_realistic_data(150, seed=i))
+
+    loaded = []
+    real_load = executor.load_cached_many
+    monkeypatch.setattr(executor, 'load_cached_many',
+                        lambda symbols, *args, **kwargs: loaded.append(list(symbols)) or real_load(symbols, *args, **kwargs))
+
+    symbols = ['SYM0.NS', 'SYM1.NS', 'SYM2.NS']
+    kwargs = dict(cache_dir=tmp_path / 'market', atr_period=10, multiplier=3.0,
+                  indicator_cache=tmp_path / 'indicators')
+    first = executor.analyze_shard(symbols, **kwargs)
+
+    store.write('SYM1.NS', '1wk', create_realistic_data(160, seed=1))
+    second = executor.analyze_shard(symbols, **kwargs)
+
+    assert loaded == [symbols, ['SYM1.NS']]
+    unchanged = first['symbol'] != 'SYM1.NS'
+    pd.testing.assert_frame_equal(
+        first[unchanged].reset_index(drop=True),
+        second[second['symbol'] != 'SYM1.NS'].reset_index(drop=True),
+        check_categorical=False,
+    )
+
+    # compute leaves outputs of unchanged symbols alone
+    out = tmp_path / 'processed'
+    out.mkdir()
+    computed, failed, unchanged = executor.compute_shard(symbols, output_dir=out, **kwargs)
+    assert (computed, unchanged) == (symbols, [])
+    computed, failed, unchanged = executor.compute_shard(symbols, output_dir=out, **kwargs)
+    assert (computed, unchanged) == ([], symbols)
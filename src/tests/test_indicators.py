@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from scanner.indicators import atr, supertrend
+from scanner.indicators import atr, supertrend, supertrend_direction_grid
 
 
 def create_test_data(n=100):
@@ -108,3 +108,69 @@ def test_supertrend_different_parameters():
     assert len(df_st1) == len(df_st2)
     assert set(df_st1.columns) == set(df_st2.columns)
 
+
+
+def reference_supertrend(df, atr_period=10, multiplier=3.0):
+    """Bar-by-bar SuperTrend reference used to check the array kernel."""
+    df = df.copy()
+    df['ATR'] = atr(df, atr_period)
+    hl2 = (df['High'] + df['Low']) / 2
+    basic_ub = (hl2 + multiplier * df['ATR']).tolist()
+    basic_lb = (hl2 - multiplier * df['ATR']).tolist()
+    close = df['Close'].tolist()
+    final_ub, final_lb = list(basic_ub), list(basic_lb)
+    st = [np.nan] * len(df)
+    st_dir = [1] * len(df)
+    
+    for i in range(atr_period, len(df)):
+        if basic_ub[i] < final_ub[i-1] or close[i-1] > final_ub[i-1]:
+            final_ub[i] = basic_ub[i]
+        else:
+            final_ub[i] = final_ub[i-1]
+        if basic_lb[i] > final_lb[i-1] or close[i-1] < final_lb[i-1]:
+            final_lb[i] = basic_lb[i]
+        else:
+            final_lb[i] = final_lb[i-1]
+    
+    for i in range(atr_period, len(df)):
+        if i == atr_period:
+            st_dir[i] = -1 if close[i] <= final_ub[i] else 1
+        elif st_dir[i-1] == 1:
+            st_dir[i] = -1 if close[i] <= final_lb[i] else 1
+        else:
+            st_dir[i] = 1 if close[i] >= final_ub[i] else -1
+        st[i] = final_ub[i] if st_dir[i] == -1 else final_lb[i]
+    
+    return np.array(final_ub), np.array(final_lb), np.array(st), np.array(st_dir)
+
+
+def test_supertrend_matches_reference_loop():
+    """Array kernel must be bit-identical to the bar-by-bar definition."""
+    df = create_test_data(300)
+    df.loc[40:45, 'Close'] = np.nan
+    
+    for atr_period, multiplier in [(10, 3.0), (7, 2.0), (14, 4.0)]:
+        df_st = supertrend(df, atr_period=atr_period, multiplier=multiplier)
+        final_ub, final_lb, st, st_dir = reference_supertrend(df, atr_period, multiplier)
+        
+        np.testing.assert_array_equal(df_st['final_ub'].to_numpy(), final_ub)
+        np.testing.assert_array_equal(df_st['final_lb'].to_numpy(), final_lb)
+        np.testing.assert_array_equal(df_st['ST'].to_numpy(), st)
+        np.testing.assert_array_equal(df_st['ST_dir'].to_numpy(), st_dir)
+
+
+def test_supertrend_direction_grid_matches_single():
+    """Grid evaluation must agree with one supertrend() call per multiplier."""
+    df = create_test_data(200)
+    multipliers = [1.5, 2.0, 3.0, 4.0]
+    
+    atr_values = atr(df, period=10).to_numpy()
+    grid = supertrend_direction_grid(
+        df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(),
+        atr_values, 10, multipliers
+    )
+    
+    assert grid.shape == (len(multipliers), len(df))
+    for multiplier, st_dir in zip(multipliers, grid):
+        expected = supertrend(df, atr_period=10, multiplier=multiplier)['ST_dir'].to_numpy()
+        np.testing.assert_array_equal(st_dir, expected)
@@ -6,6 +6,8 @@ from pathlib import Path
 from scanner.indicators import supertrend
 from scanner.signal_detector import detect_signals_for_symbol, find_buy_sell_pairs
 from scanner.analyser import filter_trades, compute_summary_stats, threshold_analysis
+from scanner.sweep import run_sweep
+from scanner.panel import build_panel, panel_supertrend, analyze_panel
 
 
 def create_realistic_data(n=100, seed=42):
@@ -148,3 +150,54 @@ def test_edge_case_all_nan():
     # Should still produce some valid values
     assert df_st['ST'].notna().sum() > 0
 
+
+
+def test_sweep_matches_per_combination_runs():
+    """Parameter sweep should reproduce individual detect_signals runs."""
+    symbol_data = [(f'SYM{i}', create_realistic_data(150, seed=i)) for i in range(3)]
+    atr_periods = [7, 10]
+    multipliers = [2.0, 3.0]
+    
+    summary_df, trades_df = run_sweep(symbol_data, atr_periods, multipliers)
+    
+    assert len(summary_df) == len(atr_periods) * len(multipliers)
+    
+    for atr_period in atr_periods:
+        for multiplier in multipliers:
+            expected = []
+            for symbol, df in symbol_data:
+                _, trades = detect_signals_for_symbol(symbol, df, atr_period, multiplier)
+                expected.extend(trades)
+            
+            row = summary_df[(summary_df['atr_period'] == atr_period) &
+                             (summary_df['multiplier'] == multiplier)].iloc[0]
+            assert row['total_trades'] == len(expected)
+            if expected:
+                expected_mean = pd.DataFrame(expected)['pct_change'].mean()
+                assert abs(row['mean_return'] - expected_mean) < 1e-9
+
+
+def test_panel_matches_per_symbol_supertrend():
+    """Panel computation over ragged symbols should equal per-symbol runs."""
+    symbol_data = [(f'SYM{i}', create_realistic_data(80 + 15 * i, seed=i)) for i in range(4)]
+    
+    panel = build_panel(symbol_data)
+    result = panel_supertrend(panel, atr_period=10, multiplier=3.0)
+    
+    for row, (symbol, df) in enumerate(symbol_data):
+        expected = supertrend(df, atr_period=10, multiplier=3.0)
+        n = len(df)
+        for col in ['ATR', 'final_ub', 'final_lb', 'ST', 'ST_dir']:
+            np.testing.assert_array_equal(result[col][row, :n], expected[col].to_numpy())
+    
+    panel_trades = analyze_panel(symbol_data, atr_period=10, multiplier=3.0)
+    expected_trades = []
+    for symbol, df in symbol_data:
+        _, trades = detect_signals_for_symbol(symbol, df, atr_period=10, multiplier=3.0)
+        expected_trades.extend(trades)
+    
+    assert len(panel_trades) == len(expected_trades)
+    for got, expected in zip(panel_trades, expected_trades):
+        assert got['symbol'] == expected['symbol']
+        assert got['buy_date'] == expected['buy_date']
+        assert got['pct_change'] == expected['pct_change']
@@ -0,0 +1,129 @@
+"""Tests for the columnar market-data store."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner.market_store import MarketDataStore, import_csv_cache
+
+
+def create_ohlcv(n=60, start='2023-01-02', freq='W-MON', tz=None, lowercase=False):
+    """Create a small OHLCV frame."""
+    dates = pd.date_range(start, periods=n, freq=freq, tz=tz)
+    close = 100 + np.arange(n, dtype=float)
+
+    df = pd.DataFrame({
+        'Date': dates,
+        'Open': close - 1,
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': np.arange(n) * 1000
+    })
+
+    if lowercase:
+        df.columns = df.columns.str.lower()
+    return df
+
+
+def test_write_read_roundtrip(tmp_path):
+    """Stored series should come back typed, naive and unchanged."""
+    store = MarketDataStore(tmp_path)
+    df = create_ohlcv(tz='Asia/Kolkata')
+
+    store.write('RELIANCE.NS', '1wk', df)
+    loaded = store.read('RELIANCE.NS', '1wk')
+
+    assert list(loaded.columns) == ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    assert loaded['Date'].dt.tz is None
+    assert loaded['Volume'].dtype == np.int64
+    np.testing.assert_array_equal(loaded['Close'].to_numpy(), df['Close'].to_numpy())
+
+    # Same key regardless of symbol spelling
+    assert store.read('RELIANCE_NS', '1wk') is not None
+    assert store.symbols('1wk') == ['RELIANCE_NS']
+    assert store.read('RELIANCE.NS', '1d') is None
+
+
+def test_date_range_and_projection(tmp_path):
+    """Date filters and column projection should be applied on read."""
+    store = MarketDataStore(tmp_path)
+    store.write('TCS.NS', '1wk', create_ohlcv())
+
+    loaded = store.read('TCS.NS', '1wk', start='2023-03-01', end='2023-04-30', columns=['Close'])
+
+    assert list(loaded.columns) == ['Date', 'Close']
+    assert loaded['Date'].min() >= pd.Timestamp('2023-03-01')
+    assert loaded['Date'].max() <= pd.Timestamp('2023-04-30')
+    assert len(loaded) == 8
+
+
+def test_read_many(tmp_path):
+    """Multi-symbol reads should split back into per-symbol frames."""
+    store = MarketDataStore(tmp_path)
+    for i, symbol in enumerate(['A.NS', 'B.NS', 'C.NS']):
+        store.write(symbol, '1d', create_ohlcv(n=20 + i, freq='B', lowercase=True))
+
+    data = store.read_many(['A.NS', 'C.NS', 'MISSING.NS'], '1d')
+
+    assert set(data) == {'A.NS', 'C.NS'}
+    assert len(data['A.NS']) == 20
+    assert len(data['C.NS']) == 22
+    pd.testing.assert_frame_equal(data['C.NS'], store.read('C.NS', '1d'))
+
+
+def test_import_csv_cache(tmp_path):
+    """Legacy weekly and daily CSV caches should land in the right partitions."""
+    csv_dir = tmp_path / 'raw'
+    csv_dir.mkdir()
+    create_ohlcv().to_csv(csv_dir / 'INFY_NS.csv', index=False)
+    create_ohlcv(freq='B').to_csv(csv_dir / 'INFY_NS_daily.csv', index=False)
+
+    store = MarketDataStore(tmp_path / 'store')
+    assert import_csv_cache(store, csv_dir) == 2
+
+    assert store.symbols('1wk') == ['INFY_NS']
+    assert store.symbols('1d') == ['INFY_NS']
+
+
+def test_manifest_tracks_writes(tmp_path):
+    """Writes, appends and deletes should keep the manifest in step."""
+    store = MarketDataStore(tmp_path)
+    df = create_ohlcv(n=30)
+    store.write('TCS.NS', '1wk', df.iloc[:20], source='yahoo')
+    store.append('TCS.NS', '1wk', df.iloc[18:], source='replay')
+
+    entry = store.manifest.get('TCS_NS', '1wk')
+    assert entry['rows'] == 30
+    assert entry['first_bar'] == df['Date'].iloc[0]
+    assert entry['last_bar'] == df['Date'].iloc[-1]
+    assert entry['source'] == 'replay'
+    assert store.date_ranges(['TCS.NS', 'MISSING.NS'], '1wk') == {
+        'TCS.NS': (df['Date'].iloc[0], df['Date'].iloc[-1], 30)
+    }
+
+    # Same content hashes the same regardless of how it was written
+    other = MarketDataStore(tmp_path / 'other')
+    other.write('TCS.NS', '1wk', df)
+    assert other.manifest.get('TCS_NS', '1wk')['content_hash'] == entry['content_hash']
+
+    store.delete('TCS.NS', '1wk')
+    assert store.manifest.get('TCS_NS', '1wk') is None
+    assert store.symbols('1wk') == []
+
+
+def test_manifest_rebuilt_and_gc(tmp_path):
+    """A missing manifest is rebuilt from the files; gc drops stale series."""
+    store = MarketDataStore(tmp_path)
+    store.write('OLD.NS', '1d', create_ohlcv(n=20, start='2015-01-01', freq='B'))
+    store.write('NEW.NS', '1d', create_ohlcv(n=20, start='2023-01-02', freq='B'))
+    (tmp_path / 'manifest.sqlite').unlink()
+    (store.path('NEW.NS', '1d').parent / '.data.parquet.tmp').write_bytes(b'partial')
+
+    rebuilt = MarketDataStore(tmp_path)
+    assert rebuilt.symbols('1d') == ['NEW_NS', 'OLD_NS']
+
+    result = rebuilt.gc(older_than='2020-01-01')
+
+    assert result['tmp_files'] == 1
+    assert result['stale_series'] == 1
+    assert rebuilt.symbols('1d') == ['NEW_NS']
+    assert not store.path('OLD.NS', '1d').parent.exists()
@@ -2,7 +2,8 @@
 import pytest
 import pandas as pd
 import numpy as np
-from scanner.signal_detector import find_buy_sell_pairs
+from scanner.signal_detector import find_buy_sell_pairs, pair_flips
+from scanner.signal_detector_fixed_exit import find_buy_sell_pairs_fixed_exit
 
 
 def create_signal_data():
@@ -159,3 +160,71 @@ def test_multiple_complete_cycles():
     # Should find 3 complete cycles
     assert len(trades) == 3
 
+
+
+def reference_pairs(st_dir, include_open=False):
+    """Bar-by-bar pairing, as find_buy_sell_pairs used to do it."""
+    pairs, buy = [], None
+    for i in range(1, len(st_dir)):
+        prev, curr = st_dir[i - 1], st_dir[i]
+        if np.isnan(prev) or np.isnan(curr):
+            continue
+        if prev == -1 and curr == 1:
+            buy = i
+        elif prev == 1 and curr == -1 and buy is not None:
+            pairs.append((buy, i))
+            buy = None
+    if include_open and buy is not None:
+        pairs.append((buy, -1))
+    return pairs
+
+
+def random_directions(rng, n):
+    st_dir = rng.choice([-1.0, 1.0], size=n, p=[0.5, 0.5])
+    st_dir[rng.random(n) < 0.05] = np.nan
+    return st_dir
+
+
+@pytest.mark.parametrize('include_open', [False, True])
+def test_vectorized_pairing_matches_loop(include_open):
+    """Array pairing should reproduce the loop on random directions, row by row."""
+    rng = np.random.default_rng(7)
+    grid = np.array([random_directions(rng, 300) for _ in range(20)])
+
+    rows, buy_idx, sell_idx = pair_flips(grid, include_open=include_open)
+
+    for row in range(len(grid)):
+        got = list(zip(buy_idx[rows == row], sell_idx[rows == row]))
+        assert got == reference_pairs(grid[row], include_open)
+
+
+@pytest.mark.parametrize('include_open', [False, True])
+def test_sells_without_buys(include_open):
+    """Sell flips with no buy anywhere pair into no trades."""
+    for st_dir in ([1, 1, -1], [[1, 1, -1], [1, -1, -1]]):
+        rows, buy_idx, sell_idx = pair_flips(st_dir, include_open=include_open)
+        assert len(rows) == len(buy_idx) == len(sell_idx) == 0
+
+    df = pd.DataFrame({'Date': pd.date_range('2023-01-01', periods=3, freq='W'),
+                       'Close': [100, 98, 96], 'ST_dir': [1, 1, -1]})
+    assert find_buy_sell_pairs(df, 'TEST', include_open=include_open) == []
+
+
+def test_fixed_exit_takes_next_buy_after_exit():
+    """A buy during an open position is skipped; exits follow target > stop > time."""
+    dates = pd.date_range('2023-01-02', periods=12, freq='W-MON')
+    close = [100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100]
+    high = [101] * 12
+    high[4] = 115  # target hit on bar 4, after the buy on bar 3
+    low = [99] * 12
+    st_dir = [-1, 1, -1, 1, 1, 1, -1, 1, 1, 1, 1, 1]
+    df = pd.DataFrame({'Date': dates, 'Close': close, 'High': high, 'Low': low, 'ST_dir': st_dir})
+
+    trades = find_buy_sell_pairs_fixed_exit(df, 'TEST', profit_target=10, stop_loss=10, max_days=21)
+
+    assert [(t['buy_date'], t['exit_reason']) for t in trades] == [
+        (dates[1], 'profit_target'),
+        (dates[7], 'time_stop'),
+    ]
+    assert trades[0]['sell_price'] == pytest.approx(110)
+    assert trades[1]['sell_date'] == dates[10]
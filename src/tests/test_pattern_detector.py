@@ -0,0 +1,77 @@
+"""Tests for the vectorized pattern scans."""
+import numpy as np
+import pandas as pd
+import pytest
+from scanner.pattern_detector import (
+    detect_all_patterns, detect_volume_breakout, label_outcomes, scan_patterns, scan_universe,
+    scan_volume_breakouts,
+)
+from benchmarks.synthetic import generate_universe
+
+
+def bars(closes, volume=1000.0, start='2024-01-01'):
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=len(closes)),
+        'Open': closes, 'High': closes * 1.01, 'Low': closes * 0.99, 'Close': closes,
+        'Volume': volume,
+    })
+
+
+def summary(patterns):
+    return sorted((p['pattern'], round(p['entry_price'], 6)) for p in patterns)
+
+
+def test_scan_matches_latest_bar_detection_at_every_bar():
+    df = generate_universe(1, years=2, seed=3)['SYN0000.NS']
+    occurrences = scan_patterns(df)
+    assert not occurrences.empty
+
+    for end in range(1, len(df) + 1):
+        at_bar = occurrences[occurrences['bar'] == end - 1].to_dict('records')
+        assert summary(at_bar) == summary(detect_all_patterns(df.iloc[:end])), end
+
+
+def test_volume_breakout():
+    closes = np.linspace(100, 104, 25)
+    volume = np.full(25, 1000.0)
+    volume[-1] = 5000.0
+    df = bars(closes, volume)
+    df.loc[24, 'Low'] = closes[-1] * 0.97  # close near the bar's high
+
+    pattern = detect_volume_breakout(df)
+    assert pattern['pattern'] == 'Volume Breakout'
+    assert pattern['volume_ratio'] == pytest.approx(5.0)
+    assert pattern['resistance'] == pytest.approx(df['High'].iloc[-1])
+
+    occurrences = scan_volume_breakouts(df)
+    assert occurrences['bar'].tolist() == [24]
+    assert occurrences['date'].iloc[0] == df['Date'].iloc[-1]
+
+
+def test_universe_scan_matches_per_symbol():
+    universe = generate_universe(40, years=1, seed=1)
+    universe['SHORT.NS'] = universe['SYN0000.NS'].head(5)
+
+    latest = scan_universe(universe, latest_only=True)
+    for symbol, df in universe.items():
+        found = latest[latest['symbol'] == symbol].to_dict('records')
+        assert summary(found) == summary(detect_all_patterns(df)), symbol
+
+    history = scan_universe(universe)
+    for symbol in ('SYN0000.NS', 'SYN0039.NS'):
+        expected = scan_patterns(universe[symbol])
+        scanned = history[history['symbol'] == symbol].reset_index(drop=True)[expected.columns]
+        pd.testing.assert_frame_equal(scanned, expected, check_dtype=False)
+
+
+def test_label_outcomes():
+    df = bars([100, 100, 100, 104, 99, 100])
+    occurrences = pd.DataFrame({'bar': [0, 4], 'target_1': [103.0, 110.0], 'stop_loss': [98.5, 90.0]})
+
+    labelled = label_outcomes(occurrences, df, horizon=3)
+    assert labelled['complete'].tolist() == [True, False]
+    assert labelled['hit_target_1'].tolist() == [True, False]
+    assert labelled['hit_stop'].tolist() == [False, False]
+    assert labelled['forward_return'].iloc[0] == pytest.approx(4.0)
+    assert np.isnan(labelled['forward_return'].iloc[1])
@@ -0,0 +1,86 @@
+"""Tests for stage-level profiling."""
+import json
+import logging
+import pytest
+from scanner import profiling
+from scanner.executor import analyze_shard, run_sharded
+from scanner.market_store import MarketDataStore
+from scanner.utils import TIMING_LOGGER, TimingFormatter
+from tests.test_integration import create_realistic_data
+
+
+@pytest.fixture
+def profiler():
+    profiler = profiling.enable()
+    yield profiler
+    profiling.disable()
+
+
+def test_stages_nest_and_fold(profiler):
+    with profiling.stage('analyze'):
+        for symbol in ('A.NS', 'B.NS', 'C.NS'):
+            with profiling.stage('supertrend', rows=100, symbol=symbol):
+                pass
+        with profiling.stage('write') as timer:
+            timer.rows = 7
+
+    report = profiler.report()
+    stages = {s['stage']: s for s in report['stages']}
+    assert set(stages) == {'analyze', 'analyze/supertrend', 'analyze/write'}
+    assert stages['analyze/supertrend']['calls'] == 3
+    assert stages['analyze/supertrend']['rows'] == 300
+    assert stages['analyze/write']['rows'] == 7
+    assert report['per_symbol']['supertrend']['symbols'] == 3
+    assert set(report['per_symbol']['supertrend']) >= {'p50_ms', 'p90_ms', 'p99_ms'}
+
+    lines = dict(line.rsplit(' ', 1) for line in profiler.folded().splitlines())
+    assert set(lines) == {'analyze', 'analyze;supertrend', 'analyze;write'}
+    assert all(int(value) >= 0 for value in lines.values())
+
+
+def test_stage_is_noop_when_disabled():
+    profiling.disable()
+    with profiling.stage('anything', rows=3) as timer:
+        timer.rows = 4
+    assert profiling.active() is None
+
+
+@pytest.mark.parametrize('executor', ['process', 'thread', 'serial'])
+def test_worker_stages_nest_under_caller(tmp_path, profiler, executor):
+    store = MarketDataStore(tmp_path)
+    symbols = [f'SYM{i}.NS' for i in range(4)]
+    for i, symbol in enumerate(symbols):
+        store.write(symbol, '1wk', create_realistic_data(120, seed=i))
+
+    with profiling.stage('analyze'):
+        results = run_sharded(analyze_shard, [symbols[:2], symbols[2:]], executor=executor,
+                              cache_dir=tmp_path, atr_period=10, multiplier=3.0)
+        assert len(list(results)) == 2
+
+    stages = {s['stage']: s for s in profiler.report()['stages']}
+    assert stages['analyze/load']['rows'] == 4 * 120
+    assert stages['analyze/supertrend']['calls'] == 4
+    assert profiler.report()['per_symbol']['pairing']['symbols'] == 4
+
+
+def test_timing_channel_writes_json_lines(tmp_path, profiler):
+    path = tmp_path / 'timing.jsonl'
+    handler = logging.FileHandler(path)
+    handler.setFormatter(TimingFormatter())
+    timing_logger = logging.getLogger(TIMING_LOGGER)
+    timing_logger.addHandler(handler)
+    level = timing_logger.level
+    timing_logger.setLevel(logging.DEBUG)
+    try:
+        with profiling.stage('outer'):
+            with profiling.stage('inner', rows=5, symbol='A.NS'):
+                pass
+    finally:
+        timing_logger.removeHandler(handler)
+        timing_logger.setLevel(level)
+        handler.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e['stage'] for e in events] == ['outer/inner', 'outer']
+    assert events[0]['rows'] == 5 and events[0]['symbol'] == 'A.NS'
+    assert events[0]['wall_s'] >= 0
@@ -0,0 +1,70 @@
+"""Tests for the streaming report sink."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner.analyser import compute_summary_stats, threshold_analysis, profit_loss_buckets, analyze_by_sector
+from scanner.report_sink import QuantileSketch, StreamingReportSink
+from scanner.trades import as_trade_frame
+
+
+def make_trades(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    pct = rng.normal(2, 8, n)
+    pct[::25] = np.nan  # open trades
+    pct[::40] = 0.0
+    return as_trade_frame(pd.DataFrame({
+        'symbol': [f'S{i % 97}.NS' for i in range(n)],
+        'buy_date': pd.Timestamp('2020-01-06'),
+        'buy_price': 100.0,
+        'sell_date': pd.Timestamp('2020-03-02'),
+        'sell_price': 100.0 + pct,
+        'pct_change': pct,
+        'weeks_held': rng.integers(1, 30, n).astype(float),
+        'sector': [None if i % 7 == 0 else f'sec{i % 4}' for i in range(n)],
+    }))
+
+
+def test_quantile_sketch():
+    values = np.random.default_rng(1).normal(0, 10, 10001)
+    sketch, other = QuantileSketch(), QuantileSketch()
+    sketch.update(values[:5000])
+    other.update(values[5000:])
+    sketch.merge(other)
+
+    for q in (0.1, 0.25, 0.5, 0.9):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), abs=0.01)
+
+
+def test_streamed_stats_match_in_memory(tmp_path):
+    """Chunked statistics should equal the analyser's on the full table."""
+    trades = make_trades()
+
+    with StreamingReportSink(tmp_path, formats=('csv', 'parquet'), top_n=5) as sink:
+        for start in range(0, len(trades), 700):
+            # Each chunk carries its own categories
+            chunk = trades.iloc[start:start + 700].copy()
+            chunk['symbol'] = chunk['symbol'].astype(str).astype('category')
+            sink.write(chunk)
+        generated = sink.close(echo=False)
+
+    stats = sink.stats
+    expected = compute_summary_stats(trades)
+    for key, value in stats.summary().items():
+        tolerance = 0.01 if key in ('median_return', 'q25_return', 'q75_return') else 1e-9
+        assert value == pytest.approx(expected[key], abs=tolerance), key
+
+    assert stats.threshold_stats() == threshold_analysis(trades)
+    assert stats.bucket_stats() == profit_loss_buckets(trades)
+
+    sectors = analyze_by_sector(trades)
+    assert set(stats.sector_stats()) == set(sectors)
+    for sector, values in stats.sector_stats().items():
+        assert values['total_trades'] == sectors[sector]['total_trades']
+        assert values['mean_return'] == pytest.approx(sectors[sector]['mean_return'])
+
+    assert stats.top['pct_change'].tolist() == trades['pct_change'].nlargest(5).tolist()
+
+    assert len(pd.read_csv(generated['trades_csv'])) == len(trades)
+    written = pd.read_parquet(generated['trades_parquet'])
+    assert len(written) == len(trades)
+    assert written['symbol'].tolist() == trades['symbol'].astype(str).tolist()
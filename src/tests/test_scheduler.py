@@ -0,0 +1,112 @@
+"""Tests for the rate-limited fetch scheduler."""
+import asyncio
+import time
+import pytest
+import pandas as pd
+from scanner.providers import DataProvider
+from scanner.scheduler import FetchScheduler, RetryQueue, TokenBucket, backoff_delay
+
+
+class FlakyProvider(DataProvider):
+    """Returns one bar per symbol; fails or drops symbols a set number of times."""
+
+    name = "flaky"
+    host = "test"
+
+    def __init__(self, fail_calls=0, drop=None, delay=0.0):
+        self.fail_calls = fail_calls
+        self.drop = drop or {}  # symbol -> number of calls it is missing from
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def download(self, symbols, start_date, end_date, interval):
+        self.calls.append(list(symbols))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail_calls > 0:
+                self.fail_calls -= 1
+                raise ConnectionError("429 Too Many Requests")
+
+            frames = {}
+            for symbol in symbols:
+                if self.drop.get(symbol, 0) > 0:
+                    self.drop[symbol] -= 1
+                    continue
+                frames[symbol] = pd.DataFrame({'Date': [pd.Timestamp('2024-01-01')], 'Close': [1.0]})
+            return frames
+        finally:
+            self.active -= 1
+
+
+def make_scheduler(provider, **kwargs):
+    kwargs.setdefault('rate', 0)
+    kwargs.setdefault('backoff_base', 0.0)
+    return FetchScheduler(provider, **kwargs)
+
+
+def test_retries_failed_request_then_succeeds():
+    """A throttled request should be retried with backoff."""
+    provider = FlakyProvider(fail_calls=2)
+    scheduler = make_scheduler(provider, max_retries=3)
+
+    frames = scheduler.download_sync(['A', 'B'], '2024-01-01', '2024-02-01', '1d')
+
+    assert set(frames) == {'A', 'B'}
+    assert len(provider.calls) == 3
+    assert scheduler.stats.retries == 2
+    assert scheduler.stats.symbols_fetched == 2
+
+
+def test_missing_symbols_retried_alone_and_queued(tmp_path):
+    """Only missing symbols are re-requested; exhausted ones persist in the queue."""
+    provider = FlakyProvider(drop={'B': 1, 'C': 10})
+    queue = RetryQueue(tmp_path / 'retry.json')
+    scheduler = make_scheduler(provider, max_retries=2, retry_queue=queue)
+
+    frames = scheduler.download_sync(['A', 'B', 'C'], '2024-01-01', '2024-02-01', '1d')
+
+    assert set(frames) == {'A', 'B'}
+    assert provider.calls == [['A', 'B', 'C'], ['B', 'C'], ['C']]
+    assert scheduler.stats.symbols_failed == 1
+
+    reloaded = RetryQueue(tmp_path / 'retry.json')
+    assert reloaded.pending('1d') == ['C']
+    assert reloaded.pending('1wk') == []
+
+
+def test_concurrency_bounded_per_host():
+    """No more than the host limit of requests should run at once."""
+    provider = FlakyProvider(delay=0.05)
+    scheduler = make_scheduler(provider, max_concurrency=2)
+    progress = []
+    scheduler.progress = progress.append
+
+    frames = scheduler.download_sync([f'S{i}' for i in range(8)], '2024-01-01', '2024-02-01', '1d',
+                                     chunk_size=1)
+
+    assert len(frames) == 8
+    assert provider.max_active <= 2
+    assert sum(progress) == 8
+
+
+def test_token_bucket_limits_rate():
+    """Requests beyond the burst should wait for tokens to refill."""
+    async def take(n):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(6)) >= 5 / 50 * 0.9
+
+
+def test_backoff_delay_bounds():
+    """Jittered delays should stay within the exponential envelope."""
+    for attempt in range(1, 8):
+        delay = backoff_delay(attempt, base=0.5, cap=4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
@@ -0,0 +1,81 @@
+"""Tests for deriving timeframes from stored base bars."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner.market_store import MarketDataStore
+from scanner.timeframes import resample_ohlcv, load_timeframe, load_many_timeframe, base_timeframe
+
+
+def make_bars(dates, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+    return pd.DataFrame({
+        'Date': dates,
+        'Open': close + rng.normal(0, 0.5, len(dates)),
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, len(dates)),
+    })
+
+
+def test_weekly_matches_pandas_resample():
+    """Weekly bars should match a Monday-labelled pandas resample, holidays included."""
+    dates = pd.bdate_range('2023-01-02', periods=300)
+    dates = dates.delete([3, 40, 41, 42, 43, 44])  # holidays, including a full week
+    daily = make_bars(dates)
+
+    weekly = resample_ohlcv(daily, '1wk')
+
+    expected = daily.set_index('Date').resample('W-MON', label='left', closed='left').agg({
+        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'
+    }).dropna().reset_index()
+    pd.testing.assert_frame_equal(weekly, expected, check_dtype=False)
+    assert (weekly['Date'].dt.dayofweek == 0).all()
+
+
+def test_intraday_buckets_align_to_session_open():
+    """4h bars start at 09:15 and 13:15, 15m bars at quarter-hours from 09:15."""
+    hourly_times = ['09:15', '10:15', '11:15', '12:15', '13:15', '14:15', '15:15']
+    dates = pd.DatetimeIndex([f'2024-01-0{d} {t}' for d in (1, 2) for t in hourly_times])
+    hourly = make_bars(dates)
+    hourly.columns = hourly.columns.str.lower()
+
+    four_hour = resample_ohlcv(hourly, '4h')
+
+    assert list(four_hour.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+    assert four_hour['date'].dt.strftime('%H:%M').tolist() == ['09:15', '13:15'] * 2
+    assert four_hour['volume'].iloc[0] == hourly['volume'].iloc[:4].sum()
+    assert four_hour['close'].iloc[1] == hourly['close'].iloc[6]
+
+    five_min = make_bars(pd.date_range('2024-01-01 09:15', '2024-01-01 15:25', freq='5min'))
+    fifteen = resample_ohlcv(five_min, '15m')
+    assert len(fifteen) == 25
+    assert fifteen['Date'].iloc[1] == pd.Timestamp('2024-01-01 09:30')
+
+
+def test_load_timeframe_derives_and_memoizes(tmp_path):
+    """Derived reads come from the base series and follow its updates."""
+    store = MarketDataStore(tmp_path)
+    daily = make_bars(pd.bdate_range('2023-01-02', periods=100))
+    store.write('TCS.NS', '1d', daily.iloc[:90])
+
+    weekly = load_timeframe(store, 'TCS.NS', '1wk')
+    assert len(weekly) == 18
+    assert store.symbols('1wk') == []
+
+    store.append('TCS.NS', '1d', daily.iloc[90:])
+    weekly = load_timeframe(store, 'TCS.NS', '1wk', start='2023-03-01', columns=['Close'])
+    assert list(weekly.columns) == ['Date', 'Close']
+    assert weekly['Close'].iloc[-1] == daily['Close'].iloc[-1]
+
+    many = load_many_timeframe(store, ['TCS.NS', 'MISSING.NS'], '1wk')
+    assert set(many) == {'TCS.NS'}
+    assert len(many['TCS.NS']) == 20
+
+
+def test_base_timeframe():
+    assert base_timeframe('1wk') == '1d'
+    assert base_timeframe('4h') == '1h'
+    assert base_timeframe('15m') == '5m'
+    assert base_timeframe('1d') == '1d'
@@ -0,0 +1,80 @@
+"""Tests for typed columnar trade tables."""
+import pytest
+import pandas as pd
+import numpy as np
+from scanner.trades import as_trade_frame, concat_trades
+from scanner.analyser import compute_summary_stats, filter_trades
+from scanner.panel import analyze_panel
+from tests.test_integration import create_realistic_data
+
+
+def make_trades(n=50, seed=0, symbol='AAA.NS'):
+    rng = np.random.default_rng(seed)
+    pct = rng.normal(2, 8, n)
+    pct[::10] = np.nan  # open trades
+    return pd.DataFrame({
+        'symbol': symbol,
+        'buy_date': pd.date_range('2020-01-06', periods=n, freq='W-MON'),
+        'buy_price': 100.0,
+        'sell_date': pd.date_range('2020-02-03', periods=n, freq='W-MON'),
+        'sell_price': 100.0 + pct,
+        'pct_change': pct,
+        'weeks_held': 4.0,
+        'sector': 'IT',
+    })
+
+
+def test_as_trade_frame_types_and_passthrough():
+    """Typed tables use compact dtypes and are not copied again."""
+    trades = as_trade_frame(make_trades())
+
+    assert trades['symbol'].dtype == 'category'
+    assert trades['sector'].dtype == 'category'
+    assert trades['pct_change'].dtype == np.float32
+    assert trades['buy_date'].dtype == 'datetime64[ns]'
+    assert as_trade_frame(trades) is trades
+
+
+def test_concat_keeps_categoricals():
+    """Tables with different symbols should concatenate without object columns."""
+    combined = concat_trades([
+        as_trade_frame(make_trades(symbol='AAA.NS')),
+        None,
+        as_trade_frame(make_trades(seed=1, symbol='BBB.NS').drop(columns=['sector'])),
+    ])
+
+    assert len(combined) == 100
+    assert combined['symbol'].dtype == 'category'
+    assert set(combined['symbol'].cat.categories) == {'AAA.NS', 'BBB.NS'}
+    assert combined['sector'].isna().sum() == 50
+    assert concat_trades([]).empty
+
+
+def test_summary_stats_match_pandas():
+    """Array-based stats should agree with the pandas reference."""
+    trades = make_trades(200)
+    stats = compute_summary_stats(as_trade_frame(trades))
+
+    valid = trades['pct_change'].dropna()
+    assert stats['total_trades'] == len(valid)
+    assert stats['mean_return'] == pytest.approx(valid.mean(), rel=1e-6)
+    assert stats['median_return'] == pytest.approx(valid.median(), rel=1e-6)
+    assert stats['std_return'] == pytest.approx(valid.std(), rel=1e-6)
+    assert stats['q25_return'] == pytest.approx(valid.quantile(0.25), rel=1e-6)
+    assert stats['winning_trades'] == (valid > 0).sum()
+
+    filtered = filter_trades(as_trade_frame(trades), abs_threshold=5.0)
+    assert len(filtered) == (valid.abs() < 5.0).sum()
+    assert filtered['symbol'].dtype == 'category'
+
+
+def test_panel_table_matches_records():
+    """The columnar panel output should hold the same trades as the dicts."""
+    symbol_data = [(f'SYM{i}', create_realistic_data(120, seed=i)) for i in range(3)]
+
+    records = analyze_panel(symbol_data, include_open=True)
+    table = analyze_panel(symbol_data, include_open=True, as_frame=True)
+
+    assert len(table) == len(records)
+    assert table['symbol'].astype(str).tolist() == [t['symbol'] for t in records]
+    assert table['buy_date'].tolist() == [t['buy_date'] for t in records]
@@ -0,0 +1,49 @@
+"""Tests for the NSE trading calendar."""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scanner.trading_calendar import TradingCalendar, nse_calendar
+
+
+def test_holidays_weekends_and_special_sessions():
+    calendar = nse_calendar()
+    assert calendar.is_trading_day(datetime(2024, 3, 7))
+    assert not calendar.is_trading_day(datetime(2024, 3, 8))      # Mahashivratri
+    assert not calendar.is_trading_day('2024-03-09')              # Saturday
+    assert calendar.is_trading_day('2024-01-20')                  # Saturday session
+    assert not calendar.is_trading_day('2024-01-20', special=False)
+    assert calendar.is_trading_day('2024-11-01')                  # Muhurat trading
+    assert not calendar.is_trading_day('2024-11-01', special=False)
+    assert not calendar.is_trading_day('2025-10-22')              # Diwali Balipratipada
+    assert calendar.is_trading_day('2025-10-21')                  # Muhurat trading
+    assert not calendar.is_trading_day('2025-10-21', special=False)
+
+    sessions = calendar.sessions('2024-03-04', '2024-03-10')
+    assert [d.day for d in sessions] == [4, 5, 6, 7]
+    assert calendar.next_session('2024-03-07') == pd.Timestamp('2024-03-11')
+    assert calendar.previous_session('2024-03-11') == pd.Timestamp('2024-03-07')
+
+
+def test_observed_dates_decide_within_their_span():
+    # 2019-03-04 was a holiday the list does not cover; the data shows it
+    observed = pd.bdate_range('2019-03-01', '2019-03-08').drop(pd.Timestamp('2019-03-04'))
+    calendar = TradingCalendar().with_observed(observed)
+
+    assert not calendar.is_trading_day('2019-03-04')
+    assert calendar.is_trading_day('2019-03-05')
+    sessions = calendar.sessions('2019-02-27', '2019-03-12')
+    expected = pd.bdate_range('2019-02-27', '2019-03-12').drop(pd.Timestamp('2019-03-04'))
+    assert sessions.equals(expected)
+
+
+def test_options_expiry_uses_calendar():
+    from webapp.utils.options import _get_previous_trading_day, _is_trading_holiday
+
+    assert _is_trading_holiday(datetime(2024, 11, 1))  # Muhurat day carries no expiry
+    assert not _is_trading_holiday(datetime(2024, 10, 31))
+    assert _get_previous_trading_day(datetime(2024, 11, 4)) == datetime(2024, 10, 31)
@@ -0,0 +1,80 @@
+"""Tests for walk-forward optimization."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from strategies.base_strategy import cached_indicators
+from strategies.pullback_entry import PullbackEntryStrategy
+from utils.backtest_engine import BacktestConfig, BacktestEngine
+from utils.batch_backtest import make_strategy
+from utils.price_panel import PricePanel
+from utils.walk_forward import select_parameters, walk_forward, walk_forward_windows
+from benchmarks.synthetic import generate_universe
+
+
+def test_windows_roll_without_gaps():
+    windows = walk_forward_windows('2023-01-15', '2024-06-30', in_sample_months=6, out_of_sample_months=4)
+    assert [(w.in_sample_start, w.in_sample_end, w.out_of_sample_start, w.out_of_sample_end) for w in windows] == [
+        ('2023-01-15', '2023-07-14', '2023-07-15', '2023-11-14'),
+        ('2023-05-15', '2023-11-14', '2023-11-15', '2024-03-14'),
+        ('2023-09-15', '2024-03-14', '2024-03-15', '2024-06-30'),
+    ]
+    assert walk_forward_windows('2024-01-01', '2024-03-31', in_sample_months=6) == []
+
+
+def test_indicators_are_shared_across_parameter_sets():
+    frame = PricePanel(generate_universe(1, years=1, seed=1)).frames['SYN0000.NS']
+    loose, strict = PullbackEntryStrategy(), PullbackEntryStrategy()
+    strict.min_volume_ratio = 2.0
+
+    assert loose.indicator(frame, loose.rsi_series, 14) is not strict.indicator(frame, strict.rsi_series, 14)
+    with cached_indicators():
+        assert loose.indicator(frame, loose.rsi_series, 14) is strict.indicator(frame, strict.rsi_series, 14)
+        assert loose.indicator(frame, loose.calculate_sma, 20) is strict.indicator(frame, strict.calculate_sma, 20)
+        assert loose.indicator(frame, loose.calculate_sma, 20) is not loose.indicator(frame, loose.calculate_sma, 50)
+        assert loose.generate_signals(frame).sum() >= strict.generate_signals(frame).sum()
+
+
+def test_select_parameters_needs_enough_trades():
+    results = [
+        {'total_trades': 2, 'sharpe_ratio': 3.0},
+        {'total_trades': 9, 'sharpe_ratio': 0.5},
+        None,
+        {'total_trades': 9, 'sharpe_ratio': 0.8},
+        {'total_trades': 9, 'sharpe_ratio': None},
+    ]
+    assert select_parameters([{}] * 5, results, min_trades=5) == 3
+    assert select_parameters([{}] * 5, results, min_trades=10) is None
+
+
+@pytest.mark.parametrize('executor', ['process', 'serial'])
+def test_walk_forward_evaluates_chosen_parameters_out_of_sample(executor):
+    universe = generate_universe(10, years=3, seed=6)
+    panel = PricePanel(universe)
+    config = BacktestConfig(start_date='2023-07-01', end_date='2024-12-31', initial_capital=100000)
+    grid = {'min_volume_ratio': [0.8, 1.2], 'max_rsi': [60, 70]}
+
+    result = walk_forward(config, 'pullback_entry', list(universe), grid, in_sample_months=6,
+                          out_of_sample_months=6, min_trades=3, panel=panel, executor=executor, max_workers=2)
+
+    assert len(result.windows) == 2 and len(result.in_sample) == 8
+    assert result.in_sample['error'].isna().all()
+    for window, oos in zip(result.windows, result.out_of_sample):
+        in_sample = result.in_sample[result.in_sample['universe'] == f"window {window['window']}"]
+        eligible = in_sample[in_sample['total_trades'] >= 3]
+        assert window['in_sample_score'] == eligible['sharpe_ratio'].max()
+
+        window_config = BacktestConfig(window['out_of_sample_start'], window['out_of_sample_end'], 100000)
+        strategy = make_strategy('pullback_entry', window['params'])
+        expected = BacktestEngine(window_config, panel=panel).run(strategy, list(universe))
+        assert oos['trades'] == expected.to_dict()['trades']
+
+    # The aggregate compounds the windows' returns
+    growth = 1.0
+    for oos in result.out_of_sample:
+        growth *= oos['final_capital'] / oos['initial_capital']
+    assert result.equity_curve[-1]['capital'] == pytest.approx(100000 * growth)
+    assert result.total_trades == sum(oos['total_trades'] for oos in result.out_of_sample)
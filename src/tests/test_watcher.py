@@ -0,0 +1,98 @@
+"""Tests for the store watcher."""
+import pandas as pd
+import numpy as np
+from scanner import watcher as watcher_module
+from scanner.market_store import MarketDataStore
+from scanner.watcher import SignalWatcher, bar_end, flip_events
+from scanner.indicators import supertrend
+
+
+def daily_bars(closes, start='2023-01-02'):
+    dates = pd.bdate_range(start, periods=len(closes))
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        'Date': dates, 'Open': closes, 'High': closes * 1.01, 'Low': closes * 0.99,
+        'Close': closes, 'Volume': 1000,
+    })
+
+
+def test_reports_only_new_flips_of_changed_symbols(tmp_path, monkeypatch):
+    store = MarketDataStore(tmp_path / 'market')
+    rising = 100 * np.exp(np.linspace(0, 0.8, 300))
+    store.write('UP.NS', '1d', daily_bars(rising))
+    store.write('FLAT.NS', '1d', daily_bars(100 + np.sin(np.arange(300) / 9) * 5))
+
+    posted = []
+    monkeypatch.setattr('requests.post', lambda url, json, timeout: posted.append(json) or
+                        type('Response', (), {'raise_for_status': lambda self: None})())
+    watcher = SignalWatcher(tmp_path / 'market', atr_period=10, multiplier=3.0,
+                            symbols=['UP.NS', 'FLAT.NS'], sectors={'UP.NS': 'Tech'}, output_dir=tmp_path / 'out',
+                            webhook='http://example.invalid/hook')
+
+    assert watcher.poll() == []  # primes state
+    assert set(watcher.frames) == {'UP.NS', 'FLAT.NS'}
+    assert watcher.poll() == []  # nothing changed
+
+    computed = []
+    real_supertrend = watcher_module.supertrend
+    monkeypatch.setattr(watcher_module, 'supertrend',
+                        lambda df, **kwargs: computed.append(len(df)) or real_supertrend(df, **kwargs))
+
+    # A crash in the new bars flips UP.NS to a downtrend
+    crash = rising[-1] * np.exp(np.linspace(-0.05, -0.6, 30))
+    store.append('UP.NS', '1d', daily_bars(crash, start='2024-02-26'))
+    signals = watcher.poll()
+
+    assert len(computed) == 1
+    assert [(s['symbol'], s['signal'], s['sector']) for s in signals] == [('UP.NS', 'SELL', 'Tech')]
+    assert signals[0]['date'] >= pd.Timestamp('2024-02-26')
+
+    written = pd.read_csv(tmp_path / 'out' / 'signals.csv')
+    assert written[['symbol', 'signal']].values.tolist() == [['UP.NS', 'SELL']]
+    assert posted[0]['signals'][0]['symbol'] == 'UP.NS'
+
+
+def test_flip_on_a_weekly_bar_is_sent_once(tmp_path, monkeypatch):
+    store = MarketDataStore(tmp_path / 'market')
+    rising = 100 * np.exp(np.linspace(0, 0.8, 300))
+    store.write('UP.NS', '1d', daily_bars(rising))
+
+    posted = []
+    monkeypatch.setattr('requests.post', lambda url, json, timeout: posted.append(json) or
+                        type('Response', (), {'raise_for_status': lambda self: None})())
+    watcher = SignalWatcher(tmp_path / 'market', atr_period=10, multiplier=3.0, symbols=['UP.NS'],
+                            output_dir=tmp_path / 'out', webhook='http://example.invalid/hook')
+    assert watcher.poll() == []
+
+    # Daily bars that alternately crash and recover flip the week's bar back and forth
+    signals = []
+    for i, date in enumerate(pd.bdate_range('2024-02-26', periods=5)):
+        close = rising[-1] * (0.5 if i % 2 == 0 else 1.02)
+        store.append('UP.NS', '1d', daily_bars([close], start=date))
+        signals += watcher.poll()
+
+    assert [(s['signal'], s['date']) for s in signals] == [('SELL', pd.Timestamp('2024-02-26'))]
+    written = pd.read_csv(tmp_path / 'out' / 'signals.csv')
+    assert written[['symbol', 'signal']].values.tolist() == [['UP.NS', 'SELL']]
+    assert sum(len(payload['signals']) for payload in posted) == 1
+
+    # While the week is still open its flip is held back
+    monkeypatch.setattr(watcher_module, 'bar_end', lambda date, timeframe: pd.Timestamp.max)
+    store.append('UP.NS', '1d', daily_bars([rising[-1] * 1.02], start='2024-03-04'))
+    assert watcher.poll() == []
+
+
+def test_bar_end():
+    assert bar_end('2024-02-26', '1wk') == pd.Timestamp('2024-03-04')
+    assert bar_end('2024-02-01', '1mo') == pd.Timestamp('2024-03-01')
+    assert bar_end('2024-02-26 09:15', '4h') == pd.Timestamp('2024-02-26 13:15')
+    assert bar_end('2024-02-26', '1d') == pd.Timestamp('2024-02-27')
+
+
+def test_flip_events():
+    df = daily_bars(np.concatenate([np.linspace(100, 200, 60), np.linspace(200, 80, 60)]))
+    df_st = supertrend(df, atr_period=10, multiplier=2.0)
+    events = flip_events(df_st)
+    direction = df_st['ST_dir'].to_numpy()
+    flips = np.flatnonzero(direction[1:] != direction[:-1]) + 1
+    assert {date for date, _ in events} == set(df_st['Date'].iloc[flips])
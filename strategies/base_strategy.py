@@ -6,12 +6,41 @@ All strategy scanners should inherit from this class.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import pandas as pd
 import yfinance as yf
 
+from .data_cache import get_shared_cache
+
+# Indicator series memoized by BaseStrategy.indicator while
+# cached_indicators() is active: {(id(df), func, args): (df, series)}
+_indicator_cache: Optional[Dict] = None
+
+
+@contextmanager
+def cached_indicators():
+    """
+    Share indicator series across strategy instances within the block
+    
+    A parameter search runs generate_signals on the same frames for every
+    combination; with this active, each indicator is computed once per
+    frame and period instead of once per combination. Nested blocks share
+    the outermost cache, which is dropped when it exits.
+    """
+    global _indicator_cache
+    if _indicator_cache is not None:
+        yield
+        return
+    
+    _indicator_cache = {}
+    try:
+        yield
+    finally:
+        _indicator_cache = None
+
 
 @dataclass
 class Signal:
@@ -124,6 +153,51 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        Entry conditions for every bar at once (optional hook)
+        
+        Lets the backtest engine compute indicators once per symbol instead
+        of calling validate_signal on each day's history. Bar i's value must
+        equal validate_signal(df.iloc[:i + 1]), so only indicators over a
+        fixed window (not recursive ones like EMA or SuperTrend, which
+        depend on where the history starts) can be vectorized exactly.
+        
+        Args:
+            df: DataFrame with a symbol's full OHLCV history
+        
+        Returns:
+            Boolean (or score, > 0 meaning a signal) Series aligned with df,
+            or None if the strategy does not implement the hook
+        """
+        return None
+    
+    def indicator(self, df: pd.DataFrame, func: Callable, *args) -> pd.Series:
+        """
+        Indicator series func(df, *args), memoized inside cached_indicators()
+        
+        Entries are keyed by the frame's identity, so only use this on
+        long-lived frames (e.g. a price panel's), as generate_signals does.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            func: Indicator function or method taking (df, *args)
+            *args: Indicator parameters (e.g. the period)
+        
+        Returns:
+            Indicator Series aligned with df
+        """
+        cache = _indicator_cache
+        if cache is None:
+            return func(df, *args)
+        
+        key = (id(df), getattr(func, '__func__', func), args)
+        entry = cache.get(key)
+        if entry is None:
+            # Keeping df referenced stops its id being reused for another frame
+            entry = cache[key] = (df, func(df, *args))
+        return entry[1]
+    
     def fetch_data(
         self, 
         symbol: str, 
@@ -133,6 +207,9 @@ class BaseStrategy(ABC):
         """
         Fetch historical data for a symbol
         
+        Served from the process-wide OHLCV cache (see data_cache), so
+        strategies scanning the same symbols share one download.
+        
         Args:
             symbol: Stock symbol
             period: Time period (1mo, 3mo, 6mo, 1y, etc.)
@@ -142,21 +219,31 @@ class BaseStrategy(ABC):
             DataFrame with OHLCV data or None if error
         """
         try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
-            
-            if df.empty:
-                return None
-            
-            # Clean column names
-            df.columns = [col.lower() for col in df.columns]
-            
-            return df
+            return get_shared_cache().get(symbol, period, interval, self._download_history)
         
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _download_history(symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """Download bars from Yahoo Finance (cache loader for fetch_data)"""
+        ticker = yf.Ticker(symbol)
+        df = ticker.history(period=period, interval=interval)
+        
+        if df.empty:
+            return None
+        
+        # Clean column names
+        df.columns = [col.lower() for col in df.columns]
+        
+        return df
+    
+    @staticmethod
+    def cache_stats() -> Dict:
+        """Hit/miss counters of the shared fetch_data cache"""
+        return get_shared_cache().stats()
+    
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
         """
         Calculate Average True Range (ATR)
@@ -205,14 +292,17 @@ class BaseStrategy(ABC):
         Returns:
             Current RSI value
         """
+        return float(self.rsi_series(df, period).iloc[-1])
+    
+    @staticmethod
+    def rsi_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
+        """RSI of every bar (simple moving averages of gains and losses)"""
         delta = df['close'].diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
         
         rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return float(rsi.iloc[-1])
+        return 100 - (100 / (1 + rs))
     
     def calculate_volume_ratio(self, df: pd.DataFrame, period: int = 20) -> float:
         """
@@ -232,6 +322,12 @@ class BaseStrategy(ABC):
             return float(current_volume / avg_volume)
         return 1.0
     
+    @staticmethod
+    def volume_ratio_series(df: pd.DataFrame, period: int = 20) -> pd.Series:
+        """calculate_volume_ratio of every bar (1.0 where the average is not positive)"""
+        avg_volume = df['volume'].rolling(window=period).mean()
+        return (df['volume'] / avg_volume).where(avg_volume > 0, 1.0)
+    
     def is_above_sma(self, df: pd.DataFrame, period: int) -> bool:
         """
         Check if current price is above SMA
@@ -261,6 +357,11 @@ class BaseStrategy(ABC):
         """
         return float(df['high'].tail(period).max())
     
+    @staticmethod
+    def recent_high_series(df: pd.DataFrame, period: int = 20) -> pd.Series:
+        """get_recent_high of every bar"""
+        return df['high'].rolling(window=period, min_periods=1).max()
+    
     def get_recent_low(self, df: pd.DataFrame, period: int = 20) -> float:
         """
         Get lowest price in recent period
@@ -0,0 +1,349 @@
+"""
+Shared OHLCV Cache
+
+Process-wide cache behind BaseStrategy.fetch_data, so several strategies
+scanning the same watchlist download each (symbol, period, interval) once.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from src.config import MARKET_DATA_DIR
+    from src.scanner.market_store import MarketDataStore
+    from src.scanner.trading_calendar import nse_calendar
+    from src.scanner.utils import sanitize_symbol
+    STORE_AVAILABLE = True
+except ImportError:
+    STORE_AVAILABLE = False
+
+
+PERIOD_PATTERN = re.compile(r'(\d+)(d|wk|mo|y)')
+
+# How far a bar's Date can precede the last bar it covers, by interval
+BAR_SPANS = {'1wk': pd.Timedelta(days=6), '1mo': pd.Timedelta(days=30), '3mo': pd.Timedelta(days=91)}
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """
+    First date covered by a yfinance period string
+
+    Args:
+        period: '5d', '2wk', '3mo', '1y', 'ytd' or 'max'
+        now: Reference time (default: today)
+
+    Returns:
+        Timestamp, or None for 'max' / unrecognised periods
+    """
+    now = (now or pd.Timestamp.now()).normalize()
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1)
+
+    match = PERIOD_PATTERN.fullmatch(period)
+    if not match:
+        return None
+
+    n, unit = int(match.group(1)), match.group(2)
+    offsets = {
+        'd': pd.DateOffset(days=n),
+        'wk': pd.DateOffset(weeks=n),
+        'mo': pd.DateOffset(months=n),
+        'y': pd.DateOffset(years=n),
+    }
+    return now - offsets[unit]
+
+
+class OHLCVCache:
+    """
+    TTL'd, size-bounded LRU cache of fetch_data results.
+
+    Lookups go memory -> on-disk market-data store -> loader. A miss that
+    reaches the loader writes the bars to the store, so other processes
+    (and the next run) can reuse them while they are fresh. Concurrent
+    requests for the same key share one in-flight load.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float = 900.0,
+        store=None
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum cached frames
+            max_bytes: Maximum total frame memory
+            ttl: Seconds before a cached frame (or stored series) is stale
+            store: MarketDataStore to spill to (None for memory only)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.store = store
+
+        self._entries = OrderedDict()  # key -> (expires_at, nbytes, DataFrame)
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._bytes = 0
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'disk_hits': 0,
+            'coalesced': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'errors': 0,
+        }
+
+    def get(
+        self,
+        symbol: str,
+        period: str,
+        interval: str,
+        loader: Callable[[str, str, str], Optional[pd.DataFrame]]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Cached frame for (symbol, period, interval), loading it on a miss
+
+        Args:
+            symbol: Stock symbol
+            period: yfinance period string
+            interval: Bar interval
+            loader: Called as loader(symbol, period, interval) on a miss
+
+        Returns:
+            Copy of the cached DataFrame, or None if the loader found no data
+        """
+        key = (symbol, period, interval)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return entry[2].copy()
+                self._drop(key)
+                self._counters['expirations'] += 1
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters['coalesced'] += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self._counters['misses'] += 1
+                owner = True
+
+        if not owner:
+            df = future.result()
+            return None if df is None else df.copy()
+
+        try:
+            df = self._load(symbol, period, interval, loader)
+            if df is not None:
+                self._put(key, df)
+            future.set_result(df)
+        except Exception as e:
+            with self._lock:
+                self._counters['errors'] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        return None if df is None else df.copy()
+
+    def get_many(
+        self,
+        symbols: List[str],
+        period: str,
+        interval: str,
+        batch_loader: Callable[[List[str], str, str], Dict[str, pd.DataFrame]]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Cached frames for many symbols, loading every miss in one call
+
+        Symbols are served from memory, then the store; the rest go to
+        batch_loader together and are cached and stored like get() misses.
+        Batched loads are not coalesced with concurrent get() calls.
+
+        Args:
+            symbols: Stock symbols
+            period: yfinance period string
+            interval: Bar interval
+            batch_loader: Called as batch_loader(symbols, period, interval) with
+                the misses; returns {symbol: DataFrame in fetch_data layout}
+
+        Returns:
+            {symbol: copy of the cached DataFrame} for the symbols with data
+        """
+        frames, missing = {}, []
+        for symbol in dict.fromkeys(symbols):
+            key = (symbol, period, interval)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    frames[symbol] = entry[2].copy()
+                    continue
+                if entry is not None:
+                    self._drop(key)
+                    self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+
+            df = self._read_store(symbol, period, interval)
+            if df is not None:
+                with self._lock:
+                    self._counters['disk_hits'] += 1
+                self._put(key, df)
+                frames[symbol] = df.copy()
+            else:
+                missing.append(symbol)
+
+        if missing:
+            try:
+                loaded = batch_loader(missing, period, interval) or {}
+            except Exception:
+                with self._lock:
+                    self._counters['errors'] += 1
+                raise
+            for symbol in missing:
+                df = loaded.get(symbol)
+                if df is None or df.empty:
+                    continue
+                self._write_store(symbol, interval, df)
+                self._put((symbol, period, interval), df)
+                frames[symbol] = df.copy()
+
+        return frames
+
+    def _load(self, symbol, period, interval, loader):
+        df = self._read_store(symbol, period, interval)
+        if df is not None:
+            with self._lock:
+                self._counters['disk_hits'] += 1
+            return df
+
+        df = loader(symbol, period, interval)
+        if df is not None and not df.empty:
+            self._write_store(symbol, interval, df)
+        return df
+
+    def _read_store(self, symbol, period, interval):
+        """Fresh enough stored bars covering the period, in fetch_data layout"""
+        if self.store is None:
+            return None
+
+        try:
+            entry = self.store.manifest.get(sanitize_symbol(symbol), interval)
+            if entry is None:
+                return None
+
+            updated_at = datetime.fromisoformat(entry['updated_at'])
+            start = period_start(period)
+            if datetime.now() - updated_at > timedelta(seconds=self.ttl):
+                return None
+            if start is None or entry['first_bar'] > start + pd.Timedelta(days=5):
+                return None
+            if entry['last_bar'] < self._latest_expected_bar(interval):
+                # Recently written, but an old window (e.g. a historical fetch)
+                return None
+
+            df = self.store.read(symbol, interval, start=start)
+            if df is None or df.empty:
+                return None
+
+            df = df.set_index('Date')
+            df.columns = [col.lower() for col in df.columns]
+            return df
+        except Exception:
+            return None
+
+    def _latest_expected_bar(self, interval):
+        """
+        Oldest acceptable last bar for a series to count as current
+
+        Today's bar may not exist yet, so the last session before today is
+        enough (or anything within the TTL, if that is longer).
+        """
+        now = pd.Timestamp.now()
+        expected = min(nse_calendar().previous_session(now), (now - pd.Timedelta(seconds=self.ttl)).normalize())
+        return expected - BAR_SPANS.get(interval, pd.Timedelta(0))
+
+    def _write_store(self, symbol, interval, df):
+        if self.store is None:
+            return
+        try:
+            with self._store_lock:
+                self.store.append(symbol, interval, df, source='yahoo')
+        except Exception:
+            # The store is an optimisation; never fail a fetch because of it
+            pass
+
+    def _put(self, key, df):
+        nbytes = int(df.memory_usage(index=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, nbytes, df)
+            self._bytes += nbytes
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._counters['evictions'] += 1
+
+    def _drop(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def clear(self):
+        """Drop every cached frame (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counters and current size
+
+        Returns:
+            Dict with hits, misses, disk_hits, coalesced, evictions,
+            expirations, errors, hit_rate, entries and bytes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+            stats['hit_rate'] = (stats['hits'] + stats['coalesced']) / lookups if lookups else 0.0
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> OHLCVCache:
+    """Process-wide cache used by BaseStrategy.fetch_data"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            store = MarketDataStore(MARKET_DATA_DIR) if STORE_AVAILABLE else None
+            _shared_cache = OHLCVCache(store=store)
+        return _shared_cache
@@ -181,6 +181,37 @@ class MeanReversionStrategy(BaseStrategy):
         except Exception as e:
             return False
     
+    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        """
+        validate_signal for every bar at once
+        
+        Args:
+            df: DataFrame with OHLCV data
+        
+        Returns:
+            Boolean Series, True where the bar is a valid oversold bounce setup
+        """
+        close = df['close']
+        sma_200 = self.indicator(df, self.calculate_sma, self.sma_long)
+        rsi = self.indicator(df, self.rsi_series, self.rsi_period)
+        recent_high = self.indicator(df, self.recent_high_series, 5)
+        volume_ratio = self.indicator(df, self.volume_ratio_series, self.volume_period)
+        selloff_pct = (close - recent_high) / recent_high * 100
+        
+        # validate_signal's Bollinger Band check always falls through to its
+        # except (there is no calculate_bollinger_bands), so it is not applied
+        signals = (
+            ~(close < sma_200)
+            & ~(rsi > self.max_rsi)
+            & ~((selloff_pct > -self.min_selloff_pct) | (selloff_pct < -self.max_selloff_pct))
+            & ~(volume_ratio < self.min_volume_ratio)
+            & ~(close <= close.shift())
+            & ~((close - df['open']).abs() < (df['high'] - df['low']) * 0.5)
+        )
+        
+        # The first bar has no previous close (validate_signal fails on it)
+        return signals & (np.arange(len(df)) > 0)
+    
     def calculate_targets(self, df: pd.DataFrame, entry_price: float) -> Dict:
         """
         Calculate stop loss and target prices
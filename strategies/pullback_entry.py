@@ -162,6 +162,35 @@ class PullbackEntryStrategy(BaseStrategy):
         
         return True
     
+    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        """
+        validate_signal for every bar at once
+        
+        Args:
+            df: DataFrame with OHLCV data
+        
+        Returns:
+            Boolean Series, True where the bar is a valid pullback setup
+        """
+        close = df['close']
+        sma_50 = self.indicator(df, self.calculate_sma, self.long_sma_period)
+        sma_20 = self.indicator(df, self.calculate_sma, self.short_sma_period)
+        rsi = self.indicator(df, self.rsi_series, self.rsi_period)
+        volume_ratio = self.indicator(df, self.volume_ratio_series, self.volume_lookback)
+        recent_high = self.indicator(df, self.recent_high_series, 10)
+        distance_from_sma = (close - sma_20).abs() / sma_20 * 100
+        
+        # Negated failure conditions, so NaN indicators pass as in validate_signal
+        return (
+            ~(close < sma_50)
+            & ~(distance_from_sma > self.max_distance_from_sma)
+            & ~(close < sma_20 * 0.98)
+            & ~((rsi < self.min_rsi) | (rsi > self.max_rsi))
+            & ~(volume_ratio < self.min_volume_ratio)
+            & ~(recent_high < close * 1.03)
+            & ~(sma_20 < sma_50)
+        )
+    
     def calculate_targets(self, df: pd.DataFrame, entry_price: float) -> Dict:
         """
         Calculate stop loss and target prices
@@ -9,10 +9,14 @@ Features:
 - Performance metrics calculation
 - Trade log generation
 - Multiple strategy comparison
+- Vectorized signals for strategies implementing generate_signals
+
+Prices come from a PricePanel loaded once per run from the market-data
+store, so a backtest makes no per-day downloads and can run offline.
 """
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -25,6 +29,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from strategies.base_strategy import BaseStrategy, Signal
 from utils.performance_tracker import StrategyMetrics, TradeResult
+from utils.price_panel import PricePanel
+from src.scanner.trading_calendar import nse_calendar
 
 # Setup logging
 logs_dir = Path("logs")
@@ -44,6 +50,14 @@ file_handler.setFormatter(formatter)
 
 logger.addHandler(file_handler)
 
+# Calendar days of history a strategy sees on each simulated day
+HISTORY_DAYS = 365
+
+# Bars of history needed before a strategy is asked for a signal
+MIN_HISTORY_BARS = 50
+
+SIGNAL_MODES = ("auto", "vectorized", "loop")
+
 
 @dataclass
 class BacktestConfig:
@@ -150,14 +164,36 @@ class BacktestEngine:
     - Realistic entry/exit
     """
     
-    def __init__(self, config: BacktestConfig):
+    def __init__(
+        self,
+        config: BacktestConfig,
+        panel: Optional[PricePanel] = None,
+        cache_dir: Optional[str] = None,
+        offline: bool = False,
+        mode: str = "auto"
+    ):
         """
         Initialize backtest engine
         
         Args:
             config: Backtest configuration
+            panel: Preloaded prices (default: loaded from the store on run)
+            cache_dir: Market-data store root (default: MARKET_DATA_DIR)
+            offline: Only use stored bars, never download missing ones
+            mode: How entries are found: 'vectorized' precomputes them with
+                strategy.generate_signals, 'loop' calls validate_signal on
+                each day's history, 'auto' vectorizes when the strategy
+                implements the hook
         """
+        if mode not in SIGNAL_MODES:
+            raise ValueError(f"mode must be one of {SIGNAL_MODES}, got {mode!r}")
+        
         self.config = config
+        self.panel = panel
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.mode = mode
+        self.signals: Dict[str, np.ndarray] = {}
         self.capital = config.initial_capital
         self.trades: List[BacktestTrade] = []
         self.open_positions: List[BacktestTrade] = []
@@ -192,15 +228,32 @@ class BacktestEngine:
         start_date = datetime.fromisoformat(self.config.start_date)
         end_date = datetime.fromisoformat(self.config.end_date)
         
-        # Iterate through each trading day
-        current_date = start_date
-        day_count = 0
+        # Every symbol's history, once, with warm-up for the first day's indicators
+        if self.panel is None:
+            self.panel = PricePanel.load(
+                symbols,
+                start_date - timedelta(days=HISTORY_DAYS),
+                end_date,
+                cache_dir=self.cache_dir,
+                download_missing=not self.offline
+            )
+        
+        # Entry conditions for every bar, once per symbol
+        if self.mode != "loop":
+            self.signals = self._precompute_signals(strategy, symbols)
+            if self.mode == "vectorized" and not self.signals:
+                raise ValueError(f"{strategy.name} does not implement generate_signals")
+        logger.info(f"Signal mode: {'vectorized' if self.signals else 'loop'}")
         
-        while current_date <= end_date:
-            day_count += 1
+        # Iterate through each NSE session; within the loaded data its bar dates decide
+        calendar = nse_calendar().with_observed(self.panel.dates)
+        sessions = calendar.sessions(start_date, end_date)
+        
+        for day_count, session in enumerate(sessions, 1):
+            current_date = session.to_pydatetime()
             
-            # Progress update
-            if progress_callback and day_count % 30 == 0:
+            # Progress update (about monthly)
+            if progress_callback and day_count % 20 == 0:
                 progress = int(((current_date - start_date).days / (end_date - start_date).days) * 100)
                 progress_callback(progress, current_date.strftime('%Y-%m-%d'))
                 logger.info(f"Progress: {progress}% - {current_date.strftime('%Y-%m-%d')} - Open positions: {len(self.open_positions)} - Trades: {len(self.trades)}")
@@ -217,12 +270,10 @@ class BacktestEngine:
                 'date': current_date.strftime('%Y-%m-%d'),
                 'capital': self.capital
             })
-            
-            # Next trading day
-            current_date += timedelta(days=1)
         
-        # Close all remaining positions at end date
-        self._close_all_positions(end_date, "backtest_end")
+        # Close all remaining positions on the last session
+        last_session = sessions[-1].to_pydatetime() if len(sessions) else end_date
+        self._close_all_positions(last_session, "backtest_end")
         
         # Calculate results
         result = self._calculate_results(strategy.name)
@@ -248,21 +299,11 @@ class BacktestEngine:
             if any(pos.symbol == symbol for pos in self.open_positions):
                 continue
             
-            # Get historical data up to current_date
             try:
-                df = self._get_historical_data(symbol, current_date)
-                
-                if df is None or len(df) < 50:  # Need enough data for indicators
-                    continue
+                # Historical data up to current_date, if the strategy signals on its last bar
+                df_for_strategy = self._signal_history(strategy, symbol, current_date)
                 
-                # Prepare DataFrame for strategy validation
-                # Ensure it has lowercase column names expected by strategies
-                df_for_strategy = df.copy()
-                if 'Close' in df_for_strategy.columns:
-                    df_for_strategy.columns = df_for_strategy.columns.str.lower()
-                
-                # Check if strategy validates this as a signal
-                if not strategy.validate_signal(df_for_strategy):
+                if df_for_strategy is None:
                     continue
                 
                 # Calculate entry price and targets
@@ -317,6 +358,47 @@ class BacktestEngine:
                 # Silent fail for individual symbols to keep backtest running
                 continue
     
+    def _precompute_signals(self, strategy: BaseStrategy, symbols: List[str]) -> Dict[str, np.ndarray]:
+        """
+        strategy.generate_signals over each traded symbol's full history
+        
+        Returns:
+            {symbol: bool array aligned with the panel frame}, empty if the
+            strategy does not implement the hook. Symbols whose signals
+            fail to compute are left out and use validate_signal.
+        """
+        signals = {}
+        for symbol in symbols:
+            frame = self.panel.frames.get(symbol)
+            if frame is None:
+                continue
+            try:
+                values = strategy.generate_signals(frame)
+            except Exception as e:
+                logger.error(f"Error generating signals for {symbol}: {str(e)}")
+                continue
+            
+            if values is None:
+                return {}
+            signals[symbol] = np.nan_to_num(np.asarray(values, dtype=np.float64)) > 0
+        return signals
+    
+    def _signal_history(self, strategy: BaseStrategy, symbol: str, current_date: datetime) -> Optional[pd.DataFrame]:
+        """History up to current_date if the strategy signals on it, else None"""
+        signals = self.signals.get(symbol)
+        
+        if signals is None:
+            df = self._get_historical_data(symbol, current_date)
+            if df is None or not strategy.validate_signal(df):
+                return None
+            return df
+        
+        # Precomputed: the signal of the last bar before current_date
+        lo, hi = self.panel.rows(symbol, current_date, days=HISTORY_DAYS)
+        if hi - lo < MIN_HISTORY_BARS or not signals[hi - 1]:
+            return None
+        return self.panel.frames[symbol].iloc[lo:hi]
+    
     def _check_exits(self, current_date: datetime):
         """Check if any open positions hit SL/Target or time stop"""
         for position in self.open_positions[:]:  # Copy list to allow removal during iteration
@@ -383,57 +465,17 @@ class BacktestEngine:
         Get historical data for a symbol up to current_date (for backtesting).
         This simulates what data would have been available on that date.
         """
-        try:
-            # Get data from 1 year before current_date to ensure enough history for indicators
-            start = current_date - timedelta(days=365)
-            end = current_date
-            
-            df = yf.download(symbol, start=start, end=end, progress=False)
-            
-            if df.empty or len(df) < 50:
-                return None
-            
-            # Flatten multi-level columns if present
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            # Reset index to have Date as a column
-            df = df.reset_index()
-            df['symbol'] = symbol
-            
-            return df
-            
-        except Exception as e:
+        # One year before current_date to ensure enough history for indicators
+        df = self.panel.history(symbol, current_date, days=HISTORY_DAYS)
+        
+        if df is None or len(df) < MIN_HISTORY_BARS:
             return None
+        
+        return df
     
     def _get_ohlc_for_date(self, symbol: str, date: datetime) -> Optional[Dict]:
         """Get OHLC data for a specific date"""
-        try:
-            # Fetch a small window around the date
-            start = date - timedelta(days=5)
-            end = date + timedelta(days=1)
-            
-            df = yf.download(symbol, start=start, end=end, progress=False)
-            
-            if df.empty:
-                return None
-            
-            # Find the row for the specific date
-            date_str = date.strftime('%Y-%m-%d')
-            
-            if date_str in df.index.astype(str):
-                row = df.loc[date_str]
-                return {
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': float(row['Volume'])
-                }
-            
-            return None
-        except:
-            return None
+        return self.panel.bar(symbol, date)
     
     def _calculate_results(self, strategy_name: str) -> BacktestResult:
         """Calculate backtest results"""
@@ -540,6 +582,61 @@ class BacktestEngine:
         return max_dd
 
 
+def cross_check_modes(
+    config: BacktestConfig,
+    strategy: BaseStrategy,
+    symbols: List[str],
+    panel: Optional[PricePanel] = None,
+    cache_dir: Optional[str] = None,
+    offline: bool = False
+) -> Dict:
+    """
+    Backtest a strategy in vectorized and loop mode on the same prices
+    
+    The two must agree trade for trade; a difference means generate_signals
+    does not reproduce validate_signal.
+    
+    Args:
+        config: Backtest configuration
+        strategy: Strategy implementing generate_signals
+        symbols: List of symbols to trade
+        panel: Preloaded prices (default: loaded once for both runs)
+        cache_dir: Market-data store root (default: MARKET_DATA_DIR)
+        offline: Only use stored bars, never download missing ones
+        
+    Returns:
+        Dict with match, the vectorized and loop results, and the trades
+        found by only one of them (only_vectorized, only_loop)
+    """
+    vectorized_engine = BacktestEngine(config, panel=panel, cache_dir=cache_dir, offline=offline, mode="vectorized")
+    vectorized = vectorized_engine.run(strategy, symbols)
+    loop = BacktestEngine(config, panel=vectorized_engine.panel, mode="loop").run(strategy, symbols)
+    
+    def keys(result):
+        return {
+            (t['symbol'], t['entry_date'], t['entry_price'], t['shares'], t['exit_date'], t['exit_price'])
+            for t in result.trades
+        }
+    
+    only_vectorized = sorted(keys(vectorized) - keys(loop))
+    only_loop = sorted(keys(loop) - keys(vectorized))
+    match = not only_vectorized and not only_loop and vectorized.final_capital == loop.final_capital
+    
+    if not match:
+        logger.error(
+            f"Signal modes disagree for {strategy.name}: {len(only_vectorized)} trades only vectorized, "
+            f"{len(only_loop)} only loop"
+        )
+    
+    return {
+        'match': match,
+        'vectorized': vectorized,
+        'loop': loop,
+        'only_vectorized': only_vectorized,
+        'only_loop': only_loop
+    }
+
+
 # Example usage
 if __name__ == "__main__":
     # Example configuration
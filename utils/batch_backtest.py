@@ -0,0 +1,333 @@
+"""
+Batch Backtest
+
+Run many backtests (strategies x parameter sets x symbol universes) in one
+wall-clock run and compare them.
+
+The prices for every universe are loaded once into a PricePanel, saved to
+a temporary directory and opened memory-mapped by each worker process, so
+the pool shares one read-only copy of the market data instead of
+pickling or reloading it per job.
+"""
+
+import importlib
+import itertools
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from strategies.base_strategy import BaseStrategy, cached_indicators
+from utils.backtest_engine import HISTORY_DAYS, BacktestConfig, BacktestEngine
+from utils.price_panel import PricePanel
+from src.scanner.executor import make_shards, run_sharded
+
+logger = logging.getLogger("backtest")
+
+# Strategies available to batch runs: name -> (module, class)
+STRATEGIES = {
+    "pullback_entry": ("strategies.pullback_entry", "PullbackEntryStrategy"),
+    "momentum_btst": ("strategies.momentum_btst", "MomentumBTSTStrategy"),
+    "improved_btst": ("strategies.improved_btst", "ImprovedBTSTStrategy"),
+    "swing_supertrend": ("strategies.swing_supertrend", "SwingSuperTrendStrategy"),
+    "mean_reversion": ("strategies.mean_reversion", "MeanReversionStrategy"),
+    "swing_breakout_india": ("strategies.swing_breakout_india", "SwingBreakoutIndiaStrategy"),
+}
+
+# Config fields a parameter set may override (the period decides the panel)
+CONFIG_PARAMS = tuple(f.name for f in fields(BacktestConfig) if f.name not in ("start_date", "end_date"))
+
+# Columns of the comparison table, in order
+TABLE_COLUMNS = [
+    'job_id', 'strategy', 'universe', 'params', 'symbols', 'total_trades', 'win_rate',
+    'total_return_pct', 'profit_factor', 'expectancy', 'max_drawdown', 'sharpe_ratio',
+    'final_capital', 'error'
+]
+
+# Panels opened by this process, by directory
+_panels: Dict[str, PricePanel] = {}
+
+
+@dataclass
+class BatchJob:
+    """One backtest of a batch"""
+    job_id: int
+    strategy: str
+    universe: str
+    symbols: List[str]
+    params: Dict = field(default_factory=dict)
+    
+    # Period overriding the batch config's (within the panel's dates)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'strategy': self.strategy,
+            'universe': self.universe,
+            'symbols': len(self.symbols),
+            'params': self.params,
+            'start_date': self.start_date,
+            'end_date': self.end_date
+        }
+
+
+@dataclass
+class BatchResult:
+    """Batch backtest results"""
+    jobs: List[BatchJob]
+    table: pd.DataFrame  # One row per job, best total return first
+    results: Dict[int, Dict]  # job_id -> BacktestResult.to_dict()
+    
+    def to_dict(self):
+        return {
+            'jobs': [job.to_dict() for job in self.jobs],
+            'table': self.table.astype(object).where(self.table.notna(), None).to_dict('records'),
+            'results': {str(job_id): result for job_id, result in self.results.items()}
+        }
+
+
+def make_strategy(name: str, params: Optional[Dict] = None) -> BaseStrategy:
+    """
+    Instantiate a strategy and apply parameter overrides
+    
+    Args:
+        name: Strategy name (key of STRATEGIES)
+        params: Strategy attributes to set (e.g. {'min_volume_ratio': 1.2});
+            config keys (CONFIG_PARAMS) are ignored here
+    
+    Returns:
+        Strategy instance
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}', expected one of {', '.join(STRATEGIES)}")
+    
+    module, class_name = STRATEGIES[name]
+    strategy = getattr(importlib.import_module(module), class_name)()
+    
+    for key, value in (params or {}).items():
+        if key in CONFIG_PARAMS:
+            continue
+        if not hasattr(strategy, key):
+            raise ValueError(f"{name} has no parameter '{key}'")
+        setattr(strategy, key, value)
+    
+    return strategy
+
+
+def expand_jobs(
+    strategies: List[str],
+    universes: Dict[str, List[str]],
+    param_sets: Optional[Union[List[Dict], Dict[str, List[Dict]]]] = None
+) -> List[BatchJob]:
+    """
+    Every combination of strategy, parameter set and universe
+    
+    Args:
+        strategies: Strategy names
+        universes: {universe name: symbols}
+        param_sets: Parameter sets for every strategy, or {strategy: parameter
+            sets}; a strategy without any runs once with its defaults
+    
+    Returns:
+        List of BatchJob, numbered in order
+    """
+    jobs = []
+    for strategy in strategies:
+        if isinstance(param_sets, dict):
+            sets = param_sets.get(strategy) or [{}]
+        else:
+            sets = param_sets or [{}]
+        
+        for params, (universe, symbols) in itertools.product(sets, universes.items()):
+            # Fail here, not in a worker, on unknown strategies or parameters
+            make_strategy(strategy, params)
+            jobs.append(BatchJob(len(jobs), strategy, universe, list(symbols), dict(params)))
+    
+    return jobs
+
+
+def run_jobs(jobs: List[BatchJob], panel_dir: str, config: Dict, mode: str = "auto") -> List[Dict]:
+    """
+    Run a shard of jobs on a saved panel
+    
+    Runs inside the worker: the panel is memory-mapped once per process and
+    only the job descriptions and result dicts cross the process boundary.
+    Jobs in a shard share indicator series (see cached_indicators), so a
+    shard of parameter sets computes each indicator once per symbol.
+    
+    Args:
+        jobs: Jobs to run
+        panel_dir: Directory written by PricePanel.save
+        config: Base BacktestConfig as a dict
+        mode: Signal mode for the engine
+    
+    Returns:
+        List of {'job_id', 'result'} or {'job_id', 'error'} dicts
+    """
+    panel = _panels.get(panel_dir)
+    if panel is None:
+        panel = _panels[panel_dir] = PricePanel.open(panel_dir)
+    
+    outcomes = []
+    with cached_indicators():
+        for job in jobs:
+            try:
+                overrides = {key: value for key, value in job.params.items() if key in CONFIG_PARAMS}
+                if job.start_date:
+                    overrides['start_date'] = job.start_date
+                if job.end_date:
+                    overrides['end_date'] = job.end_date
+                
+                strategy = make_strategy(job.strategy, job.params)
+                engine = BacktestEngine(BacktestConfig(**{**config, **overrides}), panel=panel, mode=mode)
+                outcomes.append({'job_id': job.job_id, 'result': engine.run(strategy, job.symbols).to_dict()})
+            except Exception as e:
+                logger.error(f"Batch job {job.job_id} ({job.strategy}/{job.universe}) failed: {str(e)}")
+                outcomes.append({'job_id': job.job_id, 'error': str(e)})
+    
+    return outcomes
+
+
+def run_parallel(
+    jobs: List[BatchJob],
+    panel_dir: str,
+    config: BacktestConfig,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+    mode: str = "auto",
+    shard_size: int = 1,
+    progress_callback: Optional[Callable] = None
+) -> Tuple[Dict[int, Dict], Dict[int, str]]:
+    """
+    Fan jobs out over run_jobs on a saved panel
+    
+    Args:
+        jobs: Jobs to run
+        panel_dir: Directory written by PricePanel.save
+        config: Base backtest configuration
+        executor: 'process', 'thread' or 'serial'
+        max_workers: Pool size (default: CPU count)
+        mode: Signal mode for the engine
+        shard_size: Jobs per worker call; larger shards share more cached
+            indicators, smaller ones balance the pool better
+        progress_callback: Optional callback(jobs done, total jobs)
+    
+    Returns:
+        ({job_id: BacktestResult dict}, {job_id: error message})
+    """
+    results, errors = {}, {}
+    shards = make_shards(jobs, shard_size, max_workers=max_workers or os.cpu_count())
+    outcomes = run_sharded(
+        run_jobs, shards, executor=executor, max_workers=max_workers,
+        panel_dir=str(panel_dir), config=config.to_dict(), mode=mode
+    )
+    
+    done = 0
+    for shard, shard_outcomes in outcomes:
+        for outcome in shard_outcomes:
+            if 'error' in outcome:
+                errors[outcome['job_id']] = outcome['error']
+            else:
+                results[outcome['job_id']] = outcome['result']
+        done += len(shard)
+        if progress_callback:
+            progress_callback(done, len(jobs))
+    
+    _panels.pop(str(panel_dir), None)
+    return results, errors
+
+
+def load_panel(
+    config: BacktestConfig,
+    symbols: List[str],
+    cache_dir: Optional[str] = None,
+    offline: bool = False
+) -> PricePanel:
+    """Load a panel covering the config's period plus indicator warm-up"""
+    return PricePanel.load(
+        list(dict.fromkeys(symbols)),
+        datetime.fromisoformat(config.start_date) - timedelta(days=HISTORY_DAYS),
+        datetime.fromisoformat(config.end_date),
+        cache_dir=cache_dir,
+        download_missing=not offline
+    )
+
+
+def comparison_table(jobs: List[BatchJob], results: Dict[int, Dict], errors: Dict[int, str]) -> pd.DataFrame:
+    """
+    One row of metrics per job, best total return first
+    
+    Returns:
+        DataFrame with TABLE_COLUMNS
+    """
+    rows = []
+    for job in jobs:
+        row = job.to_dict()
+        result = results.get(job.job_id)
+        if result is not None:
+            row.update({column: result[column] for column in TABLE_COLUMNS if column in result})
+        row['error'] = errors.get(job.job_id)
+        rows.append(row)
+    
+    table = pd.DataFrame(rows).reindex(columns=TABLE_COLUMNS)
+    return table.sort_values(['total_return_pct', 'job_id'], ascending=[False, True], na_position='last').reset_index(drop=True)
+
+
+def run_batch(
+    config: BacktestConfig,
+    strategies: List[str],
+    universes: Dict[str, List[str]],
+    param_sets: Optional[Union[List[Dict], Dict[str, List[Dict]]]] = None,
+    panel: Optional[PricePanel] = None,
+    cache_dir: Optional[str] = None,
+    offline: bool = False,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+    mode: str = "auto",
+    progress_callback: Optional[Callable] = None
+) -> BatchResult:
+    """
+    Backtest every strategy x parameter set x universe in parallel
+    
+    Args:
+        config: Backtest period and default capital settings
+        strategies: Strategy names (keys of STRATEGIES)
+        universes: {universe name: symbols}
+        param_sets: Parameter sets (see expand_jobs); keys naming config
+            fields (CONFIG_PARAMS) override the config, others set strategy
+            attributes
+        panel: Preloaded prices covering every universe (default: loaded
+            once from the store)
+        cache_dir: Market-data store root (default: MARKET_DATA_DIR)
+        offline: Only use stored bars, never download missing ones
+        executor: 'process', 'thread' or 'serial'
+        max_workers: Pool size (default: CPU count)
+        mode: Signal mode for the engine ('auto', 'vectorized' or 'loop')
+        progress_callback: Optional callback(jobs done, total jobs)
+    
+    Returns:
+        BatchResult
+    """
+    jobs = expand_jobs(strategies, universes, param_sets)
+    logger.info(f"Batch backtest: {len(jobs)} jobs ({len(strategies)} strategies x {len(universes)} universes)")
+    
+    if panel is None:
+        panel = load_panel(config, [symbol for job in jobs for symbol in job.symbols], cache_dir, offline)
+    
+    with tempfile.TemporaryDirectory(prefix="batch_panel_") as panel_dir:
+        panel.save(panel_dir)
+        
+        # One job per call: strategies differ widely in cost
+        results, errors = run_parallel(
+            jobs, panel_dir, config, executor=executor, max_workers=max_workers,
+            mode=mode, progress_callback=progress_callback
+        )
+    
+    logger.info(f"Batch backtest complete: {len(results)} jobs succeeded, {len(errors)} failed")
+    return BatchResult(jobs=jobs, table=comparison_table(jobs, results, errors), results=results)
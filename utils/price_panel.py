@@ -0,0 +1,248 @@
+"""
+Price Panel
+
+Daily OHLCV for every symbol in a backtest, loaded once from the
+market-data store and aligned on a common calendar.
+
+Lookups during the simulation are index arithmetic on preloaded arrays:
+- history(): a row slice of the symbol's frame (a view, not a copy)
+- bar(): one column of the concatenated price array
+
+All state is a handful of numpy arrays, so a panel can be saved once and
+opened read-only by many processes as memory-mapped files (save/open).
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.config import MARKET_DATA_DIR
+    from src.scanner.data_fetcher import fetch_batch, load_cached_many
+    STORE_AVAILABLE = True
+except ImportError:
+    STORE_AVAILABLE = False
+
+logger = logging.getLogger("backtest")
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Arrays that make up a panel (see PricePanel attributes)
+ARRAYS = ('prices', 'bar_dates', 'offsets', 'date_values', 'positions')
+
+
+class PricePanel:
+    """
+    Daily bars for many symbols on the union of their trading dates
+
+    Attributes:
+        symbols: Symbols in panel order
+        dates: Sorted union of every symbol's bar dates
+        prices: float64 array (field, bar) of every symbol's bars, symbol by symbol
+        bar_dates: int64 array (bar) of bar dates in nanoseconds
+        offsets: int64 array (symbol + 1); symbol s owns bars offsets[s]:offsets[s + 1]
+        date_values: dates as int64 nanoseconds
+        positions: int64 array (date + 1, symbol); positions[i, s] is the
+            number of bars of symbol s dated before dates[i]
+        frames: {symbol: DataFrame} views in the layout strategies expect
+            (date, open, high, low, close, volume, symbol)
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame]):
+        """
+        Build the panel from stored bars
+
+        Args:
+            data: {symbol: DataFrame with Date/Open/High/Low/Close/Volume columns}
+        """
+        data = {
+            symbol: df.sort_values('Date').drop_duplicates('Date', keep='last')
+            for symbol, df in data.items() if df is not None and not df.empty
+        }
+        frames = list(data.values())
+
+        lengths = [len(df) for df in frames]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        if frames:
+            bar_dates = np.concatenate([pd.DatetimeIndex(df['Date']).as_unit('ns').asi8 for df in frames])
+            prices = np.vstack([
+                np.concatenate([df[field.capitalize()].to_numpy(dtype=np.float64) for df in frames])
+                for field in FIELDS
+            ])
+        else:
+            bar_dates = np.empty(0, dtype=np.int64)
+            prices = np.empty((len(FIELDS), 0))
+        date_values = np.unique(bar_dates)
+
+        positions = np.empty((len(date_values) + 1, len(frames)), dtype=np.int64)
+        for s in range(len(frames)):
+            positions[:-1, s] = np.searchsorted(bar_dates[offsets[s]:offsets[s + 1]], date_values)
+            positions[-1, s] = lengths[s]
+
+        self._attach(list(data), {
+            'prices': prices,
+            'bar_dates': bar_dates,
+            'offsets': offsets,
+            'date_values': date_values,
+            'positions': positions,
+        })
+
+    def _attach(self, symbols: List[str], arrays: Dict[str, np.ndarray]):
+        """Set the panel's arrays and build the per-symbol frames over them"""
+        self.symbols: List[str] = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.dates = pd.DatetimeIndex(np.asarray(self.date_values).view('datetime64[ns]'))
+
+        self.frames: Dict[str, pd.DataFrame] = {}
+        for s, symbol in enumerate(self.symbols):
+            lo, hi = int(self.offsets[s]), int(self.offsets[s + 1])
+            columns = {'date': self.bar_dates[lo:hi].view('datetime64[ns]')}
+            columns.update({field: self.prices[f, lo:hi] for f, field in enumerate(FIELDS)})
+            # Categorical, so slicing it is as cheap as slicing the prices
+            columns['symbol'] = pd.Categorical.from_codes(np.zeros(hi - lo, dtype=np.int8), [symbol])
+            self.frames[symbol] = pd.DataFrame(columns, copy=False)
+
+    @classmethod
+    def load(
+        cls,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        cache_dir=None,
+        download_missing: bool = True
+    ) -> "PricePanel":
+        """
+        Load daily bars from the market-data store
+
+        Args:
+            symbols: Symbols to load
+            start_date: First date needed (including indicator warm-up)
+            end_date: Last date needed
+            cache_dir: Market-data store root (default: MARKET_DATA_DIR)
+            download_missing: First fetch bars the store is missing, in
+                batched requests; False to run offline from the store
+
+        Returns:
+            PricePanel of the symbols found
+        """
+        if not STORE_AVAILABLE:
+            raise RuntimeError("Market-data store is not available (src.scanner could not be imported)")
+
+        cache_dir = cache_dir or MARKET_DATA_DIR
+        if download_missing:
+            try:
+                fetch_batch(symbols, start_date, end_date + timedelta(days=1), cache_dir, timeframe="1d")
+            except Exception as e:
+                # Whatever is already stored is still usable
+                logger.error(f"Error fetching missing bars: {str(e)}")
+
+        data = load_cached_many(symbols, cache_dir, timeframe="1d", start_date=start_date, end_date=end_date)
+        missing = [symbol for symbol in symbols if symbol not in data]
+        if missing:
+            logger.warning(f"No stored daily bars for {len(missing)} symbols: {', '.join(missing[:10])}")
+
+        panel = cls(data)
+        logger.info(f"Loaded price panel: {len(panel.symbols)} symbols x {len(panel.dates)} dates")
+        return panel
+
+    def save(self, directory) -> Path:
+        """
+        Write the panel as .npy files plus symbols.json, for open()
+
+        Returns:
+            The directory
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with open(directory / "symbols.json", 'w') as f:
+            json.dump(self.symbols, f)
+        return directory
+
+    @classmethod
+    def open(cls, directory) -> "PricePanel":
+        """
+        Open a saved panel read-only, memory-mapping its arrays
+
+        Processes opening the same directory share the pages instead of
+        each holding a copy.
+        """
+        directory = Path(directory)
+        with open(directory / "symbols.json") as f:
+            symbols = json.load(f)
+        panel = cls.__new__(cls)
+        panel._attach(symbols, {name: np.load(directory / f"{name}.npy", mmap_mode='r') for name in ARRAYS})
+        return panel
+
+    def _date_position(self, date: datetime) -> int:
+        """Number of panel dates before date"""
+        return int(np.searchsorted(self.date_values, pd.Timestamp(date).as_unit('ns').value))
+
+    def history(self, symbol: str, date: datetime, days: int = 365) -> Optional[pd.DataFrame]:
+        """
+        Bars of a symbol dated in [date - days, date)
+
+        What a strategy could have seen before the session on date.
+
+        Args:
+            symbol: Stock symbol
+            date: Simulated date (excluded)
+            days: Calendar days of history
+
+        Returns:
+            Row slice of the symbol's frame, or None if the symbol is not loaded
+        """
+        rows = self.rows(symbol, date, days)
+        if rows is None:
+            return None
+        return self.frames[symbol].iloc[rows[0]:rows[1]]
+
+    def rows(self, symbol: str, date: datetime, days: int = 365) -> Optional[Tuple[int, int]]:
+        """
+        Row range of history() in the symbol's frame
+
+        Returns:
+            (start, stop) row positions, or None if the symbol is not loaded
+        """
+        s = self.index.get(symbol)
+        if s is None:
+            return None
+        lo = self.positions[self._date_position(date - timedelta(days=days)), s]
+        hi = self.positions[self._date_position(date), s]
+        return int(lo), int(hi)
+
+    def bar(self, symbol: str, date: datetime) -> Optional[Dict]:
+        """
+        OHLCV of a symbol on date
+
+        Returns:
+            Dict with open, high, low, close and volume, or None if the
+            symbol has no bar that day
+        """
+        s = self.index.get(symbol)
+        if s is None:
+            return None
+        row = self._date_position(date)
+        if row >= len(self.date_values) or self.date_values[row] != pd.Timestamp(date).as_unit('ns').value:
+            return None
+        lo, hi = self.positions[row, s], self.positions[row + 1, s]
+        if hi == lo:
+            return None
+        return dict(zip(FIELDS, self.prices[:, self.offsets[s] + lo].tolist()))
+
+    def field(self, name: str) -> np.ndarray:
+        """One field aligned as a (date x symbol) array, NaN where a symbol has no bar"""
+        aligned = np.full((len(self.date_values), len(self.symbols)), np.nan)
+        values = self.prices[FIELDS.index(name)]
+        for s in range(len(self.symbols)):
+            lo, hi = self.offsets[s], self.offsets[s + 1]
+            aligned[np.searchsorted(self.date_values, self.bar_dates[lo:hi]), s] = values[lo:hi]
+        return aligned
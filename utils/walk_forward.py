@@ -0,0 +1,343 @@
+"""
+Walk-Forward Optimization
+
+Tune strategy thresholds without fitting them to the period they are
+judged on:
+- Split history into rolling windows: an in-sample period followed by the
+  out-of-sample period after it
+- Backtest every combination of a parameter grid on each in-sample period
+  (in parallel, see batch_backtest) and keep the best by an objective
+- Backtest each window's best parameters on its out-of-sample period and
+  chain those results into one out-of-sample equity curve
+
+Prices are loaded once into a shared PricePanel, and each worker computes
+an indicator once per symbol for all the combinations it runs (see
+strategies.base_strategy.cached_indicators).
+"""
+
+import itertools
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from strategies.base_strategy import cached_indicators
+from utils.backtest_engine import BacktestConfig
+from utils.batch_backtest import BatchJob, comparison_table, load_panel, make_strategy, run_parallel
+from utils.price_panel import PricePanel
+from src.scanner.executor import DEFAULT_SHARD_SIZE
+
+logger = logging.getLogger("backtest")
+
+# BacktestResult metrics a window's parameters can be chosen by (higher is better)
+OBJECTIVES = ('sharpe_ratio', 'total_return_pct', 'profit_factor', 'expectancy', 'win_rate')
+
+
+@dataclass
+class WalkForwardWindow:
+    """One in-sample period and the out-of-sample period after it (dates inclusive)"""
+    index: int
+    in_sample_start: str
+    in_sample_end: str
+    out_of_sample_start: str
+    out_of_sample_end: str
+
+
+@dataclass
+class WalkForwardResult:
+    """Walk-forward optimization results"""
+    strategy_name: str
+    config: BacktestConfig
+    objective: str
+    
+    # Per window: dates, chosen parameters, in-sample score, out-of-sample metrics
+    windows: List[Dict]
+    
+    # Every window x combination, in job order
+    in_sample: pd.DataFrame
+    
+    # Out-of-sample backtests (BacktestResult.to_dict()), by window
+    out_of_sample: List[Optional[Dict]]
+    
+    # Aggregated out-of-sample metrics
+    equity_curve: List[Dict]  # List of {date, capital, window}
+    total_return_pct: float
+    max_drawdown: float
+    total_trades: int
+    win_rate: float
+    
+    def to_dict(self):
+        return {
+            'strategy_name': self.strategy_name,
+            'config': self.config.to_dict(),
+            'objective': self.objective,
+            'windows': self.windows,
+            'in_sample': self.in_sample.astype(object).where(self.in_sample.notna(), None).to_dict('records'),
+            'out_of_sample': self.out_of_sample,
+            'equity_curve': self.equity_curve,
+            'total_return_pct': self.total_return_pct,
+            'max_drawdown': self.max_drawdown,
+            'total_trades': self.total_trades,
+            'win_rate': self.win_rate
+        }
+
+
+def walk_forward_windows(
+    start_date: str,
+    end_date: str,
+    in_sample_months: int = 12,
+    out_of_sample_months: int = 3
+) -> List[WalkForwardWindow]:
+    """
+    Rolling windows over [start_date, end_date]
+    
+    Out-of-sample periods follow each other without gaps or overlap, from
+    in_sample_months after start_date to end_date (the last may be short);
+    each in-sample period is the in_sample_months before its out-of-sample one.
+    
+    Args:
+        start_date: First in-sample date ('YYYY-MM-DD')
+        end_date: Last out-of-sample date ('YYYY-MM-DD')
+        in_sample_months: Length of each in-sample period
+        out_of_sample_months: Length of each out-of-sample period (and the step)
+    
+    Returns:
+        List of WalkForwardWindow, oldest first
+    """
+    if in_sample_months < 1 or out_of_sample_months < 1:
+        raise ValueError("in_sample_months and out_of_sample_months must be at least 1")
+    
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    day = pd.Timedelta(days=1)
+    windows = []
+    
+    while True:
+        oos_months = in_sample_months + len(windows) * out_of_sample_months
+        oos_start = start + pd.DateOffset(months=oos_months)
+        if oos_start > end:
+            break
+        
+        is_start = oos_start - pd.DateOffset(months=in_sample_months)
+        oos_end = min(start + pd.DateOffset(months=oos_months + out_of_sample_months) - day, end)
+        windows.append(WalkForwardWindow(
+            index=len(windows),
+            in_sample_start=is_start.strftime('%Y-%m-%d'),
+            in_sample_end=(oos_start - day).strftime('%Y-%m-%d'),
+            out_of_sample_start=oos_start.strftime('%Y-%m-%d'),
+            out_of_sample_end=oos_end.strftime('%Y-%m-%d')
+        ))
+    
+    return windows
+
+
+def parameter_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Every combination of a parameter grid
+    
+    Args:
+        grid: {parameter: candidate values}, e.g. {'min_volume_ratio': [1.0, 1.2]}
+    
+    Returns:
+        List of parameter dicts, last parameter varying fastest
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def select_parameters(
+    candidates: List[Dict],
+    results: List[Optional[Dict]],
+    objective: str = "sharpe_ratio",
+    min_trades: int = 5
+) -> Optional[int]:
+    """
+    Index of the best in-sample result
+    
+    Results with fewer than min_trades trades, no objective value or no
+    result at all (the job failed) are not eligible; ties go to the
+    earlier candidate.
+    
+    Returns:
+        Index into candidates, or None if none is eligible
+    """
+    best, best_score = None, None
+    for i, result in enumerate(results):
+        if result is None or result['total_trades'] < min_trades:
+            continue
+        score = result.get(objective)
+        if score is None or np.isnan(score):
+            continue
+        if best_score is None or score > best_score:
+            best, best_score = i, score
+    return best
+
+
+def chain_equity(results: List[Optional[Dict]], initial_capital: float) -> List[Dict]:
+    """
+    One equity curve from consecutive out-of-sample backtests
+    
+    Every backtest starts from initial_capital; each is rescaled to start
+    where the previous one ended, so the curve compounds window returns.
+    
+    Returns:
+        List of {date, capital, window}
+    """
+    curve = []
+    capital = initial_capital
+    for window, result in enumerate(results):
+        if result is None or not result['equity_curve']:
+            continue
+        scale = capital / result['initial_capital']
+        curve.extend(
+            {'date': point['date'], 'capital': point['capital'] * scale, 'window': window}
+            for point in result['equity_curve']
+        )
+        capital = result['final_capital'] * scale
+    return curve
+
+
+def walk_forward(
+    config: BacktestConfig,
+    strategy: str,
+    symbols: List[str],
+    grid: Dict[str, List],
+    in_sample_months: int = 12,
+    out_of_sample_months: int = 3,
+    objective: str = "sharpe_ratio",
+    min_trades: int = 5,
+    panel: Optional[PricePanel] = None,
+    cache_dir: Optional[str] = None,
+    offline: bool = False,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+    mode: str = "auto",
+    progress_callback: Optional[Callable] = None
+) -> WalkForwardResult:
+    """
+    Walk-forward optimize a strategy's parameters
+    
+    Args:
+        config: Full period (first in-sample to last out-of-sample date) and
+            capital settings
+        strategy: Strategy name (key of batch_backtest.STRATEGIES)
+        symbols: List of symbols to trade
+        grid: {parameter: candidate values}; parameters are strategy
+            attributes or config fields, as in batch_backtest
+        in_sample_months: Length of each in-sample period
+        out_of_sample_months: Length of each out-of-sample period
+        objective: In-sample metric to maximize (one of OBJECTIVES)
+        min_trades: In-sample trades a combination needs to be eligible;
+            windows with no eligible combination use the strategy defaults
+        panel: Preloaded prices (default: loaded once from the store)
+        cache_dir: Market-data store root (default: MARKET_DATA_DIR)
+        offline: Only use stored bars, never download missing ones
+        executor: 'process', 'thread' or 'serial'
+        max_workers: Pool size (default: CPU count)
+        mode: Signal mode for the engine ('auto', 'vectorized' or 'loop')
+        progress_callback: Optional callback(backtests done, total backtests)
+    
+    Returns:
+        WalkForwardResult
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}, got {objective!r}")
+    
+    windows = walk_forward_windows(config.start_date, config.end_date, in_sample_months, out_of_sample_months)
+    if not windows:
+        raise ValueError(f"{config.start_date} to {config.end_date} is shorter than one in-sample period")
+    
+    candidates = parameter_grid(grid)
+    for params in candidates:
+        # Fail here, not in a worker, on unknown strategies or parameters
+        make_strategy(strategy, params)
+    
+    logger.info(
+        f"Walk-forward: {strategy}, {len(windows)} windows x {len(candidates)} parameter sets "
+        f"({in_sample_months}m in-sample / {out_of_sample_months}m out-of-sample)"
+    )
+    
+    in_sample_jobs = [
+        BatchJob(w.index * len(candidates) + c, strategy, f"window {w.index}", symbols, params,
+                 start_date=w.in_sample_start, end_date=w.in_sample_end)
+        for w in windows for c, params in enumerate(candidates)
+    ]
+    total = len(in_sample_jobs) + len(windows)
+    
+    if panel is None:
+        panel = load_panel(config, symbols, cache_dir, offline)
+    
+    # Serial and thread runs share one indicator cache for the whole search
+    with tempfile.TemporaryDirectory(prefix="walk_forward_panel_") as panel_dir, cached_indicators():
+        panel.save(panel_dir)
+        
+        # Large shards: every combination a worker runs reuses its indicators
+        in_sample, in_sample_errors = run_parallel(
+            in_sample_jobs, panel_dir, config, executor=executor, max_workers=max_workers, mode=mode,
+            shard_size=DEFAULT_SHARD_SIZE,
+            progress_callback=progress_callback and (lambda done, _: progress_callback(done, total))
+        )
+        
+        chosen, out_of_sample_jobs = [], []
+        for w in windows:
+            jobs = in_sample_jobs[w.index * len(candidates):(w.index + 1) * len(candidates)]
+            best = select_parameters(candidates, [in_sample.get(job.job_id) for job in jobs], objective, min_trades)
+            chosen.append(best)
+            out_of_sample_jobs.append(BatchJob(
+                len(in_sample_jobs) + w.index, strategy, f"window {w.index}", symbols,
+                candidates[best] if best is not None else {},
+                start_date=w.out_of_sample_start, end_date=w.out_of_sample_end
+            ))
+        
+        out_of_sample, out_of_sample_errors = run_parallel(
+            out_of_sample_jobs, panel_dir, config, executor=executor, max_workers=max_workers, mode=mode,
+            progress_callback=progress_callback and (lambda done, _: progress_callback(len(in_sample_jobs) + done, total))
+        )
+    
+    oos_results = [out_of_sample.get(job.job_id) for job in out_of_sample_jobs]
+    window_rows = []
+    for w, best, job, result in zip(windows, chosen, out_of_sample_jobs, oos_results):
+        in_sample_result = in_sample.get(in_sample_jobs[w.index * len(candidates) + best].job_id) if best is not None else None
+        window_rows.append({
+            'window': w.index,
+            'in_sample_start': w.in_sample_start,
+            'in_sample_end': w.in_sample_end,
+            'out_of_sample_start': w.out_of_sample_start,
+            'out_of_sample_end': w.out_of_sample_end,
+            'params': job.params,
+            'defaults': best is None,
+            'in_sample_score': in_sample_result[objective] if in_sample_result else None,
+            'in_sample_trades': in_sample_result['total_trades'] if in_sample_result else None,
+            'out_of_sample_score': result[objective] if result else None,
+            'out_of_sample_return_pct': result['total_return_pct'] if result else None,
+            'out_of_sample_trades': result['total_trades'] if result else None,
+            'error': out_of_sample_errors.get(job.job_id)
+        })
+    
+    equity_curve = chain_equity(oos_results, config.initial_capital)
+    capital = np.array([point['capital'] for point in equity_curve] or [config.initial_capital])
+    peak = np.maximum.accumulate(capital)
+    trades = [trade for result in oos_results if result for trade in result['trades']]
+    winners = sum(1 for trade in trades if (trade['profit_loss'] or 0) > 0)
+    
+    result = WalkForwardResult(
+        strategy_name=strategy,
+        config=config,
+        objective=objective,
+        windows=window_rows,
+        in_sample=comparison_table(in_sample_jobs, in_sample, in_sample_errors).sort_values('job_id').reset_index(drop=True),
+        out_of_sample=oos_results,
+        equity_curve=equity_curve,
+        total_return_pct=float((capital[-1] / config.initial_capital - 1) * 100),
+        max_drawdown=float(np.max((peak - capital) / peak) * 100),
+        total_trades=len(trades),
+        win_rate=winners / len(trades) * 100 if trades else 0.0
+    )
+    
+    logger.info(
+        f"Walk-forward complete: {strategy} out-of-sample return {result.total_return_pct:.2f}% "
+        f"over {result.total_trades} trades, max drawdown {result.max_drawdown:.2f}%"
+    )
+    return result
@@ -5,7 +5,7 @@ Endpoints for running and managing strategy backtests.
 """
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel
 from pathlib import Path
 from datetime import datetime
@@ -16,6 +16,7 @@ import json
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from utils.backtest_engine import BacktestEngine, BacktestConfig, BacktestResult
+from utils.batch_backtest import expand_jobs, make_strategy, run_batch
 
 router = APIRouter()
 
@@ -31,6 +32,10 @@ backtest_status = {
 # Cache for completed backtests
 backtest_results = {}
 
+# Status and results of batch backtests, by batch id
+batch_status = {}
+batch_results = {}
+
 
 class BacktestRequest(BaseModel):
     """Request model for running a backtest"""
@@ -44,6 +49,20 @@ class BacktestRequest(BaseModel):
     brokerage_per_trade: float = 20.0
 
 
+class BatchBacktestRequest(BaseModel):
+    """Request model for a batch of backtests (strategies x parameter sets x universes)"""
+    strategies: List[str]
+    universes: Dict[str, List[str]]
+    param_sets: Optional[Union[List[Dict], Dict[str, List[Dict]]]] = None
+    start_date: str
+    end_date: str
+    initial_capital: float = 100000
+    risk_per_trade: float = 2.0
+    max_positions: int = 5
+    brokerage_per_trade: float = 20.0
+    max_workers: Optional[int] = None
+
+
 @router.get("/status")
 async def get_backtest_status():
     """Get current backtest status"""
@@ -187,6 +206,140 @@ async def execute_backtest(
         backtest_status["is_running"] = False
 
 
+@router.post("/batch")
+async def run_batch_backtest(request: BatchBacktestRequest, background_tasks: BackgroundTasks):
+    """
+    Run a batch of backtests in parallel and compare them
+    
+    Every strategy x parameter set x universe runs as its own job on a
+    process pool; poll /batch/{batch_id} for progress and the comparison table.
+    
+    Args:
+        request: BatchBacktestRequest with the jobs and shared configuration
+        background_tasks: FastAPI background tasks
+    """
+    try:
+        start_date = datetime.fromisoformat(request.start_date)
+        end_date = datetime.fromisoformat(request.end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    
+    if not request.strategies or not request.universes:
+        raise HTTPException(status_code=400, detail="At least one strategy and one universe are required")
+    
+    # Fail here, not in the background task, on unknown strategies or parameters
+    try:
+        expand_jobs(request.strategies, request.universes, request.param_sets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    batch_status[batch_id] = {
+        "is_running": True,
+        "completed": 0,
+        "total": 0,
+        "message": "Queued"
+    }
+    
+    background_tasks.add_task(execute_batch_backtest, batch_id, request)
+    
+    return {
+        "success": True,
+        "message": f"Batch backtest started for {len(request.strategies)} strategies",
+        "batch_id": batch_id,
+        "period": f"{request.start_date} to {request.end_date}"
+    }
+
+
+async def execute_batch_backtest(batch_id: str, request: BatchBacktestRequest):
+    """Execute a batch backtest in background (non-blocking)"""
+    status = batch_status[batch_id]
+    
+    try:
+        config = BacktestConfig(
+            start_date=request.start_date,
+            end_date=request.end_date,
+            initial_capital=request.initial_capital,
+            risk_per_trade=request.risk_per_trade,
+            max_positions=request.max_positions,
+            brokerage_per_trade=request.brokerage_per_trade
+        )
+        
+        def progress_callback(completed: int, total: int):
+            status["completed"] = completed
+            status["total"] = total
+            status["message"] = f"{completed}/{total} backtests complete"
+        
+        status["message"] = "Loading prices..."
+        
+        # The batch fans out to its own process pool; wait for it off the event loop
+        import asyncio
+        
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(
+            None,
+            lambda: run_batch(
+                config,
+                request.strategies,
+                request.universes,
+                request.param_sets,
+                max_workers=request.max_workers,
+                progress_callback=progress_callback
+            )
+        )
+        
+        batch_results[batch_id] = result.to_dict()
+        
+        # Save to file (own directory, so /results lists single backtests only)
+        output_dir = Path("data/backtests/batches")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_dir / f"{batch_id}.json", 'w') as f:
+            json.dump({"config": config.to_dict(), **batch_results[batch_id]}, f, indent=2)
+        
+        status["message"] = f"Batch complete! {len(result.jobs)} backtests compared."
+        status["result_id"] = batch_id
+        
+    except Exception as e:
+        status["message"] = f"Error: {str(e)}"
+        import traceback
+        traceback.print_exc()
+    
+    finally:
+        status["is_running"] = False
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_backtest(batch_id: str):
+    """Get status and, once finished, the comparison table of a batch backtest"""
+    try:
+        if batch_id in batch_status and batch_status[batch_id]["is_running"]:
+            return {"success": True, "status": batch_status[batch_id]}
+        
+        result = batch_results.get(batch_id)
+        if result is None:
+            output_file = Path("data/backtests/batches") / f"{batch_id}.json"
+            
+            if not output_file.exists():
+                return {"success": False, "error": "Batch backtest not found", "status": batch_status.get(batch_id)}
+            
+            with open(output_file, 'r') as f:
+                result = json.load(f)
+        
+        return {
+            "success": True,
+            "status": batch_status.get(batch_id),
+            "table": result["table"],
+            "result": result
+        }
+    
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 @router.get("/results")
 async def get_backtest_results():
     """Get list of all backtest results"""
@@ -288,6 +441,12 @@ async def get_available_strategies():
             "description": "1-3 day momentum breakout trades",
             "icon": "⚡"
         },
+        {
+            "id": "improved_btst",
+            "name": "Improved BTST",
+            "description": "Late-session breakout with overnight hold",
+            "icon": "🌙"
+        },
         {
             "id": "swing_supertrend",
             "name": "Swing SuperTrend",
@@ -332,26 +491,9 @@ def load_strategy(strategy_name: str):
         Strategy instance or None
     """
     try:
-        if strategy_name == "pullback_entry":
-            from strategies.pullback_entry import PullbackEntryStrategy
-            return PullbackEntryStrategy()
-        
-        elif strategy_name == "momentum_btst":
-            from strategies.momentum_btst import MomentumBTSTStrategy
-            return MomentumBTSTStrategy()
-        
-        elif strategy_name == "swing_supertrend":
-            from strategies.swing_supertrend import SwingSuperTrendStrategy
-            return SwingSuperTrendStrategy()
-        
-        elif strategy_name == "mean_reversion":
-            from strategies.mean_reversion import MeanReversionStrategy
-            return MeanReversionStrategy()
-        
-        elif strategy_name == "swing_breakout_india":
-            from strategies.swing_breakout_india import SwingBreakoutIndiaStrategy
-            return SwingBreakoutIndiaStrategy()
-        
+        return make_strategy(strategy_name)
+    
+    except ValueError:
         return None
     
     except Exception as e:
@@ -6,12 +6,13 @@ Integrates with weekly_trade_scanner.py for signal detection
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import sys
 from pathlib import Path
 import logging
 import subprocess
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 class AIScanRequest(BaseModel):
@@ -42,8 +43,11 @@ class AIWatchlistRequest(BaseModel):
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.config import OUTPUT_DIR, RAW_DATA_DIR
+from src.config import (
+    OUTPUT_DIR, MARKET_DATA_DIR, FETCH_RATE_LIMIT, FETCH_MAX_CONCURRENCY, FETCH_MAX_RETRIES, RETRY_QUEUE_PATH
+)
 from src.scanner.data_fetcher import fetch_weekly, load_cached
+from src.scanner.scheduler import FetchScheduler, RetryQueue
 from src.scanner.indicators import supertrend, calculate_momentum, calculate_sma, calculate_rsi
 
 logger = logging.getLogger(__name__)
@@ -75,6 +79,13 @@ async def get_scanner_status():
     return {"success": True, "status": scanner_status}
 
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Hit/miss counters of the shared strategy data cache"""
+    from strategies.data_cache import get_shared_cache
+    return {"success": True, "stats": get_shared_cache().stats()}
+
+
 @router.get("/latest-signals")
 async def get_latest_signals(strategy: str = "all", capital: float = 100000):
     """Get latest scanner signals for a specific strategy or all"""
@@ -398,6 +409,7 @@ async def execute_pullback_scanner(top_n: int, capital: float):
     try:
         # Import required modules
         from strategies.pullback_entry import PullbackEntryStrategy
+        from strategies.data_cache import get_shared_cache, period_start
         import pandas as pd
         
         # Try to find a watchlist file (same locations as other strategies)
@@ -447,6 +459,32 @@ async def execute_pullback_scanner(top_n: int, capital: float):
         # Initialize strategy
         strategy = PullbackEntryStrategy()
         
+        # Load the whole watchlist up front through the shared OHLCV cache (the
+        # same memory and on-disk store as fetch_data); misses are downloaded
+        # together, batched and rate limited
+        scanner_status["current_stock"] = f"Downloading data for {len(symbols)} stocks..."
+        scheduler = FetchScheduler(
+            rate=FETCH_RATE_LIMIT,
+            max_concurrency=FETCH_MAX_CONCURRENCY,
+            max_retries=FETCH_MAX_RETRIES,
+            retry_queue=RetryQueue(RETRY_QUEUE_PATH),
+        )
+        
+        def download_missing(missing, period, interval):
+            end_date = datetime.now() + timedelta(days=1)
+            downloaded = scheduler.download_sync(missing, period_start(period).to_pydatetime(), end_date, interval)
+            logger.info(f"Pullback scanner data: {scheduler.stats.summary()}")
+            
+            frames = {}
+            for symbol, df_data in downloaded.items():
+                # Same layout as strategy.fetch_data: date index, lowercase columns
+                df_data = df_data.set_index('Date')
+                df_data.columns = [col.lower() for col in df_data.columns]
+                frames[symbol] = df_data
+            return frames
+        
+        frames = await asyncio.to_thread(get_shared_cache().get_many, symbols, "6mo", "1d", download_missing)
+        
         # Scan symbols
         signals = []
         for i, symbol in enumerate(symbols, 1):
@@ -455,8 +493,7 @@ async def execute_pullback_scanner(top_n: int, capital: float):
             scanner_status["current_stock"] = f"[{i}/{len(symbols)}] {symbol}"
             
             try:
-                df_data = strategy.fetch_data(symbol, period="6mo", interval="1d")
-                
+                df_data = frames.get(symbol)
                 if df_data is None or len(df_data) < 50:
                     continue
                 
@@ -492,7 +529,7 @@ async def check_signal(symbol: str):
     """Check for SuperTrend signal on a specific symbol"""
     try:
         # Load data
-        df = load_cached(symbol, RAW_DATA_DIR)
+        df = load_cached(symbol, MARKET_DATA_DIR)
         if df is None or len(df) < 50:
             return {
                 "success": False,
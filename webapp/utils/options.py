@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import calendar
 import logging
 
+from src.scanner.trading_calendar import nse_calendar
+
 logger = logging.getLogger(__name__)
 
 NSE_OC_URL_EQUITIES = "https://www.nseindia.com/api/option-chain-equities?symbol={symbol}"
@@ -20,18 +22,6 @@ NSE_REFERER = "https://www.nseindia.com/option-chain"
 # List of index symbols (not equities)
 INDEX_SYMBOLS = {'NIFTY', 'BANKNIFTY', 'FINNIFTY', 'MIDCPNIFTY', 'SENSEX', 'BANKEX', 'SENSEX50', 'NIFTYNXT50'}
 
-# NSE/BSE Trading Holidays 2024-2025 (update annually)
-# Format: "YYYY-MM-DD"
-NSE_BSE_HOLIDAYS = [
-    "2024-01-26", "2024-03-08", "2024-03-25", "2024-03-29", "2024-04-11", "2024-04-17",
-    "2024-04-21", "2024-05-01", "2024-05-23", "2024-06-17", "2024-07-17", "2024-08-15",
-    "2024-08-26", "2024-10-02", "2024-10-12", "2024-11-01", "2024-11-02", "2024-11-15",
-    "2024-12-25",
-    "2025-01-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
-    "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-11-01",
-    "2025-11-05", "2025-12-25",
-]
-
 # Index expiry schedules (as per NSE/BSE rules)
 # Format: {symbol: (expiry_day_of_week, expiry_type)}
 # expiry_day_of_week: 0=Monday, 1=Tuesday, 2=Wednesday, 3=Thursday, 4=Friday
@@ -122,16 +112,8 @@ def _is_trading_holiday(date: datetime) -> bool:
     Returns:
         True if it's a holiday, False if it's a trading day
     """
-    # Check if weekend (Saturday=5, Sunday=6)
-    if date.weekday() >= 5:
-        return True
-    
-    # Check if it's a market holiday
-    date_str = date.strftime('%Y-%m-%d')
-    if date_str in NSE_BSE_HOLIDAYS:
-        return True
-    
-    return False
+    # Special sessions (e.g. Muhurat trading) do not carry expiries, so they count as holidays
+    return not nse_calendar().is_trading_day(date, special=False)
 
 
 def _adjust_for_trading_holiday(date: datetime) -> datetime: